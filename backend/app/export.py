@@ -0,0 +1,112 @@
+"""
+Streaming CSV export
+Result reports are formatted section by section into small text chunks, so
+memory stays flat and the first bytes are sent before the whole report is done
+"""
+
+import io
+import csv
+from itertools import islice
+from typing import Iterable, Iterator, Union
+
+from app.models.schemas import OPFResult, ColumnarOPFResult, BatchOPFResult
+from app.solver.results import ResultArrays
+
+# Target size of each yielded chunk
+CHUNK_BYTES = 64 * 1024
+
+# Rows handed to csv.writer at a time
+ROW_BLOCK = 1024
+
+
+class ChunkedCSVWriter:
+    """csv.writer over a small buffer that is drained whenever it fills up"""
+
+    def __init__(self, chunk_bytes: int = CHUNK_BYTES):
+        self.chunk_bytes = chunk_bytes
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _drain(self) -> str:
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+    def rows(self, rows: Iterable) -> Iterator[str]:
+        """Write rows, yielding a chunk each time the buffer reaches chunk_bytes"""
+        rows = iter(rows)
+        while True:
+            block = list(islice(rows, ROW_BLOCK))
+            if not block:
+                return
+            self._writer.writerows(block)
+            if self._buffer.tell() >= self.chunk_bytes:
+                yield self._drain()
+
+    def flush(self) -> Iterator[str]:
+        """Yield whatever is still buffered"""
+        if self._buffer.tell():
+            yield self._drain()
+
+
+def iter_result_csv(result: Union[OPFResult, ColumnarOPFResult],
+                    chunk_bytes: int = CHUNK_BYTES) -> Iterator[str]:
+    """CSV report of one OPF result: generator, bus and line sections plus totals"""
+    arrays = ResultArrays.from_result(result)
+    col = arrays.columns
+    out = ChunkedCSVWriter(chunk_bytes)
+
+    yield from out.rows([["Generator Results"], ["Bus", "Pg (MW)", "Qg (MVAR)", "Cost ($/h)"]])
+    yield from out.rows(zip(col["gen_bus"], col["gen_pg"], col["gen_qg"], col["gen_cost"]))
+
+    yield from out.rows([[], ["Bus Results"],
+                         ["Bus", "Va (degrees)", "Pl (MW)", "Ql (MVAR)", "LMP ($/MWh)", "Curtailment (MW)"]])
+    yield from out.rows(zip(col["bus"], col["bus_va"], col["bus_pl"], col["bus_ql"],
+                            col["bus_marginal_cost"], col["bus_curtailment"]))
+
+    yield from out.rows([[], ["Line Results"],
+                         ["From", "To", "Flow (MW)", "Loading (%)", "Congestion Rent ($/h)"]])
+    yield from out.rows(zip(col["line_from"], col["line_to"], col["line_flow_mw"],
+                            col["line_loading_percent"], col["line_congestion_rent"]))
+
+    yield from out.rows([[], ["Total Cost", f"{arrays.total_cost} $/h"],
+                         ["Total Curtailment", f"{arrays.total_curtailment} MW"]])
+    yield from out.flush()
+
+
+def iter_batch_csv(batch: BatchOPFResult, chunk_bytes: int = CHUNK_BYTES) -> Iterator[str]:
+    """
+    CSV report of a batch result in long form: a scenario summary, then one
+    row per scenario and element for generators, buses and lines
+    """
+    out = ChunkedCSVWriter(chunk_bytes)
+    scenarios = batch.scenarios
+
+    yield from out.rows([["Scenario Summary"],
+                         ["Scenario", "Status", "Error", "Total Cost ($/h)", "Objective ($/h)",
+                          "Total Curtailment (MW)"]])
+    yield from out.rows(zip(scenarios, batch.status, batch.error, batch.total_cost,
+                            batch.objective_value, batch.total_curtailment))
+
+    yield from out.rows([[], ["Generator Results"], ["Scenario", "Generator", "Pg (MW)"]])
+    for name, pg in zip(scenarios, batch.pg):
+        yield from out.rows((name, gen_id, p) for gen_id, p in zip(batch.gen_ids, pg))
+
+    yield from out.rows([[], ["Bus Results"], ["Scenario", "Bus", "LMP ($/MWh)", "Curtailment (MW)"]])
+    for name, lmp, curtailment in zip(scenarios, batch.lmp, batch.curtailment):
+        yield from out.rows((name, bus, m, c) for bus, m, c in zip(batch.bus_ids, lmp, curtailment))
+
+    yield from out.rows([[], ["Line Results"], ["Scenario", "From", "To", "Flow (MW)"]])
+    for name, flow in zip(scenarios, batch.flow):
+        yield from out.rows((name, f, t, p) for f, t, p in zip(batch.line_from, batch.line_to, flow))
+
+    yield from out.flush()
+
+
+def iter_csv(result: Union[OPFResult, ColumnarOPFResult, BatchOPFResult],
+             chunk_bytes: int = CHUNK_BYTES) -> Iterator[str]:
+    """CSV report of a single or batch result"""
+    if isinstance(result, BatchOPFResult):
+        return iter_batch_csv(result, chunk_bytes)
+    return iter_result_csv(result, chunk_bytes)
@@ -0,0 +1,208 @@
+"""
+Background solve jobs
+Queues long-running solves on the job pool and keeps their status and
+results so clients can poll instead of holding a request open
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from app.models.schemas import JobInfo
+from app.workers import submit_job
+
+logger = logging.getLogger(__name__)
+
+# Jobs allowed to wait or run at once; submissions beyond this are rejected
+MAX_ACTIVE_JOBS = max(1, int(os.environ.get("OPF_MAX_QUEUED_JOBS", 32)))
+
+# Finished jobs (and their results) kept for retrieval
+JOB_HISTORY_SIZE = max(1, int(os.environ.get("OPF_JOB_HISTORY", 100)))
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue has no room for another submission"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job when cancellation was requested"""
+
+
+class Job:
+    """A solve submitted to the job pool"""
+
+    def __init__(self, kind: str, cleanup: Optional[Callable[[], None]] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.progress = 0.0
+        self.error: Optional[str] = None
+        self.result = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.future = None
+        self.cancel_requested = threading.Event()
+        self.cleanup = cleanup
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def report_progress(self, done: int, total: int):
+        """Progress hook for the job function; stops the job if it was cancelled"""
+        if total > 0:
+            self.progress = min(1.0, done / total)
+        if self.cancel_requested.is_set():
+            raise JobCancelled()
+
+    def discard(self):
+        """Release what the job keeps outside memory (e.g. sweep output files); runs once"""
+        cleanup, self.cleanup = self.cleanup, None
+        if cleanup is not None:
+            try:
+                cleanup()
+            except Exception as e:
+                logger.warning(f"Cleanup of job {self.id} failed: {str(e)}")
+
+    def info(self) -> JobInfo:
+        return JobInfo(
+            id=self.id,
+            kind=self.kind,
+            status=self.status,
+            progress=self.progress,
+            error=self.error,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at
+        )
+
+
+class JobManager:
+    """
+    In-process job registry.
+
+    Jobs run on the job pool (app.workers), apart from interactive solves.
+    At most max_active jobs may be queued or running; the most recent
+    history_size finished jobs are kept with their results, older ones are
+    dropped. A job's cleanup runs when it is dropped, or as soon as it fails
+    or is cancelled.
+    """
+
+    def __init__(self, max_active: int = MAX_ACTIVE_JOBS, history_size: int = JOB_HISTORY_SIZE):
+        self.max_active = max_active
+        self.history_size = history_size
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable[[Job], object], cleanup: Optional[Callable[[], None]] = None) -> Job:
+        """
+        Queue fn(job) on the job pool. fn may call job.report_progress()
+        to publish progress and to honour cancellation. cleanup() releases
+        what the job leaves outside memory, such as its output files; it
+        also runs if the queue is full.
+        """
+        job = Job(kind, cleanup)
+        with self._lock:
+            active = sum(1 for j in self._jobs.values() if not j.finished)
+            if active < self.max_active:
+                self._jobs[job.id] = job
+                job.future = submit_job(self._run, job, fn)
+        if job.future is None:
+            job.discard()
+            raise JobQueueFull(f"Job queue is full ({self.max_active} active jobs)")
+        logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    def _run(self, job: Job, fn: Callable[[Job], object]):
+        with self._lock:
+            if job.status != QUEUED:
+                return
+            cancelled = job.cancel_requested.is_set()
+            if cancelled:
+                discarded = self._finish(job, CANCELLED)
+            else:
+                job.status = RUNNING
+                job.started_at = time.time()
+        if cancelled:
+            self._discard(discarded)
+            return
+
+        try:
+            result = fn(job)
+        except JobCancelled:
+            with self._lock:
+                discarded = self._finish(job, CANCELLED)
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {str(e)}")
+            with self._lock:
+                job.error = str(e)
+                discarded = self._finish(job, FAILED)
+        else:
+            with self._lock:
+                # A solve that can't be interrupted still honours a late cancel
+                if job.cancel_requested.is_set():
+                    discarded = self._finish(job, CANCELLED)
+                else:
+                    job.result = result
+                    job.progress = 1.0
+                    discarded = self._finish(job, COMPLETED)
+        self._discard(discarded)
+
+    def _finish(self, job: Job, status: str) -> List[Job]:
+        """Mark job finished and trim the history; returns the jobs to clean up"""
+        job.status = status
+        job.finished_at = time.time()
+        logger.info(f"Job {job.id} {status}")
+
+        finished = [j.id for j in self._jobs.values() if j.finished]
+        dropped = [self._jobs.pop(job_id) for job_id in finished[:max(0, len(finished) - self.history_size)]]
+        if status != COMPLETED and job not in dropped:
+            dropped.append(job)
+        return dropped
+
+    @staticmethod
+    def _discard(jobs: List[Job]):
+        # Outside the lock: cleanup may remove files
+        for job in jobs:
+            job.discard()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job. Queued jobs are removed from the pool queue; running
+        jobs stop at their next progress report, or have their result
+        discarded when they finish.
+        """
+        discarded = []
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job.cancel_requested.set()
+            if job.status == QUEUED and job.future.cancel():
+                discarded = self._finish(job, CANCELLED)
+        self._discard(discarded)
+        return job
+
+
+job_manager = JobManager()
@@ -3,29 +3,63 @@ DC OPF Simulator - Backend API
 FastAPI application for DC Optimal Power Flow calculations
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Query, Depends, File, UploadFile, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
-import io
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse, PlainTextResponse
 import os
-import csv
 import json
-from typing import Optional
+import time
+import uuid
+import shutil
+import tempfile
+import functools
+import numpy as np
+from typing import List, Optional, Union
 import logging
 
 from app.models.schemas import (
     PowerSystem,
     OPFRequest,
     OPFResult,
+    ColumnarOPFResult,
+    BatchOPFRequest,
+    BatchOPFResult,
     Bus,
     Generator,
     Line,
     Load,
     CaseData,
+    JobInfo,
+    SensitivityRequest,
+    PTDFResult,
+    LODFResult,
+    PowerFlowRequest,
+    PowerFlowResult,
+    ContingencyRequest,
+    ContingencyResult,
+    SCOPFRequest,
+    SCOPFResult,
+    MultiPeriodRequest,
+    MultiPeriodResult,
+    SweepResult,
     ExportFormat
 )
 from app.parser.matpower import MatpowerParser
+from app.parser.case_cache import load_case_file
 from app.solver.opf_solver import DCOPSolver
+from app.solver.results import as_opf_result
+from app.solver.sensitivity import get_sensitivity_model, MAX_BLOCK_ENTRIES
+from app.solver.powerflow import dc_power_flow
+from app.solver.contingency import screen_contingencies
+from app.solver.scopf import solve_scopf
+from app.solver.multiperiod import solve_multiperiod
+from app.solver.timeseries import run_sweep, DEFAULT_CHUNK_SIZE as SWEEP_CHUNK_SIZE
+from app.workers import run_in_worker, run_io, pending_tasks, OPF_MAX_WORKERS, OPF_JOB_WORKERS
+from app.jobs import job_manager, JobQueueFull, COMPLETED
+from app.store import session_store, DEFAULT_SESSION
+from app.wire import encode_response
+from app.export import iter_csv, iter_result_csv
+from app.metrics import registry as metrics_registry, request_duration, observe_solve
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,6 +67,12 @@ logger = logging.getLogger(__name__)
 # Directory for storing cases
 CASES_DIR = os.path.join(os.path.dirname(__file__), "cases")
 
+# Sweep profiles and result files, one directory per sweep
+SWEEP_DIR = os.environ.get("OPF_SWEEP_DIR", os.path.join(tempfile.gettempdir(), "opf_sweeps"))
+
+# Upload block size when saving a profile CSV to disk
+UPLOAD_BLOCK = 1024 * 1024
+
 app = FastAPI(
     title="DC OPF Simulator API",
     description="Backend API for DC Optimal Power Flow calculations",
@@ -47,24 +87,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global state for current case
-current_case: Optional[CaseData] = None
-opf_result: Optional[OPFResult] = None
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    """Request latency per route template (so /jobs/{job_id} is one series)"""
+    started = request.scope["received_at"] = time.perf_counter()
+    try:
+        return await call_next(request)
+    finally:
+        route = request.scope.get("route")
+        request_duration.observe(time.perf_counter() - started, method=request.method,
+                                 path=getattr(route, "path", "unmatched"))
+
+
+def session_id_param(
+    x_session_id: Optional[str] = Header(None, alias="X-Session-Id"),
+    session: Optional[str] = Query(None, description="Session ID for plain links (e.g. downloads)")
+) -> str:
+    """Client session from the X-Session-Id header or ?session=; shared default otherwise"""
+    return x_session_id or session or DEFAULT_SESSION
+
+
+SessionId = Depends(session_id_param)
+
+# Accept header for endpoints that can answer in JSON or columnar msgpack
+AcceptHeader = Header(None, alias="Accept")
 
 
 @app.get("/")
 async def root():
     """Health check endpoint"""
-    return {"status": "ok", "message": "DC OPF Simulator API is running"}
+    return {
+        "status": "ok",
+        "message": "DC OPF Simulator API is running",
+        "workers": OPF_MAX_WORKERS,
+        "job_workers": OPF_JOB_WORKERS,
+        "pending_tasks": pending_tasks()
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Latency histograms, solve counters and process gauges in Prometheus text format"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.post("/case", response_model=CaseData)
-async def parse_case(case: PowerSystem):
+async def parse_case(case: PowerSystem, session_id: str = SessionId,
+                     accept: Optional[str] = AcceptHeader):
     """
     Parse a power system from JSON input
     """
-    global current_case
-
     try:
         current_case = CaseData(
             buses=case.buses,
@@ -72,51 +145,80 @@ async def parse_case(case: PowerSystem):
             lines=case.lines,
             loads=case.loads
         )
+        await run_io(session_store.set_case, session_id, current_case)
         logger.info(f"Parsed case with {len(current_case.buses)} buses, "
                    f"{len(current_case.generators)} generators, "
                    f"{len(current_case.lines)} lines")
-        return current_case
+        return encode_response(current_case, accept)
     except Exception as e:
         logger.error(f"Error parsing case: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/case/text")
-async def parse_text_case(matpower_text: str):
+async def parse_text_case(matpower_text: str, session_id: str = SessionId,
+                          accept: Optional[str] = AcceptHeader):
     """
     Parse a MATPOWER format case file from text input
     """
-    global current_case
-
     try:
         parser = MatpowerParser()
-        current_case = parser.parse_text(matpower_text)
+        current_case = await run_in_worker(parser.parse_text, matpower_text)
+        await run_io(session_store.set_case, session_id, current_case)
         logger.info(f"Parsed MATPOWER case with {len(current_case.buses)} buses")
-        return current_case
+        return encode_response(current_case, accept)
     except Exception as e:
         logger.error(f"Error parsing MATPOWER case: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/case", response_model=CaseData)
-async def get_case():
+async def get_case(session_id: str = SessionId, accept: Optional[str] = AcceptHeader):
     """
     Get the current case data
     """
+    current_case = await run_io(session_store.get_case, session_id)
     if current_case is None:
         raise HTTPException(status_code=404, detail="No case loaded")
-    return current_case
-
-
-@app.post("/opf", response_model=OPFResult)
-async def run_opf(request: OPFRequest):
+    return encode_response(current_case, accept)
+
+
+def _solve_opf(case, request: OPFRequest, parse_seconds: float = 0.0):
+    """DC OPF for an OPFRequest, recorded in the solve metrics"""
+    solver = DCOPSolver()
+    result = solver.solve(
+        case,
+        voll=request.voll,
+        enforce_line_limits=request.enforce_line_limits,
+        remove_isolated=request.remove_isolated,
+        line_limit_mode=request.line_limit_mode,
+        result_format=request.result_format,
+        presolve=request.presolve
+    )
+    timings = solver.timer.summary()
+    if parse_seconds:
+        timings.phases = {"parse": parse_seconds, **timings.phases}
+        timings.total_seconds += parse_seconds
+    observe_solve(timings, result.status)
+    if request.include_timings:
+        result.timings = timings
+    return result
+
+
+@app.post("/opf", response_model=Union[OPFResult, ColumnarOPFResult])
+async def run_opf(request: OPFRequest, http_request: Request, session_id: str = SessionId,
+                  accept: Optional[str] = AcceptHeader):
     """
-    Run DC OPF optimization
+    Run DC OPF optimization.
+    result_format "columns" returns parallel arrays per field instead of
+    one object per element. include_timings adds the wall time per phase
+    (parse covers reading and validating the request body), solver
+    iterations, model size and peak memory.
     """
-    global current_case, opf_result
-
     try:
+        parse_seconds = time.perf_counter() - http_request.scope.get("received_at", time.perf_counter())
         # Use provided case or current case
+        current_case = await run_io(session_store.get_case, session_id)
         if request.case_data:
             current_case = CaseData(
                 buses=request.case_data.buses,
@@ -124,91 +226,461 @@ async def run_opf(request: OPFRequest):
                 lines=request.case_data.lines,
                 loads=request.case_data.loads
             )
+            await run_io(session_store.set_case, session_id, current_case)
 
         if current_case is None:
             raise HTTPException(status_code=400, detail="No case data provided")
 
-        # Run DC OPF solver
+        # Run DC OPF solver on the worker pool
+        opf_result = await run_in_worker(_solve_opf, current_case, request, parse_seconds)
+
+        await run_io(session_store.set_result, session_id, current_case, opf_result)
+
+        logger.info(f"OPF solved successfully. Total cost: {opf_result.total_cost}")
+        return encode_response(opf_result, accept)
+
+    except Exception as e:
+        logger.error(f"Error running OPF: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/opf/batch", response_model=BatchOPFResult)
+async def run_opf_batch(request: BatchOPFRequest, session_id: str = SessionId):
+    """
+    Run DC OPF for a batch of scenarios on one base case
+    """
+    case = await run_io(session_store.get_case, session_id)
+    if request.case_data:
+        case = CaseData(
+            buses=request.case_data.buses,
+            generators=request.case_data.generators,
+            lines=request.case_data.lines,
+            loads=request.case_data.loads
+        )
+
+    if case is None:
+        raise HTTPException(status_code=400, detail="No case data provided")
+    if not request.scenarios:
+        raise HTTPException(status_code=400, detail="No scenarios provided")
+
+    try:
         solver = DCOPSolver()
-        opf_result = solver.solve(
-            current_case,
+        batch = await run_in_worker(
+            solver.solve_many,
+            case,
+            request.scenarios,
             voll=request.voll,
             enforce_line_limits=request.enforce_line_limits,
-            remove_isolated=request.remove_isolated
+            remove_isolated=request.remove_isolated,
+            max_workers=request.max_workers
         )
-
-        logger.info(f"OPF solved successfully. Total cost: {opf_result.total_cost}")
-        return opf_result
+        logger.info(f"Batch OPF solved {len(request.scenarios)} scenarios")
+        return batch
 
     except Exception as e:
-        logger.error(f"Error running OPF: {str(e)}")
+        logger.error(f"Error running batch OPF: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/results", response_model=OPFResult)
-async def get_results():
+def _job_case(case_data: Optional[PowerSystem], session_id: str) -> CaseData:
+    """Case for a job: the request's own case data or the session's current case"""
+    if case_data:
+        return CaseData(
+            buses=case_data.buses,
+            generators=case_data.generators,
+            lines=case_data.lines,
+            loads=case_data.loads
+        )
+    current_case = session_store.get_case(session_id)
+    if current_case is None:
+        raise HTTPException(status_code=400, detail="No case data provided")
+    return current_case
+
+
+def _submit_job(kind: str, fn, cleanup=None) -> JobInfo:
+    try:
+        return job_manager.submit(kind, fn, cleanup).info()
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+
+def _sensitivity_model(request: SensitivityRequest, session_id: str):
+    """Factorized sensitivity model of the request's case or the session case"""
+    case = _job_case(request.case_data, session_id)
+    return get_sensitivity_model(case)
+
+
+def _check_block(n_rows: int, n_cols: int):
+    if n_rows * n_cols > MAX_BLOCK_ENTRIES:
+        raise ValueError(f"Requested block has {n_rows * n_cols} entries (limit {MAX_BLOCK_ENTRIES}); "
+                         f"select fewer lines, buses or outages")
+
+
+def _compute_ptdf(request: SensitivityRequest, session_id: str) -> PTDFResult:
+    model = _sensitivity_model(request, session_id)
+    lines = list(range(model.n_line)) if request.lines is None else request.lines
+    model.check_lines(lines)
+    buses = model.bus_positions(request.buses) if request.buses is not None else np.arange(model.n_bus)
+    _check_block(len(lines), len(buses))
+    return PTDFResult(
+        lines=lines,
+        line_from=model.line_from[lines].tolist(),
+        line_to=model.line_to[lines].tolist(),
+        bus_ids=model.bus_ids[buses].tolist(),
+        reference_buses=model.bus_ids[model.refs].tolist(),
+        ptdf=model.ptdf(lines, buses).tolist()
+    )
+
+
+def _compute_lodf(request: SensitivityRequest, session_id: str) -> LODFResult:
+    model = _sensitivity_model(request, session_id)
+    lines = list(range(model.n_line)) if request.lines is None else request.lines
+    outages = list(range(model.n_line)) if request.outages is None else request.outages
+    model.check_lines(lines)
+    model.check_lines(outages)
+    _check_block(len(lines), len(outages))
+    lodf, islanding = model.lodf(lines, outages)
+    return LODFResult(
+        lines=lines,
+        outages=outages,
+        islanding=islanding.tolist(),
+        lodf=[[None if np.isnan(v) else v for v in row] for row in lodf.tolist()]
+    )
+
+
+@app.post("/sensitivity/ptdf", response_model=PTDFResult)
+async def get_ptdf(request: SensitivityRequest, session_id: str = SessionId):
+    """
+    PTDF factors for the selected lines and injection buses. The sparse
+    factorization is cached per topology, so repeated studies reuse it.
+    """
+    try:
+        result = await run_in_worker(_compute_ptdf, request, session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return encode_response(result)
+
+
+@app.post("/sensitivity/lodf", response_model=LODFResult)
+async def get_lodf(request: SensitivityRequest, session_id: str = SessionId):
+    """
+    LODF factors for the selected monitored lines and line outages
+    """
+    try:
+        result = await run_in_worker(_compute_lodf, request, session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return encode_response(result)
+
+
+def _compute_power_flow(request: PowerFlowRequest, session_id: str) -> PowerFlowResult:
+    case = _job_case(request.case_data, session_id)
+    injections = None
+    if request.injections is not None:
+        if not request.injections:
+            raise ValueError("No injection vectors given")
+        if len({len(v) for v in request.injections}) > 1:
+            raise ValueError("Injection vectors must all have the same length")
+        injections = np.asarray(request.injections, dtype=float).T
+        _check_block(len(request.injections), len(case.buses) + len(case.lines))
+    pf = dc_power_flow(case, injections, request.buses, request.load_scale)
+    return PowerFlowResult(
+        bus_ids=pf.bus_ids.tolist(),
+        line_from=pf.line_from.tolist(),
+        line_to=pf.line_to.tolist(),
+        reference_buses=pf.bus_ids[pf.refs].tolist(),
+        va=np.degrees(pf.theta.T).tolist() if request.include_angles else [],
+        flows=pf.flows.T.tolist(),
+        slack=pf.slack_mw.T.tolist()
+    )
+
+
+@app.post("/powerflow/dc", response_model=PowerFlowResult)
+async def run_dc_power_flow(request: PowerFlowRequest, session_id: str = SessionId):
+    """
+    DC power flow of one or many injection vectors, solved together as a
+    multi-column right-hand side on the topology's cached LU factorization.
+    Without injections, the case's generator dispatch and loads are used.
+    """
+    try:
+        result = await run_in_worker(_compute_power_flow, request, session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return encode_response(result)
+
+
+@app.post("/contingency", response_model=ContingencyResult)
+async def run_contingency(request: ContingencyRequest, session_id: str = SessionId):
+    """
+    N-1 screening: solve the base DC OPF, then evaluate every branch and
+    generator outage with LODF/PTDF updates and rank the overloads
+    """
+    case = await run_io(_job_case, request.case_data, session_id)
+    try:
+        result = await run_in_worker(
+            screen_contingencies,
+            case,
+            voll=request.voll,
+            enforce_line_limits=request.enforce_line_limits,
+            branch_outages=request.branch_outages,
+            generator_outages=request.generator_outages,
+            include_generators=request.include_generators,
+            threshold=request.threshold,
+            max_violations=request.max_violations,
+            max_workers=request.max_workers
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info(f"N-1 screening found {result.n_violations} violations")
+    return encode_response(result)
+
+
+@app.post("/scopf", response_model=SCOPFResult)
+async def run_scopf(request: SCOPFRequest, session_id: str = SessionId):
+    """
+    Preventive security-constrained DC OPF: post-contingency branch flows are
+    kept within the selected rating, adding violated contingency limits in
+    cutting-plane rounds
+    """
+    case = await run_io(_job_case, request.case_data, session_id)
+    try:
+        result = await run_in_worker(
+            solve_scopf,
+            case,
+            voll=request.voll,
+            enforce_line_limits=request.enforce_line_limits,
+            contingency_rating=request.contingency_rating,
+            branch_outages=request.branch_outages,
+            overload_cost=request.overload_cost,
+            max_rounds=request.max_rounds,
+            max_cuts_per_round=request.max_cuts_per_round,
+            tolerance_mw=request.tolerance_mw,
+            result_format=request.result_format
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return encode_response(result)
+
+
+@app.post("/multiperiod", response_model=MultiPeriodResult)
+async def run_multiperiod(request: MultiPeriodRequest, session_id: str = SessionId):
+    """
+    DC OPF over a horizon of periods in one model, with per-period demand
+    and generator ramp limits between consecutive periods
+    """
+    case = await run_io(_job_case, request.case_data, session_id)
+    try:
+        result = await run_in_worker(
+            solve_multiperiod,
+            case,
+            load_scale=request.load_scale,
+            bus_profiles=request.bus_load_profiles,
+            period_hours=request.period_hours,
+            ramp_rates=request.ramp_rates,
+            initial_pg=request.initial_pg,
+            voll=request.voll,
+            enforce_line_limits=request.enforce_line_limits
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return encode_response(result)
+
+
+@app.post("/jobs/opf", response_model=JobInfo, status_code=202)
+async def submit_opf_job(request: OPFRequest, session_id: str = SessionId):
+    """
+    Queue a DC OPF solve and return its job ID without waiting for the result
+    """
+    case = await run_io(_job_case, request.case_data, session_id)
+
+    def run(job):
+        return _solve_opf(case, request)
+
+    return _submit_job("opf", run)
+
+
+@app.post("/jobs/opf/batch", response_model=JobInfo, status_code=202)
+async def submit_batch_job(request: BatchOPFRequest, session_id: str = SessionId):
+    """
+    Queue a batch scenario OPF; progress is reported per chunk of scenarios
+    """
+    case = await run_io(_job_case, request.case_data, session_id)
+    if not request.scenarios:
+        raise HTTPException(status_code=400, detail="No scenarios provided")
+
+    def run(job):
+        return DCOPSolver().solve_many(
+            case,
+            request.scenarios,
+            voll=request.voll,
+            enforce_line_limits=request.enforce_line_limits,
+            remove_isolated=request.remove_isolated,
+            max_workers=request.max_workers,
+            progress=job.report_progress
+        )
+
+    return _submit_job("batch", run)
+
+
+@app.post("/jobs/sweep", response_model=JobInfo, status_code=202)
+async def submit_sweep_job(
+    profiles: UploadFile = File(..., description="Profile CSV: load_scale, load:<bus ID>, gen:<generator ID> columns"),
+    voll: float = Query(10000.0, description="Value of Lost Load ($/MWh)"),
+    enforce_line_limits: bool = Query(True, description="Enforce line loading constraints"),
+    max_workers: Optional[int] = Query(None, description="Worker processes (defaults to CPU count)"),
+    chunk_size: int = Query(SWEEP_CHUNK_SIZE, ge=1, description="Profile rows per worker task"),
+    session_id: str = SessionId
+):
+    """
+    Queue a time-series sweep of the session case: one OPF per profile row,
+    results written to CSV files retrieved from /jobs/{job_id}/files/{name}
+    """
+    case = await run_io(_job_case, None, session_id)
+    output_dir = os.path.join(SWEEP_DIR, uuid.uuid4().hex)
+    await run_io(os.makedirs, output_dir)
+    profile_path = os.path.join(output_dir, "profiles.csv")
+    # The output directory goes when the job fails, is cancelled or leaves the history
+    cleanup = functools.partial(shutil.rmtree, output_dir, ignore_errors=True)
+
+    # The profile is saved in blocks and read back row by row by the sweep
+    n_lines, last = 0, b"\n"
+    try:
+        f = await run_io(open, profile_path, "wb")
+        try:
+            while True:
+                block = await profiles.read(UPLOAD_BLOCK)
+                if not block:
+                    break
+                await run_io(f.write, block)
+                n_lines += block.count(b"\n")
+                last = block[-1:]
+        finally:
+            await run_io(f.close)
+    except BaseException:
+        await run_io(cleanup)
+        raise
+    n_lines += last != b"\n"
+
+    def run(job):
+        with open(profile_path, newline="") as f:
+            return run_sweep(
+                case, f, output_dir,
+                voll=voll,
+                enforce_line_limits=enforce_line_limits,
+                max_workers=max_workers,
+                chunk_size=chunk_size,
+                total_hours=max(1, n_lines - 1),
+                progress=job.report_progress
+            )
+
+    return _submit_job("sweep", run, cleanup)
+
+
+@app.get("/jobs", response_model=List[JobInfo])
+async def list_jobs():
+    """List queued, running and recently finished jobs"""
+    return [job.info() for job in job_manager.list()]
+
+
+@app.get("/jobs/{job_id}", response_model=JobInfo)
+async def get_job(job_id: str):
+    """Get job status and progress"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.info()
+
+
+@app.get("/jobs/{job_id}/result", response_model=Union[OPFResult, ColumnarOPFResult, BatchOPFResult, SweepResult])
+async def get_job_result(job_id: str):
+    """Get the result of a completed job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return job.result
+
+
+@app.get("/jobs/{job_id}/export/csv")
+async def export_job_csv(job_id: str):
+    """Export the result of a completed OPF or batch job as CSV, streamed in chunks"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if isinstance(job.result, SweepResult):
+        raise HTTPException(status_code=400, detail=f"Sweep results are files: /jobs/{job_id}/files/<name>")
+    return StreamingResponse(
+        iter_csv(job.result),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={job.kind}_{job.id}.csv"}
+    )
+
+
+@app.get("/jobs/{job_id}/files/{filename}")
+async def get_job_file(job_id: str, filename: str):
+    """Download a result file of a completed sweep job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if not isinstance(job.result, SweepResult) or filename not in job.result.files:
+        raise HTTPException(status_code=404, detail="File not found")
+    return FileResponse(
+        os.path.join(job.result.output_dir, filename),
+        media_type="text/csv",
+        filename=f"{job.kind}_{job.id}_{filename}"
+    )
+
+
+@app.delete("/jobs/{job_id}", response_model=JobInfo)
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.info()
+
+
+@app.get("/results", response_model=Union[OPFResult, ColumnarOPFResult])
+async def get_results(session_id: str = SessionId, accept: Optional[str] = AcceptHeader):
     """
     Get the current OPF results
     """
+    opf_result = await run_io(session_store.get_result, session_id)
     if opf_result is None:
         raise HTTPException(status_code=404, detail="No OPF results available")
-    return opf_result
+    return encode_response(opf_result, accept)
 
 
 @app.get("/export/csv")
-async def export_csv():
+async def export_csv(session_id: str = SessionId):
     """
-    Export OPF results as CSV
+    Export OPF results as CSV, streamed in chunks
     """
+    opf_result = await run_io(session_store.get_result, session_id)
     if opf_result is None:
         raise HTTPException(status_code=404, detail="No OPF results to export")
 
-    try:
-        output = io.StringIO()
-
-        # Export generator results
-        writer = csv.writer(output)
-        writer.writerow(["Generator Results"])
-        writer.writerow(["Bus", "Pg (MW)", "Qg (MVAR)", "Cost ($/h)"])
-        for gen in opf_result.generator_results:
-            writer.writerow([gen.bus, gen.pg, gen.qg, gen.cost])
-
-        writer.writerow([])
-        writer.writerow(["Bus Results"])
-        writer.writerow(["Bus", "Va (degrees)", "Pl (MW)", "Ql (MVAR)", "LMP ($/MWh)", "Curtailment (MW)"])
-        for bus in opf_result.bus_results:
-            writer.writerow([bus.bus, bus.va, bus.pl, bus.ql, bus.marginal_cost, bus.curtailment])
-
-        writer.writerow([])
-        writer.writerow(["Line Results"])
-        writer.writerow(["From", "To", "Flow (MW)", "Loading (%)", "Congestion Rent ($/h)"])
-        for line in opf_result.line_results:
-            writer.writerow([line.from_bus, line.to_bus, line.flow_mw,
-                           line.loading_percent, line.congestion_rent])
-
-        writer.writerow([])
-        writer.writerow(["Total Cost", f"{opf_result.total_cost} $/h"])
-        writer.writerow(["Total Curtailment", f"{opf_result.total_curtailment} MW"])
-
-        output.seek(0)
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=opf_results.csv"}
-        )
-
-    except Exception as e:
-        logger.error(f"Error exporting CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(
+        iter_result_csv(opf_result),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=opf_results.csv"}
+    )
 
 
 @app.get("/export/json")
-async def export_json():
+async def export_json(session_id: str = SessionId):
     """
     Export OPF results as JSON
     """
+    opf_result = await run_io(session_store.get_result, session_id)
     if opf_result is None:
         raise HTTPException(status_code=404, detail="No OPF results to export")
+    opf_result = as_opf_result(opf_result)
 
     try:
         result_dict = opf_result.model_dump()
@@ -333,12 +805,11 @@ async def list_cases():
 
 
 @app.post("/cases/{filename}/load", response_model=CaseData)
-async def load_server_case(filename: str):
+async def load_server_case(filename: str, session_id: str = SessionId,
+                           accept: Optional[str] = AcceptHeader):
     """
     Load a specific case file from the server
     """
-    global current_case
-    
     # Secure filename to prevent directory traversal
     filename = os.path.basename(filename)
     file_path = os.path.join(CASES_DIR, filename)
@@ -347,21 +818,21 @@ async def load_server_case(filename: str):
         raise HTTPException(status_code=404, detail="Case file not found")
         
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-            
         if filename.endswith('.m'):
-            parser = MatpowerParser()
-            current_case = parser.parse_text(content)
+            # Parsed cases are cached in memory and in CASES_DIR/.cache
+            current_case = await run_in_worker(load_case_file, file_path)
         elif filename.endswith('.json'):
+            with open(file_path, 'r') as f:
+                content = f.read()
             # Parse JSON to dict then to CaseData
             data = json.loads(content)
             current_case = CaseData(**data)
         else:
             raise HTTPException(status_code=400, detail="Unsupported file format")
-            
+
+        await run_io(session_store.set_case, session_id, current_case)
         logger.info(f"Loaded server case {filename}")
-        return current_case
+        return encode_response(current_case, accept)
     except Exception as e:
         logger.error(f"Error loading case {filename}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,148 @@
+"""
+Service metrics
+Request latency and solve phase histograms, solve counters and process
+gauges, rendered in the Prometheus text exposition format for GET /metrics
+"""
+
+import threading
+from typing import Dict, Tuple
+
+from app.models.schemas import SolveTimings
+
+# Upper bounds (s) of the latency histogram buckets; +Inf is implied
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Labels) -> str:
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set"""
+
+    def __init__(self, name: str, help: str, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * len(self.buckets), 0, 0.0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += 1
+            series[2] += value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = sorted((key, (list(c), n, s)) for key, (c, n, s) in self._series.items())
+        for key, (counts, count, total) in series:
+            for bound, bucket_count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket{_labels(key + (('le', f'{bound:g}'),))} {bucket_count}"
+            yield f"{self.name}_bucket{_labels(key + (('le', '+Inf'),))} {count}"
+            yield f"{self.name}_sum{_labels(key)} {total:.6f}"
+            yield f"{self.name}_count{_labels(key)} {count}"
+
+
+class Counter:
+    """Monotonic count per label set"""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._series: Dict[Labels, int] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            series = sorted(self._series.items())
+        for key, value in series:
+            yield f"{self.name}{_labels(key)} {value}"
+
+
+class Gauge:
+    """Value read when the metrics are rendered"""
+
+    def __init__(self, name: str, help: str, read):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def render(self):
+        value = self.read()
+        if value is None:
+            return
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        yield f"{self.name} {value:g}"
+
+
+class MetricsRegistry:
+    """The metrics of this process"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = [line for metric in self.metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+def _peak_rss_mb():
+    from app.solver.timing import peak_rss_mb
+    return peak_rss_mb()
+
+
+def _pending_tasks():
+    from app.workers import pending_tasks
+    return pending_tasks()
+
+
+registry = MetricsRegistry()
+
+request_duration = registry.register(Histogram(
+    "opf_request_duration_seconds", "HTTP request latency by route"))
+solve_phase_duration = registry.register(Histogram(
+    "opf_solve_phase_seconds", "OPF solve wall time by phase"))
+solves_total = registry.register(Counter(
+    "opf_solves_total", "OPF solves by solver and result status"))
+solver_iterations_total = registry.register(Counter(
+    "opf_solver_iterations_total", "Simplex / ADMM iterations by solver"))
+registry.register(Gauge(
+    "opf_worker_pending_tasks", "Tasks running or queued on the worker pool", _pending_tasks))
+registry.register(Gauge(
+    "opf_process_peak_rss_megabytes", "Peak resident memory of the server process", _peak_rss_mb))
+
+
+def observe_solve(timings: SolveTimings, status: str):
+    """Record one OPF solve: its phase times, solver and iterations"""
+    for phase, seconds in timings.phases.items():
+        solve_phase_duration.observe(seconds, phase=phase)
+    solve_phase_duration.observe(timings.total_seconds, phase="total")
+    solver = timings.solver or "none"
+    solves_total.inc(solver=solver, status=status)
+    solver_iterations_total.inc(timings.solver_iterations, solver=solver)
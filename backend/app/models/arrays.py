@@ -0,0 +1,250 @@
+"""
+Array-backed case representation
+Struct-of-arrays view of a case (one NumPy column per element field) for
+the parser, cache and solver hot paths, convertible to and from CaseData
+"""
+
+import numpy as np
+
+from app.models.schemas import Bus, Generator, Line, Load, CaseData
+
+# Float columns per element table, named after the Pydantic fields
+BUS_FLOATS = ("v_mag", "v_ang", "g_shunt", "b_shunt", "base_kv")
+GEN_FLOATS = ("pg", "qg", "vg", "mbase", "pmax", "pmin", "qmax", "qmin", "ramp_30")
+LINE_FLOATS = ("r", "x", "b", "rate_a", "rate_b", "rate_c")
+
+BUS_COLUMNS = ("bus_id", "bus_name", "bus_type", "zone") + BUS_FLOATS
+GEN_COLUMNS = ("gen_id", "gen_name", "gen_bus", "gen_status", "gen_cost", "gen_cost_len") + GEN_FLOATS
+LINE_COLUMNS = ("line_from", "line_to", "line_status") + LINE_FLOATS
+LOAD_COLUMNS = ("load_bus", "load_pd", "load_qd")
+COLUMNS = BUS_COLUMNS + GEN_COLUMNS + LINE_COLUMNS + LOAD_COLUMNS
+
+# Optional string columns (object arrays of str or None)
+STRING_COLUMNS = ("bus_name", "gen_id", "gen_name")
+
+
+def _floats(values, n: int) -> np.ndarray:
+    return np.fromiter(values, dtype=float, count=n)
+
+
+def _ints(values, n: int) -> np.ndarray:
+    return np.fromiter(values, dtype=np.int64, count=n)
+
+
+def _objects(values) -> np.ndarray:
+    values = list(values)
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _cost_matrix(costs) -> tuple:
+    """Zero-padded cost coefficient matrix plus the length of each cost list"""
+    costs = list(costs)
+    n_cost = np.fromiter(map(len, costs), dtype=np.int64, count=len(costs))
+    width = int(n_cost.max()) if len(costs) else 0
+    if len(costs) and n_cost.min() == width:
+        return np.array(costs, dtype=float).reshape(len(costs), width), n_cost
+    matrix = np.zeros((len(costs), width))
+    for i, cost in enumerate(costs):
+        matrix[i, :len(cost)] = cost
+    return matrix, n_cost
+
+
+class CaseArrays:
+    """
+    Columnar case: bus, generator, branch and load tables held as NumPy
+    columns in element order. Optional string fields (names, generator IDs)
+    are object arrays holding str or None; generator cost lists are a
+    zero-padded matrix plus per-row lengths, so conversion back to CaseData
+    is lossless.
+    """
+
+    def __init__(self, base_mva: float = 100.0, **columns):
+        self.base_mva = float(base_mva)
+
+        n_bus = len(columns.get("bus_id", ()))
+        n_gen = len(columns.get("gen_bus", ()))
+        n_line = len(columns.get("line_from", ()))
+
+        # Bus table
+        self.bus_id = np.asarray(columns.get("bus_id", ()), dtype=np.int64)
+        self.bus_name = columns.get("bus_name", _objects([None] * n_bus))
+        self.bus_type = np.asarray(columns.get("bus_type", np.ones(n_bus)), dtype=np.int64)
+        self.zone = np.asarray(columns.get("zone", np.ones(n_bus)), dtype=np.int64)
+        bus_defaults = dict(v_mag=1.0, v_ang=0.0, g_shunt=0.0, b_shunt=0.0, base_kv=345.0)
+        for name, default in bus_defaults.items():
+            setattr(self, name, np.asarray(columns.get(name, np.full(n_bus, default)), dtype=float))
+
+        # Generator table
+        self.gen_id = columns.get("gen_id", _objects([None] * n_gen))
+        self.gen_name = columns.get("gen_name", _objects([None] * n_gen))
+        self.gen_bus = np.asarray(columns.get("gen_bus", ()), dtype=np.int64)
+        self.gen_status = np.asarray(columns.get("gen_status", np.ones(n_gen)), dtype=np.int64)
+        gen_defaults = dict(pg=0.0, qg=0.0, vg=1.0, mbase=100.0, pmax=250.0, pmin=10.0,
+                            qmax=300.0, qmin=-300.0, ramp_30=0.0)
+        for name, default in gen_defaults.items():
+            setattr(self, name, np.asarray(columns.get(name, np.full(n_gen, default)), dtype=float))
+        if "gen_cost" in columns:
+            cost = np.asarray(columns["gen_cost"], dtype=float)
+            self.gen_cost = cost.reshape(n_gen, -1) if n_gen else cost.reshape(0, 0)
+            self.gen_cost_len = np.asarray(
+                columns.get("gen_cost_len", np.full(n_gen, self.gen_cost.shape[1])), dtype=np.int64
+            )
+        else:
+            self.gen_cost = np.tile([0.0, 25.0, 0.0], (n_gen, 1))
+            self.gen_cost_len = np.full(n_gen, 3, dtype=np.int64)
+
+        # Branch table
+        self.line_from = np.asarray(columns.get("line_from", ()), dtype=np.int64)
+        self.line_to = np.asarray(columns.get("line_to", ()), dtype=np.int64)
+        self.line_status = np.asarray(columns.get("line_status", np.ones(n_line)), dtype=np.int64)
+        line_defaults = dict(r=0.0, x=0.01, b=0.0, rate_a=250.0, rate_b=250.0, rate_c=250.0)
+        for name, default in line_defaults.items():
+            setattr(self, name, np.asarray(columns.get(name, np.full(n_line, default)), dtype=float))
+
+        # Load table
+        self.load_bus = np.asarray(columns.get("load_bus", ()), dtype=np.int64)
+        self.load_pd = np.asarray(columns.get("load_pd", ()), dtype=float)
+        self.load_qd = np.asarray(columns.get("load_qd", np.zeros(len(self.load_bus))), dtype=float)
+
+    @property
+    def n_bus(self) -> int:
+        return len(self.bus_id)
+
+    @property
+    def n_gen(self) -> int:
+        return len(self.gen_bus)
+
+    @property
+    def n_line(self) -> int:
+        return len(self.line_from)
+
+    @property
+    def n_load(self) -> int:
+        return len(self.load_bus)
+
+    @classmethod
+    def from_case(cls, case: CaseData) -> "CaseArrays":
+        """Build the columnar form of a Pydantic case"""
+        buses, gens, lines, loads = case.buses, case.generators, case.lines, case.loads
+        nb, ng, nl, nd = len(buses), len(gens), len(lines), len(loads)
+
+        columns = dict(
+            bus_id=_ints((b.id for b in buses), nb),
+            bus_name=_objects(b.name for b in buses),
+            bus_type=_ints((b.type for b in buses), nb),
+            zone=_ints((b.zone for b in buses), nb),
+            gen_id=_objects(g.id for g in gens),
+            gen_name=_objects(g.name for g in gens),
+            gen_bus=_ints((g.bus for g in gens), ng),
+            gen_status=_ints((g.status for g in gens), ng),
+            line_from=_ints((l.from_bus for l in lines), nl),
+            line_to=_ints((l.to_bus for l in lines), nl),
+            line_status=_ints((l.status for l in lines), nl),
+            load_bus=_ints((l.bus for l in loads), nd),
+            load_pd=_floats((l.pd for l in loads), nd),
+            load_qd=_floats((l.qd for l in loads), nd),
+        )
+        for name in BUS_FLOATS:
+            columns[name] = _floats((getattr(b, name) for b in buses), nb)
+        for name in GEN_FLOATS:
+            columns[name] = _floats((getattr(g, name) for g in gens), ng)
+        for name in LINE_FLOATS:
+            columns[name] = _floats((getattr(l, name) for l in lines), nl)
+        columns["gen_cost"], columns["gen_cost_len"] = _cost_matrix(g.cost for g in gens)
+
+        return cls(base_mva=case.base_mva, **columns)
+
+    def to_case(self) -> CaseData:
+        """Build the equivalent Pydantic case"""
+        buses = [
+            Bus(id=i, name=name, type=t, zone=z, v_mag=vm, v_ang=va, g_shunt=gs, b_shunt=bs,
+                base_kv=kv)
+            for i, name, t, z, vm, va, gs, bs, kv in zip(
+                self.bus_id.tolist(), self.bus_name.tolist(), self.bus_type.tolist(),
+                self.zone.tolist(), *(getattr(self, f).tolist() for f in BUS_FLOATS)
+            )
+        ]
+
+        generators = [
+            Generator(id=gid, name=name, bus=bus, status=status, cost=cost[:n], pg=pg, qg=qg,
+                      vg=vg, mbase=mbase, pmax=pmax, pmin=pmin, qmax=qmax, qmin=qmin,
+                      ramp_30=ramp_30)
+            for gid, name, bus, status, cost, n, pg, qg, vg, mbase, pmax, pmin, qmax, qmin, ramp_30 in zip(
+                self.gen_id.tolist(), self.gen_name.tolist(), self.gen_bus.tolist(),
+                self.gen_status.tolist(), self.gen_cost.tolist(), self.gen_cost_len.tolist(),
+                *(getattr(self, f).tolist() for f in GEN_FLOATS)
+            )
+        ]
+
+        lines = [
+            Line(from_bus=f, to_bus=t, status=status, r=r, x=x, b=b, rate_a=ra, rate_b=rb,
+                 rate_c=rc)
+            for f, t, status, r, x, b, ra, rb, rc in zip(
+                self.line_from.tolist(), self.line_to.tolist(), self.line_status.tolist(),
+                *(getattr(self, f).tolist() for f in LINE_FLOATS)
+            )
+        ]
+
+        loads = [
+            Load(bus=bus, pd=pd, qd=qd)
+            for bus, pd, qd in zip(self.load_bus.tolist(), self.load_pd.tolist(),
+                                   self.load_qd.tolist())
+        ]
+
+        return CaseData(buses=buses, generators=generators, lines=lines, loads=loads,
+                        base_mva=self.base_mva)
+
+    def subset(self, bus_mask: np.ndarray) -> "CaseArrays":
+        """
+        Case restricted to the buses selected by bus_mask, with the generators,
+        loads and branches attached to them (branches need both ends kept)
+        """
+        bus_keep = np.asarray(bus_mask, dtype=bool)
+        keep_ids = self.bus_id[bus_keep]
+        masks = (
+            (BUS_COLUMNS, bus_keep),
+            (GEN_COLUMNS, np.isin(self.gen_bus, keep_ids)),
+            (LINE_COLUMNS, np.isin(self.line_from, keep_ids) & np.isin(self.line_to, keep_ids)),
+            (LOAD_COLUMNS, np.isin(self.load_bus, keep_ids)),
+        )
+        columns = {name: getattr(self, name)[mask] for names, mask in masks for name in names}
+        return CaseArrays(base_mva=self.base_mva, **columns)
+
+    def columns(self) -> dict:
+        """All element columns by name (the keyword arguments of the constructor)"""
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    def to_npz_columns(self) -> dict:
+        """
+        Columns for np.savez: optional strings become a text array plus a
+        '<name>_set' presence mask so the file loads without pickling
+        """
+        out = {"base_mva": np.float64(self.base_mva)}
+        for name, value in self.columns().items():
+            if name in STRING_COLUMNS:
+                values = value.tolist()
+                out[name] = np.array([v if v is not None else "" for v in values], dtype=str)
+                out[name + "_set"] = np.array([v is not None for v in values], dtype=bool)
+            else:
+                out[name] = value
+        return out
+
+    @classmethod
+    def from_npz_columns(cls, data) -> "CaseArrays":
+        """Inverse of to_npz_columns; data is any mapping of name to array"""
+        columns = {}
+        for name in COLUMNS:
+            if name in STRING_COLUMNS:
+                text = data[name].tolist()
+                present = data[name + "_set"].tolist()
+                columns[name] = _objects(t if p else None for t, p in zip(text, present))
+            else:
+                columns[name] = np.asarray(data[name])
+        return cls(base_mva=float(data["base_mva"]), **columns)
+
+
+def as_case_arrays(case) -> CaseArrays:
+    """Accept either representation and return the columnar one"""
+    return case if isinstance(case, CaseArrays) else CaseArrays.from_case(case)
@@ -3,7 +3,7 @@ Pydantic models for DC OPF Simulator API
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal, Union
 
 
 class Bus(BaseModel):
@@ -32,6 +32,7 @@ class Generator(BaseModel):
     pmin: float = Field(10.0, description="Minimum real power output (MW)")
     qmax: float = Field(300.0, description="Maximum reactive power (MVAR)")
     qmin: float = Field(-300.0, description="Minimum reactive power (MVAR)")
+    ramp_30: float = Field(0.0, description="Ramp rate over 30 minutes (MW), 0 = unlimited")
     cost: List[float] = Field(default_factory=lambda: [0, 25, 0],
                                description="Cost coefficients [a, b, c] in $/h")
     status: int = Field(1, description="Status (1=in service, 0=out of service)")
@@ -81,6 +82,36 @@ class OPFRequest(BaseModel):
     voll: float = Field(10000.0, description="Value of Lost Load ($/MWh)")
     enforce_line_limits: bool = Field(True, description="Enforce line loading constraints")
     remove_isolated: bool = Field(False, description="Automatically remove buses and components not connected to the slack bus")
+    line_limit_mode: Literal["full", "lazy"] = Field(
+        "full", description="'full' (every line limit in the model) or 'lazy' (add violated limits and re-solve)")
+    result_format: Literal["records", "columns"] = Field(
+        "records", description="'records' (one object per element) or 'columns' (parallel arrays per field)")
+    include_timings: bool = Field(False, description="Add per-phase timings and model size to the result")
+    presolve: bool = Field(False, description="Solve an exactly reduced network (merged branches, radial and pass-through buses eliminated)")
+
+
+class Scenario(BaseModel):
+    """Perturbation of a base case for batch OPF"""
+    name: Optional[str] = Field(None, description="Scenario label")
+    load_scale: float = Field(1.0, description="Multiplier applied to every load")
+    load_overrides: Dict[int, float] = Field(default_factory=dict,
+                                             description="Bus ID -> total real demand (MW), replaces scaled loads")
+    cost_overrides: Dict[str, List[float]] = Field(default_factory=dict,
+                                                   description="Generator ID -> cost coefficients [a, b, c]")
+    gen_outages: List[str] = Field(default_factory=list, description="IDs of generators taken out of service")
+    line_outages: List[int] = Field(default_factory=list,
+                                    description="Positions of lines (in the case line list) taken out of service")
+    voll: Optional[float] = Field(None, description="Scenario VOLL ($/MWh), defaults to the batch VOLL")
+
+
+class BatchOPFRequest(BaseModel):
+    """Batch OPF request: one base case, many scenarios"""
+    case_data: Optional[PowerSystem] = None
+    scenarios: List[Scenario] = Field(default_factory=list)
+    voll: float = Field(10000.0, description="Value of Lost Load ($/MWh)")
+    enforce_line_limits: bool = Field(True, description="Enforce line loading constraints")
+    remove_isolated: bool = Field(False, description="Automatically remove buses and components not connected to the slack bus")
+    max_workers: Optional[int] = Field(None, description="Worker processes (defaults to CPU count)")
 
 
 class GeneratorResult(BaseModel):
@@ -113,6 +144,20 @@ class LineResult(BaseModel):
     congestion_rent: float = Field(0.0, description="Congestion rent ($/h)")
 
 
+class SolveTimings(BaseModel):
+    """Where a solve spent its time, and the size of the model it solved"""
+    total_seconds: float = Field(0.0, description="Wall time of the solve (s)")
+    phases: Dict[str, float] = Field(default_factory=dict,
+                                     description="Wall time per phase (s): parse, prepare, assembly, solve, "
+                                                 "separation, theta, results")
+    solver: Optional[str] = Field(None, description="Solver of the last solve: highs, linprog, osqp or trust-constr")
+    solver_iterations: int = Field(0, description="Simplex / ADMM iterations summed over solves")
+    rows: int = Field(0, description="Constraint rows of the largest model solved")
+    cols: int = Field(0, description="Variables of the largest model solved")
+    nnz: int = Field(0, description="Constraint matrix nonzeros of the largest model solved")
+    peak_rss_mb: Optional[float] = Field(None, description="Peak resident memory of the server process (MB)")
+
+
 class OPFResult(BaseModel):
     """OPF solution result"""
     status: str = Field("optimal", description="Solution status")
@@ -122,7 +167,238 @@ class OPFResult(BaseModel):
     line_results: List[LineResult] = Field(default_factory=list)
     objective_value: float = Field(..., description="Objective function value")
     total_curtailment: float = Field(0.0, description="Total load curtailment (MW)")
-    iterations: int = Field(0, description="Number of iterations")
+    iterations: int = Field(0, description="Number of solves (more than one with lazy limits)")
+    presolve_resolves: int = Field(0, description="Full-model re-solves after presolve (0 or 1)")
+    timings: Optional[SolveTimings] = Field(None, description="Solve instrumentation, when requested")
+
+
+class ColumnarOPFResult(BaseModel):
+    """
+    OPF solution result as parallel arrays, one list per field.
+    Generator, bus and line fields follow the element order of OPFResult.
+    """
+    shape: Literal["columns"] = Field("columns", description="Result shape marker")
+    status: str = Field("optimal", description="Solution status")
+    total_cost: float = Field(..., description="Total generation cost ($/h)")
+    objective_value: float = Field(..., description="Objective function value")
+    total_curtailment: float = Field(0.0, description="Total load curtailment (MW)")
+    iterations: int = Field(0, description="Number of solves (more than one with lazy limits)")
+    presolve_resolves: int = Field(0, description="Full-model re-solves after presolve (0 or 1)")
+    timings: Optional[SolveTimings] = Field(None, description="Solve instrumentation, when requested")
+    gen_id: List[Optional[str]] = Field(default_factory=list)
+    gen_bus: List[int] = Field(default_factory=list)
+    gen_pg: List[float] = Field(default_factory=list, description="Real power output (MW)")
+    gen_qg: List[float] = Field(default_factory=list, description="Reactive power output (MVAR)")
+    gen_cost: List[float] = Field(default_factory=list, description="Generation cost ($/h)")
+    bus: List[int] = Field(default_factory=list)
+    bus_va: List[float] = Field(default_factory=list, description="Voltage angle (degrees)")
+    bus_vm: List[float] = Field(default_factory=list, description="Voltage magnitude (pu)")
+    bus_pl: List[float] = Field(default_factory=list, description="Net real power injection (MW)")
+    bus_ql: List[float] = Field(default_factory=list, description="Net reactive power injection (MVAR)")
+    bus_marginal_cost: List[float] = Field(default_factory=list, description="Marginal cost ($/MWh)")
+    bus_curtailment: List[float] = Field(default_factory=list, description="Load curtailment (MW)")
+    line_from: List[int] = Field(default_factory=list)
+    line_to: List[int] = Field(default_factory=list)
+    line_flow_mw: List[float] = Field(default_factory=list, description="Real power flow (MW)")
+    line_flow_mvar: List[float] = Field(default_factory=list, description="Reactive power flow (MVAR)")
+    line_loading_percent: List[float] = Field(default_factory=list, description="Line loading percentage")
+    line_congestion_rent: List[float] = Field(default_factory=list, description="Congestion rent ($/h)")
+
+
+class BatchOPFResult(BaseModel):
+    """
+    Batch OPF results in columnar form.
+    Per-element fields are [scenario][element] matrices aligned with
+    bus_ids / gen_ids / line positions of the base case; null marks an
+    element absent from a scenario (e.g. removed as isolated).
+    """
+    scenarios: List[str] = Field(default_factory=list)
+    status: List[str] = Field(default_factory=list)
+    error: List[Optional[str]] = Field(default_factory=list)
+    total_cost: List[Optional[float]] = Field(default_factory=list)
+    objective_value: List[Optional[float]] = Field(default_factory=list)
+    total_curtailment: List[Optional[float]] = Field(default_factory=list)
+    bus_ids: List[int] = Field(default_factory=list)
+    gen_ids: List[Optional[str]] = Field(default_factory=list)
+    line_from: List[int] = Field(default_factory=list)
+    line_to: List[int] = Field(default_factory=list)
+    pg: List[List[Optional[float]]] = Field(default_factory=list, description="Generator output (MW)")
+    lmp: List[List[Optional[float]]] = Field(default_factory=list, description="Bus LMP ($/MWh)")
+    curtailment: List[List[Optional[float]]] = Field(default_factory=list, description="Bus curtailment (MW)")
+    flow: List[List[Optional[float]]] = Field(default_factory=list, description="Line flow (MW)")
+
+
+class SensitivityRequest(BaseModel):
+    """PTDF/LODF request; omitted selections mean every line or bus"""
+    case_data: Optional[PowerSystem] = None
+    lines: Optional[List[int]] = Field(None, description="Monitored line positions (in the case line list)")
+    buses: Optional[List[int]] = Field(None, description="Injection bus IDs (PTDF columns)")
+    outages: Optional[List[int]] = Field(None, description="Outaged line positions (LODF columns)")
+
+
+class PTDFResult(BaseModel):
+    """PTDF block: MW flow per MW injected at a bus and withdrawn at its island reference bus"""
+    lines: List[int] = Field(default_factory=list, description="Line positions (rows)")
+    line_from: List[int] = Field(default_factory=list)
+    line_to: List[int] = Field(default_factory=list)
+    bus_ids: List[int] = Field(default_factory=list, description="Injection buses (columns)")
+    reference_buses: List[int] = Field(default_factory=list, description="Reference bus of each island")
+    ptdf: List[List[float]] = Field(default_factory=list, description="[line][bus] factors")
+
+
+class LODFResult(BaseModel):
+    """LODF block: change in line flow per MW of pre-outage flow on the outaged line"""
+    lines: List[int] = Field(default_factory=list, description="Monitored line positions (rows)")
+    outages: List[int] = Field(default_factory=list, description="Outaged line positions (columns)")
+    islanding: List[bool] = Field(default_factory=list, description="Outage splits an island (factors undefined)")
+    lodf: List[List[Optional[float]]] = Field(default_factory=list, description="[line][outage] factors")
+
+
+class PowerFlowRequest(BaseModel):
+    """Batched DC power flow request; without injections the case dispatch (generator Pg) is used"""
+    case_data: Optional[PowerSystem] = None
+    injections: Optional[List[List[float]]] = Field(None, description="Injection vectors (MW), one per power flow: [flow][bus]")
+    buses: Optional[List[int]] = Field(None, description="Bus IDs of the injection entries; every bus in case order when omitted")
+    load_scale: float = Field(1.0, description="Load multiplier when the case dispatch is used")
+    include_angles: bool = Field(True, description="Return bus angles")
+
+
+class PowerFlowResult(BaseModel):
+    """DC power flow of each injection vector; reference buses balance their island"""
+    bus_ids: List[int] = Field(default_factory=list)
+    line_from: List[int] = Field(default_factory=list)
+    line_to: List[int] = Field(default_factory=list)
+    reference_buses: List[int] = Field(default_factory=list, description="Reference bus of each island")
+    va: List[List[float]] = Field(default_factory=list, description="[flow][bus] voltage angles (degrees)")
+    flows: List[List[float]] = Field(default_factory=list, description="[flow][line] branch flows (MW)")
+    slack: List[List[float]] = Field(default_factory=list, description="[flow][reference bus] injections (MW)")
+
+
+class ContingencyRequest(BaseModel):
+    """N-1 screening request around the base DC OPF solution"""
+    case_data: Optional[PowerSystem] = None
+    voll: float = Field(10000.0, description="Value of Lost Load ($/MWh)")
+    enforce_line_limits: bool = Field(True, description="Enforce line limits in the base OPF")
+    branch_outages: Optional[List[int]] = Field(None, description="Line positions to outage; every in-service line when omitted")
+    generator_outages: Optional[List[str]] = Field(None, description="Generator IDs to outage; every dispatched unit when omitted")
+    include_generators: bool = Field(True, description="Screen generator outages")
+    threshold: float = Field(100.0, description="Report post-contingency loadings above this percentage of rate_a")
+    max_violations: int = Field(1000, description="Violations returned (highest loading first)")
+    max_workers: Optional[int] = Field(None, description="Screening threads (defaults to CPU count)")
+
+
+class ContingencyViolation(BaseModel):
+    """Post-contingency overload of one line"""
+    outage_type: str = Field(..., description="branch or generator")
+    outage_index: int = Field(..., description="Position of the outaged line or generator in the case")
+    outage_id: str = Field(..., description="Outaged line (from-to) or generator ID")
+    line: int = Field(..., description="Position of the overloaded line")
+    from_bus: int
+    to_bus: int
+    base_flow_mw: float = Field(..., description="Pre-contingency flow (MW)")
+    flow_mw: float = Field(..., description="Post-contingency flow (MW)")
+    rating_mw: float = Field(..., description="Line rating (rate_a, MW)")
+    loading_percent: float = Field(..., description="Post-contingency loading percentage")
+
+
+class ContingencyResult(BaseModel):
+    """N-1 screening result"""
+    status: str = Field("optimal", description="Base OPF status")
+    base_cost: float = Field(..., description="Base OPF total cost ($/h)")
+    n_branch_outages: int = 0
+    n_generator_outages: int = 0
+    islanding: List[int] = Field(default_factory=list, description="Line positions whose outage splits an island (not screened)")
+    n_violations: int = Field(0, description="Violations found (before max_violations)")
+    violations: List[ContingencyViolation] = Field(default_factory=list)
+
+
+class SCOPFRequest(BaseModel):
+    """Security-constrained (preventive N-1) DC OPF request"""
+    case_data: Optional[PowerSystem] = None
+    voll: float = Field(10000.0, description="Value of Lost Load ($/MWh)")
+    enforce_line_limits: bool = Field(True, description="Enforce base-case limits (rate_a)")
+    contingency_rating: Literal["rate_a", "rate_b", "rate_c"] = Field(
+        "rate_c", description="Rating that limits post-contingency flows")
+    branch_outages: Optional[List[int]] = Field(None, description="Line positions to secure against; every in-service line when omitted")
+    overload_cost: Optional[float] = Field(None, description="Price of post-contingency overload ($/MWh), defaults to VOLL")
+    max_rounds: int = Field(20, ge=1, description="OPF solves before stopping")
+    max_cuts_per_round: int = Field(500, ge=1, description="Contingency limits added per round (most violated first)")
+    tolerance_mw: float = Field(0.01, ge=0, description="Post-contingency overload tolerated without a new limit (MW)")
+    result_format: Literal["records", "columns"] = Field(
+        "records", description="'records' (one object per element) or 'columns' (parallel arrays per field)")
+
+
+class SCOPFResult(BaseModel):
+    """SCOPF solution with the cutting-plane summary"""
+    converged: bool = Field(..., description="Every violated contingency limit is in the final model")
+    rounds: int = Field(..., description="OPF solves")
+    n_outages: int = Field(0, description="Branch outages secured against")
+    n_cuts: int = Field(0, description="Contingency limits added to the OPF")
+    n_violations: int = Field(0, description="Post-contingency overloads left at the final solution")
+    overload_mw: float = Field(0.0, description="Total post-contingency overload at the final solution (MW)")
+    max_post_loading_percent: float = Field(0.0, description="Highest post-contingency loading of the final solution")
+    islanding: List[int] = Field(default_factory=list, description="Line positions whose outage splits an island (not secured)")
+    rating: str = Field("rate_c", description="Rating used for post-contingency limits")
+    result: Union[OPFResult, ColumnarOPFResult]
+
+
+class MultiPeriodRequest(BaseModel):
+    """Multi-period DC OPF request: per-period demand over a horizon of equal periods"""
+    case_data: Optional[PowerSystem] = None
+    voll: float = Field(10000.0, description="Value of Lost Load ($/MWh)")
+    enforce_line_limits: bool = Field(True, description="Enforce line loading constraints")
+    load_scale: Optional[List[float]] = Field(None, description="Multiplier of every load, one per period")
+    bus_load_profiles: Dict[int, List[float]] = Field(
+        default_factory=dict, description="Bus ID -> demand per period (MW), replacing the scaled load at that bus")
+    period_hours: float = Field(1.0, gt=0, description="Length of each period (h)")
+    ramp_rates: Dict[str, float] = Field(
+        default_factory=dict, description="Generator ID -> ramp rate (MW/h), overriding ramp_30; 0 = unlimited")
+    initial_pg: Dict[str, float] = Field(
+        default_factory=dict, description="Generator ID -> output before the first period (MW), ramp-limited")
+
+
+class MultiPeriodResult(BaseModel):
+    """
+    Multi-period OPF results in columnar form.
+    Per-element fields are [period][element] matrices aligned with
+    bus_ids / gen_ids / line positions of the case.
+    """
+    status: str = Field(..., description="Solver status")
+    total_cost: float = Field(..., description="Cost over the horizon ($)")
+    n_periods: int = Field(0)
+    period_hours: float = Field(1.0, description="Length of each period (h)")
+    period_cost: List[float] = Field(default_factory=list, description="Cost per period ($/h)")
+    period_curtailment: List[float] = Field(default_factory=list, description="Curtailment per period (MW)")
+    bus_ids: List[int] = Field(default_factory=list)
+    gen_ids: List[Optional[str]] = Field(default_factory=list)
+    line_from: List[int] = Field(default_factory=list)
+    line_to: List[int] = Field(default_factory=list)
+    pg: List[List[float]] = Field(default_factory=list, description="Generator output (MW)")
+    lmp: List[List[float]] = Field(default_factory=list, description="Bus LMP ($/MWh)")
+    curtailment: List[List[float]] = Field(default_factory=list, description="Bus curtailment (MW)")
+    flow: List[List[float]] = Field(default_factory=list, description="Line flow (MW)")
+
+
+class SweepResult(BaseModel):
+    """Summary of a time-series sweep; per-hour results are in the output files"""
+    n_periods: int = Field(0, description="Profile rows solved")
+    n_failed: int = Field(0, description="Rows whose OPF failed")
+    total_cost: float = Field(0.0, description="Sum of hourly costs of the solved rows ($)")
+    total_curtailment: float = Field(0.0, description="Sum of hourly curtailment of the solved rows (MWh)")
+    output_dir: str = Field(..., description="Directory holding the result files")
+    files: List[str] = Field(default_factory=list, description="Result CSV files: summary, then one per quantity")
+
+
+class JobInfo(BaseModel):
+    """Status of a queued or finished solve job"""
+    id: str
+    kind: str = Field(..., description="Job type: opf, batch or sweep")
+    status: str = Field("queued", description="queued, running, completed, failed or cancelled")
+    progress: float = Field(0.0, description="Fraction of work done (0-1)")
+    error: Optional[str] = None
+    created_at: float = Field(..., description="Submission time (Unix seconds)")
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
 
 
 class ExportFormat(str):
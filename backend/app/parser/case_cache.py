@@ -0,0 +1,149 @@
+"""
+Parsed case cache
+Keeps parsed MATPOWER cases in memory and as uncompressed .npz column files
+next to the sources, so loading a server case skips the text parse
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from app.models.schemas import CaseData
+from app.models.arrays import CaseArrays
+from app.parser.matpower import MatpowerParser
+
+logger = logging.getLogger(__name__)
+
+# Bump when the parser output or the column layout changes
+CACHE_VERSION = 4
+
+# Directory (inside the cases directory) holding the .npz files
+CACHE_DIRNAME = ".cache"
+
+# Parsed cases kept in memory
+MEMORY_CACHE_SIZE = 8
+
+
+def _source_digest(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+
+def cache_path(path: str) -> str:
+    """Location of the .npz cache file for a case source"""
+    directory, filename = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, CACHE_DIRNAME, filename + ".npz")
+
+
+def _read_disk_cache(path: str, stat: os.stat_result) -> Optional[CaseArrays]:
+    npz_path = cache_path(path)
+    if not os.path.exists(npz_path):
+        return None
+    try:
+        with np.load(npz_path, allow_pickle=False) as data:
+            if int(data["cache_version"]) != CACHE_VERSION:
+                return None
+            # mtime and size are enough when unchanged; otherwise compare content
+            if int(data["source_mtime_ns"]) != stat.st_mtime_ns or int(data["source_size"]) != stat.st_size:
+                if str(data["source_digest"]) != _source_digest(path):
+                    return None
+            return CaseArrays.from_npz_columns(data)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable case cache {npz_path}: {e}")
+        return None
+
+
+def _write_disk_cache(path: str, stat: os.stat_result, case: CaseArrays):
+    npz_path = cache_path(path)
+    try:
+        os.makedirs(os.path.dirname(npz_path), exist_ok=True)
+        cols = case.to_npz_columns()
+        cols["cache_version"] = np.int64(CACHE_VERSION)
+        cols["source_mtime_ns"] = np.int64(stat.st_mtime_ns)
+        cols["source_size"] = np.int64(stat.st_size)
+        cols["source_digest"] = np.array(_source_digest(path))
+        # Write then rename so concurrent readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(npz_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **cols)
+            os.replace(tmp, npz_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except Exception as e:
+        logger.warning(f"Could not write case cache {npz_path}: {e}")
+
+
+class _CachedCase:
+    """Parsed arrays for one source file"""
+
+    def __init__(self, stamp: tuple, arrays: CaseArrays):
+        self.stamp = stamp
+        self.arrays = arrays
+
+
+_memory_cache: "OrderedDict[str, _CachedCase]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _load_entry(path: str) -> _CachedCase:
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _memory_lock:
+        entry = _memory_cache.get(path)
+        if entry is not None and entry.stamp == stamp:
+            _memory_cache.move_to_end(path)
+            return entry
+
+    arrays = _read_disk_cache(path, stat)
+    if arrays is not None:
+        logger.info(f"Loaded {os.path.basename(path)} from case cache")
+    else:
+        with open(path, "r") as f:
+            arrays = MatpowerParser().parse_arrays(f.read())
+        _write_disk_cache(path, stat, arrays)
+
+    entry = _CachedCase(stamp, arrays)
+    with _memory_lock:
+        _memory_cache[path] = entry
+        _memory_cache.move_to_end(path)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    return entry
+
+
+def load_case_arrays(path: str) -> CaseArrays:
+    """
+    Parse a MATPOWER case file into arrays, using the in-memory and on-disk
+    caches. Cache entries are invalidated when the source file changes.
+    Every call returns its own copy, free to modify.
+    """
+    arrays = _load_entry(path).arrays
+    return CaseArrays(base_mva=arrays.base_mva,
+                      **{name: column.copy() for name, column in arrays.columns().items()})
+
+
+def load_case_file(path: str) -> CaseData:
+    """
+    Parse a MATPOWER case file into a CaseData, using the caches. Every call
+    builds its own CaseData from the cached arrays, so sessions loading the
+    same case never share (and modify) one object.
+    """
+    return _load_entry(path).arrays.to_case()
+
+
+def clear_memory_cache():
+    """Drop parsed cases held in memory"""
+    with _memory_lock:
+        _memory_cache.clear()
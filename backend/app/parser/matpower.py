@@ -2,276 +2,336 @@
 MATPOWER case file parser
 """
 
+import io
 import re
 import numpy as np
-from typing import List
+from collections import defaultdict
+from typing import Optional, Union
 import logging
 
-from app.models.schemas import Bus, Generator, Line, Load, CaseData
+from app.models.schemas import CaseData
+from app.models.arrays import CaseArrays
 
 logger = logging.getLogger(__name__)
 
+# MATLAB comments run from '%' to the end of the line
+_COMMENT_RE = re.compile(r'%[^\n]*')
+_BASE_MVA_RE = re.compile(r'baseMVA\s*=\s*([\d.]+)')
+
+DEFAULT_COST = [0, 25, 0]
+
+
+def strip_comments(text: str) -> str:
+    """Remove MATLAB comments"""
+    return _COMMENT_RE.sub('', text)
+
+
+def _skip_space(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def find_matrix_body(text: str, name: str, lowered: str = None) -> Optional[str]:
+    """
+    Body of the first `[mpc.]<name> = [ ... ]` assignment (name matched
+    case-insensitively), or None. Uses str.find rather than a regex scan, which
+    is much slower on multi-megabyte files.
+    """
+    lowered = text.lower() if lowered is None else lowered
+    name = name.lower()
+    pos = lowered.find(name)
+    while pos >= 0:
+        i = _skip_space(text, pos + len(name))
+        if i < len(text) and text[i] == '=':
+            i = _skip_space(text, i + 1)
+            if i < len(text) and text[i] == '[':
+                end = text.find(']', i + 1)
+                if end >= 0:
+                    return text[i + 1:end]
+        pos = lowered.find(name, pos + 1)
+    return None
+
+
+def find_base_mva(text: str) -> Optional[float]:
+    """Value of the first `baseMVA = <number>` assignment"""
+    pos = text.find('baseMVA')
+    while pos >= 0:
+        match = _BASE_MVA_RE.match(text, pos)
+        if match:
+            return float(match.group(1))
+        pos = text.find('baseMVA', pos + 1)
+    return None
+
+
+class Matrix:
+    """
+    Numeric MATPOWER matrix as a zero-padded 2-D array plus the number of
+    values given on each row (rows may be ragged)
+    """
+
+    def __init__(self, data: np.ndarray, widths: np.ndarray):
+        self.data = data
+        self.widths = widths
+
+    def __len__(self):
+        return len(self.widths)
+
+    def rows_with(self, min_values: int) -> "Matrix":
+        """Keep rows that have at least min_values entries"""
+        keep = self.widths >= min_values
+        return Matrix(self.data[keep], self.widths[keep])
+
+    def column(self, k: int, default: float) -> np.ndarray:
+        """Column k, with default where a row is too short to have it"""
+        if k >= self.data.shape[1]:
+            return np.full(len(self), float(default))
+        return np.where(self.widths > k, self.data[:, k], default)
+
+
+def parse_matrix(text: str) -> Matrix:
+    """Tokenize the body of a MATPOWER matrix; rows end at ';' or a newline"""
+    rows = [row.split() for row in text.replace(';', '\n').split('\n')]
+    rows = [row for row in rows if row]
+    widths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    if len(rows) == 0:
+        return Matrix(np.zeros((0, 0)), widths)
+
+    width = int(widths.max())
+    if widths.min() == width:
+        data = np.array(rows, dtype=float)
+    else:
+        data = np.zeros((len(rows), width))
+        for i, row in enumerate(rows):
+            data[i, :len(row)] = np.array(row, dtype=float)
+    return Matrix(data, widths)
+
 
 class MatpowerParser:
     """Parser for MATPOWER format case files"""
 
     def __init__(self):
         self.base_mva = 100.0
+        self._lowered = None
 
     def parse_text(self, text: str) -> CaseData:
         """Parse MATPOWER format case file from text"""
+        return self.parse_arrays(text).to_case()
+
+    def parse_arrays(self, text: str) -> CaseArrays:
+        """Parse MATPOWER format case file from text into columnar arrays"""
         try:
-            # Remove comments
-            lines = []
-            for line in text.split('\n'):
-                # Remove MATLAB comments
-                if '%' in line:
-                    line = line.split('%')[0]
-                lines.append(line)
-            text = '\n'.join(lines)
+            # Remove MATLAB comments
+            text = strip_comments(text)
+            self._lowered = text.lower()
 
             # Extract base MVA
-            base_mva_match = re.search(r'(?:mpc\.)?baseMVA\s*=\s*([\d.]+)', text)
-            if base_mva_match:
-                self.base_mva = float(base_mva_match.group(1))
+            base_mva = find_base_mva(text)
+            if base_mva is not None:
+                self.base_mva = base_mva
 
             # Parse bus and load data
-            buses, loads = self._parse_bus_data(text)
+            columns = self._parse_bus_data(text)
 
             # Parse generator data
-            generators = self._parse_gen_data(text)
+            columns.update(self._parse_gen_data(text))
 
             # Parse branch data
-            lines_data = self._parse_branch_data(text)
-
-            logger.info(f"Parsed {len(buses)} buses, {len(generators)} generators, "
-                       f"{len(lines_data)} lines, {len(loads)} loads")
+            columns.update(self._parse_branch_data(text))
 
-            return CaseData(
-                buses=buses,
-                generators=generators,
-                lines=lines_data,
-                loads=loads,
-                base_mva=self.base_mva
-            )
+            case = CaseArrays(base_mva=self.base_mva, **columns)
+            logger.info(f"Parsed {case.n_bus} buses, {case.n_gen} generators, "
+                       f"{case.n_line} lines, {case.n_load} loads")
+            return case
 
         except Exception as e:
             logger.error(f"Error parsing MATPOWER file: {str(e)}")
             raise ValueError(f"Failed to parse MATPOWER file: {str(e)}")
 
-    def _parse_bus_data(self, text: str) -> tuple[List[Bus], List[Load]]:
-        """Extract bus and load data from MATPOWER format"""
-        buses = []
-        loads = []
-
-        # Find bus matrix
-        bus_match = re.search(
-            r'(?:mpc\.)?bus\s*=\s*\[(.*?)\]\s*;?',
-            text,
-            re.DOTALL | re.IGNORECASE
-        )
-
-        if not bus_match:
+    def _find_matrix(self, text: str, name: str) -> Optional[Matrix]:
+        """Locate mpc.<name> = [...] and tokenize it"""
+        body = find_matrix_body(text, name, self._lowered)
+        if body is None:
+            return None
+        return parse_matrix(body)
+
+    def _parse_bus_data(self, text: str) -> dict:
+        """Extract bus and load columns from MATPOWER format"""
+        m = self._find_matrix(text, "bus")
+        if m is None:
             logger.warning("No bus matrix found in MATPOWER text")
-            return buses, loads
-
-        bus_text = bus_match.group(1)
-        rows = self._parse_matrix_rows(bus_text)
-
-        for row in rows:
-            if len(row) >= 2:
-                bus_id = int(row[0])
-                bus_type = int(row[1]) if len(row) > 1 else 1
-                pd = float(row[2]) if len(row) > 2 and row[2] else 0.0
-                qd = float(row[3]) if len(row) > 3 and row[3] else 0.0
-                vm = float(row[7]) if len(row) > 7 and row[7] else 1.0
-                va = float(row[8]) if len(row) > 8 and row[8] else 0.0
-                base_kv = float(row[9]) if len(row) > 9 and row[9] else 345.0
-
-                buses.append(Bus(
-                    id=bus_id,
-                    type=bus_type,
-                    v_mag=vm,
-                    v_ang=va,
-                    base_kv=base_kv,
-                    zone=1
-                ))
-
-                # Extract load if present
-                if pd > 0 or qd != 0:
-                    loads.append(Load(
-                        bus=bus_id,
-                        pd=pd,
-                        qd=qd
-                    ))
-
-        return buses, loads
-
-    def _parse_gen_data(self, text: str) -> List[Generator]:
-        """Extract generator data from MATPOWER format"""
-        generators = []
-
-        # Find generator matrix
-        gen_match = re.search(
-            r'(?:mpc\.)?gen\s*=\s*\[(.*?)\]\s*;?',
-            text,
-            re.DOTALL | re.IGNORECASE
-        )
-
-        if not gen_match:
-            return generators
-
-        gen_text = gen_match.group(1)
-        rows = self._parse_matrix_rows(gen_text)
-
-        for idx, row in enumerate(rows):
-            if len(row) >= 2:
-                bus = int(row[0])
-                pg = float(row[1]) if row[1] else 0.0
-                qg = float(row[2]) if row[2] else 0.0
-                qmax = float(row[3]) if len(row) > 3 and row[3] else 300.0
-                qmin = float(row[4]) if len(row) > 4 and row[4] else -300.0
-                vg = float(row[5]) if len(row) > 5 and row[5] else 1.0
-                mbase = float(row[6]) if len(row) > 6 and row[6] else 100.0
-                pmax = float(row[8]) if len(row) > 8 and row[8] else 250.0
-                pmin = float(row[9]) if len(row) > 9 and row[9] else 0.0
-
-                status = int(float(row[7])) if len(row) > 7 and row[7] else 1
-
-                # Generate unique ID: G-{bus}-{sequence_count_at_bus}
-                bus_gen_count = len([g for g in generators if g.bus == bus])
-                gen_id = f"G-{bus}-{bus_gen_count + 1}"
-
-                generators.append(Generator(
-                    id=gen_id,
-                    bus=bus,
-                    pg=pg,
-                    qg=qg,
-                    vg=vg,
-                    mbase=mbase,
-                    pmax=pmax,
-                    pmin=pmin,
-                    qmax=qmax,
-                    qmin=qmin,
-                    status=status,
-                    cost=[0, 25, 0]  # Default cost, will be overridden by gencost
-                ))
-
-        # Parse generator costs
+            return {}
+
+        m = m.rows_with(2)
+        bus_ids = m.column(0, 0).astype(np.int64)
+        pd = m.column(2, 0.0)
+        qd = m.column(3, 0.0)
+
+        # Loads at buses with demand
+        has_load = (pd > 0) | (qd != 0)
+        return {
+            "bus_id": bus_ids,
+            "bus_type": m.column(1, 1).astype(np.int64),
+            "v_mag": m.column(7, 1.0),
+            "v_ang": m.column(8, 0.0),
+            "base_kv": m.column(9, 345.0),
+            "load_bus": bus_ids[has_load],
+            "load_pd": pd[has_load],
+            "load_qd": qd[has_load],
+        }
+
+    def _parse_gen_data(self, text: str) -> dict:
+        """Extract generator columns from MATPOWER format"""
+        m = self._find_matrix(text, "gen")
+        if m is None:
+            return {}
+
+        m = m.rows_with(2)
+        gen_bus = m.column(0, 0).astype(np.int64)
+        n_gen = len(gen_bus)
+
+        # Unique IDs: G-{bus}-{sequence_count_at_bus}
+        seen = defaultdict(int)
+        gen_ids = np.empty(n_gen, dtype=object)
+        for i, bus in enumerate(gen_bus.tolist()):
+            seen[bus] += 1
+            gen_ids[i] = f"G-{bus}-{seen[bus]}"
+
+        # Default cost, overridden by gencost
+        cost = np.tile(np.array(DEFAULT_COST, dtype=float), (n_gen, 1))
         try:
             gencost = self._parse_gencost(text)
-            if not gencost:
+            if gencost is None:
                 logger.warning("No gencost data found, using default linear cost [0, 25, 0]")
-                gencost = [[0, 25, 0]] * len(generators)
-            
-            for i, cost in enumerate(gencost):
-                if i < len(generators):
-                    generators[i].cost = cost
+            else:
+                k = min(n_gen, len(gencost))
+                cost[:k] = gencost[:k]
         except Exception as e:
             logger.warning(f"Failed to parse gencost, using defaults: {e}")
-            # Keep default costs assigned in Generator constructor
-
-
-        return generators
-
-    def _parse_gencost(self, text: str) -> List[List[float]]:
-        """Extract generator cost data"""
-        costs = []
-
-        # Find gencost matrix
-        cost_match = re.search(
-            r'(?:mpc\.)?gencost\s*=\s*\[(.*?)\]\s*;?',
-            text,
-            re.DOTALL | re.IGNORECASE
-        )
-
-        if not cost_match:
-            return [[0, 25, 0]] * 10  # Default costs
-
-        cost_text = cost_match.group(1)
-        rows = self._parse_matrix_rows(cost_text)
-
-        for row in rows:
-            if len(row) >= 5:
-                model = int(row[0])
-                if model == 2:  # Polynomial cost
-                    n = int(row[3])
-                    if len(row) >= 4 + n:
-                        # Cost coefficients in decreasing order: c_{n-1}, ..., c0
-                        # We want exactly [c2, c1, c0]
-                        raw_coeffs = [float(x) for x in row[4:4+n]]
-                        
-                        # Pad with leading zeros to make it at least 3 elements
-                        coeffs = [0.0] * max(0, 3 - n) + raw_coeffs
-                        
-                        # Use only the last 3 (c2, c1, c0) or first 3? 
-                        # MATPOWER n=3 means [c2, c1, c0]. 
-                        # If n > 3, we take the last 3 for simplicity (quadratic approx)
-                        costs.append(coeffs[-3:])
-
-        return costs if costs else [[0, 25, 0]] * len(rows)
-
-    def _parse_branch_data(self, text: str) -> List[Line]:
-        """Extract branch data from MATPOWER format"""
-        lines = []
-
-        # Find branch matrix
-        branch_match = re.search(
-            r'(?:mpc\.)?branch\s*=\s*\[(.*?)\]\s*;?',
-            text,
-            re.DOTALL | re.IGNORECASE
-        )
-
-        if not branch_match:
-            return lines
-
-        branch_text = branch_match.group(1)
-        rows = self._parse_matrix_rows(branch_text)
-
-        for row in rows:
-            if len(row) >= 4:
-                from_bus = int(row[0])
-                to_bus = int(row[1])
-                r = float(row[2]) if row[2] else 0.0
-                x = float(row[3]) if row[3] else 0.01
-                b = float(row[4]) if len(row) > 4 and row[4] else 0.0
-                rate_a = float(row[5]) if len(row) > 5 and row[5] else 250.0
-
-                status = int(float(row[10])) if len(row) > 10 and row[10] else 1
-
-                lines.append(Line(
-                    from_bus=from_bus,
-                    to_bus=to_bus,
-                    r=r,
-                    x=x,
-                    b=b,
-                    rate_a=rate_a,
-                    status=status
-                ))
-
-        return lines
-
-
-
-    def _parse_matrix_rows(self, text: str) -> List[List[str]]:
-        """Parse matrix rows from MATPOWER text"""
-        rows = []
-        
-        # Split by semicolons OR newlines
-        # This handles both [ 1 2 ; 3 4 ] and [ 1 2 \n 3 4 ]
-        raw_rows = re.split(r'[;\n]', text)
-
-        for row_str in raw_rows:
-            row_str = row_str.strip()
-            if not row_str:
-                continue
-                
-            # Split by whitespace (spaces or tabs)
-            values = row_str.split()
-            # Filter out empty strings
-            values = [v for v in values if v]
-            if values:
-                rows.append(values)
-
-        return rows
 
+        return {
+            "gen_id": gen_ids,
+            "gen_bus": gen_bus,
+            "pg": m.column(1, 0.0),
+            "qg": m.column(2, 0.0),
+            "qmax": m.column(3, 300.0),
+            "qmin": m.column(4, -300.0),
+            "vg": m.column(5, 1.0),
+            "mbase": m.column(6, 100.0),
+            "gen_status": m.column(7, 1).astype(np.int64),
+            "pmax": m.column(8, 250.0),
+            "pmin": m.column(9, 0.0),
+            "ramp_30": m.column(18, 0.0),
+            "gen_cost": cost,
+        }
+
+    def _parse_gencost(self, text: str) -> Optional[np.ndarray]:
+        """
+        Extract generator cost coefficients as an (n, 3) [c2, c1, c0] array,
+        or None when the case has no usable polynomial costs
+        """
+        m = self._find_matrix(text, "gencost")
+        if m is None:
+            return None
+
+        m = m.rows_with(5)
+
+        # Polynomial rows (model 2) with all n coefficients present; other rows are skipped
+        model = m.column(0, 0)
+        n = m.column(3, 0)
+        if np.any(n != np.floor(n)):
+            raise ValueError("Non-integer number of cost coefficients")
+        n = n.astype(np.int64)
+        poly = (model == 2) & (m.widths >= 4 + n)
+        if not np.any(poly):
+            return None
+
+        # Coefficients run c_{n-1} ... c0 from column 4. Keep [c2, c1, c0]:
+        # lower orders are zero-padded, higher orders dropped (quadratic approximation)
+        data, n = m.data[poly], n[poly]
+        cols = 4 + n[:, None] - 3 + np.arange(3)[None, :]
+        present = cols >= 4
+        return np.where(present, data[np.arange(len(data))[:, None], np.maximum(cols, 0)], 0.0)
+
+    def _parse_branch_data(self, text: str) -> dict:
+        """Extract branch columns from MATPOWER format"""
+        m = self._find_matrix(text, "branch")
+        if m is None:
+            return {}
+
+        m = m.rows_with(4)
+        return {
+            "line_from": m.column(0, 0).astype(np.int64),
+            "line_to": m.column(1, 0).astype(np.int64),
+            "r": m.column(2, 0.0),
+            "x": m.column(3, 0.01),
+            "b": m.column(4, 0.0),
+            "rate_a": m.column(5, 250.0),
+            "rate_b": m.column(6, 250.0),
+            "rate_c": m.column(7, 250.0),
+            "line_status": m.column(10, 1).astype(np.int64),
+        }
+
+
+def _format_rows(columns, fmt: str) -> str:
+    """One tab-separated, ';'-terminated row per element"""
+    buf = io.StringIO()
+    np.savetxt(buf, np.column_stack(columns), fmt=fmt, delimiter="\t", newline=";\n")
+    return buf.getvalue()
+
+
+def format_matpower(case: Union[CaseData, CaseArrays], name: str = "case") -> str:
+    """
+    MATPOWER text for a case, readable by MatpowerParser (and MATPOWER).
+    Loads are summed into the Pd/Qd columns of their buses; generator costs
+    are written as quadratic polynomials.
+    """
+    case = case if isinstance(case, CaseArrays) else CaseArrays.from_case(case)
+    positions = {bus: i for i, bus in enumerate(case.bus_id.tolist())}
+    load_pos = np.fromiter((positions[bus] for bus in case.load_bus.tolist()), dtype=np.int64,
+                           count=case.n_load)
+    pd = np.bincount(load_pos, weights=case.load_pd, minlength=case.n_bus)
+    qd = np.bincount(load_pos, weights=case.load_qd, minlength=case.n_bus)
+
+    nb, ng, nl = case.n_bus, case.n_gen, case.n_line
+    bus = _format_rows(
+        [case.bus_id, case.bus_type, pd, qd, case.g_shunt, case.b_shunt, np.ones(nb), case.v_mag,
+         case.v_ang, case.base_kv, case.zone, np.full(nb, 1.1), np.full(nb, 0.9)],
+        "%d\t%d\t%.8g\t%.8g\t%.8g\t%.8g\t%d\t%.8g\t%.8g\t%.8g\t%d\t%.8g\t%.8g"
+    )
+    zeros = np.zeros(ng)
+    gen = _format_rows(
+        [case.gen_bus, case.pg, case.qg, case.qmax, case.qmin, case.vg, case.mbase, case.gen_status,
+         case.pmax, case.pmin] + [zeros] * 8 + [case.ramp_30, zeros, zeros],
+        "%d\t" + "\t".join(["%.8g"] * 6) + "\t%d" + "\t%.8g" * 13
+    )
+    branch = _format_rows(
+        [case.line_from, case.line_to, case.r, case.x, case.b, case.rate_a, case.rate_b, case.rate_c,
+         np.zeros(nl), np.zeros(nl), case.line_status, np.full(nl, -360.0), np.full(nl, 360.0)],
+        "%d\t%d" + "\t%.8g" * 8 + "\t%d\t%.8g\t%.8g"
+    )
+    cost = np.zeros((ng, 3))
+    width = min(case.gen_cost.shape[1], 3) if ng else 0
+    cost[:, :width] = case.gen_cost[:, :width]
+    gencost = _format_rows(
+        [np.full(ng, 2), zeros, zeros, np.full(ng, 3), cost],
+        "%d\t%.8g\t%.8g\t%d\t%.10g\t%.10g\t%.10g"
+    )
+
+    return (
+        f"function mpc = {name}\n"
+        "mpc.version = '2';\n"
+        f"mpc.baseMVA = {case.base_mva:g};\n\n"
+        "% bus data\n"
+        "%\tbus_i\ttype\tPd\tQd\tGs\tBs\tarea\tVm\tVa\tbaseKV\tzone\tVmax\tVmin\n"
+        f"mpc.bus = [\n{bus}];\n\n"
+        "% generator data\n"
+        "%\tbus\tPg\tQg\tQmax\tQmin\tVg\tmBase\tstatus\tPmax\tPmin\t...\tramp_30\n"
+        f"mpc.gen = [\n{gen}];\n\n"
+        "% branch data\n"
+        "%\tfbus\ttbus\tr\tx\tb\trateA\trateB\trateC\tratio\tangle\tstatus\tangmin\tangmax\n"
+        f"mpc.branch = [\n{branch}];\n\n"
+        "% generator cost data\n"
+        "%\t2\tstartup\tshutdown\tn\tc2\tc1\tc0\n"
+        f"mpc.gencost = [\n{gencost}];\n"
+    )
@@ -0,0 +1,338 @@
+"""
+Sparse model assembly for the nodal DC OPF formulation
+Builds constraint blocks from index arrays, shared by the LP and QP paths
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+
+def find_island_references(B_sparse: sp.spmatrix, slack_idx: int):
+    """
+    Detect connected components of the network and pick one reference bus per island.
+    The global slack bus is the reference of its own island; every other island
+    uses its first bus.
+
+    Returns (n_components, labels, ref_idx)
+    """
+    n = B_sparse.shape[0]
+    n_components, labels = connected_components(csgraph=B_sparse, directed=False)
+
+    # Labels are numbered in order of first appearance, so the first index of
+    # each label is the lowest bus index of that island
+    _, ref_idx = np.unique(labels, return_index=True)
+    if 0 <= slack_idx < n:
+        ref_idx[labels[slack_idx]] = slack_idx
+
+    return n_components, labels, ref_idx
+
+
+def build_balance_block(B_sparse: sp.spmatrix, gen_bus_idx: np.ndarray,
+                        n_gen: int, n_bus: int) -> sp.csr_matrix:
+    """
+    Nodal power balance rows: B*theta - sum(Pg at bus) - Curtailment = -Pd
+    Shape (n_bus, n_gen + 2*n_bus)
+    """
+    G = sp.csr_matrix(
+        (np.full(n_gen, -1.0), (np.asarray(gen_bus_idx, dtype=np.int64), np.arange(n_gen))),
+        shape=(n_bus, n_gen)
+    )
+    C = -sp.identity(n_bus, format="csr")
+    return sp.hstack([G, C, sp.csr_matrix(B_sparse)], format="csr")
+
+
+def build_reference_block(ref_idx: np.ndarray, n_vars: int, theta_offset: int) -> sp.csr_matrix:
+    """Island reference rows: theta[ref_bus_of_island_k] = 0"""
+    k = len(ref_idx)
+    return sp.csr_matrix(
+        (np.ones(k), (np.arange(k), theta_offset + np.asarray(ref_idx, dtype=np.int64))),
+        shape=(k, n_vars)
+    )
+
+
+def build_flow_block(from_idx: np.ndarray, to_idx: np.ndarray, susceptances: np.ndarray,
+                     n_vars: int, theta_offset: int) -> sp.csr_matrix:
+    """Branch flow rows: Flow_k = b_k * (theta_i - theta_j)"""
+    m = len(susceptances)
+    rows = np.arange(m)
+    return sp.csr_matrix(
+        (np.concatenate([susceptances, -susceptances]),
+         (np.concatenate([rows, rows]),
+          np.concatenate([theta_offset + from_idx, theta_offset + to_idx]))),
+        shape=(m, n_vars)
+    )
+
+
+def _widen(M: sp.spmatrix, n_cols: int) -> sp.csr_matrix:
+    """The same rows with zero columns appended up to n_cols"""
+    M = sp.csr_matrix(M)
+    return sp.csr_matrix((M.data, M.indices, M.indptr), shape=(M.shape[0], n_cols))
+
+
+class NodalModel:
+    """
+    Assembled sparse nodal DC OPF model.
+    Variables x = [Pg (n_gen), Curtailment (n_bus), Theta (n_bus)], followed
+    by one overload variable per soft cut
+    """
+
+    def __init__(self, n_gen: int, n_bus: int, c: np.ndarray, quad: np.ndarray,
+                 A_eq: sp.csr_matrix, b_eq: np.ndarray, A_flow: sp.csr_matrix,
+                 line_rates: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+                 n_islands: int, enforce_line_limits: bool = True):
+        self.n_gen = n_gen
+        self.n_bus = n_bus
+        self.n_vars = n_gen + 2 * n_bus
+        self.c = c
+        self.quad = quad
+        self.A_eq = A_eq
+        self.b_eq = b_eq
+        self.A_flow = A_flow
+        self.line_rates = line_rates
+        self.lower = lower
+        self.upper = upper
+        self.n_islands = n_islands
+        self.enforce_line_limits = enforce_line_limits
+
+        # Flow limits added after assembly (e.g. post-contingency flows):
+        # -limit <= row @ x <= limit. A soft limit gets its own overload
+        # variable s >= 0, priced in c, and becomes |row @ x| <= limit + s.
+        self.A_cuts = sp.csr_matrix((0, self.n_vars))
+        self.cut_limits = np.zeros(0)
+        self.cut_slack = np.zeros(0, dtype=np.int64)  # overload variable, -1 if hard
+
+    @property
+    def theta_offset(self) -> int:
+        return self.n_gen + self.n_bus
+
+    @property
+    def n_lines(self) -> int:
+        return self.A_flow.shape[0]
+
+    @property
+    def n_cuts(self) -> int:
+        return self.A_cuts.shape[0]
+
+    @property
+    def overload_slice(self) -> slice:
+        """Overload variables of soft cuts, after Theta"""
+        return slice(self.theta_offset + self.n_bus, self.n_vars)
+
+    def add_cuts(self, theta_rows: sp.spmatrix, limits: np.ndarray, penalty: float = None):
+        """
+        Append flow limits -limit <= row @ theta <= limit, with rows given over
+        the bus angles (n_bus columns). With a penalty (cost per pu of
+        overload) the limits are soft.
+        """
+        rows = sp.csr_matrix(theta_rows)
+        n = rows.shape[0]
+        slack = np.full(n, -1, dtype=np.int64)
+        if penalty is not None and n > 0:
+            slack = self.n_vars + np.arange(n)
+            self.n_vars += n
+            self.c = np.concatenate([self.c, np.full(n, float(penalty))])
+            self.quad = np.concatenate([self.quad, np.zeros(n)])
+            self.lower = np.concatenate([self.lower, np.zeros(n)])
+            self.upper = np.concatenate([self.upper, np.full(n, np.inf)])
+            self.A_eq = _widen(self.A_eq, self.n_vars)
+            self.A_flow = _widen(self.A_flow, self.n_vars)
+            self.A_cuts = _widen(self.A_cuts, self.n_vars)
+
+        rows = sp.hstack([sp.csr_matrix((n, self.theta_offset)), rows,
+                          sp.csr_matrix((n, self.n_vars - self.theta_offset - self.n_bus))], format="csr")
+        self.A_cuts = sp.vstack([self.A_cuts, rows], format="csr")
+        self.cut_limits = np.concatenate([self.cut_limits, np.asarray(limits, dtype=float)])
+        self.cut_slack = np.concatenate([self.cut_slack, slack])
+
+    def lp_inequalities(self):
+        """
+        Line limits as A_ub @ x <= b_ub, two rows per branch:
+        row 2k: Flow_k <= rate_k, row 2k+1: -Flow_k <= rate_k.
+        Cuts follow the branch rows in the same layout (minus the overload
+        variable for soft cuts).
+        """
+        blocks, limits = [], []
+        if self.enforce_line_limits and self.n_lines > 0:
+            blocks.append(self.A_flow)
+            limits.append(self.line_rates)
+        if self.n_cuts > 0:
+            blocks.append(self.A_cuts)
+            limits.append(self.cut_limits)
+        if not blocks:
+            return None, None
+
+        F = sp.vstack(blocks, format="coo")
+        rows = [2 * F.row, 2 * F.row + 1]
+        cols = [F.col, F.col]
+        data = [F.data, -F.data]
+        soft = np.flatnonzero(self.cut_slack >= 0)
+        if len(soft):
+            r = F.shape[0] - self.n_cuts + soft
+            rows += [2 * r, 2 * r + 1]
+            cols += [self.cut_slack[soft]] * 2
+            data += [np.full(len(soft), -1.0)] * 2
+        A_ub = sp.coo_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(2 * F.shape[0], self.n_vars)
+        )
+        b_ub = np.repeat(np.concatenate(limits), 2)
+        return A_ub, b_ub
+
+    def cut_constraints(self, bound_rows: bool = True):
+        """
+        Cuts as l <= A x <= u, in the order they were added: one row per hard
+        cut; three per soft cut (upper side, lower side, overload >= 0).
+        Without bound_rows the overload >= 0 rows are left to the variable
+        bounds (two rows per soft cut).
+        """
+        soft = self.cut_slack >= 0
+        counts = np.where(soft, 3 if bound_rows else 2, 1)
+        start = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+        C = self.A_cuts.tocoo()
+        on_soft = soft[C.row]
+        s = np.flatnonzero(soft)
+        s_col = self.cut_slack[s]
+        bounds = s if bound_rows else s[:0]
+        rows = np.concatenate([start[C.row], start[C.row[on_soft]] + 1,
+                               start[s], start[s] + 1, start[bounds] + 2])
+        cols = np.concatenate([C.col, C.col[on_soft], s_col, s_col, self.cut_slack[bounds]])
+        data = np.concatenate([C.data, C.data[on_soft],
+                               np.full(len(s), -1.0), np.ones(len(s)), np.ones(len(bounds))])
+        n_rows = int(counts.sum())
+        A = sp.csr_matrix((data, (rows, cols)), shape=(n_rows, self.n_vars))
+
+        lim = self.cut_limits
+        l = np.empty(n_rows)
+        u = np.empty(n_rows)
+        l[start] = np.where(soft, -np.inf, -lim)
+        u[start] = lim
+        l[start[s] + 1] = -lim[s]
+        u[start[s] + 1] = np.inf
+        l[start[bounds] + 2] = 0.0
+        u[start[bounds] + 2] = np.inf
+        return A, l, u
+
+    def lp_constraints(self):
+        """
+        Rows as l <= A x <= u for an LP solver with ranged rows: power
+        balance and island references (l = u), one row per line limit, then
+        cuts. Variable bounds stay bounds (lp_bounds).
+        """
+        blocks = [self.A_eq]
+        lower = [self.b_eq]
+        upper = [self.b_eq]
+        if self.enforce_line_limits and self.n_lines > 0:
+            blocks.append(self.A_flow)
+            lower.append(-self.line_rates)
+            upper.append(self.line_rates)
+        if self.n_cuts > 0:
+            A_cuts, l_cuts, u_cuts = self.cut_constraints(bound_rows=False)
+            blocks.append(A_cuts)
+            lower.append(l_cuts)
+            upper.append(u_cuts)
+
+        A = sp.vstack(blocks, format="csc")
+        return A, np.concatenate(lower), np.concatenate(upper)
+
+    def lp_bounds(self) -> np.ndarray:
+        """Variable bounds as an (n_vars, 2) array for linprog"""
+        return np.column_stack([self.lower, self.upper])
+
+    def quadratic_cost(self) -> sp.csc_matrix:
+        """Diagonal quadratic cost matrix P for 1/2 x'Px"""
+        idx = np.flatnonzero(self.quad > 1e-9)
+        return sp.csc_matrix((self.quad[idx], (idx, idx)), shape=(self.n_vars, self.n_vars))
+
+    def qp_constraints(self):
+        """
+        Stack all constraints as l <= A x <= u (OSQP form):
+        power balance, island references, line limits, Pg bounds, curtailment
+        bounds, then cuts (last, so earlier duals keep their positions)
+        """
+        n_bounded = self.n_gen + self.n_bus
+        I_bounds = sp.identity(self.n_vars, format="csr")[:n_bounded]
+
+        blocks = [self.A_eq]
+        lower = [self.b_eq]
+        upper = [self.b_eq]
+        if self.enforce_line_limits and self.n_lines > 0:
+            blocks.append(self.A_flow)
+            lower.append(-self.line_rates)
+            upper.append(self.line_rates)
+        blocks.append(I_bounds)
+        lower.append(self.lower[:n_bounded])
+        upper.append(self.upper[:n_bounded])
+        if self.n_cuts > 0:
+            A_cuts, l_cuts, u_cuts = self.cut_constraints()
+            blocks.append(A_cuts)
+            lower.append(l_cuts)
+            upper.append(u_cuts)
+
+        A = sp.vstack(blocks, format="csc")
+        return A, np.concatenate(lower), np.concatenate(upper)
+
+
+def build_nodal_model(gen_costs: np.ndarray, gen_pmin: np.ndarray, gen_pmax: np.ndarray,
+                      gen_bus_idx: np.ndarray, Pd_pu: np.ndarray, B_sparse: sp.spmatrix,
+                      from_idx: np.ndarray, to_idx: np.ndarray, susceptances: np.ndarray,
+                      line_rates: np.ndarray, slack_idx: int, voll: float, base_mva: float,
+                      enforce_line_limits: bool = True, island_refs: np.ndarray = None) -> NodalModel:
+    """
+    Assemble the sparse nodal DC OPF model from array inputs.
+
+    gen_costs is an (n_gen, 3) array of [a, b, c] coefficients ($/h with Pg in MW).
+    Costs are scaled to per-unit decision variables. island_refs can pass
+    precomputed reference buses (one per island) to skip component detection.
+    """
+    n_gen = len(gen_pmin)
+    n_bus = len(Pd_pu)
+    n_vars = n_gen + 2 * n_bus
+    theta_offset = n_gen + n_bus
+
+    gen_costs = np.asarray(gen_costs, dtype=float).reshape(n_gen, -1)
+
+    # Objective: c_gen * Pg + voll * Curtailment + 0 * Theta
+    c = np.zeros(n_vars)
+    c[:n_gen] = gen_costs[:, 1] * base_mva
+    c[n_gen:theta_offset] = voll * base_mva
+
+    quad = np.zeros(n_vars)
+    quad[:n_gen] = 2 * gen_costs[:, 0] * base_mva**2
+
+    # Equality constraints: nodal balance + one theta reference per island
+    if island_refs is None:
+        _, _, island_refs = find_island_references(B_sparse, slack_idx)
+    ref_idx = np.asarray(island_refs, dtype=np.int64)
+    n_components = len(ref_idx)
+    A_eq = sp.vstack([
+        build_balance_block(B_sparse, gen_bus_idx, n_gen, n_bus),
+        build_reference_block(ref_idx, n_vars, theta_offset),
+    ], format="csr")
+    b_eq = np.zeros(n_bus + n_components)
+    b_eq[:n_bus] = -Pd_pu
+
+    A_flow = build_flow_block(
+        np.asarray(from_idx, dtype=np.int64), np.asarray(to_idx, dtype=np.int64),
+        np.asarray(susceptances, dtype=float), n_vars, theta_offset
+    )
+
+    # Bounds: Pmin <= Pg <= Pmax, 0 <= Curtailment <= Pd, Theta free.
+    # Negative Pd (generation modeled as load) can't be shed, so Curt is fixed at 0 there.
+    lower = np.concatenate([gen_pmin, np.zeros(n_bus), np.full(n_bus, -np.inf)])
+    upper = np.concatenate([gen_pmax, np.maximum(Pd_pu, 0.0), np.full(n_bus, np.inf)])
+
+    return NodalModel(
+        n_gen=n_gen,
+        n_bus=n_bus,
+        c=c,
+        quad=quad,
+        A_eq=A_eq,
+        b_eq=b_eq,
+        A_flow=A_flow,
+        line_rates=np.asarray(line_rates, dtype=float),
+        lower=lower,
+        upper=upper,
+        n_islands=n_components,
+        enforce_line_limits=enforce_line_limits
+    )
@@ -0,0 +1,215 @@
+"""
+N-1 contingency screening
+Post-contingency branch flows from LODF (branch outages) and PTDF (generator
+outages) updates of the base DC OPF solution, without re-solving
+"""
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from app.models.arrays import CaseArrays, as_case_arrays
+from app.models.schemas import CaseData, ContingencyResult, ContingencyViolation
+from app.solver.sensitivity import SensitivityModel, get_sensitivity_model
+
+logger = logging.getLogger(__name__)
+
+# Outages evaluated per block (one multi-RHS factor solve each)
+DEFAULT_CHUNK_SIZE = 256
+
+BRANCH = "branch"
+GENERATOR = "generator"
+
+
+class _Violations:
+    """Violation columns gathered from one block of outages"""
+
+    def __init__(self, outage_type: str, outages: np.ndarray, lines: np.ndarray,
+                 flow_mw: np.ndarray, loading: np.ndarray):
+        self.outage_type = outage_type
+        self.outages = outages
+        self.lines = lines
+        self.flow_mw = flow_mw
+        self.loading = loading
+
+
+def _block_violations(outage_type: str, outages: np.ndarray, post_mw: np.ndarray,
+                      rating_mw: np.ndarray, threshold: float) -> _Violations:
+    """Entries of a [line, outage] post-contingency flow block above threshold percent"""
+    limited = rating_mw > 0
+    loading = np.zeros(post_mw.shape)
+    loading[limited] = np.abs(post_mw[limited]) / rating_mw[limited, None] * 100
+    lines, cols = np.nonzero(loading > threshold)
+    return _Violations(outage_type, outages[cols], lines, post_mw[lines, cols], loading[lines, cols])
+
+
+class ContingencyScreen:
+    """
+    N-1 screening around one base operating point.
+
+    base_flow_mw are the branch flows of the base solution (case line order)
+    and rating_mw the post-contingency limits (<= 0 means unlimited).
+    Branch outage m changes flows by LODF[:, m] * flow[m]; a generator outage
+    removes its output at its bus, picked up at the island reference bus, and
+    changes flows by -Pg * PTDF[:, bus].
+    """
+
+    def __init__(self, model: SensitivityModel, base_flow_mw: np.ndarray, rating_mw: np.ndarray,
+                 threshold: float = 100.0):
+        self.model = model
+        self.base_flow_mw = np.asarray(base_flow_mw, dtype=float)
+        self.rating_mw = np.asarray(rating_mw, dtype=float)
+        self.threshold = threshold
+
+    def branch_block(self, outages: np.ndarray):
+        """(violations, islanding outage positions) for a block of branch outages"""
+        lodf = self.model.lodf_columns(outages)
+        islanding = np.isnan(lodf).any(axis=0) if len(lodf) else np.zeros(len(outages), dtype=bool)
+        ok = ~islanding
+        post = self.base_flow_mw[:, None] + lodf[:, ok] * self.base_flow_mw[outages[ok]][None, :]
+        return (_block_violations(BRANCH, outages[ok], post, self.rating_mw, self.threshold),
+                outages[islanding])
+
+    def generator_block(self, gens: np.ndarray, gen_bus_pos: np.ndarray, pg_mw: np.ndarray):
+        """(violations, no islanding outages) for a block of generator outages"""
+        ptdf = self.model.ptdf_columns(gen_bus_pos)
+        post = self.base_flow_mw[:, None] - ptdf * pg_mw[None, :]
+        return (_block_violations(GENERATOR, gens, post, self.rating_mw, self.threshold),
+                np.zeros(0, dtype=np.int64))
+
+
+def screen_contingencies(case: Union[CaseData, CaseArrays], voll: float = 10000.0,
+                         enforce_line_limits: bool = True,
+                         branch_outages: Optional[Sequence[int]] = None,
+                         generator_outages: Optional[Sequence[str]] = None,
+                         include_generators: bool = True, threshold: float = 100.0,
+                         max_violations: int = 1000, max_workers: Optional[int] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         progress: Optional[Callable[[int, int], None]] = None) -> ContingencyResult:
+    """
+    Solve the base DC OPF, then screen branch and generator outages for
+    post-contingency overloads against rate_a. Outage blocks run on a thread
+    pool sharing the cached factorization.
+
+    branch_outages are line positions (default: every in-service branch);
+    generator_outages are generator IDs (default: every dispatched unit).
+    Violations are ranked by loading, highest first.
+    """
+    from app.solver.opf_solver import DCOPSolver
+
+    case = as_case_arrays(case)
+    base = DCOPSolver().solve(case, voll=voll, enforce_line_limits=enforce_line_limits,
+                              result_format="columns")
+    base_mva = case.base_mva if case.base_mva else 100.0
+
+    model = get_sensitivity_model(case)
+    injections = (np.asarray(base.bus_pl) + np.asarray(base.bus_curtailment)) / base_mva
+    base_flow_mw = model.flows(injections) * base_mva
+    screen = ContingencyScreen(model, base_flow_mw, case.rate_a, threshold)
+
+    # Outage lists
+    if branch_outages is None:
+        branches = model.active_lines
+    else:
+        model.check_lines(branch_outages)
+        branches = np.asarray(branch_outages, dtype=np.int64)
+
+    pg_mw = np.asarray(base.gen_pg)
+    if not include_generators:
+        gens = np.zeros(0, dtype=np.int64)
+    elif generator_outages is None:
+        gens = np.flatnonzero(pg_mw > 0)
+    else:
+        index = {gid: k for k, gid in enumerate(case.gen_id.tolist())}
+        missing = [g for g in generator_outages if g not in index]
+        if missing:
+            raise ValueError(f"Unknown generator {missing[0]!r}")
+        gens = np.array([index[g] for g in generator_outages], dtype=np.int64)
+    gen_bus_pos = model.bus_positions(case.gen_bus[gens]) if len(gens) else gens
+
+    tasks = [(screen.branch_block, (branches[i:i + chunk_size],))
+             for i in range(0, len(branches), chunk_size)]
+    tasks += [(screen.generator_block, (gens[i:i + chunk_size], gen_bus_pos[i:i + chunk_size],
+                                        pg_mw[gens[i:i + chunk_size]]))
+              for i in range(0, len(gens), chunk_size)]
+    sizes = [len(args[0]) for _, args in tasks]
+    total = int(sum(sizes))
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(tasks)))
+
+    blocks = []
+    done = 0
+    if max_workers == 1:
+        for (fn, args), size in zip(tasks, sizes):
+            blocks.append(fn(*args))
+            done += size
+            if progress is not None:
+                progress(done, total)
+    else:
+        logger.info(f"Screening {total} contingencies on {max_workers} threads")
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="n1") as pool:
+            futures = [pool.submit(fn, *args) for fn, args in tasks]
+            try:
+                for f, size in zip(futures, sizes):
+                    blocks.append(f.result())
+                    done += size
+                    if progress is not None:
+                        progress(done, total)
+            except BaseException:
+                for f in futures:
+                    f.cancel()
+                raise
+
+    found = [violations for violations, _ in blocks]
+    islanding = [int(m) for _, split in blocks for m in split]
+
+    return ContingencyResult(
+        status=base.status,
+        base_cost=base.total_cost,
+        n_branch_outages=len(branches),
+        n_generator_outages=len(gens),
+        islanding=sorted(islanding),
+        n_violations=int(sum(len(v.lines) for v in found)),
+        violations=_ranked(case, found, base_flow_mw, max_violations)
+    )
+
+
+def _ranked(case: CaseArrays, found: List[_Violations], base_flow_mw: np.ndarray,
+            limit: int) -> List[ContingencyViolation]:
+    """The limit highest-loading violations as response models"""
+    if not found:
+        return []
+    loading = np.concatenate([v.loading for v in found])
+    order = np.argsort(-loading, kind="stable")[:max(0, limit)]
+
+    outage_type = np.concatenate([np.full(len(v.lines), v.outage_type, dtype=object) for v in found])
+    outages = np.concatenate([v.outages for v in found])
+    lines = np.concatenate([v.lines for v in found])
+    flow = np.concatenate([v.flow_mw for v in found])
+
+    gen_id = case.gen_id.tolist()
+    violations = []
+    for k in order.tolist():
+        kind, m, l = outage_type[k], int(outages[k]), int(lines[k])
+        if kind == BRANCH:
+            label = f"{int(case.line_from[m])}-{int(case.line_to[m])}"
+        else:
+            label = gen_id[m] if gen_id[m] is not None else f"gen {m}"
+        violations.append(ContingencyViolation(
+            outage_type=kind,
+            outage_index=m,
+            outage_id=label,
+            line=l,
+            from_bus=int(case.line_from[l]),
+            to_bus=int(case.line_to[l]),
+            base_flow_mw=float(base_flow_mw[l]),
+            flow_mw=float(flow[k]),
+            rating_mw=float(case.rate_a[l]),
+            loading_percent=float(loading[k])
+        ))
+    return violations
@@ -0,0 +1,95 @@
+"""
+Lazy branch limits
+Constraint generation for base-case line limits: solve with only the limits
+expected to bind, check every flow, add the violated lines and re-solve
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.solver.network import NetworkModel
+
+LINE_LIMIT_MODES = ("full", "lazy")
+
+# Rounds before giving up (the last solve may still violate limits)
+DEFAULT_MAX_ROUNDS = 50
+
+# Flow above the rating tolerated without adding the limit (MW)
+DEFAULT_TOLERANCE_MW = 1e-4
+
+# Lines loaded within this share of their rating at the optimum are
+# remembered as binding for the next solve
+BINDING_MARGIN = 0.01
+
+# Networks whose binding lines are remembered to seed the next solve
+PREDICTION_CACHE_SIZE = 16
+
+
+class LazyLineLimits:
+    """
+    Separator for base-case branch limits, used as DCOPSolver.solve's
+    lazy_constraints. Rows are over the bus angles: b_k (e_from - e_to).
+    Limits are hard, as in the full model.
+    """
+
+    penalty = None
+
+    def __init__(self, net: NetworkModel, max_rounds: int = DEFAULT_MAX_ROUNDS,
+                 tolerance_mw: float = DEFAULT_TOLERANCE_MW):
+        self.net = net
+        self.max_rounds = max_rounds
+        self.tolerance_pu = tolerance_mw / net.base_mva
+        self.flow_rows = sp.csr_matrix(sp.diags(net.susceptances) @ net.incidence)
+        self.added = np.zeros(len(net.active_lines), dtype=bool)
+
+    def rows(self, lines: np.ndarray):
+        """Rows and limits (pu) for active line positions, marked as added"""
+        self.added[lines] = True
+        return self.flow_rows[lines], self.net.line_rates[lines]
+
+    def initial(self):
+        """Rows and limits for the lines that bound the last solve of this network"""
+        return self.rows(predicted_lines(self.net.key, len(self.added)))
+
+    def separate(self, theta: np.ndarray):
+        """Rows and limits of every line over its rating and not yet in the model"""
+        flows = self.flow_rows @ np.asarray(theta, dtype=float)
+        violated = (np.abs(flows) > self.net.line_rates + self.tolerance_pu) & ~self.added
+        return self.rows(np.flatnonzero(violated))
+
+    def remember(self, theta: np.ndarray):
+        """Keep the lines at or near their rating for the final angles to seed the next solve"""
+        flows = self.flow_rows @ np.asarray(theta, dtype=float)
+        binding = np.abs(flows) >= self.net.line_rates * (1 - BINDING_MARGIN) - self.tolerance_pu
+        remember_lines(self.net.key, np.flatnonzero(binding))
+
+
+_predictions: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_predictions_lock = threading.Lock()
+
+
+def predicted_lines(network_key: str, n_active: int) -> np.ndarray:
+    """Active line positions remembered for a network (empty if none)"""
+    with _predictions_lock:
+        lines = _predictions.get(network_key)
+        if lines is None:
+            return np.zeros(0, dtype=np.int64)
+        _predictions.move_to_end(network_key)
+    return lines[lines < n_active]
+
+
+def remember_lines(network_key: str, lines: np.ndarray):
+    with _predictions_lock:
+        _predictions[network_key] = np.asarray(lines, dtype=np.int64)
+        _predictions.move_to_end(network_key)
+        while len(_predictions) > PREDICTION_CACHE_SIZE:
+            _predictions.popitem(last=False)
+
+
+def clear_predictions():
+    """Forget the remembered binding lines"""
+    with _predictions_lock:
+        _predictions.clear()
@@ -0,0 +1,310 @@
+"""
+Multi-period DC OPF
+One block-structured sparse model over a time horizon: the single-period
+nodal blocks tiled along the diagonal, coupled by generator ramp limits
+"""
+
+import logging
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.models.arrays import CaseArrays, as_case_arrays
+from app.models.schemas import CaseData, MultiPeriodResult
+from app.solver.assembly import NodalModel, build_nodal_model
+from app.solver.network import NetworkModel, get_network_model
+from app.solver.results import polynomial_cost
+from app.solver.workspaces import OSQP_SETTINGS, solve_osqp
+
+logger = logging.getLogger(__name__)
+
+# OSQP iteration budget per period of the horizon (at least four times the
+# single-period budget); the coupled models need well over the single-period
+# max_iter to reach eps on the larger cases
+QP_ITER_PER_PERIOD = 1000
+
+
+def load_profiles(case: CaseArrays, net: NetworkModel, load_scale: Optional[List[float]] = None,
+                  bus_profiles: Optional[Dict[int, List[float]]] = None) -> np.ndarray:
+    """
+    Nodal demand (n_periods, n_bus) in per-unit. load_scale multiplies every
+    load per period; bus_profiles (bus ID -> MW per period) replace the
+    scaled demand at their bus. Shunt conductance is added as load, unscaled.
+    """
+    bus_profiles = bus_profiles or {}
+    lengths = {len(p) for p in bus_profiles.values()}
+    if load_scale is not None:
+        lengths.add(len(load_scale))
+    if len(lengths) != 1:
+        raise ValueError("Load profiles must be given and have the same number of periods")
+    n_periods = lengths.pop()
+    if n_periods == 0:
+        raise ValueError("Load profiles have no periods")
+
+    Pd, _ = net.extract_loads(case.load_bus, case.load_pd, case.load_qd)
+    Pd = Pd - net.g_shunt
+    scale = np.ones(n_periods) if load_scale is None else np.asarray(load_scale, dtype=float)
+    demand = scale[:, None] * Pd[None, :]
+
+    if bus_profiles:
+        buses = list(bus_profiles)
+        pos = net.bus_positions(buses)
+        if np.any(pos < 0):
+            raise ValueError(f"Unknown bus {buses[int(np.flatnonzero(pos < 0)[0])]}")
+        demand[:, pos] = np.array([bus_profiles[b] for b in buses], dtype=float).T / net.base_mva
+    return demand + net.g_shunt[None, :]
+
+
+def ramp_limits(case: CaseArrays, period_hours: float,
+                ramp_rates: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Largest change in output between consecutive periods (MW, inf when
+    unlimited). ramp_30 gives the rate per 30 minutes; ramp_rates
+    (generator ID -> MW/h) override it.
+    """
+    per_hour = np.where(case.ramp_30 > 0, 2.0 * case.ramp_30, np.inf)
+    if ramp_rates:
+        index = {gid: k for k, gid in enumerate(case.gen_id.tolist())}
+        missing = [g for g in ramp_rates if g not in index]
+        if missing:
+            raise ValueError(f"Unknown generator {missing[0]!r}")
+        for gid, rate in ramp_rates.items():
+            per_hour[index[gid]] = rate if rate > 0 else np.inf
+    return per_hour * period_hours
+
+
+def _initial_output(case: CaseArrays, initial_pg: Optional[Dict[str, float]],
+                    base_mva: float) -> Optional[np.ndarray]:
+    """Initial outputs (pu) by generator position, NaN where not given"""
+    if not initial_pg:
+        return None
+    index = {gid: k for k, gid in enumerate(case.gen_id.tolist())}
+    missing = [g for g in initial_pg if g not in index]
+    if missing:
+        raise ValueError(f"Unknown generator {missing[0]!r}")
+    initial = np.full(case.n_gen, np.nan)
+    for gid, pg in initial_pg.items():
+        initial[index[gid]] = pg / base_mva
+    return initial
+
+
+class MultiPeriodModel:
+    """
+    Block-diagonal horizon model built from one assembled period.
+    Variables x = [x_0, ..., x_{T-1}] with x_t = [Pg, Curtailment, Theta] laid
+    out as in the single-period NodalModel; the constraint blocks of the
+    period are tiled with sparse Kronecker products, so each period shares
+    the network assembly. Ramp rows couple Pg of consecutive periods.
+    """
+
+    def __init__(self, period: NodalModel, demand_pu: np.ndarray, ramp_pu: np.ndarray,
+                 initial_pg_pu: Optional[np.ndarray] = None):
+        T, n_bus = demand_pu.shape
+        n_gen = period.n_gen
+        self.period = period
+        self.n_periods = T
+        self.n_vars = T * period.n_vars
+        I = sp.identity(T, format="csr")
+
+        self.c = np.tile(period.c, T)
+        self.quad = np.tile(period.quad, T)
+
+        # Balance and reference rows per period; only the demand changes
+        self.A_eq = sp.kron(I, period.A_eq, format="csr")
+        b_eq = np.tile(period.b_eq, (T, 1))
+        b_eq[:, :n_bus] = -demand_pu
+        self.b_eq = b_eq.ravel()
+
+        self.A_flow = sp.kron(I, period.A_flow, format="csr")
+        self.line_rates = np.tile(period.line_rates, T)
+        self.enforce_line_limits = period.enforce_line_limits
+
+        # Bounds: curtailment up to each period's demand
+        lower = np.tile(period.lower, (T, 1))
+        upper = np.tile(period.upper, (T, 1))
+        upper[:, n_gen:n_gen + n_bus] = np.maximum(demand_pu, 0.0)
+        if initial_pg_pu is not None:
+            # First period within one ramp of the initial output (NaN: not given)
+            known = ~np.isnan(initial_pg_pu) & np.isfinite(ramp_pu)
+            start = np.where(known, initial_pg_pu, 0.0)
+            lower[0, :n_gen] = np.where(known, np.maximum(lower[0, :n_gen], start - ramp_pu), lower[0, :n_gen])
+            upper[0, :n_gen] = np.where(known, np.minimum(upper[0, :n_gen], start + ramp_pu), upper[0, :n_gen])
+            upper[0, :n_gen] = np.maximum(upper[0, :n_gen], lower[0, :n_gen])
+        self.lower = lower.ravel()
+        self.upper = upper.ravel()
+
+        # Ramp rows: Pg[t, g] - Pg[t-1, g] for ramp-limited units
+        limited = np.flatnonzero(np.isfinite(ramp_pu))
+        t = np.repeat(np.arange(1, T), len(limited))
+        g = np.tile(limited, T - 1)
+        rows = np.arange(len(t))
+        self.A_ramp = sp.csr_matrix(
+            (np.concatenate([np.ones(len(t)), -np.ones(len(t))]),
+             (np.concatenate([rows, rows]),
+              np.concatenate([t * period.n_vars + g, (t - 1) * period.n_vars + g]))),
+            shape=(len(t), self.n_vars)
+        )
+        self.ramp_limits = ramp_pu[g]
+
+    @property
+    def n_lines(self) -> int:
+        return self.A_flow.shape[0]
+
+    def _range_rows(self):
+        """Two-sided limits |A x| <= limit as (A, limit) pairs"""
+        blocks = []
+        if self.enforce_line_limits and self.n_lines > 0:
+            blocks.append((self.A_flow, self.line_rates))
+        if self.A_ramp.shape[0] > 0:
+            blocks.append((self.A_ramp, self.ramp_limits))
+        return blocks
+
+    def lp_inequalities(self):
+        """Line and ramp limits as A_ub @ x <= b_ub (both signs of each row)"""
+        blocks = self._range_rows()
+        if not blocks:
+            return None, None
+        A = sp.vstack([M for M, _ in blocks], format="csr")
+        limits = np.concatenate([lim for _, lim in blocks])
+        return sp.vstack([A, -A], format="csr"), np.concatenate([limits, limits])
+
+    def qp_constraints(self):
+        """l <= A x <= u: balance and references, line and ramp limits, Pg and curtailment bounds"""
+        n_period = self.period.n_vars
+        n_bounded = self.period.n_gen + self.period.n_bus
+        bounded = (np.arange(self.n_periods)[:, None] * n_period + np.arange(n_bounded)[None, :]).ravel()
+        I_bounds = sp.csr_matrix(
+            (np.ones(len(bounded)), (np.arange(len(bounded)), bounded)),
+            shape=(len(bounded), self.n_vars)
+        )
+
+        blocks = [self.A_eq]
+        lower = [self.b_eq]
+        upper = [self.b_eq]
+        for M, limits in self._range_rows():
+            blocks.append(M)
+            lower.append(-limits)
+            upper.append(limits)
+        blocks.append(I_bounds)
+        lower.append(self.lower[bounded])
+        upper.append(self.upper[bounded])
+        return sp.vstack(blocks, format="csc"), np.concatenate(lower), np.concatenate(upper)
+
+    def quadratic_cost(self) -> sp.csc_matrix:
+        idx = np.flatnonzero(self.quad > 1e-9)
+        return sp.csc_matrix((self.quad[idx], (idx, idx)), shape=(self.n_vars, self.n_vars))
+
+
+def _solve_lp(model: MultiPeriodModel):
+    from scipy.optimize import linprog
+
+    A_ub, b_ub = model.lp_inequalities()
+    result = linprog(model.c, A_eq=model.A_eq, b_eq=model.b_eq, A_ub=A_ub, b_ub=b_ub,
+                     bounds=np.column_stack([model.lower, model.upper]), method="highs",
+                     options={"presolve": True})
+    if not result.success:
+        logger.warning(f"Multi-period LP solver failed: {result.message}")
+        if result.x is None:
+            raise ValueError(f"Multi-period OPF failed: {result.message}")
+    # Balance rows read B*theta - Pg - Curt = -Pd, so dCost/dPd is minus the dual
+    return result.x, -result.eqlin.marginals, "optimal" if result.success else "suboptimal"
+
+
+def _qp_settings(n_periods: int) -> dict:
+    """OSQP settings for a horizon: iteration budget scaled with its length, polished"""
+    max_iter = max(4 * OSQP_SETTINGS["max_iter"], QP_ITER_PER_PERIOD * n_periods)
+    return {**OSQP_SETTINGS, "max_iter": max_iter, "polish": True}
+
+
+def _solve_qp(model: MultiPeriodModel, network_key: str):
+    A, l, u = model.qp_constraints()
+    res, warm = solve_osqp(model.quadratic_cost(), model.c, A, l, u, network_key=network_key,
+                           settings=_qp_settings(model.n_periods))
+    if warm:
+        logger.info(f"OSQP warm start: {res.info.iter} iterations")
+    if res.info.status != "solved":
+        raise ValueError(f"Multi-period OPF failed: OSQP {res.info.status} after {res.info.iter} iterations")
+    return res.x, res.y[:model.A_eq.shape[0]], "optimal"
+
+
+def solve_multiperiod(case: Union[CaseData, CaseArrays], load_scale: Optional[List[float]] = None,
+                      bus_profiles: Optional[Dict[int, List[float]]] = None,
+                      period_hours: float = 1.0, ramp_rates: Optional[Dict[str, float]] = None,
+                      initial_pg: Optional[Dict[str, float]] = None, voll: float = 10000.0,
+                      enforce_line_limits: bool = True) -> MultiPeriodResult:
+    """
+    Solve the DC OPF over a horizon of equal periods in one model.
+
+    Demand per period comes from load_scale and/or bus_profiles (see
+    load_profiles). Consecutive outputs differ by at most the unit's ramp
+    over period_hours (see ramp_limits); initial_pg (generator ID -> MW)
+    also limits the first period's change from that output. Period costs
+    are in $/h and LMPs in $/MWh; total_cost is the cost of the horizon ($).
+    Raises ValueError when the quadratic-cost model does not converge.
+    """
+    if period_hours <= 0:
+        raise ValueError("period_hours must be positive")
+    case = as_case_arrays(case)
+    base_mva = case.base_mva if case.base_mva else 100.0
+    if case.n_bus == 0 or case.n_gen == 0 or case.n_line == 0:
+        raise ValueError("Invalid case: missing buses, generators, or lines")
+
+    net = get_network_model(case)
+    if np.any(net.gen_bus_idx < 0):
+        raise ValueError(f"Generator connected to unknown bus {int(net.gen_bus[net.gen_bus_idx < 0][0])}")
+
+    demand = load_profiles(case, net, load_scale, bus_profiles)
+    T = demand.shape[0]
+
+    gen_on = case.gen_status != 0
+    costs = case.gen_cost.copy()
+    costs[~gen_on] = 0.0
+    pmin = np.where(gen_on, case.pmin / base_mva, 0.0)
+    pmax = np.where(gen_on, case.pmax / base_mva, 0.0)
+    ramp = ramp_limits(case, period_hours, ramp_rates) / base_mva
+
+    period = build_nodal_model(
+        costs, pmin, pmax, net.gen_bus_idx, demand[0], net.B, net.from_idx, net.to_idx,
+        net.susceptances, net.line_rates, net.slack_idx, voll, base_mva, enforce_line_limits,
+        island_refs=net.island_refs
+    )
+    model = MultiPeriodModel(period, demand, ramp, _initial_output(case, initial_pg, base_mva))
+    logger.info(f"Multi-period OPF: {T} periods, {model.n_vars} variables, "
+                f"{model.A_ramp.shape[0]} ramp rows")
+
+    if np.all(costs[:, 0] == 0):
+        x, duals, status = _solve_lp(model)
+    else:
+        x, duals, status = _solve_qp(model, network_key=net.key)
+
+    # Per-period columns
+    n_gen, n_bus = case.n_gen, net.n_bus
+    x = x.reshape(T, period.n_vars)
+    pg = np.clip(x[:, :n_gen] * base_mva, pmin * base_mva, pmax * base_mva)
+    curtailment = np.clip(x[:, n_gen:n_gen + n_bus], 0.0, np.maximum(demand, 0.0)) * base_mva
+    theta = x[:, period.theta_offset:period.theta_offset + n_bus]
+    flow = np.zeros((T, case.n_line))
+    flow[:, net.active_lines] = (net.incidence @ theta.T).T * net.susceptances * base_mva
+    lmp = duals.reshape(T, -1)[:, :n_bus] / base_mva
+
+    period_cost = (polynomial_cost(np.tile(costs, (T, 1)), pg.ravel()).reshape(T, n_gen).sum(axis=1)
+                   + curtailment.sum(axis=1) * voll)
+    logger.info(f"Multi-period OPF solved: {status}, cost {period_cost.sum() * period_hours:.2f} $")
+
+    return MultiPeriodResult(
+        status=status,
+        total_cost=float(period_cost.sum() * period_hours),
+        n_periods=T,
+        period_hours=period_hours,
+        period_cost=period_cost.tolist(),
+        period_curtailment=curtailment.sum(axis=1).tolist(),
+        bus_ids=case.bus_id.tolist(),
+        gen_ids=case.gen_id.tolist(),
+        line_from=case.line_from.tolist(),
+        line_to=case.line_to.tolist(),
+        pg=pg.tolist(),
+        lmp=lmp.tolist(),
+        curtailment=curtailment.tolist(),
+        flow=flow.tolist()
+    )
@@ -0,0 +1,209 @@
+"""
+Compiled network model
+Array-backed bus/generator/branch tables and topology matrices, built once per
+case topology and cached by content hash across OPF solves
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Tuple, Union
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.models.schemas import CaseData
+from app.models.arrays import CaseArrays, as_case_arrays
+from app.solver.assembly import find_island_references
+
+# Reactance floor used when building the susceptance matrix
+MIN_REACTANCE = 0.0001
+
+# Number of compiled networks kept in memory
+NETWORK_CACHE_SIZE = 16
+
+
+def build_susceptance_matrix(n_bus: int, from_idx: np.ndarray, to_idx: np.ndarray,
+                             susceptances: np.ndarray, b_shunt: np.ndarray) -> sp.csc_matrix:
+    """Build sparse DC susceptance matrix in per-unit from branch index arrays"""
+    f = np.asarray(from_idx, dtype=np.int64)
+    t = np.asarray(to_idx, dtype=np.int64)
+    b = np.asarray(susceptances, dtype=float)
+
+    # Four entries per branch in (i,i), (j,j), (i,j), (j,i) order
+    rows = np.stack([f, t, f, t], axis=1).ravel()
+    cols = np.stack([f, t, t, f], axis=1).ravel()
+    data = np.stack([b, b, -b, -b], axis=1).ravel()
+
+    # Nodal shunts (b_shunt) on the diagonal
+    shunt_idx = np.flatnonzero(b_shunt)
+    rows = np.concatenate([rows, shunt_idx])
+    cols = np.concatenate([cols, shunt_idx])
+    data = np.concatenate([data, np.asarray(b_shunt, dtype=float)[shunt_idx]])
+
+    # Duplicates are summed
+    return sp.coo_matrix((data, (rows, cols)), shape=(n_bus, n_bus)).tocsc()
+
+
+class NetworkModel:
+    """
+    Compiled network topology.
+
+    Bus, generator and branch data are held as NumPy columns indexed by
+    position; branch endpoints are mapped to bus positions (-1 when the
+    bus does not exist). Only data that defines the topology is compiled:
+    loads, costs and generator limits are read per solve.
+    """
+
+    def __init__(self, key: str, base_mva: float, bus_ids: np.ndarray, bus_type: np.ndarray,
+                 g_shunt: np.ndarray, b_shunt: np.ndarray, v_mag: np.ndarray,
+                 gen_bus: np.ndarray, line_from: np.ndarray, line_to: np.ndarray,
+                 line_x: np.ndarray, line_rate_a: np.ndarray, line_status: np.ndarray):
+        self.key = key
+        self.base_mva = base_mva
+
+        # Bus table
+        self.bus_ids = bus_ids
+        self.bus_type = bus_type
+        self.g_shunt = g_shunt
+        self.b_shunt = b_shunt
+        self.v_mag = v_mag
+        self.n_bus = len(bus_ids)
+        self.bus_index = {int(b): i for i, b in enumerate(bus_ids)}
+        self._id_order = np.argsort(bus_ids, kind="stable")
+        self._sorted_ids = bus_ids[self._id_order]
+
+        slack = np.flatnonzero(bus_type == 3)
+        self.slack_bus = int(bus_ids[slack[0]]) if len(slack) else (int(bus_ids[0]) if self.n_bus else 1)
+        self.slack_idx = self.bus_index.get(self.slack_bus, 0)
+
+        # Generator table
+        self.gen_bus = gen_bus
+        self.gen_bus_idx = self.bus_positions(gen_bus)
+
+        # Branch table
+        self.line_from = line_from
+        self.line_to = line_to
+        self.line_x = line_x
+        self.line_rate_a = line_rate_a
+        self.line_status = line_status
+        self.line_from_idx = self.bus_positions(line_from)
+        self.line_to_idx = self.bus_positions(line_to)
+        self.line_connected = (self.line_from_idx >= 0) & (self.line_to_idx >= 0)
+        self.line_in_service = line_status != 0
+
+        # Branches that take part in the network equations
+        self.active_lines = np.flatnonzero(self.line_in_service & self.line_connected)
+        self.from_idx = self.line_from_idx[self.active_lines]
+        self.to_idx = self.line_to_idx[self.active_lines]
+        x = line_x[self.active_lines]
+        self.susceptances = 1.0 / np.where(x > 0, x, MIN_REACTANCE)
+        rate_a = line_rate_a[self.active_lines]
+        self.line_rates = np.where(rate_a > 0, rate_a / base_mva, 999.99)
+
+        # Topology matrices
+        n_active = len(self.active_lines)
+        rows = np.arange(n_active)
+        self.incidence = sp.csr_matrix(
+            (np.concatenate([np.ones(n_active), -np.ones(n_active)]),
+             (np.concatenate([rows, rows]), np.concatenate([self.from_idx, self.to_idx]))),
+            shape=(n_active, self.n_bus)
+        )
+        self.B = build_susceptance_matrix(
+            self.n_bus, self.from_idx, self.to_idx, self.susceptances, b_shunt
+        )
+        self.n_islands, self.island_labels, self.island_refs = \
+            find_island_references(self.B, self.slack_idx)
+
+    def bus_positions(self, ids) -> np.ndarray:
+        """Map bus IDs to positions in the bus table (-1 for unknown IDs)"""
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.n_bus == 0 or len(ids) == 0:
+            return np.full(len(ids), -1, dtype=np.int64)
+        order = self._id_order
+        sorted_ids = self._sorted_ids
+        # Last occurrence wins for duplicated IDs, as with a dict lookup
+        pos = np.searchsorted(sorted_ids, ids, side="right") - 1
+        found = (pos >= 0) & (sorted_ids[np.maximum(pos, 0)] == ids)
+        return np.where(found, order[np.maximum(pos, 0)], -1)
+
+    def extract_loads(self, load_bus: np.ndarray, load_pd: np.ndarray,
+                      load_qd: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Aggregate load arrays into per-unit nodal demand vectors"""
+        idx = self.bus_positions(load_bus)
+        keep = idx >= 0
+        Pd = np.bincount(idx[keep], weights=load_pd[keep] / self.base_mva, minlength=self.n_bus)
+        Qd = np.bincount(idx[keep], weights=load_qd[keep] / self.base_mva, minlength=self.n_bus)
+
+        # Nodal shunt conductance (g_shunt) acts as additional load
+        Pd = Pd + self.g_shunt
+        return Pd, Qd
+
+
+def case_tables(case: CaseArrays) -> dict:
+    """
+    The topology-defining columns of a case, copied so a cached network is
+    unaffected by later edits to the case arrays
+    """
+    columns = {
+        "bus_ids": case.bus_id,
+        "bus_type": case.bus_type,
+        "g_shunt": case.g_shunt,
+        "b_shunt": case.b_shunt,
+        "v_mag": case.v_mag,
+        "gen_bus": case.gen_bus,
+        "line_from": case.line_from,
+        "line_to": case.line_to,
+        "line_x": case.x,
+        "line_rate_a": case.rate_a,
+        "line_status": case.line_status,
+    }
+    return {name: np.array(values, copy=True) for name, values in columns.items()}
+
+
+def network_key(tables: dict, base_mva: float) -> str:
+    """Content hash of the topology tables"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.float64(base_mva).tobytes())
+    for name in sorted(tables):
+        arr = np.ascontiguousarray(tables[name])
+        h.update(name.encode())
+        h.update(str(arr.shape).encode())
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+_network_cache: "OrderedDict[str, NetworkModel]" = OrderedDict()
+_network_cache_lock = threading.Lock()
+
+
+def get_network_model(case: Union[CaseData, CaseArrays]) -> NetworkModel:
+    """
+    Return the compiled network for a case, reusing a cached model when a case
+    with identical topology has been compiled before.
+    """
+    case = as_case_arrays(case)
+    base_mva = case.base_mva if case.base_mva else 100.0
+    tables = case_tables(case)
+    key = network_key(tables, base_mva)
+
+    with _network_cache_lock:
+        net = _network_cache.get(key)
+        if net is not None:
+            _network_cache.move_to_end(key)
+            return net
+
+    net = NetworkModel(key=key, base_mva=base_mva, **tables)
+
+    with _network_cache_lock:
+        _network_cache[key] = net
+        _network_cache.move_to_end(key)
+        while len(_network_cache) > NETWORK_CACHE_SIZE:
+            _network_cache.popitem(last=False)
+    return net
+
+
+def clear_network_cache():
+    """Drop all compiled networks"""
+    with _network_cache_lock:
+        _network_cache.clear()
@@ -1,28 +1,44 @@
 """
 DC Optimal Power Flow Solver
-Pure Python implementation using scipy optimization
-Supports both LP (linprog) and QP (SLSQP) formulations
+Sparse nodal formulation: linear costs are solved as an LP with HiGHS
+(scipy linprog as fallback), quadratic costs as a QP with OSQP
+(scipy trust-constr as fallback)
 """
 
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Optional, Union
 import logging
 import scipy.sparse as sp
-from scipy.sparse.linalg import spsolve
 
-from app.models.schemas import CaseData, Bus, Generator, Line, OPFResult, \
-    GeneratorResult, BusResult, LineResult
+from app.models.schemas import CaseData, OPFResult, ColumnarOPFResult, Scenario, BatchOPFResult
+from app.models.arrays import CaseArrays, as_case_arrays
+from app.solver.assembly import NodalModel, build_nodal_model
+from app.solver.network import NetworkModel, get_network_model
+from app.solver.line_limits import LazyLineLimits, LINE_LIMIT_MODES
+from app.solver.presolve import MAX_KEPT_SHARE, NetworkReduction, protected_buses, reduce_network, \
+    remember_protected
+from app.solver.results import ResultArrays, RESULT_FORMATS, element_results, polynomial_cost
+from app.solver.sensitivity import get_sensitivity_model
+from app.solver.timing import PhaseTimer
+from app.solver.workspaces import solve_highs, solve_osqp
 
 logger = logging.getLogger(__name__)
 
 
 class DCOPSolver:
-    """DC Optimal Power Flow solver using scipy"""
+    """DC Optimal Power Flow solver on the sparse nodal formulation"""
 
     def __init__(self):
         self.base_mva = 100.0
-
-    def solve(self, case: CaseData, voll: float = 10000.0, enforce_line_limits: bool = True, remove_isolated: bool = False) -> OPFResult:
+        self._qp_solution = None
+        self._lp_basis = None
+        self.timer = PhaseTimer()
+
+    def solve(self, case: Union[CaseData, CaseArrays], voll: float = 10000.0,
+              enforce_line_limits: bool = True, remove_isolated: bool = False,
+              result_format: str = "records", line_limit_mode: str = "full",
+              lazy_constraints=None, timings: bool = False,
+              presolve: bool = False) -> Union[OPFResult, ColumnarOPFResult]:
         """
         Solve DC OPF problem
 
@@ -30,115 +46,183 @@ class DCOPSolver:
         - Power balance constraints
         - Generator capacity constraints
         - Line flow constraints via curtailment (VOLL method)
+
+        The case may be given as CaseData or in columnar form (CaseArrays).
+        result_format "columns" returns parallel arrays (ColumnarOPFResult)
+        instead of one result object per element.
+
+        line_limit_mode "lazy" generates line limits instead of adding two rows
+        per branch: the first solve has only the lines that bound the last
+        solve of the same network, then violated lines are added and the model
+        re-solved until every flow is within its rating.
+
+        lazy_constraints adds flow limits iteratively: after each solve its
+        separate(theta) returns the violated rows (over bus angles) and their
+        limits, which are appended (soft, at its penalty per pu of overload,
+        unless the penalty is None) and the model re-solved, warm started on
+        the QP path, until none are returned or max_rounds solves were made.
+        The number of solves is reported as iterations.
+
+        presolve solves an exactly reduced network (app.solver.presolve:
+        parallel branches merged, radial and zero-injection pass-through
+        buses eliminated) and maps angles, curtailment and LMPs back to every
+        bus. It applies with line_limit_mode "full" and no lazy_constraints,
+        when the reduction keeps at most MAX_KEPT_SHARE of the buses. If a
+        branch next to an eliminated pass-through bus binds, that bus's LMP
+        is not recoverable: the full model is solved once more, started from
+        the presolved solution (counted as presolve_resolves, not in
+        iterations), and the bus is kept in later presolves of the network.
+
+        Wall time per phase, solver iterations and model size are kept in
+        self.timer; timings=True also returns them with the result.
         """
+        self.timer = timer = PhaseTimer()
         try:
+            if result_format not in RESULT_FORMATS:
+                raise ValueError(f"Unknown result format {result_format!r}, expected one of {RESULT_FORMATS}")
+            if line_limit_mode not in LINE_LIMIT_MODES:
+                raise ValueError(f"Unknown line limit mode {line_limit_mode!r}, expected one of {LINE_LIMIT_MODES}")
+            case = as_case_arrays(case)
             if remove_isolated:
                 case = self._get_slack_connected_subset(case)
             self.base_mva = case.base_mva if case.base_mva else 100.0
 
-            # Extract system data
-            buses = case.buses
-            generators = case.generators
-            lines = case.lines
-            loads = case.loads if case.loads else []
-
-            if not buses or not generators or not lines:
+            if case.n_bus == 0 or case.n_gen == 0 or case.n_line == 0:
                 raise ValueError("Invalid case: missing buses, generators, or lines")
             
-            n_buses = len(buses)
-            n_real_gen = len(generators)
+            # Compiled topology, shared by every solve on the same network
+            net = get_network_model(case)
+
+            n_buses = net.n_bus
+            n_real_gen = case.n_gen
+
+            missing = net.gen_bus_idx < 0
+            if np.any(missing):
+                raise ValueError(f"Generator connected to unknown bus {int(net.gen_bus[missing][0])}")
 
             # Get slack bus
-            slack_bus = self._find_slack_bus(buses)
+            slack_bus = net.slack_bus
+            slack_idx = net.slack_idx
 
-            # Extract load demands in per-unit
-            Pd_pu, Qd_pu = self._extract_loads(buses, loads)
+            # Extract load demands in per-unit (g_shunt is added as load)
+            Pd_pu, Qd_pu = net.extract_loads(case.load_bus, case.load_pd, case.load_qd)
 
             # Total load in per-unit
             total_load_pu = np.sum(Pd_pu)
 
-            # Get real generator info in per-unit
-            real_gen_costs = []
-            real_gen_pmin_list = []
-            real_gen_pmax_list = []
-            
-            for g in generators:
-                # Defensive check: ensure status is 1 or 0
-                g_status = int(getattr(g, 'status', 1))
-                if g_status == 0:
-                    real_gen_costs.append([0.0, 0.0, 0.0])
-                    real_gen_pmin_list.append(0.0)
-                    real_gen_pmax_list.append(0.0)
-                else:
-                    real_gen_costs.append(g.cost)
-                    real_gen_pmin_list.append(g.pmin / self.base_mva)
-                    real_gen_pmax_list.append(g.pmax / self.base_mva)
-            
-            real_gen_pmin = np.array(real_gen_pmin_list)
-            real_gen_pmax = np.array(real_gen_pmax_list)
-
-            # Map generator indices to bus indices
-            bus_ids = {bus.id: i for i, bus in enumerate(buses)}
-            real_gen_bus_indices = [bus_ids[g.bus] for g in generators]
-            slack_idx = bus_ids.get(slack_bus, 0)
+            # Get real generator info in per-unit (out-of-service units fixed at zero)
+            gen_on = case.gen_status != 0
+            real_gen_costs = case.gen_cost.copy()
+            real_gen_costs[~gen_on] = 0.0
+            real_gen_pmin = np.where(gen_on, case.pmin / self.base_mva, 0.0)
+            real_gen_pmax = np.where(gen_on, case.pmax / self.base_mva, 0.0)
+            real_gen_bus_indices = net.gen_bus_idx
 
             # Detect if problem is LP (all quadratic cost coefficients are zero)
-            is_linear = all(cost[0] == 0 for cost in real_gen_costs)
+            is_linear = bool(np.all(real_gen_costs[:, 0] == 0))
 
-            # Use Sparse Nodal Formulation for large cases (> 50 buses) or if requested
-            # Nodal formulation avoids dense PTDF matrix
-            B = None
-            B_sparse = None
-            using_sparse = False
             # Always use Nodal Formulation (Sparse) for all cases to ensure island-wise balance
+            # Nodal formulation avoids dense PTDF matrix
             logger.info(f"Using Nodal Formulation for case ({n_buses} buses)")
-            B_sparse = self._build_sparse_susceptance_matrix(buses, lines)
-            using_sparse = True
-            
-            # Line parameters for flow constraints
-            line_indices = []
-            line_susceptances = []
-            line_rates = []
-            active_line_count = 0
-            for line in lines:
-                l_status = int(getattr(line, 'status', 1))
-                if l_status == 0:
-                    continue
-                active_line_count += 1
-                if line.from_bus in bus_ids and line.to_bus in bus_ids:
-                    idx_from = bus_ids[line.from_bus]
-                    idx_to = bus_ids[line.to_bus]
-                    x = line.x if line.x > 0 else 0.0001
-                    b = 1.0 / x
-                    rate = line.rate_a / self.base_mva if line.rate_a > 0 else 999.99
-                    line_indices.append((idx_from, idx_to))
-                    line_susceptances.append(b)
-                    line_rates.append(rate)
-
-            logger.info(f"OPF Solver config: {active_line_count}/{len(lines)} lines active, "
-                       f"{len([c for c in real_gen_pmax_list if c > 0])}/{len(generators)} gens active")
-            logger.info(f"Enforce limits: {enforce_line_limits}, VOLL: {voll}")
+
+            logger.info(f"OPF Solver config: {int(np.count_nonzero(net.line_in_service))}/{case.n_line} lines active, "
+                       f"{int(np.count_nonzero(real_gen_pmax > 0))}/{n_real_gen} gens active")
+            logger.info(f"Enforce limits: {enforce_line_limits} ({line_limit_mode}), VOLL: {voll}")
+
+            lazy_lines = None
+            if enforce_line_limits and line_limit_mode == "lazy":
+                lazy_lines = LazyLineLimits(net)
+            timer.lap("prepare")
+
+            reduction = None
+            if presolve and lazy_lines is None and lazy_constraints is None:
+                reduction = self._reduce(net, Pd_pu, real_gen_bus_indices, real_gen_pmin, real_gen_pmax,
+                                         enforce_line_limits, protected_buses(net.key))
+                timer.lap("presolve")
+            model = self._assemble(net, reduction, real_gen_bus_indices, Pd_pu, real_gen_costs, real_gen_pmin,
+                                   real_gen_pmax, voll, enforce_line_limits and lazy_lines is None)
+            if lazy_lines is not None:
+                model.add_cuts(*lazy_lines.initial())
+            timer.lap("assembly")
 
             if is_linear:
                 Pg_opt_pu, fict_gen_pg, status, lmp, theta_opt = self._solve_nodal_lp(
-                        n_real_gen, n_buses, real_gen_costs, real_gen_pmin, real_gen_pmax,
-                        real_gen_bus_indices, Pd_pu, B_sparse, line_indices, 
-                        line_susceptances, line_rates, slack_bus, bus_ids, voll, enforce_line_limits
+                    model, network_key=net.key
                 )
             else:
                 Pg_opt_pu, fict_gen_pg, status, lmp, theta_opt = self._solve_nodal_qp(
-                        n_real_gen, n_buses, real_gen_costs, real_gen_pmin, real_gen_pmax,
-                        real_gen_bus_indices, Pd_pu, B_sparse, line_indices, 
-                        line_susceptances, line_rates, slack_bus, bus_ids, voll, enforce_line_limits
+                    model, network_key=net.key
                 )
-            
+            timer.lap("solve")
+
+            # Cutting-plane rounds: add the violated limits and re-solve
+            separators = [sep for sep in (lazy_lines, lazy_constraints) if sep is not None]
+            max_rounds = min((sep.max_rounds for sep in separators), default=1)
+            iterations = 1
+            while separators:
+                found = [(sep, *sep.separate(theta_opt)) for sep in separators]
+                timer.lap("separation")
+                n_found = sum(rows.shape[0] for _, rows, _ in found)
+                if n_found == 0:
+                    break
+                if iterations >= max_rounds:
+                    logger.warning(f"Stopped after {iterations} solves with {n_found} flow limits violated")
+                    break
+                for sep, rows, limits in found:
+                    if rows.shape[0] > 0:
+                        model.add_cuts(rows, limits, penalty=sep.penalty)
+                logger.info(f"Round {iterations}: added {n_found} flow limits ({model.n_cuts} total)")
+                timer.lap("assembly")
+                if is_linear:
+                    Pg_opt_pu, fict_gen_pg, status, lmp, theta_opt = self._solve_nodal_lp(
+                        model, warm_start=self._lp_basis
+                    )
+                else:
+                    Pg_opt_pu, fict_gen_pg, status, lmp, theta_opt = self._solve_nodal_qp(
+                        model, warm_start=self._qp_solution
+                    )
+                timer.lap("solve")
+                iterations += 1
+            if lazy_lines is not None:
+                lazy_lines.remember(theta_opt)
+
+            # Presolved: map back to every bus. If a branch next to an
+            # eliminated pass-through bus binds, that bus is remembered for the
+            # next presolve and the full model solved once, started from the
+            # mapped-back solution (the same optimum, with every LMP)
+            presolve_resolves = 0
+            if reduction is not None:
+                Pg_opt_pu, theta_opt = self._expand_reduction(reduction, Pg_opt_pu, theta_opt, Pd_pu,
+                                                              real_gen_bus_indices)
+                binding = reduction.passthrough_binding(theta_opt, enforce_line_limits)
+                remember_protected(net.key, np.union1d(reduction.protected, binding))
+                if len(binding) == 0:
+                    fict_gen_pg = Pg_opt_pu[n_real_gen:] * self.base_mva
+                    lmp = reduction.expand_prices(lmp)
+                else:
+                    logger.info(f"Presolve: {len(binding)} pass-through buses next to binding branches, "
+                                f"solving the full model")
+                    model = self._assemble(net, None, real_gen_bus_indices, Pd_pu, real_gen_costs,
+                                           real_gen_pmin, real_gen_pmax, voll, enforce_line_limits)
+                    timer.lap("assembly")
+                    x = np.zeros(len(model.c))
+                    x[:n_real_gen + n_buses] = Pg_opt_pu
+                    x[model.theta_offset:model.theta_offset + n_buses] = theta_opt
+                    if is_linear:
+                        Pg_opt_pu, fict_gen_pg, status, lmp, theta_opt = self._solve_nodal_lp(model, warm_start=x)
+                    else:
+                        Pg_opt_pu, fict_gen_pg, status, lmp, theta_opt = self._solve_nodal_qp(
+                            model, warm_start=(x, np.zeros(0))
+                        )
+                    timer.lap("solve")
+                    presolve_resolves = 1
+
             # Use theta from nodal formulation
             theta = theta_opt
 
             # Compute raw net injections (before clamping) for theta consistency check
-            Pg_full_pu_raw = np.zeros(n_buses)
-            for idx, gen_idx in enumerate(real_gen_bus_indices):
-                Pg_full_pu_raw[gen_idx] += Pg_opt_pu[idx]
+            Pg_full_pu_raw = np.bincount(real_gen_bus_indices, weights=Pg_opt_pu[:n_real_gen],
+                                         minlength=n_buses)
 
             curtailment_pu_raw = Pg_opt_pu[n_real_gen:] if len(Pg_opt_pu) > n_real_gen else np.zeros(n_buses)
             Pd_effective_raw = Pd_pu - curtailment_pu_raw
@@ -170,10 +254,8 @@ class DCOPSolver:
             fict_gen_mw = curtailment_pu * self.base_mva
 
             # Update Pg_full_pu with clamped values for power flow calc
-            Pg_full_pu = np.zeros(n_buses)
-            for i, pg_mw in enumerate(real_gen_pg_mw):
-                bus_idx = real_gen_bus_indices[i]
-                Pg_full_pu[bus_idx] += pg_mw / self.base_mva
+            Pg_full_pu = np.bincount(real_gen_bus_indices, weights=real_gen_pg_mw / self.base_mva,
+                                     minlength=n_buses)
 
             Pd_effective_pu = Pd_pu - curtailment_pu
             Pnet_clean = Pg_full_pu - Pd_effective_pu
@@ -182,37 +264,27 @@ class DCOPSolver:
             # This keeps flows and balances consistent with the displayed Pg/Pd.
             theta_recalc_eps = 1e-6
             if np.max(np.abs(Pnet_clean - Pnet_raw)) > theta_recalc_eps:
-                if using_sparse:
-                    theta = self._solve_theta_sparse(B_sparse, Pnet_clean, slack_idx)
-                else:
-                    theta = self._solve_theta(B, Pnet_clean, slack_idx)
+                timer.lap("results")
+                theta = self._solve_theta_sparse(net, Pnet_clean)
+                timer.lap("theta")
 
             # Normalize theta so slack bus is strictly 0, and bound it to [-pi, pi]
             theta = theta - theta[slack_idx]
             # Wrap to [-pi, pi]
             theta = (theta + np.pi) % (2 * np.pi) - np.pi
 
-            # Calculate line flows (with cleaned theta if we had it, but using solver theta)
-            line_flows = self._calculate_line_flows(lines, buses, theta, lmp)
-
             # Curtailment in MW
             total_curtailment_mw = float(np.sum(fict_gen_mw))
 
-            # LMPs were computed from optimization duals by the solver
-            marginal_costs = lmp
-
-            # Calculate bus results (including curtailment)
-            bus_results = self._calculate_bus_results(
-                buses, theta, Pg_full_pu, Pd_pu, marginal_costs, fict_gen_mw
+            # Generator, bus and line results in bulk. LMPs were computed from
+            # optimization duals by the solver.
+            columns = element_results(
+                case, net, theta, real_gen_pg_mw, Pg_full_pu, Pd_pu, lmp, fict_gen_mw, self.base_mva
             )
 
-            # Calculate generator results (real generators only)
-            gen_results = self._calculate_gen_results(generators, real_gen_pg_mw)
-
             # Calculate total cost (real generators + curtailment penalty)
             # Use CLEANED values for consistent reporting
-            gen_cost = sum(cost[0] * real_gen_pg_mw[i]**2 + cost[1] * real_gen_pg_mw[i] + cost[2]
-                           for i, cost in enumerate(real_gen_costs))
+            gen_cost = float(np.sum(polynomial_cost(real_gen_costs, real_gen_pg_mw)))
             
             curtailment_cost = total_curtailment_mw * voll
             total_cost_with_curtailment = gen_cost + curtailment_cost
@@ -226,562 +298,125 @@ class DCOPSolver:
 
             logger.info(f"DC OPF solved. Cost: {gen_cost:.2f} $/h, Curtailment: {total_curtailment_mw:.2f} MW")
 
-            return OPFResult(
+            result = ResultArrays(
                 status=status,
                 total_cost=total_cost_with_curtailment,
-                generator_results=gen_results,
-                bus_results=bus_results,
-                line_results=line_flows,
                 objective_value=gen_cost, # Return generation cost as objective value
                 total_curtailment=total_curtailment_mw,
-                iterations=1
-            )
+                iterations=iterations,
+                presolve_resolves=presolve_resolves,
+                **columns
+            ).build(result_format)
+            timer.lap("results")
+            if timings:
+                result.timings = timer.summary()
+            return result
 
         except Exception as e:
             logger.error(f"Error solving DC OPF: {str(e)}")
             raise
 
-    # ========== LP SOLVER (linear costs) ==========
-
-    def _solve_lp(self, n_real_gen, n_buses, real_gen_costs, real_gen_pmin,
-                  real_gen_pmax, real_gen_bus_indices, Pd_pu, total_load_pu,
-                  PTDF, line_rates, voll):
+    def solve_many(self, case: CaseData, scenarios: List[Scenario], voll: float = 10000.0,
+                   enforce_line_limits: bool = True, remove_isolated: bool = False,
+                   max_workers: int = None, progress=None) -> BatchOPFResult:
         """
-        Solve DC OPF as Linear Program using scipy.optimize.linprog.
-        Used when all quadratic cost coefficients are zero.
-
-        Decision variables: x = [Pg_real (n_real_gen), Pg_curtail (n_buses)]
+        Solve a batch of load/cost/outage scenarios of one base case.
+        Scenarios are distributed across a process pool; results are returned
+        in columnar form aligned with the base case elements.
         """
-        from scipy.optimize import linprog
-
-        n_vars = n_real_gen + n_buses
-        n_lines = len(PTDF)
-
-        # === Objective: minimize c^T x ===
-        # Cost in MW: cost[1] * Pg_mw = cost[1] * Pg_pu * base_mva
-        c = np.zeros(n_vars)
-        for i, cost in enumerate(real_gen_costs):
-            c[i] = cost[1] * self.base_mva  # linear cost coefficient
-        for i in range(n_buses):
-            c[n_real_gen + i] = voll * self.base_mva  # VOLL penalty
-
-        # === Equality constraint: power balance ===
-        # sum(Pg_real) + sum(Pg_curtail) = total_load_pu
-        # (curtailment acts as negative load, so gen + curtail = load)
-        A_eq = np.zeros((1, n_vars))
-        A_eq[0, :n_real_gen] = 1.0
-        # Power balance: real_gen - (total_load - curtailment) = 0
-        # => real_gen + curtailment = total_load
-        # But curtailment reduces load, not adds generation. Correct formulation:
-        # sum(Pg_real) = total_load - sum(curtailment)
-        # => sum(Pg_real) + sum(curtailment) = total_load (if curtailment is subtracted from load)
-        # Wait — curtailment here IS fictitious generation that offsets load at each bus
-        # So: sum(Pg_real) = total_load - sum(curtailment)
-        # Rearranged: sum(Pg_real) + sum(curtailment) = total_load
-        # BUT the curtailment variable represents load reduction, treated as virtual gen
-        # Actually in the original formulation:
-        # real_pg - (total_load - curtail) = 0  =>  real_pg + curtail = total_load
-        A_eq[0, n_real_gen:] = 1.0
-        b_eq = np.array([total_load_pu])
-
-        # === Inequality constraints: line flow limits ===
-        # Build the injection-to-flow mapping
-        # For each gen i at bus b: Pnet[b] += Pg[i]
-        # For each curtail j at bus j: Pnet[j] -= (-curtail[j]) i.e. Pnet[j] += curtail[j]
-        #   Actually curtail reduces demand: Pd_eff = Pd - curtail
-        #   Pnet = Pg_full - Pd_eff = Pg_full - Pd + curtail
-        # Flow = PTDF @ Pnet = PTDF @ (Pg_full - Pd + curtail)
-        # Since Pd is constant, flow = PTDF @ Pg_full + PTDF @ curtail - PTDF @ Pd
-        # We need |flow| <= line_rates
-        # => PTDF @ (Pg_mapping @ x) + PTDF @ curtail_mapping @ x <= line_rates + PTDF @ Pd
-        # AND -(PTDF @ (Pg_mapping @ x) + PTDF @ curtail_mapping @ x) <= line_rates - (- PTDF @ Pd)
-
-        # Build gen-to-bus mapping matrix: M_gen (n_buses x n_real_gen)
-        M_gen = np.zeros((n_buses, n_real_gen))
-        for i, bus_idx in enumerate(real_gen_bus_indices):
-            M_gen[bus_idx, i] += 1.0
-
-        # Curtailment mapping: identity for bus positions
-        M_curt = np.eye(n_buses)
-
-        # Combined injection matrix: maps x -> Pnet (excluding constant Pd term)
-        # Pnet = M_gen @ Pg_real + M_curt @ curtail - Pd
-        # flow = PTDF @ Pnet = PTDF @ M_gen @ Pg_real + PTDF @ M_curt @ curtail - PTDF @ Pd
-        H_gen = PTDF @ M_gen    # (n_lines x n_real_gen)
-        H_curt = PTDF @ M_curt  # (n_lines x n_buses)
-        H = np.hstack([H_gen, H_curt])  # (n_lines x n_vars)
-        d = PTDF @ Pd_pu  # constant term from load
-
-        # Constraints: -line_rates <= H @ x - d <= line_rates
-        # => H @ x <= line_rates + d   AND  -H @ x <= line_rates - d
-        # Rewrite as A_ub @ x <= b_ub
-        A_ub = np.vstack([H, -H])
-        b_ub = np.concatenate([line_rates + d, line_rates - d])
+        from app.solver.scenarios import solve_scenarios
 
-        # === Bounds ===
-        bounds = []
-        for i in range(n_real_gen):
-            bounds.append((real_gen_pmin[i], real_gen_pmax[i]))
-        for i in range(n_buses):
-            bounds.append((0.0, max(0.0, Pd_pu[i])))  # can't curtail more than load
-
-        # === Solve ===
-        result = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
-                         bounds=bounds, method='highs',
-                         options={'maxiter': 10000, 'presolve': True})
-
-        if result.success:
-            status = "optimal"
-        else:
-            logger.warning(f"LP solver status: {result.message}")
-            status = "suboptimal"
-
-        Pg_opt_pu = result.x
-        fict_gen_pg = result.x[n_real_gen:] * self.base_mva
-
-        # === LMP from Lagrange multipliers ===
-        bmva = self.base_mva
-        n_lines = len(line_rates)
-        lmp = np.zeros(n_buses)
-
-        y_eq = result.eqlin.marginals[0]  # dual of power balance
-        y_ub = result.ineqlin.marginals    # duals of line limits (non-positive)
-        y_pos = y_ub[:n_lines]   # H @ x <= rate + d
-        y_neg = y_ub[n_lines:]   # -H @ x <= rate - d
-
-        # result.eqlin.marginals[0] is typically positive for sum(Pg) = Pd
-        # but ineqlin.marginals (y_ub) are non-positive for Ax <= b.
-        # Congestion Rent = (LMP_j - LMP_i) * Flow_ij. 
-        # lambda_i = y_eq - sum(mu_k * PTDF_ki) where mu are duals of Hx <= b_ub.
-        # Since mu (y_ub) are non-positive, we subtract them (or add their abs).
-        for i in range(n_buses):
-            congestion = np.sum((y_pos - y_neg) * PTDF[:, i])
-            # y_eq is around VOLL * BMVA (positive)
-            # y_pos/y_neg are non-positive. 
-            # We want LMP to INCREASE if a line is congested (mu < 0).
-            # So we subtract congestion if congestion is negative.
-            lmp[i] = (y_eq - congestion) / bmva
-
-        return Pg_opt_pu, fict_gen_pg, status, lmp
-
-    def _solve_ed_lp(self, n_real_gen, n_buses, real_gen_costs, real_gen_pmin,
-                     real_gen_pmax, total_load_pu):
-        """Simple economic dispatch as LP (no line limits)"""
-        from scipy.optimize import linprog
-
-        # Objective: minimize sum(cost[1] * Pg_pu * base_mva)
-        c = np.array([cost[1] * self.base_mva for cost in real_gen_costs])
-
-        # Equality: sum(Pg) = total_load
-        A_eq = np.ones((1, n_real_gen))
-        b_eq = np.array([total_load_pu])
-
-        bounds = list(zip(real_gen_pmin, real_gen_pmax))
-
-        result = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=bounds,
-                         method='highs')
-
-        if result.success:
-            status = "optimal"
-        else:
-            logger.warning(f"ED LP solver status: {result.message}")
-            status = "suboptimal"
-
-        Pg_opt_pu = np.zeros(n_real_gen + n_buses)
-        Pg_opt_pu[:n_real_gen] = result.x
-        fict_gen_pg = np.zeros(n_buses)
-
-        # LMP: uniform system lambda (no congestion)
-        bmva = self.base_mva
-        y_eq = result.eqlin.marginals[0]
-        lmp = np.full(n_buses, y_eq / bmva)
-
-        return Pg_opt_pu, fict_gen_pg, status, lmp
-
-    # ========== QP SOLVER (quadratic costs) ==========
-
-    def _solve_qp(self, n_real_gen, n_buses, real_gen_costs, real_gen_pmin,
-                  real_gen_pmax, real_gen_bus_indices, Pd_pu, total_load_pu,
-                  PTDF, line_rates, voll):
-        """
-        Solve DC OPF with quadratic costs using trust-constr (interior-point).
-        Uses matrix-based constraint specification for robust convergence.
-        """
-        from scipy.optimize import minimize, LinearConstraint, Bounds
-
-        n_lines = len(PTDF)
-        n_vars = n_real_gen + n_buses
-
-        # Create fictitious generators for curtailment with VOLL cost
-        fict_costs = [[0, voll, 0] for _ in range(n_buses)]
-        fict_min = np.zeros(n_buses)
-        fict_max = Pd_pu.copy()
-
-        all_costs = real_gen_costs + fict_costs
-        all_min = np.concatenate([real_gen_pmin, fict_min])
-        all_max = np.concatenate([real_gen_pmax, fict_max])
-
-        # Pre-compute gen-to-bus mapping for vectorized operations
-        M_gen = np.zeros((n_buses, n_real_gen))
-        for i, bus_idx in enumerate(real_gen_bus_indices):
-            M_gen[bus_idx, i] += 1.0
-        M_curt = np.eye(n_buses)
-
-        # H maps decision vars to flows: flow = H @ x - d
-        H_gen = PTDF @ M_gen
-        H_curt = PTDF @ M_curt
-        H = np.hstack([H_gen, H_curt])
-        d = PTDF @ Pd_pu
-
-        # Cost coefficients as arrays for vectorized computation
-        a_coeffs = np.array([c[0] for c in all_costs])
-        b_coeffs = np.array([c[1] for c in all_costs])
-        c_coeffs = np.array([c[2] for c in all_costs])
-        bmva = self.base_mva
-
-        def objective(x):
-            Pg_mw = x * bmva
-            return np.sum(a_coeffs * Pg_mw**2 + b_coeffs * Pg_mw + c_coeffs)
-
-        def objective_jac(x):
-            Pg_mw = x * bmva
-            return (2 * a_coeffs * Pg_mw * bmva + b_coeffs * bmva)
-
-        def objective_hess(x):
-            return np.diag(2 * a_coeffs * bmva**2)
-
-        # === Constraints using LinearConstraint objects ===
-
-        # Power balance: sum(x) = total_load_pu
-        A_eq = np.ones((1, n_vars))
-        power_balance = LinearConstraint(A_eq, total_load_pu, total_load_pu)
-
-        # Line flow limits: -line_rates <= H @ x - d <= line_rates
-        # => -line_rates + d <= H @ x <= line_rates + d
-        line_limits = LinearConstraint(H, -line_rates + d, line_rates + d)
-
-        # Variable bounds
-        bounds = Bounds(all_min, all_max)
-
-        # Initial guess: economic dispatch ordering
-        x0 = np.zeros(n_vars)
-        x0[:n_real_gen] = self._economic_dispatch_init(
-            real_gen_costs, real_gen_pmin, real_gen_pmax, total_load_pu
-        )
-
-        result = minimize(
-            objective,
-            x0,
-            jac=objective_jac,
-            hess=objective_hess,
-            method='trust-constr',
-            bounds=bounds,
-            constraints=[power_balance, line_limits],
-            options={'maxiter': 5000, 'gtol': 1e-8}
+        return solve_scenarios(
+            case, scenarios, voll=voll, enforce_line_limits=enforce_line_limits,
+            remove_isolated=remove_isolated, max_workers=max_workers, progress=progress
         )
 
-        Pg_opt_pu = result.x
-        fict_gen_pg = result.x[n_real_gen:] * self.base_mva
-        status = "optimal" if result.success else "suboptimal"
-
-        # Log solver info
-        flows_final = H @ result.x - d
-        final_viol = np.max(np.abs(flows_final) - line_rates)
-        logger.info(f"QP solver: {result.message}, max violation: {final_viol*100:.4f}%")
-
-        # === LMP from trust-constr Lagrange multipliers ===
-        bmva = self.base_mva
-        n_lines = len(line_rates)
-        lmp = np.zeros(n_buses)
-
-        # result.v[0] = dual of power balance, result.v[1] = duals of line limits
-        # For trust-constr, eq duals are negative of marginal costs
-        v_eq = -result.v[0][0]   # Flip sign for positive system lambda
-        v_line = -result.v[1]    # Flip sign for line congestion duals
-        
-        for i in range(n_buses):
-            congestion = np.sum(v_line * PTDF[:, i])
-            lmp[i] = (v_eq + congestion) / bmva
-
-        return Pg_opt_pu, fict_gen_pg, status, lmp
-
-    def _solve_ed_qp(self, n_real_gen, n_buses, generators, real_gen_costs,
-                     real_gen_pmin, real_gen_pmax, total_load_pu):
-        """Simple economic dispatch with quadratic costs (no line limits)"""
-        from scipy.optimize import minimize
-
-        def objective(Pg_pu):
-            Pg_mw = Pg_pu * self.base_mva
-            return sum(cost[0] * Pg_mw[i]**2 + cost[1] * Pg_mw[i] + cost[2]
-                      for i, cost in enumerate(real_gen_costs))
-
-        def power_balance(Pg_pu):
-            return np.sum(Pg_pu) - total_load_pu
+    # ========== NODAL SOLVER (Sparse) ==========
 
-        # Better initial guess
-        Pg_init = self._economic_dispatch_init(
-            real_gen_costs, real_gen_pmin, real_gen_pmax, total_load_pu
+    def _assemble(self, net: NetworkModel, reduction: Optional[NetworkReduction], gen_bus_idx: np.ndarray,
+                  Pd_pu: np.ndarray, gen_costs: np.ndarray, gen_pmin: np.ndarray, gen_pmax: np.ndarray,
+                  voll: float, enforce_line_limits: bool) -> NodalModel:
+        """Nodal model of the network, or of its presolved reduction (a NetworkReduction)"""
+        network = net
+        if reduction is not None:
+            network = reduction
+            gen_bus_idx = reduction.gen_bus_idx(gen_bus_idx)
+            Pd_pu = reduction.loads(Pd_pu)
+        return build_nodal_model(
+            gen_costs, gen_pmin, gen_pmax, gen_bus_idx, Pd_pu, network.B, network.from_idx,
+            network.to_idx, network.susceptances, network.line_rates, network.slack_idx, voll,
+            self.base_mva, enforce_line_limits, island_refs=network.island_refs
         )
 
-        result = minimize(
-            objective,
-            Pg_init,
-            method='SLSQP',
-            bounds=list(zip(real_gen_pmin, real_gen_pmax)),
-            constraints=[{'type': 'eq', 'fun': power_balance}],
-            options={'maxiter': 1000, 'ftol': 1e-8}
-        )
-
-        Pg_opt_pu = np.zeros(n_real_gen + n_buses)
-        Pg_opt_pu[:n_real_gen] = result.x
-        fict_gen_pg = np.zeros(n_buses)
-        status = "optimal" if result.success else "suboptimal"
-
-        # LMP: uniform system lambda from marginal generator
-        # At optimum, the marginal gen satisfies: 2*a*Pg_mw + b = lambda
-        bmva = self.base_mva
-        # Find the marginal generator (interior, not at bounds)
-        system_lambda = 0.0
-        for i in range(n_real_gen):
-            pg_pu = result.x[i]
-            a, b_coeff = real_gen_costs[i][0], real_gen_costs[i][1]
-            pg_mw = pg_pu * bmva
-            # Check if generator is interior (not hard against bounds)
-            if pg_pu > real_gen_pmin[i] + 1e-6 and pg_pu < real_gen_pmax[i] - 1e-6:
-                system_lambda = 2 * a * pg_mw + b_coeff
-                break
-        else:
-            # All at bounds, derive lambda from active bound marginal costs (KKT range)
-            tol = 1e-6
-            active_lower = []
-            active_upper = []
-            for i in range(n_real_gen):
-                pg_pu = result.x[i]
-                a, b_coeff = real_gen_costs[i][0], real_gen_costs[i][1]
-                pg_mw = pg_pu * bmva
-                mc = 2 * a * pg_mw + b_coeff
-                if pg_pu <= real_gen_pmin[i] + tol:
-                    active_lower.append(mc)
-                if pg_pu >= real_gen_pmax[i] - tol:
-                    active_upper.append(mc)
-
-            lambda_lower = max(active_upper) if active_upper else None
-            lambda_upper = min(active_lower) if active_lower else None
-
-            if lambda_lower is not None and lambda_upper is not None:
-                if lambda_lower > lambda_upper:
-                    logger.warning("LMP bounds inverted (lambda_lower > lambda_upper). Using average.")
-                system_lambda = 0.5 * (lambda_lower + lambda_upper)
-            elif lambda_lower is not None:
-                system_lambda = lambda_lower
-            elif lambda_upper is not None:
-                system_lambda = lambda_upper
-            else:
-                logger.warning("No active bounds detected for LMP fallback; defaulting to 0.0")
-                system_lambda = 0.0
-
-        lmp = np.full(n_buses, system_lambda)
-
-        return Pg_opt_pu, fict_gen_pg, status, lmp
-
-    # ========== NODAL SOLVER (Sparse) ==========
-
-    def _build_sparse_susceptance_matrix(self, buses: List[Bus], lines: List[Line]) -> sp.csc_matrix:
-        """Build Sparse DC susceptance matrix in per-unit"""
-        n = len(buses)
-        bus_ids = {bus.id: i for i, bus in enumerate(buses)}
-        
-        # Use simple coordinate format for construction using lists
-        row_ind = []
-        col_ind = []
-        data = []
-
-        for line in lines:
-            if getattr(line, 'status', 1) == 0:
-                continue
-            if line.from_bus in bus_ids and line.to_bus in bus_ids:
-                i = bus_ids[line.from_bus]
-                j = bus_ids[line.to_bus]
-                x = line.x if line.x > 0 else 0.0001
-                b_ij = 1.0 / x
-                
-                row_ind.extend([i, j, i, j])
-                col_ind.extend([i, j, j, i])
-                data.extend([b_ij, b_ij, -b_ij, -b_ij])
-
-        # Add nodal shunts (b_shunt) to the diagonal
-        for i, bus in enumerate(buses):
-            b_sh = getattr(bus, 'b_shunt', 0.0)
-            if b_sh != 0:
-                row_ind.append(i)
-                col_ind.append(i)
-                data.append(b_sh)
-
-        # Create the matrix summing duplicates
-        B = sp.coo_matrix((data, (row_ind, col_ind)), shape=(n, n)).tocsc()
-        return B
-
-    def _solve_nodal_lp(self, n_real_gen, n_buses, real_gen_costs, real_gen_pmin,
-                        real_gen_pmax, real_gen_bus_indices, Pd_pu, B_sparse,
-                        line_indices, line_susceptances, line_rates, slack_bus, 
-                        bus_ids, voll, enforce_line_limits):
+    def _reduce(self, net: NetworkModel, Pd_pu: np.ndarray, gen_bus_idx: np.ndarray, gen_pmin: np.ndarray,
+                gen_pmax: np.ndarray, enforce_line_limits: bool, keep: np.ndarray) -> Optional[NetworkReduction]:
+        """Presolved network, or None if it would not be much smaller (MAX_KEPT_SHARE of the buses)"""
+        reduction = reduce_network(net, Pd_pu, gen_bus_idx, gen_pmin, gen_pmax, enforce_line_limits, keep)
+        if reduction.n_bus > MAX_KEPT_SHARE * net.n_bus:
+            logger.info(f"Presolve: {reduction.n_bus}/{net.n_bus} buses kept, solving the full model")
+            remember_protected(net.key, reduction.protected)
+            return None
+        return reduction
+
+    def _expand_reduction(self, reduction: NetworkReduction, Pg_opt_pu: np.ndarray, theta_opt: np.ndarray,
+                          Pd_pu: np.ndarray, gen_bus_idx: np.ndarray):
+        """Pg and curtailment of every bus, and full-network angles of that dispatch"""
+        n_gen = len(gen_bus_idx)
+        curtailment = reduction.expand_curtailment(Pg_opt_pu[n_gen:], Pd_pu)
+        injections = np.bincount(gen_bus_idx, weights=Pg_opt_pu[:n_gen], minlength=len(Pd_pu))
+        theta = reduction.expand_angles(theta_opt, injections - Pd_pu + curtailment)
+        return np.concatenate([Pg_opt_pu[:n_gen], curtailment]), theta
+
+    def _solve_nodal_lp(self, model: NodalModel, network_key: str = None, warm_start=None):
         """
         Solve DC OPF using Sparse Nodal Formulation (LP).
         Variables x = [Pg (n_gen), Curtailment (n_bus), Theta (n_bus)]
-        """
-        from scipy.optimize import linprog
-        
-        n_theta = n_buses
-        n_vars = n_real_gen + n_buses + n_theta
-        
-        # === Objective ===
-        # Cost: c_gen * Pg + voll * Curtailment + 0 * Theta
-        c = np.zeros(n_vars)
-        for i, cost in enumerate(real_gen_costs):
-            c[i] = cost[1] * self.base_mva
-        for i in range(n_buses):
-            c[n_real_gen + i] = voll * self.base_mva
-            
-        # === Equality Constraints: Nodal Power Balance ===
-        # B * theta = P_injections
-        # P_injections at bus i = sum(Pg_at_i) + Curtailment_i - Pd_i
-        # => B * theta - sum(Pg) - Curtailment = -Pd
-        
-        # We need to construct the constraint matrix A_eq
-        # Rows: n_buses
-        # Cols: [Pg (n_gen) | Curtail (n_bus) | Theta (n_bus)]
-        
-        # 1. Theta part: B_sparse
-        # 2. Pg part: Sparse mapping -1 at (bus_idx, gen_idx)
-        # 3. Curtail part: -Identity
-        
-        # Construct constraint matrix as list of trios for COO
-        rows = []
-        cols = []
-        vals = []
-        
-        # Part 1: Theta (B matrix)
-        B_coo = B_sparse.tocoo()
-        rows.extend(B_coo.row)
-        cols.extend(B_coo.col + n_real_gen + n_buses) # Theta starts after gen + curt
-        vals.extend(B_coo.data)
-        
-        # Part 2: Generators (-1 coefficient)
-        for i in range(n_real_gen):
-            bus_idx = real_gen_bus_indices[i]
-            rows.append(bus_idx)
-            cols.append(i)
-            vals.append(-1.0)
-            
-        # Part 3: Curtailment (-1 coefficient)
-        for i in range(n_buses):
-            rows.append(i)
-            cols.append(n_real_gen + i)
-            vals.append(-1.0)
-            
-        # --- Multi-Island Reference Bus Support ---
-        # Detect connected components and fix one theta=0 per island
-        from scipy.sparse.csgraph import connected_components
-        n_components, labels = connected_components(csgraph=B_sparse, directed=False)
-        
-        # We need n_components extra equality constraints
-        # theta[ref_bus_of_island_k] = 0
-        extra_eq_rows = []
-        for k in range(n_components):
-            # Find buses in this island
-            island_bus_indices = np.where(labels == k)[0]
-            
-            # Prefer the global slack bus if it's in this island
-            slack_idx = bus_ids.get(slack_bus, 0)
-            
-            ref_idx = -1
-            if slack_idx in island_bus_indices:
-                ref_idx = slack_idx
-            else:
-                # Otherwise pick the first bus in the island
-                ref_idx = island_bus_indices[0]
-            
-            # theta[ref_idx] = 0
-            # Row index starts from n_buses (after power balance rows)
-            rows.append(n_buses + k) 
-            cols.append(n_real_gen + n_buses + ref_idx)
-            vals.append(1.0)
-            extra_eq_rows.append(0.0) # b_eq value
-            
-        # Construct A_eq sparse matrix
-        total_eq_rows = n_buses + n_components
-        A_eq = sp.coo_matrix((vals, (rows, cols)), shape=(total_eq_rows, n_vars))
-        
-        # RHS vector
-        b_eq = np.zeros(total_eq_rows)
-        b_eq[:n_buses] = -Pd_pu
-        # b_eq[n_buses:] are already 0.0 from extra_eq_rows
-        
-        # === Inequality Constraints: Line Flows ===
-        # -Limit <= b_ij * (theta_i - theta_j) <= Limit
-        # Loop linear constraints
-        A_ub = None
-        b_ub = None
-        
-        if enforce_line_limits:
-            ub_rows = []
-            ub_cols = []
-            ub_vals = []
-            ub_b = []
-            
-            row_count = 0
-            for k, (i, j) in enumerate(line_indices):
-                b = line_susceptances[k]
-                rate = line_rates[k]
-                
-                # Flow = b * (theta_i - theta_j)
-                # Constraint 1: b*theta_i - b*theta_j <= rate
-                ub_rows.extend([row_count, row_count])
-                ub_cols.extend([n_real_gen + n_buses + i, n_real_gen + n_buses + j])
-                ub_vals.extend([b, -b])
-                ub_b.append(rate)
-                row_count += 1
-                
-                # Constraint 2: -b*theta_i + b*theta_j <= rate (equivalent to flow >= -rate)
-                ub_rows.extend([row_count, row_count])
-                ub_cols.extend([n_real_gen + n_buses + i, n_real_gen + n_buses + j])
-                ub_vals.extend([-b, b])
-                ub_b.append(rate)
-                row_count += 1
-            
-            if row_count > 0:
-                A_ub = sp.coo_matrix((ub_vals, (ub_rows, ub_cols)), shape=(row_count, n_vars))
-                b_ub = np.array(ub_b)
 
-        # === Bounds ===
-        bounds = []
-        # Generators
-        for i in range(n_real_gen):
-            bounds.append((real_gen_pmin[i], real_gen_pmax[i]))
-        # Curtailment (0 to Pd)
-        for i in range(n_buses):
-            bounds.append((0.0, max(0.0, Pd_pu[i])))
-        # Theta (unbounded generally, but can limit to +/- 2pi or similar)
-        for i in range(n_buses):
-             bounds.append((None, None))
-             
-        # === Solve ===
-        result = linprog(c, A_eq=A_eq, b_eq=b_eq, A_ub=A_ub, b_ub=b_ub,
-                         bounds=bounds, method='highs',
-                         options={'presolve': True})
+        With the HiGHS bindings (highspy, or the copy bundled with SciPy) the
+        model is kept per network structure: later solves change only the
+        cost, bound and right-hand-side entries and hot start from the last
+        basis. warm_start passes a basis (cut rounds) or a primal point
+        (presolve fallback) to a one-off solve instead; the final basis is
+        kept in self._lp_basis. Without the bindings the LP goes through
+        scipy.optimize.linprog.
+        """
+        n_real_gen = model.n_gen
+        n_buses = model.n_bus
+
+        A, row_lower, row_upper = model.lp_constraints()
+        solved = solve_highs(model.c, A, row_lower, row_upper, model.lower, model.upper,
+                             network_key=network_key, warm_start=warm_start)
+        if solved is not None and (solved[0].x is None or solved[0].row_dual is None):
+            # HiGHS can stop without a solution, or without valid duals for
+            # the LMPs, on badly scaled models (status "Not Set"); linprog's
+            # own settings usually get through
+            logger.warning(f"HiGHS stopped without a solution and duals ({solved[0].status}), "
+                           f"retrying with linprog")
+            solved = None
+        if solved is None:
+            x, lam, success, message = self._solve_nodal_linprog(model)
+            self._lp_basis = None
+        else:
+            solution, warm = solved
+            self.timer.record_solve("highs", solution.iterations, A)
+            if warm:
+                logger.info(f"HiGHS hot start: {solution.iterations} simplex iterations")
+            x, success, message = solution.x, solution.optimal, solution.status
+            lam = solution.row_dual[:n_buses]
+            self._lp_basis = solution.basis if success else None
 
-        status = "optimal" if result.success else "suboptimal"
+        status = "optimal" if success else "suboptimal"
         
-        if not result.success:
-            logger.warning(f"Nodal LP solver failed: {result.message}")
+        if not success:
+            logger.warning(f"Nodal LP solver failed: {message}")
         
-        Pg_opt_pu = result.x[:n_real_gen + n_buses] # Gen + Curtailment
-        fict_gen_pg = result.x[n_real_gen:n_real_gen + n_buses] * self.base_mva
-        theta_opt = result.x[n_real_gen + n_buses:]
+        Pg_opt_pu = x[:n_real_gen + n_buses] # Gen + Curtailment
+        fict_gen_pg = x[n_real_gen:n_real_gen + n_buses] * self.base_mva
+        theta_opt = x[model.theta_offset:model.theta_offset + n_buses]
         
         # === Extract LMP ===
         # Dual variables from power balance equality constraints
-        # result.eqlin.marginals contains duals for A_eq
+        # lam holds the HiGHS row duals of A_eq (linprog's eqlin.marginals)
         # The first n_buses rows correspond to the nodal balance equations
         # Note: Dual definition varies. For Min cx st Ax=b, dual is usually such that lambda = dL/db
         # In power system economics, LMP = partial Cost / partial Load
@@ -791,8 +426,6 @@ class DCOPSolver:
         # Usually LMP = Lagrange multiplier of the power balance equation.
         # Highs duals usually consistent.
         
-        lam = result.eqlin.marginals[:n_buses]
-        
         # In this formulation B*theta - Pg = -Pd, LMP is dC/dPd.
         # Cost C = c*Pg. Dual of Eq Ax=b is lambda where c*x = b*lambda.
         # dC/db = lambda. Here b = [-Pd; 0].
@@ -805,207 +438,80 @@ class DCOPSolver:
             lmp = -lmp
 
         return Pg_opt_pu, fict_gen_pg, status, lmp, theta_opt
+
+    def _solve_nodal_linprog(self, model: NodalModel):
+        """LP through scipy.optimize.linprog: (x, balance duals, success, message)"""
+        from scipy.optimize import linprog
+
+        # Line limits: -Limit <= b_ij * (theta_i - theta_j) <= Limit
+        A_ub, b_ub = model.lp_inequalities()
+
+        result = linprog(model.c, A_eq=model.A_eq, b_eq=model.b_eq, A_ub=A_ub, b_ub=b_ub,
+                         bounds=model.lp_bounds(), method='highs',
+                         options={'presolve': True})
+        if result.x is None:
+            # Simplex can stall in the same way; the interior point method gets through
+            logger.warning(f"linprog stopped without a solution ({result.message}), retrying with highs-ipm")
+            result = linprog(model.c, A_eq=model.A_eq, b_eq=model.b_eq, A_ub=A_ub, b_ub=b_ub,
+                             bounds=model.lp_bounds(), method='highs-ipm')
+        self.timer.record_solve("linprog", result.nit, model.A_eq, A_ub)
+        if result.x is None:
+            raise ValueError(f"Nodal LP solver failed: {result.message}")
+        return result.x, result.eqlin.marginals[:model.n_bus], result.success, result.message
     
     
-    def _solve_nodal_qp(self, n_real_gen, n_buses, real_gen_costs, real_gen_pmin,
-                        real_gen_pmax, real_gen_bus_indices, Pd_pu, B_sparse,
-                        line_indices, line_susceptances, line_rates, slack_bus, 
-                        bus_ids, voll, enforce_line_limits):
+    def _solve_nodal_qp(self, model: NodalModel, network_key: str = None, warm_start=None):
         """
         Solve DC OPF using OSQP (Operator Splitting Quadratic Program).
         Standard for sparse QPs in power systems.
         Min 1/2 x'Px + q'x
         s.t. l <= Ax <= u
+
+        With a network_key the OSQP workspace is kept per network structure;
+        later solves only update q, l, u and warm start from the last solution.
+        warm_start passes an (x, y) starting point to a one-off solve instead.
+        The solution is kept in self._qp_solution for the next warm start.
         """
         try:
-            import osqp
+            import osqp  # noqa: F401
         except ImportError:
             logger.warning("OSQP not installed. Falling back to trust-constr nodal QP.")
-            return self._solve_nodal_qp_trust_constr(
-                n_real_gen, n_buses, real_gen_costs, real_gen_pmin, real_gen_pmax,
-                real_gen_bus_indices, Pd_pu, B_sparse, line_indices,
-                line_susceptances, line_rates, slack_bus, bus_ids, voll, enforce_line_limits
-            )
+            return self._solve_nodal_qp_trust_constr(model)
 
-        from scipy import sparse
+        n_real_gen = model.n_gen
+        n_buses = model.n_bus
 
-        n_theta = n_buses
-        n_vars = n_real_gen + n_buses + n_theta
-        
-        # === 1. Construct P (Quadratic Cost) and q (Linear Cost) ===
-        # Variables x = [Pg (n_gen), Curtailment (n_bus), Theta (n_bus)]
-        
-        # P matrix (diagonal for cost quadratic term)
-        # Cost = sum(a*Pg^2 + b*Pg + c)
-        # Minimize 1/2 x'Px + q'x
-        # So P elements should be 2*a
-        
-        P_vals = []
-        P_rows = []
-        P_cols = []
-        
-        q = np.zeros(n_vars)
-        
-        # Generators
-        for i in range(n_real_gen):
-            a, b_coeff, _ = real_gen_costs[i]
-            # P entry: 2 * a * (base_mva)^2  (since x is in p.u., cost is in MW)
-            # Actually, let's keep cost in $ directly.
-            # Pg_mw = Pg_pu * base_mva
-            # Cost = a * (Pg_pu * base)^2 + b * (Pg_pu * base) + c
-            #      = (a * base^2) * Pg_pu^2 + (b * base) * Pg_pu + c
-            # P_ii = 2 * (a * base^2)
-            
-            p_val = 2 * a * (self.base_mva**2)
-            # OSQP requires P to be upper triangular? No, usually symmetric.
-            # But diagonal is fine.
-            if p_val > 1e-9:
-                P_vals.append(p_val)
-                P_rows.append(i)
-                P_cols.append(i)
-            
-            q[i] = b_coeff * self.base_mva
-            
-        # Curtailment (Linear cost only)
-        for i in range(n_buses):
-            q[n_real_gen + i] = voll * self.base_mva
-            
-        # Theta (No cost)
-        
-        # Create sparse P
-        P = sparse.csc_matrix((P_vals, (P_rows, P_cols)), shape=(n_vars, n_vars))
-        
-        # === 2. Construct Constraints l <= Ax <= u ===
-        # We need to stack:
-        # - Equality constraints (Power Balance)
-        # - Inequality constraints (Line Flows)
-        # - Variable bounds (Pg_min, Pg_max, etc.) - OSQP usually puts bounds in A as Identity
-        
-        A_rows = []
-        A_cols = []
-        A_vals = []
-        
-        l_vec = []
-        u_vec = []
-        
-        row_idx = 0
-        
-        # --- 2.1 Power Balance (Equality) ---
-        # B*theta - Pg - Curt = -Pd
-        # l = u = -Pd
-        
-        # Theta part (B matrix)
-        B_coo = B_sparse.tocoo()
-        for r, c, v in zip(B_coo.row, B_coo.col, B_coo.data):
-            A_rows.append(row_idx + r)
-            A_cols.append(n_real_gen + n_buses + c)
-            A_vals.append(v)
-            
-        # Pg part (-Identity mapped to buses)
-        for i in range(n_real_gen):
-            bus_idx = real_gen_bus_indices[i]
-            A_rows.append(row_idx + bus_idx)
-            A_cols.append(i)
-            A_vals.append(-1.0)
-            
-        # Curt part (-Identity)
-        for i in range(n_buses):
-            A_rows.append(row_idx + i)
-            A_cols.append(n_real_gen + i)
-            A_vals.append(-1.0)
-            
-        l_vec.extend(-Pd_pu)
-        u_vec.extend(-Pd_pu)
-        row_idx += n_buses
-        
-        # --- 2.2 Multi-Island Reference Bus (Equality) ---
-        # Detect connected components and fix one theta=0 per island
-        from scipy.sparse.csgraph import connected_components
-        n_components, labels = connected_components(csgraph=B_sparse, directed=False)
-        
-        for k in range(n_components):
-            island_bus_indices = np.where(labels == k)[0]
-            slack_idx = bus_ids.get(slack_bus, 0)
-            
-            ref_idx = slack_idx if slack_idx in island_bus_indices else island_bus_indices[0]
-            
-            A_rows.append(row_idx)
-            A_cols.append(n_real_gen + n_buses + ref_idx)
-            A_vals.append(1.0)
-            l_vec.append(0.0)
-            u_vec.append(0.0)
-            row_idx += 1
-        
-        # --- 2.3 Line Limits (Inequality) ---
-        if enforce_line_limits:
-            for k, (i, j) in enumerate(line_indices):
-                b = line_susceptances[k]
-                rate = line_rates[k]
-                
-                # Flow = b*(theta_i - theta_j)
-                # -rate <= Flow <= rate
-                
-                # Coeff for theta_i
-                A_rows.append(row_idx)
-                A_cols.append(n_real_gen + n_buses + i)
-                A_vals.append(b)
-                
-                # Coeff for theta_j
-                A_rows.append(row_idx)
-                A_cols.append(n_real_gen + n_buses + j)
-                A_vals.append(-b)
-                
-                l_vec.append(-rate)
-                u_vec.append(rate)
-                row_idx += 1
-                
-        # --- 2.4 Variable Bounds ---
-        # Pg_min <= Pg <= Pg_max
-        for i in range(n_real_gen):
-            A_rows.append(row_idx)
-            A_cols.append(i)
-            A_vals.append(1.0)
-            l_vec.append(real_gen_pmin[i])
-            u_vec.append(real_gen_pmax[i])
-            row_idx += 1
-            
-        # 0 <= Curt <= Pd
-        # If Pd is negative (generation modeled as load), we can't 'shed' it using this variable.
-        # So we force Curt = 0 for negative Pd to avoid l > u (0 > negative).
-        for i in range(n_buses):
-            A_rows.append(row_idx)
-            A_cols.append(n_real_gen + i)
-            A_vals.append(1.0)
-            l_vec.append(0.0)
-            u_vec.append(max(0.0, Pd_pu[i]))
-            row_idx += 1
-            
-        # Theta bounds (none, effectively)
-        # We don't need to add rows for unbounded variables, but it's good practice 
-        # or we just rely on the solver. OSQP variables are free by default unless constrained.
-        
-        # Create A sparse matrix
-        A = sparse.csc_matrix((A_vals, (A_rows, A_cols)), shape=(row_idx, n_vars))
-        l = np.array(l_vec)
-        u = np.array(u_vec)
+        # === 1. Quadratic and linear cost ===
+        # Cost = a * (Pg_pu * base)^2 + b * (Pg_pu * base) + c
+        # P_ii = 2 * (a * base^2), q_i = b * base (x is in p.u., cost in $)
+        P = model.quadratic_cost()
+        q = model.c
+
+        # === 2. Constraints l <= Ax <= u ===
+        # Power balance and island references (l = u), line limits,
+        # and Pg / curtailment bounds as identity rows. Theta stays free.
+        A, l, u = model.qp_constraints()
         
         # === 3. Solve ===
-        prob = osqp.OSQP()
-        prob.setup(P, q, A, l, u, verbose=False, eps_abs=1e-5, eps_rel=1e-5, max_iter=5000)
-        res = prob.solve()
+        res, warm = solve_osqp(P, q, A, l, u, network_key=network_key, warm_start=warm_start)
+        self.timer.record_solve("osqp", res.info.iter, A)
+        if warm:
+            logger.info(f"OSQP warm start: {res.info.iter} iterations")
         
         # Check status
         if res.info.status != 'solved':
             logger.warning(f"OSQP solver status: {res.info.status}")
             status = "suboptimal"
+            self._qp_solution = None
         else:
             status = "optimal"
+            self._qp_solution = (np.array(res.x, copy=True), np.array(res.y, copy=True))
             
         x = res.x
         
         Pg_opt_pu = x[:n_real_gen + n_buses]
         fict_gen_pg = x[n_real_gen:n_real_gen + n_buses] * self.base_mva
-        theta_opt = x[n_real_gen + n_buses:]
+        theta_opt = x[model.theta_offset:model.theta_offset + n_buses]
         
         # === Extract LMP ===
         # Dual variables y corresponding to constraints l <= Ax <= u
@@ -1024,35 +530,24 @@ class DCOPSolver:
         
         return Pg_opt_pu, fict_gen_pg, status, lmp, theta_opt
 
-    def _solve_nodal_qp_trust_constr(self, n_real_gen, n_buses, real_gen_costs, real_gen_pmin,
-                                     real_gen_pmax, real_gen_bus_indices, Pd_pu, B_sparse,
-                                     line_indices, line_susceptances, line_rates, slack_bus,
-                                     bus_ids, voll, enforce_line_limits):
+    def _solve_nodal_qp_trust_constr(self, model: NodalModel):
         """
         Fallback nodal QP using trust-constr when OSQP is unavailable.
         Variables x = [Pg (n_gen), Curtailment (n_bus), Theta (n_bus)]
         """
         from scipy.optimize import minimize, LinearConstraint, Bounds
 
-        n_theta = n_buses
-        n_vars = n_real_gen + n_buses + n_theta
-
-        # Cost coefficients
-        a_coeffs = np.zeros(n_vars)
-        b_coeffs = np.zeros(n_vars)
-        c_coeffs = np.zeros(n_vars)
-        for i in range(n_real_gen):
-            a_coeffs[i] = real_gen_costs[i][0]
-            b_coeffs[i] = real_gen_costs[i][1]
-            c_coeffs[i] = real_gen_costs[i][2]
-        # Curtailment linear cost
-        b_coeffs[n_real_gen:n_real_gen + n_buses] = voll
-
+        n_real_gen = model.n_gen
+        n_buses = model.n_bus
         bmva = self.base_mva
 
+        # Cost coefficients in $/h with Pg in MW (curtailment priced at VOLL)
+        a_coeffs = model.quad / (2 * bmva**2)
+        b_coeffs = model.c / bmva
+
         def objective(x):
             Pg_mw = x * bmva
-            return np.sum(a_coeffs * Pg_mw**2 + b_coeffs * Pg_mw + c_coeffs)
+            return np.sum(a_coeffs * Pg_mw**2 + b_coeffs * Pg_mw)
 
         def objective_jac(x):
             Pg_mw = x * bmva
@@ -1061,77 +556,28 @@ class DCOPSolver:
         def objective_hess(x):
             return sp.diags(2 * a_coeffs * bmva**2, format="csc")
 
-        # === Equality Constraints: Nodal Power Balance + Slack Angle ===
-        rows = []
-        cols = []
-        vals = []
-
-        B_coo = B_sparse.tocoo()
-        rows.extend(B_coo.row)
-        cols.extend(B_coo.col + n_real_gen + n_buses)
-        vals.extend(B_coo.data)
-
-        for i in range(n_real_gen):
-            bus_idx = real_gen_bus_indices[i]
-            rows.append(bus_idx)
-            cols.append(i)
-            vals.append(-1.0)
-
-        for i in range(n_buses):
-            rows.append(i)
-            cols.append(n_real_gen + i)
-            vals.append(-1.0)
-
-        # Multi-Island Reference Angle
-        from scipy.sparse.csgraph import connected_components
-        n_components, labels = connected_components(csgraph=B_sparse, directed=False)
-        
-        for k in range(n_components):
-            island_bus_indices = np.where(labels == k)[0]
-            slack_idx = bus_ids.get(slack_bus, 0)
-            ref_idx = slack_idx if slack_idx in island_bus_indices else island_bus_indices[0]
-            
-            rows.append(n_buses + k)
-            cols.append(n_real_gen + n_buses + ref_idx)
-            vals.append(1.0)
-            
-        total_eq_rows = n_buses + n_components
-        A_eq = sp.coo_matrix((vals, (rows, cols)), shape=(total_eq_rows, n_vars))
-        b_eq = np.zeros(total_eq_rows)
-        b_eq[:n_buses] = -Pd_pu
-        # b_eq[n_buses:] are 0.0
-        
-        power_balance = LinearConstraint(A_eq, b_eq, b_eq)
+        # === Equality Constraints: Nodal Power Balance + Island Reference Angles ===
+        power_balance = LinearConstraint(model.A_eq, model.b_eq, model.b_eq)
 
         constraints = [power_balance]
 
         # === Line Limits (optional) ===
-        if enforce_line_limits and len(line_indices) > 0:
-            ub_rows = []
-            ub_cols = []
-            ub_vals = []
-            row_count = 0
-            for k, (i, j) in enumerate(line_indices):
-                b = line_susceptances[k]
-                # b * (theta_i - theta_j)
-                ub_rows.extend([row_count, row_count])
-                ub_cols.extend([n_real_gen + n_buses + i, n_real_gen + n_buses + j])
-                ub_vals.extend([b, -b])
-                row_count += 1
-
-            A_line = sp.coo_matrix((ub_vals, (ub_rows, ub_cols)), shape=(row_count, n_vars))
-            line_limits = LinearConstraint(A_line, -np.array(line_rates), np.array(line_rates))
+        if model.enforce_line_limits and model.n_lines > 0:
+            line_limits = LinearConstraint(model.A_flow, -model.line_rates, model.line_rates)
             constraints.append(line_limits)
+        if model.n_cuts > 0:
+            constraints.append(LinearConstraint(*model.cut_constraints()))
 
         # === Bounds ===
-        lower = np.concatenate([real_gen_pmin, np.zeros(n_buses), np.full(n_buses, -np.inf)])
-        upper = np.concatenate([real_gen_pmax, np.maximum(Pd_pu, 0.0), np.full(n_buses, np.inf)])
-        bounds = Bounds(lower, upper)
+        bounds = Bounds(model.lower, model.upper)
 
         # Initial guess
-        x0 = np.zeros(n_vars)
+        real_gen_pmin = model.lower[:n_real_gen]
+        real_gen_pmax = model.upper[:n_real_gen]
+        x0 = np.zeros(model.n_vars)
         x0[:n_real_gen] = self._economic_dispatch_init(
-            real_gen_costs, real_gen_pmin, real_gen_pmax, np.sum(Pd_pu)
+            b_coeffs[:n_real_gen, None] * np.array([0.0, 1.0, 0.0]),
+            real_gen_pmin, real_gen_pmax, -np.sum(model.b_eq[:n_buses])
         )
 
         result = minimize(
@@ -1145,10 +591,11 @@ class DCOPSolver:
             options={"maxiter": 5000, "gtol": 1e-8}
         )
 
+        self.timer.record_solve("trust-constr", result.nit, *(c.A for c in constraints))
         x = result.x
         Pg_opt_pu = x[:n_real_gen + n_buses]
         fict_gen_pg = x[n_real_gen:n_real_gen + n_buses] * self.base_mva
-        theta_opt = x[n_real_gen + n_buses:]
+        theta_opt = x[model.theta_offset:model.theta_offset + n_buses]
         status = "optimal" if result.success else "suboptimal"
 
         # LMP from nodal balance duals
@@ -1186,280 +633,42 @@ class DCOPSolver:
 
         return Pg
 
-    def _get_slack_connected_subset(self, case: CaseData) -> CaseData:
+    def _get_slack_connected_subset(self, case: CaseArrays) -> CaseArrays:
         """
         Identify components and return a subset of the case connected to the slack bus.
         """
-        from scipy.sparse.csgraph import connected_components
-        
-        buses = case.buses
-        lines = case.lines
-        
-        if not buses:
+        if case.n_bus == 0:
             return case
-            
-        # Get slack bus
-        slack_bus_id = self._find_slack_bus(buses)
-        
-        # Build adjacency matrix (sparse)
-        B_sparse = self._build_sparse_susceptance_matrix(buses, lines)
-        
-        # Find components
-        n_components, labels = connected_components(csgraph=B_sparse, directed=False, return_labels=True)
-        
+
+        # Components of the compiled network
+        net = get_network_model(case)
+        n_components, labels = net.n_islands, net.island_labels
+
         if n_components <= 1:
             return case
-            
-        bus_ids = {bus.id: i for i, bus in enumerate(buses)}
-        
+
         # Identify all components that have at least one slack bus
-        slack_bus_ids = [bus.id for bus in buses if bus.type == 3]
-        slack_components = set()
-        for s_id in slack_bus_ids:
-            if s_id in bus_ids:
-                slack_components.add(labels[bus_ids[s_id]])
-        
+        slack_positions = net.bus_positions(case.bus_id[case.bus_type == 3])
+        slack_components = set(labels[slack_positions[slack_positions >= 0]].tolist())
+
         if not slack_components:
             logger.warning("Island removal: No slack bus found in any component. Keeping entire system.")
             return case
-            
-        # Filter buses: keep those in components with at least one slack
-        connected_bus_indices = [i for i, label in enumerate(labels) if label in slack_components]
-        connected_bus_ids = {buses[i].id for i in connected_bus_indices}
-        
-        filtered_buses = [b for b in buses if b.id in connected_bus_ids]
-        filtered_generators = [g for g in case.generators if g.bus in connected_bus_ids]
-        filtered_loads = [l for l in case.loads if l.bus in connected_bus_ids]
-        filtered_lines = [line for line in lines if line.from_bus in connected_bus_ids and line.to_bus in connected_bus_ids]
-        
-        logger.info(f"Island removal: Keep {len(filtered_buses)}/{len(buses)} buses across components {slack_components}")
-        
-        return CaseData(
-            buses=filtered_buses,
-            generators=filtered_generators,
-            lines=filtered_lines,
-            loads=filtered_loads,
-            base_mva=case.base_mva
-        )
-
-    # ========== Network Building Methods ==========
-
-    def _find_slack_bus(self, buses: List[Bus]) -> int:
-        """Find the slack (reference) bus"""
-        for bus in buses:
-            if bus.type == 3:
-                return bus.id
-        return buses[0].id if buses else 1
-
-    def _build_susceptance_matrix(self, buses: List[Bus], lines: List[Line]) -> np.ndarray:
-        """Build DC susceptance matrix in per-unit"""
-        n = len(buses)
-        B = np.zeros((n, n))
-
-        bus_ids = {bus.id: i for i, bus in enumerate(buses)}
-
-        for line in lines:
-            if getattr(line, 'status', 1) == 0:
-                continue
-            if line.from_bus in bus_ids and line.to_bus in bus_ids:
-                i = bus_ids[line.from_bus]
-                j = bus_ids[line.to_bus]
-                x = line.x if line.x > 0 else 0.01
-                b_ij = 1.0 / x
-
-                B[i, i] += b_ij
-                B[j, j] += b_ij
-                B[i, j] -= b_ij
-                B[j, i] -= b_ij
-
-        # Add nodal shunts (b_shunt) to the diagonal
-        for i, bus in enumerate(buses):
-            B[i, i] += getattr(bus, 'b_shunt', 0.0)
-
-        return B
-
-    def _build_ptdf_matrix(self, B: np.ndarray, lines: List[Line],
-                          buses: List[Bus], bus_ids: dict, slack_bus: int) -> np.ndarray:
-        """Build Power Transfer Distribution Factors (PTDF) matrix"""
-        n = len(buses)
-        slack_idx = bus_ids.get(slack_bus, 0)
-        B_reduced = np.delete(np.delete(B, slack_idx, 0), slack_idx, 1)
-
-        try:
-            # For large systems, linalg.solve might be better for systems of eq,
-            # but for PTDF we usually want the explicit inverse (B_reduced^-1).
-            B_inv = np.linalg.inv(B_reduced)
-        except np.linalg.LinAlgError:
-            B_inv = np.linalg.pinv(B_reduced)
-
-        # Expand B_inv back to full size (n x n) by inserting zero row/column for slack
-        B_inv_full = np.zeros((n, n))
-        rows = np.array([k for k in range(n) if k != slack_idx])
-        B_inv_full[np.ix_(rows, rows)] = B_inv
-
-        # Pre-allocate PTDF matrix
-        PTDF = np.zeros((len(lines), n))
-        
-        for k, line in enumerate(lines):
-            if line.from_bus in bus_ids and line.to_bus in bus_ids:
-                i = bus_ids[line.from_bus]
-                j = bus_ids[line.to_bus]
-                x = line.x if line.x > 0 else 0.0001
-                
-                # PTDF_k,n = (1/x_k) * (B_inv[i, n] - B_inv[j, n])
-                PTDF[k, :] = (B_inv_full[i, :] - B_inv_full[j, :]) / x
-
-        return PTDF
-    def _extract_loads(self, buses: List[Bus], loads) -> tuple:
-        """Extract real and reactive power demands in per-unit"""
-        n = len(buses)
-        Pd = np.zeros(n)
-        Qd = np.zeros(n)
-
-        bus_ids = {bus.id: i for i, bus in enumerate(buses)}
-
-        if loads:
-            for load in loads:
-                if load.bus in bus_ids:
-                    i = bus_ids[load.bus]
-                    Pd[i] += load.pd / self.base_mva
-                    Qd[i] += load.qd / self.base_mva
-                    
-        # Add nodal shunt conductance (g_shunt) as additional load
-        for i, bus in enumerate(buses):
-            Pd[i] += getattr(bus, 'g_shunt', 0.0)
-
-        return Pd, Qd
-
-    def _solve_theta(self, B: np.ndarray, Pnet: np.ndarray, slack_idx: int) -> np.ndarray:
-        """Solve for voltage angles"""
-        n = B.shape[0]
-        if slack_idx < 0 or slack_idx >= n:
-            slack_idx = 0
-
-        B_reduced = np.delete(np.delete(B, slack_idx, 0), slack_idx, 1)
-        P_reduced = np.delete(Pnet, slack_idx)
-
-        try:
-            theta_reduced = np.linalg.solve(B_reduced, P_reduced)
-        except np.linalg.LinAlgError:
-            theta_reduced = np.linalg.lstsq(B_reduced, P_reduced, rcond=None)[0]
 
-        theta = np.insert(theta_reduced, slack_idx, 0)
-        return theta
+        # Keep buses in components with at least one slack, and what connects to them
+        subset = case.subset(np.isin(labels, list(slack_components)))
 
-    def _solve_theta_sparse(self, B_sparse: sp.csc_matrix, Pnet: np.ndarray, slack_idx: int) -> np.ndarray:
-        """Solve for voltage angles using sparse matrix"""
-        n = B_sparse.shape[0]
-        if slack_idx < 0 or slack_idx >= n:
-            slack_idx = 0
+        logger.info(f"Island removal: Keep {subset.n_bus}/{case.n_bus} buses across components {slack_components}")
+        return subset
 
-        mask = np.ones(n, dtype=bool)
-        mask[slack_idx] = False
+    # ========== Network Methods ==========
 
-        B_reduced = B_sparse[mask][:, mask]
-        P_reduced = Pnet[mask]
+    def _solve_theta_sparse(self, net: NetworkModel, Pnet: np.ndarray) -> np.ndarray:
+        """
+        Solve for voltage angles with the cached LU of the reduced susceptance
+        matrix (island reference buses fixed at zero)
+        """
+        return get_sensitivity_model(net).angles(Pnet[:, None])[:, 0]
 
-        try:
-            theta_reduced = spsolve(B_reduced, P_reduced)
-        except Exception:
-            theta_reduced = sp.linalg.lsqr(B_reduced, P_reduced)[0]
-
-        theta = np.zeros(n)
-        theta[mask] = theta_reduced
-        theta[slack_idx] = 0.0
-        return theta
-
-    def _calculate_line_flows(self, lines: List[Line], buses: List[Bus],
-                              theta: np.ndarray, lmp: np.ndarray = None) -> List[LineResult]:
-        """Calculate power flows on transmission lines"""
-        bus_ids = {bus.id: i for i, bus in enumerate(buses)}
-        line_results = []
-
-        for line in lines:
-            if getattr(line, 'status', 1) == 0:
-                line_results.append(LineResult(
-                    from_bus=line.from_bus,
-                    to_bus=line.to_bus,
-                    flow_mw=0.0,
-                    flow_mvar=0.0,
-                    loading_percent=0.0,
-                    congestion_rent=0.0
-                ))
-                continue
-            if line.from_bus in bus_ids and line.to_bus in bus_ids:
-                i = bus_ids[line.from_bus]
-                j = bus_ids[line.to_bus]
-                x = line.x if line.x > 0 else 0.01
-                b_ij = 1.0 / x
-
-                flow_pu = b_ij * (theta[i] - theta[j])
-                flow_mw = flow_pu * self.base_mva
-
-                rate = line.rate_a if line.rate_a > 0 else 250.0
-                loading = abs(flow_mw) / rate * 100
-
-                # Congestion rent = (LMP_to - LMP_from) * flow_from_to
-                congestion_rent = 0.0
-                if lmp is not None:
-                    congestion_rent = (lmp[j] - lmp[i]) * flow_mw
-
-                line_results.append(LineResult(
-                    from_bus=line.from_bus,
-                    to_bus=line.to_bus,
-                    flow_mw=flow_mw,
-                    flow_mvar=0.0,
-                    loading_percent=loading,
-                    congestion_rent=congestion_rent
-                ))
-
-        return line_results
-
-    def _calculate_bus_results(self, buses: List[Bus], theta: np.ndarray,
-                               Pg: np.ndarray, Pd: np.ndarray,
-                               marginal_costs: np.ndarray,
-                               curtailment: np.ndarray = None) -> List[BusResult]:
-        """Calculate bus-level results"""
-        bus_results = []
-
-        if curtailment is None:
-            curtailment = np.zeros(len(buses))
-
-        for i, bus in enumerate(buses):
-            pl_pu = Pg[i] - Pd[i]
-            pl_mw = pl_pu * self.base_mva
-
-            bus_results.append(BusResult(
-                bus=bus.id,
-                va=np.degrees(theta[i]),
-                vm=bus.v_mag,
-                pl=pl_mw,
-                ql=0.0,
-                marginal_cost=marginal_costs[i],
-                curtailment=curtailment[i]
-            ))
-
-        return bus_results
-
-    # NOTE: _calculate_marginal_costs removed — LMPs are now computed
-    # directly from optimization dual variables (Lagrange multipliers)
-    # inside each solver method (_solve_lp, _solve_qp, _solve_ed_lp, _solve_ed_qp).
-
-    def _calculate_gen_results(self, generators: List[Generator],
-                               Pg_mw: np.ndarray) -> List[GeneratorResult]:
-        """Calculate generator-level results"""
-        gen_results = []
-
-        for gen, pg_mw in zip(generators, Pg_mw):
-            qg_mw = 0.0
-            cost = gen.cost[0] * pg_mw**2 + gen.cost[1] * pg_mw + gen.cost[2]
-
-            gen_results.append(GeneratorResult(
-                id=gen.id,
-                bus=gen.bus,
-                pg=pg_mw,
-                qg=qg_mw,
-                cost=cost
-            ))
-
-        return gen_results
+    # NOTE: LMPs come straight from the dual variables (Lagrange multipliers)
+    # of the nodal balance rows in _solve_nodal_lp / _solve_nodal_qp.
@@ -0,0 +1,272 @@
+"""
+Network presolve for the nodal DC OPF
+Exact reductions of the bus-branch model before assembly: parallel branches
+merged, radial buses folded into their neighbour and zero-injection
+pass-through buses replaced by a series branch. The reduced network is
+assembled and solved as usual; angles, curtailment and LMPs are mapped
+back to every bus afterwards.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.solver.network import NetworkModel, build_susceptance_matrix
+
+logger = logging.getLogger(__name__)
+
+# A branch next to an eliminated pass-through bus counts as binding above
+# this share of its rating less BINDING_ATOL per-unit, OSQP's accuracy (the
+# bus's LMP then needs it in the model)
+BINDING_TOL = 1e-6
+BINDING_ATOL = 1e-4
+
+# The reduced model is solved only when it keeps at most this share of the
+# buses; smaller reductions don't pay for assembling and mapping back
+MAX_KEPT_SHARE = 0.7
+
+# Networks whose protected pass-through buses are remembered for the next solve
+PROTECTED_CACHE_SIZE = 16
+
+LEAF = 0
+PASS_THROUGH = 1
+
+
+class NetworkReduction:
+    """
+    Reduced network of one solve and the maps back to the full network.
+
+    Each branch of the reduced network stands for one or more parallel or
+    series branches and is described by its susceptance b and the largest
+    angle difference its branches allow (rating / b, the tightest one).
+    Reduced buses are the kept buses in bus order; every eliminated bus is
+    represented by a kept one (the bus its load, generators and curtailment
+    move to). Eliminations are recorded in order as (kind, bus, neighbours,
+    susceptances) so they can be undone last to first. protected are the
+    buses that were not eligible for elimination on request.
+    """
+
+    def __init__(self, net: NetworkModel, kept: np.ndarray, rep: np.ndarray,
+                 edges: List[Tuple[int, int, float, float]], eliminated: list,
+                 n_parallel: int, protected: np.ndarray):
+        self.net = net
+        self.kept = kept
+        self.protected = protected
+        self.n_bus = len(kept)
+        self.eliminated = eliminated
+        self.n_parallel = n_parallel
+        position = np.full(net.n_bus, -1, dtype=np.int64)
+        position[kept] = np.arange(self.n_bus)
+        self.bus_map = position[rep]
+
+        edges = np.array(edges, dtype=float).reshape(-1, 4)
+        self.from_idx = position[edges[:, 0].astype(np.int64)]
+        self.to_idx = position[edges[:, 1].astype(np.int64)]
+        self.susceptances = edges[:, 2]
+        self.line_rates = np.minimum(edges[:, 2] * edges[:, 3], 1e9)
+        self.B = build_susceptance_matrix(self.n_bus, self.from_idx, self.to_idx,
+                                          self.susceptances, net.b_shunt[kept])
+        self.island_refs = position[net.island_refs]
+        self.slack_idx = int(position[net.slack_idx])
+
+        self._passing = np.zeros(net.n_bus, dtype=bool)
+        self._passing[[bus for kind, bus, _, _ in eliminated if kind == PASS_THROUGH]] = True
+        self._pass_lines = np.flatnonzero(self._passing[net.from_idx] | self._passing[net.to_idx])
+
+    @property
+    def n_eliminated(self) -> int:
+        return len(self.eliminated)
+
+    def loads(self, Pd_pu: np.ndarray) -> np.ndarray:
+        """Nodal demand of the reduced buses"""
+        return np.bincount(self.bus_map, weights=Pd_pu, minlength=self.n_bus)
+
+    def gen_bus_idx(self, gen_bus_idx: np.ndarray) -> np.ndarray:
+        """Reduced bus of each generator"""
+        return self.bus_map[gen_bus_idx]
+
+    def expand_curtailment(self, curtailment: np.ndarray, Pd_pu: np.ndarray) -> np.ndarray:
+        """
+        Curtailment of every bus: each reduced bus's curtailment split over
+        the buses it represents in proportion to their demand (the split is
+        free in the full model, all at the same VOLL)
+        """
+        total = self.loads(Pd_pu)
+        share = np.divide(Pd_pu, total[self.bus_map], out=np.zeros(len(Pd_pu)),
+                          where=total[self.bus_map] > 0)
+        return curtailment[self.bus_map] * share
+
+    def expand_prices(self, lmp: np.ndarray) -> np.ndarray:
+        """
+        LMPs of every bus. A radial bus has the price of its neighbour (its
+        branch cannot bind); a pass-through bus the susceptance-weighted
+        price of its two neighbours, exact while neither branch binds
+        (check passthrough_binding).
+        """
+        full = np.zeros(self.net.n_bus)
+        full[self.kept] = lmp
+        for kind, bus, (a, c), (b1, b2) in reversed(self.eliminated):
+            full[bus] = full[a] if kind == LEAF else (b1 * full[a] + b2 * full[c]) / (b1 + b2)
+        return full
+
+    def expand_angles(self, theta: np.ndarray, injections: np.ndarray) -> np.ndarray:
+        """
+        Angles of every bus from those of the reduced buses and each bus's
+        net injection: a radial bus sits its subtree's injection over its
+        branch from its neighbour, a pass-through bus at the
+        susceptance-weighted angle of its two neighbours
+        """
+        subtree = np.array(injections, dtype=float)
+        for kind, bus, (a, _), _ in self.eliminated:
+            if kind == LEAF:
+                subtree[a] += subtree[bus]
+        full = np.zeros(self.net.n_bus)
+        full[self.kept] = theta
+        for kind, bus, (a, c), (b1, b2) in reversed(self.eliminated):
+            if kind == LEAF:
+                full[bus] = full[a] + subtree[bus] / b1
+            else:
+                full[bus] = (b1 * full[a] + b2 * full[c]) / (b1 + b2)
+        return full
+
+    def passthrough_binding(self, theta: np.ndarray, enforce_line_limits: bool) -> np.ndarray:
+        """
+        Eliminated pass-through buses at an end of a branch that is at its
+        limit for full-network angles (their LMPs are not recoverable)
+        """
+        if not enforce_line_limits or len(self._pass_lines) == 0:
+            return np.zeros(0, dtype=np.int64)
+        net = self.net
+        lines = self._pass_lines
+        flow = net.susceptances[lines] * (theta[net.from_idx[lines]] - theta[net.to_idx[lines]])
+        lines = lines[np.abs(flow) >= net.line_rates[lines] * (1 - BINDING_TOL) - BINDING_ATOL]
+        ends = np.concatenate([net.from_idx[lines], net.to_idx[lines]])
+        return np.unique(ends[self._passing[ends]])
+
+
+def reduce_network(net: NetworkModel, Pd_pu: np.ndarray, gen_bus_idx: np.ndarray,
+                   gen_pmin: np.ndarray, gen_pmax: np.ndarray,
+                   enforce_line_limits: bool = True, keep: Optional[np.ndarray] = None) -> NetworkReduction:
+    """
+    Exact reduction of the network for one solve (demand and generator
+    limits in per-unit, by bus and by generator position).
+
+    Parallel branches become one with the summed susceptance and the
+    tightest angle limit. Island reference buses and buses with a shunt
+    are kept; of the others:
+
+    - a radial bus (one neighbour) with non-negative demand, like its
+      neighbour, is folded into the neighbour when its branch cannot reach
+      its rating for any dispatch of the buses folded into it so far;
+    - a bus without demand or generation and two neighbours becomes a
+      series branch between them (tightest rating of the two).
+
+    Folding repeats until no bus qualifies, so radial chains and series
+    chains collapse completely. Bus positions in keep are never eliminated.
+    """
+    n = net.n_bus
+    has_gen = np.zeros(n, dtype=bool)
+    active = (gen_pmax != 0) | (gen_pmin != 0)
+    has_gen[gen_bus_idx[active]] = True
+    # Range of each bus's net injection: Pg - Pd + curtailment, 0 <= curtailment <= max(Pd, 0)
+    lo = np.bincount(gen_bus_idx, weights=gen_pmin, minlength=n) - Pd_pu
+    hi = np.bincount(gen_bus_idx, weights=gen_pmax, minlength=n) - Pd_pu + np.maximum(Pd_pu, 0.0)
+    injects = has_gen | (Pd_pu != 0)
+    eligible = net.b_shunt == 0
+    eligible[net.island_refs] = False
+    protected = np.zeros(0, dtype=np.int64) if keep is None else np.unique(np.asarray(keep, dtype=np.int64))
+    eligible[protected] = False
+
+    # Adjacency with parallel branches merged: bus -> {neighbour: [b, angle limit]}
+    adjacency = [dict() for _ in range(n)]
+    limit = net.line_rates / net.susceptances if enforce_line_limits else np.full(len(net.susceptances), np.inf)
+    n_parallel = 0
+    for i, j, b, d in zip(net.from_idx.tolist(), net.to_idx.tolist(),
+                          net.susceptances.tolist(), limit.tolist()):
+        if i == j:
+            continue
+        edge = adjacency[i].get(j)
+        if edge is None:
+            adjacency[i][j] = adjacency[j][i] = [b, d]
+        else:
+            edge[0] += b
+            edge[1] = min(edge[1], d)
+            n_parallel += 1
+
+    removed = np.zeros(n, dtype=bool)
+    rep = np.arange(n)
+    eliminated = []
+    queue = [i for i in range(n) if eligible[i] and len(adjacency[i]) <= 2]
+    while queue:
+        i = queue.pop()
+        if removed[i]:
+            continue
+        neighbours = adjacency[i]
+        if len(neighbours) == 1:
+            (a, (b, d)), = neighbours.items()
+            if Pd_pu[i] < 0 or Pd_pu[a] < 0 or max(-lo[i], hi[i]) > b * d:
+                continue
+            lo[a] += lo[i]
+            hi[a] += hi[i]
+            injects[a] |= injects[i]
+            del adjacency[a][i]
+            eliminated.append((LEAF, i, (a, a), (b, b)))
+            touched = [a]
+        elif len(neighbours) == 2 and not injects[i]:
+            (a, (b1, d1)), (c, (b2, d2)) = neighbours.items()
+            b = b1 * b2 / (b1 + b2)
+            d = min(b1 * d1, b2 * d2) / b
+            del adjacency[a][i], adjacency[c][i]
+            edge = adjacency[a].get(c)
+            if edge is None:
+                adjacency[a][c] = adjacency[c][a] = [b, d]
+            else:
+                edge[0] += b
+                edge[1] = min(edge[1], d)
+            eliminated.append((PASS_THROUGH, i, (a, c), (b1, b2)))
+            touched = [a, c]
+        else:
+            continue
+        adjacency[i] = {}
+        removed[i] = True
+        queue.extend(k for k in touched if eligible[k] and not removed[k] and len(adjacency[k]) <= 2)
+
+    for _, bus, (a, _), _ in reversed(eliminated):
+        rep[bus] = rep[a]
+    kept = np.flatnonzero(~removed)
+    edges = [(i, j, b, d) for i in kept.tolist() for j, (b, d) in adjacency[i].items() if i < j]
+    reduction = NetworkReduction(net, kept, rep, edges, eliminated, n_parallel, protected)
+    logger.info(f"Presolve: {n - len(kept)}/{n} buses eliminated, "
+                f"{len(net.susceptances) - len(edges)}/{len(net.susceptances)} branches merged")
+    return reduction
+
+
+_protected: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_protected_lock = threading.Lock()
+
+
+def protected_buses(network_key: str) -> np.ndarray:
+    """Bus positions kept out of the presolve of a network (empty if none)"""
+    with _protected_lock:
+        buses = _protected.get(network_key)
+        if buses is None:
+            return np.zeros(0, dtype=np.int64)
+        _protected.move_to_end(network_key)
+    return buses
+
+
+def remember_protected(network_key: str, buses: np.ndarray):
+    with _protected_lock:
+        _protected[network_key] = np.asarray(buses, dtype=np.int64)
+        _protected.move_to_end(network_key)
+        while len(_protected) > PROTECTED_CACHE_SIZE:
+            _protected.popitem(last=False)
+
+
+def clear_protected():
+    """Forget the remembered protected buses"""
+    with _protected_lock:
+        _protected.clear()
@@ -0,0 +1,168 @@
+"""
+OPF result post-processing
+Element results computed in bulk from the solved angles, dispatch and duals,
+shaped either as one record per element (OPFResult) or as parallel arrays
+(ColumnarOPFResult)
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+
+from app.models.arrays import CaseArrays
+from app.models.schemas import OPFResult, ColumnarOPFResult, GeneratorResult, BusResult, LineResult
+from app.solver.network import NetworkModel
+
+RESULT_FORMATS = ("records", "columns")
+
+# Reactance floor and rating used when reporting branch flows and loadings
+REPORT_MIN_REACTANCE = 0.01
+DEFAULT_RATE_MW = 250.0
+
+GEN_FIELDS = ("gen_id", "gen_bus", "gen_pg", "gen_qg", "gen_cost")
+BUS_FIELDS = ("bus", "bus_va", "bus_vm", "bus_pl", "bus_ql", "bus_marginal_cost", "bus_curtailment")
+LINE_FIELDS = ("line_from", "line_to", "line_flow_mw", "line_flow_mvar", "line_loading_percent",
+               "line_congestion_rent")
+
+
+def polynomial_cost(costs: np.ndarray, pg_mw: np.ndarray) -> np.ndarray:
+    """Per-generator c2*P^2 + c1*P + c0 from an (n, >=3) [c2, c1, c0] matrix"""
+    return costs[:, 0] * pg_mw**2 + costs[:, 1] * pg_mw + costs[:, 2]
+
+
+class ResultArrays:
+    """
+    Solved element results as NumPy columns (named after the ColumnarOPFResult
+    fields) plus the scalar totals
+    """
+
+    def __init__(self, status: str, total_cost: float, objective_value: float,
+                 total_curtailment: float, iterations: int = 1, presolve_resolves: int = 0, **columns):
+        self.status = status
+        self.total_cost = float(total_cost)
+        self.objective_value = float(objective_value)
+        self.total_curtailment = float(total_curtailment)
+        self.iterations = iterations
+        self.presolve_resolves = presolve_resolves
+        self.columns = columns
+
+    @classmethod
+    def from_result(cls, result: Union[OPFResult, ColumnarOPFResult]) -> "ResultArrays":
+        """Columns of a result in either shape"""
+        scalars = dict(status=result.status, total_cost=result.total_cost,
+                       objective_value=result.objective_value,
+                       total_curtailment=result.total_curtailment, iterations=result.iterations,
+                       presolve_resolves=result.presolve_resolves)
+        if isinstance(result, ColumnarOPFResult):
+            columns = {name: getattr(result, name) for name in GEN_FIELDS + BUS_FIELDS + LINE_FIELDS}
+            return cls(**scalars, **columns)
+
+        records = (
+            (result.generator_results, GEN_FIELDS, ("id", "bus", "pg", "qg", "cost")),
+            (result.bus_results, BUS_FIELDS, ("bus", "va", "vm", "pl", "ql", "marginal_cost", "curtailment")),
+            (result.line_results, LINE_FIELDS, ("from_bus", "to_bus", "flow_mw", "flow_mvar",
+                                                "loading_percent", "congestion_rent")),
+        )
+        columns = {
+            name: [getattr(item, attr) for item in items]
+            for items, names, attrs in records for name, attr in zip(names, attrs)
+        }
+        return cls(**scalars, **columns)
+
+    def _scalars(self) -> dict:
+        return dict(status=self.status, total_cost=self.total_cost,
+                    objective_value=self.objective_value,
+                    total_curtailment=self.total_curtailment, iterations=self.iterations,
+                    presolve_resolves=self.presolve_resolves)
+
+    def _lists(self, names) -> list:
+        return [self.columns[name].tolist() if isinstance(self.columns[name], np.ndarray)
+                else list(self.columns[name]) for name in names]
+
+    def to_columns(self) -> ColumnarOPFResult:
+        """Parallel-array result"""
+        fields = GEN_FIELDS + BUS_FIELDS + LINE_FIELDS
+        return ColumnarOPFResult(**self._scalars(), **dict(zip(fields, self._lists(fields))))
+
+    def to_result(self) -> OPFResult:
+        """One result object per element"""
+        generators = [
+            GeneratorResult(id=gid, bus=bus, pg=pg, qg=qg, cost=cost)
+            for gid, bus, pg, qg, cost in zip(*self._lists(GEN_FIELDS))
+        ]
+        buses = [
+            BusResult(bus=bus, va=va, vm=vm, pl=pl, ql=ql, marginal_cost=mc, curtailment=c)
+            for bus, va, vm, pl, ql, mc, c in zip(*self._lists(BUS_FIELDS))
+        ]
+        lines = [
+            LineResult(from_bus=f, to_bus=t, flow_mw=p, flow_mvar=q, loading_percent=loading,
+                       congestion_rent=rent)
+            for f, t, p, q, loading, rent in zip(*self._lists(LINE_FIELDS))
+        ]
+        return OPFResult(generator_results=generators, bus_results=buses, line_results=lines,
+                         **self._scalars())
+
+    def build(self, result_format: str = "records") -> Union[OPFResult, ColumnarOPFResult]:
+        if result_format not in RESULT_FORMATS:
+            raise ValueError(f"Unknown result format {result_format!r}, expected one of {RESULT_FORMATS}")
+        return self.to_columns() if result_format == "columns" else self.to_result()
+
+
+def element_results(case: CaseArrays, net: NetworkModel, theta: np.ndarray, pg_mw: np.ndarray,
+                    Pg_bus_pu: np.ndarray, Pd_pu: np.ndarray, lmp: Optional[np.ndarray],
+                    curtailment_mw: np.ndarray, base_mva: float) -> dict:
+    """
+    Generator, bus and branch result columns.
+
+    Branch angle differences and LMP spreads come from one product with the
+    branch-bus incidence matrix of the in-service branches. Out-of-service
+    branches are reported with zero flow; in-service branches with an unknown
+    end bus are left out.
+    """
+    n_bus, n_line = case.n_bus, case.n_line
+    active = net.active_lines
+    lmp = np.zeros(n_bus) if lmp is None else np.asarray(lmp, dtype=float)
+
+    # Branch flows (from -> to) and congestion rent (LMP_to - LMP_from) * flow
+    x = case.x[active]
+    rate = case.rate_a[active]
+    flow_active = (net.incidence @ theta) / np.where(x > 0, x, REPORT_MIN_REACTANCE) * base_mva
+    flow = np.zeros(n_line)
+    loading = np.zeros(n_line)
+    rent = np.zeros(n_line)
+    flow[active] = flow_active
+    loading[active] = np.abs(flow_active) / np.where(rate > 0, rate, DEFAULT_RATE_MW) * 100
+    rent[active] = -(net.incidence @ lmp) * flow_active
+    reported = ~net.line_in_service | net.line_connected
+
+    pg_mw = np.asarray(pg_mw, dtype=float)
+    return dict(
+        gen_id=case.gen_id,
+        gen_bus=case.gen_bus,
+        gen_pg=pg_mw,
+        gen_qg=np.zeros(case.n_gen),
+        gen_cost=polynomial_cost(case.gen_cost, pg_mw),
+        bus=case.bus_id,
+        bus_va=np.degrees(theta[:n_bus]),
+        bus_vm=case.v_mag,
+        bus_pl=(Pg_bus_pu[:n_bus] - Pd_pu[:n_bus]) * base_mva,
+        bus_ql=np.zeros(n_bus),
+        bus_marginal_cost=lmp[:n_bus],
+        bus_curtailment=np.asarray(curtailment_mw, dtype=float)[:n_bus],
+        line_from=case.line_from[reported],
+        line_to=case.line_to[reported],
+        line_flow_mw=flow[reported],
+        line_flow_mvar=np.zeros(int(np.count_nonzero(reported))),
+        line_loading_percent=loading[reported],
+        line_congestion_rent=rent[reported],
+    )
+
+
+def columns_to_result(result: ColumnarOPFResult) -> OPFResult:
+    """Per-element records for a columnar result"""
+    return ResultArrays.from_result(result).to_result()
+
+
+def as_opf_result(result: Union[OPFResult, ColumnarOPFResult]) -> OPFResult:
+    """Accept either result shape and return the per-element one"""
+    return columns_to_result(result) if isinstance(result, ColumnarOPFResult) else result
@@ -0,0 +1,207 @@
+"""
+Batch scenario OPF
+Applies load/cost/outage perturbations to a base case and solves the
+scenarios in parallel across a process pool
+"""
+
+import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+from app.models.schemas import CaseData, Load, Scenario, BatchOPFResult, OPFResult
+
+logger = logging.getLogger(__name__)
+
+# Scenarios per worker task; keeps per-task pickling overhead small while
+# letting each worker reuse its compiled network across the chunk
+DEFAULT_CHUNK_SIZE = 8
+
+
+def apply_scenario(case: CaseData, scenario: Scenario) -> CaseData:
+    """Return a copy of the base case with the scenario perturbations applied"""
+    loads = case.loads
+    if scenario.load_scale != 1.0 or scenario.load_overrides:
+        overrides = scenario.load_overrides
+        loads = [
+            load.model_copy(update={"pd": load.pd * scenario.load_scale})
+            for load in case.loads if load.bus not in overrides
+        ]
+        loads.extend(Load(bus=bus, pd=pd) for bus, pd in overrides.items())
+
+    generators = case.generators
+    if scenario.cost_overrides or scenario.gen_outages:
+        known = {g.id for g in case.generators}
+        unknown = (set(scenario.cost_overrides) | set(scenario.gen_outages)) - known
+        if unknown:
+            raise ValueError(f"Unknown generator IDs: {sorted(unknown)}")
+        outages = set(scenario.gen_outages)
+        generators = []
+        for g in case.generators:
+            update = {}
+            if g.id in scenario.cost_overrides:
+                update["cost"] = list(scenario.cost_overrides[g.id])
+            if g.id in outages:
+                update["status"] = 0
+            generators.append(g.model_copy(update=update) if update else g)
+
+    lines = case.lines
+    if scenario.line_outages:
+        lines = list(case.lines)
+        for idx in scenario.line_outages:
+            if idx < 0 or idx >= len(lines):
+                raise ValueError(f"Line outage index {idx} out of range")
+            lines[idx] = lines[idx].model_copy(update={"status": 0})
+
+    return CaseData(
+        buses=case.buses,
+        generators=generators,
+        lines=lines,
+        loads=loads,
+        base_mva=case.base_mva
+    )
+
+
+def result_columns(case: CaseData, result: OPFResult) -> dict:
+    """
+    Align one OPF result with the element order of the base case.
+    Elements dropped from the solve (isolated buses and what connects to them)
+    are reported as None.
+    """
+    bus_pos = {b.bus: k for k, b in enumerate(result.bus_results)}
+
+    lmp = [None] * len(case.buses)
+    curtailment = [None] * len(case.buses)
+    for i, bus in enumerate(case.buses):
+        k = bus_pos.get(bus.id)
+        if k is not None:
+            lmp[i] = result.bus_results[k].marginal_cost
+            curtailment[i] = result.bus_results[k].curtailment
+
+    # Generators and lines are reported in case order, restricted to solved buses
+    pg = [None] * len(case.generators)
+    gen_iter = iter(result.generator_results)
+    for i, g in enumerate(case.generators):
+        if g.bus in bus_pos:
+            pg[i] = next(gen_iter).pg
+
+    flow = [None] * len(case.lines)
+    line_iter = iter(result.line_results)
+    for i, line in enumerate(case.lines):
+        if line.from_bus in bus_pos and line.to_bus in bus_pos:
+            flow[i] = next(line_iter).flow_mw
+
+    return {
+        "status": result.status,
+        "error": None,
+        "total_cost": result.total_cost,
+        "objective_value": result.objective_value,
+        "total_curtailment": result.total_curtailment,
+        "pg": pg,
+        "lmp": lmp,
+        "curtailment": curtailment,
+        "flow": flow,
+    }
+
+
+def _error_columns(case: CaseData, message: str) -> dict:
+    return {
+        "status": "error",
+        "error": message,
+        "total_cost": None,
+        "objective_value": None,
+        "total_curtailment": None,
+        "pg": [None] * len(case.generators),
+        "lmp": [None] * len(case.buses),
+        "curtailment": [None] * len(case.buses),
+        "flow": [None] * len(case.lines),
+    }
+
+
+def solve_scenario_chunk(case: CaseData, scenarios: List[Scenario], voll: float,
+                         enforce_line_limits: bool, remove_isolated: bool) -> List[dict]:
+    """Solve a list of scenarios sequentially (one worker task)"""
+    from app.solver.opf_solver import DCOPSolver
+
+    solver = DCOPSolver()
+    columns = []
+    for scenario in scenarios:
+        try:
+            scenario_case = apply_scenario(case, scenario)
+            result = solver.solve(
+                scenario_case,
+                voll=scenario.voll if scenario.voll is not None else voll,
+                enforce_line_limits=enforce_line_limits,
+                remove_isolated=remove_isolated
+            )
+            columns.append(result_columns(case, result))
+        except Exception as e:
+            logger.warning(f"Scenario {scenario.name!r} failed: {e}")
+            columns.append(_error_columns(case, str(e)))
+    return columns
+
+
+def solve_scenarios(case: CaseData, scenarios: List[Scenario], voll: float = 10000.0,
+                    enforce_line_limits: bool = True, remove_isolated: bool = False,
+                    max_workers: Optional[int] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    progress: Optional[Callable[[int, int], None]] = None) -> BatchOPFResult:
+    """
+    Solve every scenario against the base case and collect columnar results.
+    Runs in-process for a single worker or a single chunk, otherwise across a
+    process pool. progress(done, total) is called after each chunk; an
+    exception raised from it aborts the batch.
+    """
+    chunks = [scenarios[i:i + chunk_size] for i in range(0, len(scenarios), chunk_size)]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(chunks)))
+
+    done = 0
+    if max_workers == 1:
+        per_chunk = []
+        for chunk in chunks:
+            per_chunk.append(
+                solve_scenario_chunk(case, chunk, voll, enforce_line_limits, remove_isolated)
+            )
+            done += len(chunk)
+            if progress is not None:
+                progress(done, len(scenarios))
+    else:
+        logger.info(f"Solving {len(scenarios)} scenarios on {max_workers} worker processes")
+        # spawn avoids forking a multi-threaded server process
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+            futures = [
+                pool.submit(solve_scenario_chunk, case, chunk, voll,
+                            enforce_line_limits, remove_isolated)
+                for chunk in chunks
+            ]
+            per_chunk = []
+            try:
+                for chunk, f in zip(chunks, futures):
+                    per_chunk.append(f.result())
+                    done += len(chunk)
+                    if progress is not None:
+                        progress(done, len(scenarios))
+            except BaseException:
+                for f in futures:
+                    f.cancel()
+                raise
+
+    rows = [row for chunk in per_chunk for row in chunk]
+    columns = {
+        field: [row[field] for row in rows]
+        for field in ("status", "error", "total_cost", "objective_value", "total_curtailment",
+                      "pg", "lmp", "curtailment", "flow")
+    }
+
+    return BatchOPFResult(
+        scenarios=[s.name if s.name is not None else str(i) for i, s in enumerate(scenarios)],
+        bus_ids=[b.id for b in case.buses],
+        gen_ids=[g.id for g in case.generators],
+        line_from=[line.from_bus for line in case.lines],
+        line_to=[line.to_bus for line in case.lines],
+        **columns
+    )
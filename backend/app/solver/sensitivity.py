@@ -0,0 +1,241 @@
+"""
+DC sensitivity factors
+PTDF and LODF computed on demand from a sparse LU factorization of the
+reduced susceptance matrix, cached per topology
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.sparse.linalg import splu
+
+from app.models.schemas import CaseData
+from app.models.arrays import CaseArrays
+from app.solver.network import NetworkModel, get_network_model
+
+# Factorized topologies kept in memory
+SENSITIVITY_CACHE_SIZE = 8
+
+# Memory for PTDF rows/columns and LODF columns kept per factorized topology
+VECTOR_CACHE_MB = 64
+
+# Largest PTDF/LODF block returned by the API (lines x buses or lines x outages)
+MAX_BLOCK_ENTRIES = 5_000_000
+
+# An outage with |1 - PTDF_mm| below this splits its island (LODF undefined)
+ISLANDING_TOL = 1e-8
+
+
+def sensitivity_key(net: NetworkModel) -> str:
+    """Hash of the data that determines the sensitivities (not loads, ratings or voltages)"""
+    h = hashlib.blake2b(digest_size=16)
+    for arr in (net.bus_ids, net.bus_type, net.b_shunt, net.line_from, net.line_to,
+                net.line_x, net.line_status):
+        arr = np.ascontiguousarray(arr)
+        h.update(str(arr.shape).encode())
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+class SensitivityModel:
+    """
+    Sparse LU of the susceptance matrix with the reference bus of every island
+    removed. An injection at a bus is withdrawn at its island's reference bus.
+
+    Factors use the same network equations as the OPF (in-service branches,
+    nodal shunts on the diagonal) and are indexed by bus position and by
+    position in the case line list; branches out of service or with an unknown
+    end bus have zero sensitivity.
+    """
+
+    def __init__(self, key: str, net: NetworkModel):
+        self.key = key
+        self.n_bus = net.n_bus
+        self.n_line = len(net.line_from)
+        self.bus_ids = net.bus_ids
+        self.line_from = net.line_from
+        self.line_to = net.line_to
+
+        self.active_lines = net.active_lines
+        self.from_idx = net.from_idx
+        self.to_idx = net.to_idx
+        self.susceptances = net.susceptances
+        self.incidence = net.incidence
+        self._active_pos = np.full(self.n_line, -1, dtype=np.int64)
+        self._active_pos[self.active_lines] = np.arange(len(self.active_lines))
+
+        self.refs = np.unique(net.island_refs)
+        keep = np.ones(self.n_bus, dtype=bool)
+        keep[self.refs] = False
+        self._keep = np.flatnonzero(keep)
+        B_reduced = net.B[self._keep][:, self._keep].tocsc()
+        self._lu = splu(B_reduced) if len(self._keep) else None
+
+        self._vectors: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._vector_bytes = 0
+        self._lock = threading.Lock()
+
+    # ----- factor solves -----
+
+    def angles(self, injections: np.ndarray) -> np.ndarray:
+        """Angles (n_bus, k) for injections (n_bus, k); reference buses fixed at zero"""
+        theta = np.zeros(injections.shape)
+        if self._lu is not None:
+            theta[self._keep] = self._lu.solve(np.ascontiguousarray(injections[self._keep]))
+        return theta
+
+    def line_flows(self, theta: np.ndarray) -> np.ndarray:
+        """Flows (n_line, k) for angles (n_bus, k); inactive branches carry zero"""
+        flows = np.zeros((self.n_line, theta.shape[1]))
+        flows[self.active_lines] = self.susceptances[:, None] * (self.incidence @ theta)
+        return flows
+
+    def flows(self, injections: np.ndarray) -> np.ndarray:
+        """Branch flows for one nodal injection vector (same units in and out)"""
+        return self.line_flows(self.angles(np.asarray(injections, dtype=float)[:, None]))[:, 0]
+
+    def _cached(self, kind: str, keys: Sequence[int], compute) -> np.ndarray:
+        """Stack cached vectors for keys, computing the missing ones in one batch"""
+        with self._lock:
+            found = {k: self._vectors.get((kind, k)) for k in keys}
+        missing = sorted({k for k, v in found.items() if v is None})
+        if missing:
+            new = compute(np.asarray(missing, dtype=np.int64))
+            with self._lock:
+                for i, k in enumerate(missing):
+                    found[k] = vector = np.ascontiguousarray(new[:, i])
+                    old = self._vectors.pop((kind, k), None)
+                    self._vector_bytes += vector.nbytes - (old.nbytes if old is not None else 0)
+                    self._vectors[(kind, k)] = vector
+                while self._vectors and self._vector_bytes > VECTOR_CACHE_MB * 1024 * 1024:
+                    _, evicted = self._vectors.popitem(last=False)
+                    self._vector_bytes -= evicted.nbytes
+        if not keys:
+            return np.zeros((0, 0))
+        return np.column_stack([found[k] for k in keys])
+
+    # ----- PTDF -----
+
+    def ptdf_columns(self, buses: np.ndarray) -> np.ndarray:
+        """Uncached PTDF columns [line, k] for bus positions"""
+        injections = np.zeros((self.n_bus, len(buses)))
+        injections[buses, np.arange(len(buses))] = 1.0
+        return self.line_flows(self.angles(injections))
+
+    def ptdf_rows(self, lines: np.ndarray) -> np.ndarray:
+        """Uncached PTDF rows, transposed to [bus, k], for line positions"""
+        # B is symmetric: row l of PTDF is b_l (e_from - e_to)' B_r^-1
+        rhs = np.zeros((self.n_bus, len(lines)))
+        pos = self._active_pos[lines]
+        cols = np.flatnonzero(pos >= 0)
+        rhs[self.from_idx[pos[cols]], cols] += self.susceptances[pos[cols]]
+        rhs[self.to_idx[pos[cols]], cols] -= self.susceptances[pos[cols]]
+        return self.angles(rhs)
+
+    def ptdf(self, lines: Optional[Sequence[int]] = None,
+             buses: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        PTDF block [line, bus]: MW flow on each line per MW injected at each
+        bus (by position) and withdrawn at the island reference. Solves whichever
+        orientation (rows or columns) needs fewer factor solves.
+        """
+        lines = list(range(self.n_line)) if lines is None else [int(l) for l in lines]
+        buses = list(range(self.n_bus)) if buses is None else [int(b) for b in buses]
+        if not lines or not buses:
+            return np.zeros((len(lines), len(buses)))
+        if len(lines) <= len(buses):
+            rows = self._cached("ptdf_row", lines, self.ptdf_rows)
+            return rows[buses, :].T
+        columns = self._cached("ptdf_col", buses, self.ptdf_columns)
+        return columns[lines, :]
+
+    # ----- LODF -----
+
+    def lodf_columns(self, outages: np.ndarray) -> np.ndarray:
+        """Uncached LODF columns [line, k] for outaged line positions (NaN when islanding)"""
+        # Flows for a 1 pu transfer across each outaged branch
+        injections = np.zeros((self.n_bus, len(outages)))
+        pos = self._active_pos[outages]
+        cols = np.flatnonzero(pos >= 0)
+        injections[self.from_idx[pos[cols]], cols] += 1.0
+        injections[self.to_idx[pos[cols]], cols] -= 1.0
+        transfer = self.line_flows(self.angles(injections))
+
+        lodf = np.zeros((self.n_line, len(outages)))
+        for c in cols:
+            m = outages[c]
+            denominator = 1.0 - transfer[m, c]
+            if abs(denominator) < ISLANDING_TOL:
+                lodf[:, c] = np.nan
+            else:
+                lodf[:, c] = transfer[:, c] / denominator
+                lodf[m, c] = -1.0
+        return lodf
+
+    def lodf(self, lines: Optional[Sequence[int]] = None,
+             outages: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        LODF block [line, outage]: change in MW flow on each line per MW of
+        pre-outage flow on the outaged line. Returns (lodf, islanding); columns of
+        outages that split an island are NaN and flagged in islanding.
+        Outages of branches already out of service give zero columns.
+        """
+        lines = list(range(self.n_line)) if lines is None else [int(l) for l in lines]
+        outages = list(range(self.n_line)) if outages is None else [int(m) for m in outages]
+        if not outages:
+            return np.zeros((len(lines), 0)), np.zeros(0, dtype=bool)
+        columns = self._cached("lodf", outages, self.lodf_columns)
+        islanding = np.isnan(columns).any(axis=0) if self.n_line else np.zeros(len(outages), dtype=bool)
+        return columns[lines, :], islanding
+
+    # ----- indexing helpers -----
+
+    def bus_positions(self, ids: Sequence[int]) -> np.ndarray:
+        """Positions of bus IDs, raising ValueError for unknown IDs"""
+        index = {int(b): i for i, b in enumerate(self.bus_ids.tolist())}
+        missing = [b for b in ids if int(b) not in index]
+        if missing:
+            raise ValueError(f"Unknown bus {missing[0]}")
+        return np.array([index[int(b)] for b in ids], dtype=np.int64)
+
+    def check_lines(self, lines: Sequence[int]):
+        bad = [l for l in lines if not 0 <= int(l) < self.n_line]
+        if bad:
+            raise ValueError(f"Line position {bad[0]} out of range (case has {self.n_line} lines)")
+
+
+_sensitivity_cache: "OrderedDict[str, SensitivityModel]" = OrderedDict()
+_sensitivity_cache_lock = threading.Lock()
+
+
+def get_sensitivity_model(case: Union[CaseData, CaseArrays, NetworkModel]) -> SensitivityModel:
+    """
+    Return the factorized sensitivity model for a case, reusing a cached one
+    when a case with identical topology and reactances was factorized before.
+    """
+    net = case if isinstance(case, NetworkModel) else get_network_model(case)
+    key = sensitivity_key(net)
+
+    with _sensitivity_cache_lock:
+        model = _sensitivity_cache.get(key)
+        if model is not None:
+            _sensitivity_cache.move_to_end(key)
+            return model
+
+    model = SensitivityModel(key, net)
+
+    with _sensitivity_cache_lock:
+        _sensitivity_cache[key] = model
+        _sensitivity_cache.move_to_end(key)
+        while len(_sensitivity_cache) > SENSITIVITY_CACHE_SIZE:
+            _sensitivity_cache.popitem(last=False)
+    return model
+
+
+def clear_sensitivity_cache():
+    """Drop all factorized topologies"""
+    with _sensitivity_cache_lock:
+        _sensitivity_cache.clear()
@@ -0,0 +1,324 @@
+"""
+Time-series OPF sweep
+Independent hourly OPFs of one network driven by load and availability
+profiles streamed from CSV. Hours are solved in chunks (in-process or
+across a process pool) and results are appended to CSV files on disk as
+chunks finish, so memory stays bounded for year-long studies.
+"""
+
+import os
+import csv
+import copy
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from app.export import ChunkedCSVWriter
+from app.models.arrays import CaseArrays, as_case_arrays
+from app.models.schemas import CaseData, SweepResult
+
+logger = logging.getLogger(__name__)
+
+# Hours per worker task; each worker keeps its network and solver workspace
+# across chunks, so chunks only need to be large enough to hide task overhead
+DEFAULT_CHUNK_SIZE = 168
+
+# Chunks in flight per worker; bounds the results held in memory
+CHUNKS_PER_WORKER = 2
+
+# Profile column prefixes
+LOAD_SCALE = "load_scale"
+LOAD_PREFIX = "load:"
+GEN_PREFIX = "gen:"
+
+OUTPUT_FILES = ("summary.csv", "pg.csv", "lmp.csv", "curtailment.csv", "flow.csv")
+
+
+class ProfileChunk:
+    """
+    Consecutive profile rows as arrays. Empty cells are NaN and leave the
+    base case value in place.
+    """
+
+    def __init__(self, labels: List[str], scale: np.ndarray, load_buses: np.ndarray,
+                 load_pd: np.ndarray, gen_pos: np.ndarray, gen_avail: np.ndarray):
+        self.labels = labels
+        self.scale = scale          # (n,) load multiplier
+        self.load_buses = load_buses
+        self.load_pd = load_pd      # (n, len(load_buses)) MW, replaces the bus demand
+        self.gen_pos = gen_pos
+        self.gen_avail = gen_avail  # (n, len(gen_pos)) MW, caps pmax
+
+    def __len__(self):
+        return len(self.labels)
+
+
+def _float(cell: str) -> float:
+    cell = cell.strip()
+    return float(cell) if cell else np.nan
+
+
+def iter_profile_chunks(lines: Iterable[str], case: CaseArrays,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[ProfileChunk]:
+    """
+    Parse a profile CSV lazily into chunks of chunk_size rows.
+
+    The header names the columns: load_scale (multiplier of every load),
+    load:<bus ID> (demand in MW, replacing the loads at that bus) and
+    gen:<generator ID> (available capacity in MW). A first column with any
+    other name labels the rows (e.g. a timestamp); rows are numbered otherwise.
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if not header:
+        raise ValueError("Profile CSV is empty")
+    header = [name.strip() for name in header]
+
+    has_label = header[0] != LOAD_SCALE and not header[0].startswith((LOAD_PREFIX, GEN_PREFIX))
+    columns = header[1:] if has_label else header
+    gen_index = {gid: k for k, gid in enumerate(case.gen_id.tolist())}
+    scale_col, load_cols, load_buses, gen_cols, gen_pos = None, [], [], [], []
+    for k, name in enumerate(columns):
+        if name == LOAD_SCALE:
+            scale_col = k
+        elif name.startswith(LOAD_PREFIX):
+            try:
+                load_buses.append(int(name[len(LOAD_PREFIX):]))
+            except ValueError:
+                raise ValueError(f"Invalid bus ID in profile column {name!r}")
+            load_cols.append(k)
+        elif name.startswith(GEN_PREFIX):
+            gid = name[len(GEN_PREFIX):]
+            if gid not in gen_index:
+                raise ValueError(f"Unknown generator in profile column {name!r}")
+            gen_pos.append(gen_index[gid])
+            gen_cols.append(k)
+        else:
+            raise ValueError(f"Unknown profile column {name!r}")
+    unknown = np.setdiff1d(load_buses, case.bus_id)
+    if len(unknown):
+        raise ValueError(f"Unknown bus in profile column 'load:{unknown[0]}'")
+
+    load_buses = np.asarray(load_buses, dtype=np.int64)
+    gen_pos = np.asarray(gen_pos, dtype=np.int64)
+    row_number = 0
+    while True:
+        labels, values = [], []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != len(header):
+                raise ValueError(f"Profile row {row_number + len(labels) + 1} has {len(row)} "
+                                 f"columns, expected {len(header)}")
+            if has_label:
+                labels.append(row[0])
+                row = row[1:]
+            else:
+                labels.append(str(row_number + len(labels)))
+            values.append([_float(cell) for cell in row])
+            if len(labels) == chunk_size:
+                break
+        if not labels:
+            return
+        row_number += len(labels)
+
+        values = np.array(values, dtype=float).reshape(len(labels), len(columns))
+        scale = values[:, scale_col] if scale_col is not None else np.ones(len(labels))
+        yield ProfileChunk(labels, np.where(np.isnan(scale), 1.0, scale), load_buses,
+                           values[:, load_cols], gen_pos, values[:, gen_cols])
+
+
+def hourly_case(case: CaseArrays, chunk: ProfileChunk, i: int) -> CaseArrays:
+    """The base case with row i of the profile applied (shares unchanged columns)"""
+    hour = copy.copy(case)
+    pd = case.load_pd * chunk.scale[i]
+    given = ~np.isnan(chunk.load_pd[i])
+    if given.any():
+        buses = chunk.load_buses[given]
+        keep = ~np.isin(case.load_bus, buses)
+        hour.load_bus = np.concatenate([case.load_bus[keep], buses])
+        hour.load_pd = np.concatenate([pd[keep], chunk.load_pd[i][given]])
+        hour.load_qd = np.concatenate([case.load_qd[keep], np.zeros(len(buses))])
+    else:
+        hour.load_pd = pd
+
+    avail = chunk.gen_avail[i]
+    given = ~np.isnan(avail)
+    if given.any():
+        pos = chunk.gen_pos[given]
+        hour.pmax = case.pmax.copy()
+        hour.pmin = case.pmin.copy()
+        hour.pmax[pos] = np.clip(avail[given], 0.0, case.pmax[pos])
+        hour.pmin[pos] = np.minimum(case.pmin[pos], hour.pmax[pos])
+    return hour
+
+
+class SweepChunk:
+    """Results of a profile chunk as [hour][element] arrays; failed hours are NaN"""
+
+    def __init__(self, case: CaseArrays, labels: List[str]):
+        n = len(labels)
+        self.labels = labels
+        self.status = ["error"] * n
+        self.error: List[Optional[str]] = [None] * n
+        self.total_cost = np.full(n, np.nan)
+        self.total_curtailment = np.full(n, np.nan)
+        self.pg = np.full((n, case.n_gen), np.nan)
+        self.lmp = np.full((n, case.n_bus), np.nan)
+        self.curtailment = np.full((n, case.n_bus), np.nan)
+        self.flow = np.full((n, case.n_line), np.nan)
+
+
+def solve_profile_chunk(case: CaseArrays, chunk: ProfileChunk, voll: float,
+                        enforce_line_limits: bool) -> SweepChunk:
+    """Solve the hours of a chunk sequentially, reusing the compiled network and workspace"""
+    from app.solver.opf_solver import DCOPSolver
+
+    solver = DCOPSolver()
+    out = SweepChunk(case, chunk.labels)
+    for i in range(len(chunk)):
+        try:
+            result = solver.solve(hourly_case(case, chunk, i), voll=voll,
+                                  enforce_line_limits=enforce_line_limits, result_format="columns")
+        except Exception as e:
+            logger.warning(f"Sweep hour {chunk.labels[i]!r} failed: {e}")
+            out.error[i] = str(e)
+            continue
+        out.status[i] = result.status
+        out.total_cost[i] = result.total_cost
+        out.total_curtailment[i] = result.total_curtailment
+        out.pg[i] = result.gen_pg
+        out.lmp[i] = result.bus_marginal_cost
+        out.curtailment[i] = result.bus_curtailment
+        out.flow[i] = result.line_flow_mw
+    return out
+
+
+# Worker-process state: the base case is sent once, when the worker starts
+_worker_args = None
+
+
+def _init_worker(case: CaseArrays, voll: float, enforce_line_limits: bool):
+    global _worker_args
+    logging.disable(logging.WARNING)
+    _worker_args = (case, voll, enforce_line_limits)
+
+
+def _solve_in_worker(chunk: ProfileChunk) -> SweepChunk:
+    case, voll, enforce_line_limits = _worker_args
+    return solve_profile_chunk(case, chunk, voll, enforce_line_limits)
+
+
+class SweepWriter:
+    """
+    Appends sweep results to CSV files in output_dir: a per-hour summary and
+    one wide file per quantity (a row per hour, a column per element)
+    """
+
+    def __init__(self, output_dir: str, case: CaseArrays):
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.paths = [os.path.join(output_dir, name) for name in OUTPUT_FILES]
+        self._files = [open(path, "w", newline="") for path in self.paths]
+        self._writers = [ChunkedCSVWriter() for _ in self._files]
+
+        lines = [f"{f}-{t}" for f, t in zip(case.line_from.tolist(), case.line_to.tolist())]
+        headers = [
+            ["period", "status", "total_cost", "total_curtailment", "error"],
+            ["period"] + [str(g) for g in case.gen_id.tolist()],
+            ["period"] + case.bus_id.tolist(),
+            ["period"] + case.bus_id.tolist(),
+            ["period"] + lines,
+        ]
+        for k, header in enumerate(headers):
+            self._write(k, [header])
+
+    def _write(self, k: int, rows):
+        for text in self._writers[k].rows(rows):
+            self._files[k].write(text)
+
+    def append(self, chunk: SweepChunk):
+        labels = chunk.labels
+        self._write(0, zip(labels, chunk.status, chunk.total_cost.tolist(),
+                           chunk.total_curtailment.tolist(), chunk.error))
+        for k, values in enumerate((chunk.pg, chunk.lmp, chunk.curtailment, chunk.flow), start=1):
+            self._write(k, ([label] + row for label, row in zip(labels, values.tolist())))
+
+    def close(self):
+        for writer, f in zip(self._writers, self._files):
+            for text in writer.flush():
+                f.write(text)
+            f.close()
+
+
+def run_sweep(case: Union[CaseData, CaseArrays], profile_lines: Iterable[str], output_dir: str,
+              voll: float = 10000.0, enforce_line_limits: bool = True,
+              max_workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              total_hours: Optional[int] = None,
+              progress: Optional[Callable[[int, int], None]] = None) -> SweepResult:
+    """
+    Solve one OPF per profile row and write the results to output_dir.
+
+    Profile rows are read and solved chunk by chunk; results are written in
+    profile order. Runs in-process for a single worker, otherwise across a
+    process pool with at most CHUNKS_PER_WORKER chunks per worker in flight.
+    progress(done, total_hours) is called after each chunk when total_hours
+    is known; an exception raised from it aborts the sweep.
+    """
+    case = as_case_arrays(case)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if total_hours is not None:
+        max_workers = min(max_workers, -(-total_hours // chunk_size))
+    max_workers = max(1, max_workers)
+
+    chunks = iter_profile_chunks(profile_lines, case, chunk_size)
+    writer = SweepWriter(output_dir, case)
+    summary = dict(n_periods=0, n_failed=0, total_cost=0.0, total_curtailment=0.0)
+
+    def collect(result: SweepChunk):
+        writer.append(result)
+        solved = np.array([s != "error" for s in result.status])
+        summary["n_periods"] += len(result.labels)
+        summary["n_failed"] += int(np.sum(~solved))
+        summary["total_cost"] += float(np.sum(result.total_cost[solved]))
+        summary["total_curtailment"] += float(np.sum(result.total_curtailment[solved]))
+        if progress is not None and total_hours:
+            progress(summary["n_periods"], total_hours)
+
+    try:
+        if max_workers == 1:
+            for chunk in chunks:
+                collect(solve_profile_chunk(case, chunk, voll, enforce_line_limits))
+        else:
+            logger.info(f"Sweep on {max_workers} worker processes")
+            # spawn avoids forking a multi-threaded server process
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx,
+                                     initializer=_init_worker,
+                                     initargs=(case, voll, enforce_line_limits)) as pool:
+                in_flight = deque()
+                try:
+                    for chunk in chunks:
+                        in_flight.append(pool.submit(_solve_in_worker, chunk))
+                        if len(in_flight) >= max_workers * CHUNKS_PER_WORKER:
+                            collect(in_flight.popleft().result())
+                    while in_flight:
+                        collect(in_flight.popleft().result())
+                except BaseException:
+                    for f in in_flight:
+                        f.cancel()
+                    raise
+    finally:
+        writer.close()
+
+    logger.info(f"Sweep solved {summary['n_periods']} periods ({summary['n_failed']} failed)")
+    return SweepResult(
+        output_dir=output_dir,
+        files=list(OUTPUT_FILES),
+        **summary
+    )
@@ -0,0 +1,70 @@
+"""
+Solve instrumentation
+Wall time per phase, solver iterations and model size of one solve, cheap
+enough to record on every call
+"""
+
+import time
+from typing import Optional
+
+import scipy.sparse as sp
+
+from app.models.schemas import SolveTimings
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process (MB), None where unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class PhaseTimer:
+    """
+    Accumulates wall time per named phase, in first-use order. Solver
+    helpers add their iteration counts and the size of the constraint
+    matrix they solved (the largest one when there are several solves).
+    """
+
+    def __init__(self):
+        self.started = self._mark = time.perf_counter()
+        self.phases = {}
+        self.solver = None
+        self.solver_iterations = 0
+        self.rows = self.cols = self.nnz = 0
+
+    def lap(self, name: str):
+        """Charge the time since the previous lap (or the start) to name"""
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self._mark
+        self._mark = now
+
+    def record_solve(self, solver: str, iterations: int, *blocks: Optional[sp.spmatrix]):
+        """One solve of the model whose constraint rows are stacked from blocks"""
+        self.solver = solver
+        self.solver_iterations += int(iterations)
+        blocks = [A for A in blocks if A is not None]
+        nnz = sum(int(A.nnz) for A in blocks)
+        if blocks and nnz >= self.nnz:
+            self.rows = sum(A.shape[0] for A in blocks)
+            self.cols = blocks[0].shape[1]
+            self.nnz = nnz
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> SolveTimings:
+        return SolveTimings(
+            total_seconds=self.total,
+            phases=dict(self.phases),
+            solver=self.solver,
+            solver_iterations=self.solver_iterations,
+            rows=self.rows,
+            cols=self.cols,
+            nnz=self.nnz,
+            peak_rss_mb=peak_rss_mb()
+        )
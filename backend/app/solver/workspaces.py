@@ -0,0 +1,358 @@
+"""
+Persistent solver workspaces
+Keeps factorized solver instances per network structure so repeated solves
+only update vectors and warm start from the previous solution (OSQP) or
+hot start from the previous basis (HiGHS)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+
+# Number of solver workspaces kept in memory
+WORKSPACE_CACHE_SIZE = 8
+
+OSQP_SETTINGS = dict(verbose=False, eps_abs=1e-5, eps_rel=1e-5, max_iter=5000)
+
+HIGHS_OPTIONS = dict(output_flag=False)
+
+
+def structure_key(network_key: str, *matrices: sp.spmatrix) -> str:
+    """Key a workspace by network and the sparsity pattern of its matrices"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(network_key.encode())
+    for M in matrices:
+        M = sp.csc_matrix(M)
+        h.update(str(M.shape).encode())
+        h.update(M.indptr.tobytes())
+        h.update(M.indices.tobytes())
+    return h.hexdigest()
+
+
+class WorkspaceCache:
+    """Thread-safe LRU of solver workspaces"""
+
+    def __init__(self, max_size: int = WORKSPACE_CACHE_SIZE):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            ws = self._items.get(key)
+            if ws is not None:
+                self._items.move_to_end(key)
+            return ws
+
+    def put(self, key, ws):
+        with self._lock:
+            self._items[key] = ws
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class OSQPWorkspace:
+    """
+    An OSQP problem set up once for a fixed P/A sparsity pattern.
+    Later solves update q, l, u (and P values when costs change) and warm
+    start from the last primal/dual solution.
+    """
+
+    def __init__(self, P: sp.csc_matrix, q: np.ndarray, A: sp.csc_matrix,
+                 l: np.ndarray, u: np.ndarray, settings: dict = None):
+        import osqp
+
+        self.prob = osqp.OSQP()
+        self.prob.setup(P, q, A, l, u, **(settings or OSQP_SETTINGS))
+        self.Px = P.data.copy()
+        self.Ax = A.data.copy()
+        self.n_rows, self.n_vars = A.shape
+        self.x = None
+        self.y = None
+        self.n_solves = 0
+        self.lock = threading.Lock()
+
+    def solve(self, P: sp.csc_matrix, q: np.ndarray, A: sp.csc_matrix,
+              l: np.ndarray, u: np.ndarray):
+        """Solve with updated data, warm started from the previous solution"""
+        if self.n_solves > 0:
+            matrices = {}
+            # Changed matrix values make OSQP refactor the KKT system
+            if not np.array_equal(P.data, self.Px):
+                matrices["Px"] = P.data
+                self.Px = P.data.copy()
+            if not np.array_equal(A.data, self.Ax):
+                matrices["Ax"] = A.data
+                self.Ax = A.data.copy()
+            self.prob.update(q=q, l=l, u=u, **matrices)
+            if self.x is not None:
+                self.prob.warm_start(x=self.x, y=self.y)
+            else:
+                # Last solve did not converge: don't continue from its iterate
+                self.prob.warm_start(x=np.zeros(self.n_vars), y=np.zeros(self.n_rows))
+
+        res = self.prob.solve()
+        self.n_solves += 1
+
+        if res.info.status == 'solved':
+            self.x = np.array(res.x, copy=True)
+            self.y = np.array(res.y, copy=True)
+        else:
+            self.x = self.y = None
+        return res
+
+
+osqp_workspaces = WorkspaceCache()
+
+
+def solve_osqp(P: sp.csc_matrix, q: np.ndarray, A: sp.csc_matrix, l: np.ndarray,
+               u: np.ndarray, network_key: str = None, warm_start=None, settings: dict = None):
+    """
+    Solve a QP with OSQP, reusing the cached workspace for this network
+    structure when one exists. Returns (result, warm_started).
+
+    warm_start is an optional (x, y) starting point for a one-off problem
+    (no network_key), e.g. a re-solve with rows appended to a solved model;
+    x and y are zero-padded for new variables and rows. settings replace
+    OSQP_SETTINGS and are part of the workspace key.
+    """
+    if network_key is None:
+        ws = OSQPWorkspace(P, q, A, l, u, settings)
+        if warm_start is None:
+            return ws.solve(P, q, A, l, u), False
+        x, y = warm_start
+        x0 = np.zeros(A.shape[1])
+        x0[:len(x)] = x
+        y0 = np.zeros(A.shape[0])
+        y0[:len(y)] = y
+        ws.prob.warm_start(x=x0, y=y0)
+        return ws.solve(P, q, A, l, u), True
+
+    if settings is not None:
+        network_key = f"{network_key}:{sorted(settings.items())}"
+    key = structure_key(network_key, P, A)
+    ws = osqp_workspaces.get(key)
+    if ws is None:
+        ws = OSQPWorkspace(P, q, A, l, u, settings)
+        osqp_workspaces.put(key, ws)
+
+    # A workspace in use by another thread is not shared; solve cold instead
+    if not ws.lock.acquire(blocking=False):
+        return OSQPWorkspace(P, q, A, l, u, settings).solve(P, q, A, l, u), False
+    try:
+        warm = ws.n_solves > 0
+        return ws.solve(P, q, A, l, u), warm
+    finally:
+        ws.lock.release()
+
+
+_highs_core = None
+
+# Parts of the bindings used here; other versions are not used
+HIGHS_API = ("_Highs", "HighsLp", "HighsBasis", "HighsBasisStatus", "HighsModelStatus",
+             "HighsSolution", "MatrixFormat")
+
+
+def highs_bindings():
+    """
+    HiGHS Python bindings: highspy (see requirements.txt), otherwise the copy
+    in SciPy's private _highspy module. None when neither can be imported or
+    the bindings lack part of HIGHS_API.
+    """
+    global _highs_core
+    if _highs_core is None:
+        try:
+            from highspy import _core
+        except ImportError:
+            try:
+                from scipy.optimize._highspy import _core
+            except ImportError:
+                _core = False
+        if _core and not all(hasattr(_core, name) for name in HIGHS_API):
+            _core = False
+        _highs_core = _core
+    return _highs_core or None
+
+
+class LPSolution:
+    """Primal values, row duals and status of a HiGHS solve"""
+
+    def __init__(self, x: np.ndarray, row_dual: np.ndarray, status: str, optimal: bool,
+                 iterations: int, basis=None):
+        self.x = x
+        self.row_dual = row_dual
+        self.status = status
+        self.optimal = optimal
+        self.iterations = iterations
+        self.basis = basis
+
+
+class HighsWorkspace:
+    """
+    A HiGHS LP kept for a fixed constraint pattern:
+    min c'x  s.t.  row_lower <= A x <= row_upper,  lower <= x <= upper.
+    Later solves change only the cost, bound and row-bound entries that
+    differ and hot start simplex from the last basis.
+    """
+
+    def __init__(self, core, c: np.ndarray, A: sp.csc_matrix, row_lower: np.ndarray,
+                 row_upper: np.ndarray, lower: np.ndarray, upper: np.ndarray):
+        self.core = core
+        self.highs = core._Highs()
+        for name, value in HIGHS_OPTIONS.items():
+            self.highs.setOptionValue(name, value)
+        self.n_rows, self.n_vars = A.shape
+        self._pass_model(c, A, row_lower, row_upper, lower, upper)
+        self.n_solves = 0
+        self.lock = threading.Lock()
+
+    def _pass_model(self, c, A, row_lower, row_upper, lower, upper):
+        A = sp.csc_matrix(A)
+        lp = self.core.HighsLp()
+        lp.num_col_ = self.n_vars
+        lp.num_row_ = self.n_rows
+        lp.col_cost_ = c
+        lp.col_lower_ = lower
+        lp.col_upper_ = upper
+        lp.row_lower_ = row_lower
+        lp.row_upper_ = row_upper
+        lp.a_matrix_.format_ = self.core.MatrixFormat.kColwise
+        lp.a_matrix_.num_col_ = self.n_vars
+        lp.a_matrix_.num_row_ = self.n_rows
+        lp.a_matrix_.start_ = A.indptr
+        lp.a_matrix_.index_ = A.indices
+        lp.a_matrix_.value_ = A.data
+        self.highs.passModel(lp)
+        self.c = np.array(c, copy=True)
+        self.Ax = A.data.copy()
+        self.row_lower = np.array(row_lower, copy=True)
+        self.row_upper = np.array(row_upper, copy=True)
+        self.lower = np.array(lower, copy=True)
+        self.upper = np.array(upper, copy=True)
+
+    def set_basis(self, basis):
+        """Start from a basis of this model or of one with fewer rows and columns"""
+        Status = self.core.HighsBasisStatus
+        start = self.core.HighsBasis()
+        cols = list(basis.col_status)
+        rows = list(basis.row_status)
+        # New columns (e.g. overload variables) at their lower bound, new rows basic
+        start.col_status = cols + [Status.kLower] * (self.n_vars - len(cols))
+        start.row_status = rows + [Status.kBasic] * (self.n_rows - len(rows))
+        start.valid = True
+        self.highs.setBasis(start)
+
+    def start_from(self, x: np.ndarray, A: sp.csc_matrix):
+        """Start from a primal point of this model (crossover to a basis)"""
+        start = self.core.HighsSolution()
+        start.col_value = x
+        start.row_value = A @ x
+        start.col_dual = np.zeros(self.n_vars)
+        start.row_dual = np.zeros(self.n_rows)
+        start.value_valid = True
+        start.dual_valid = False
+        self.highs.crossover(start)
+
+    def _update(self, c, A, row_lower, row_upper, lower, upper):
+        A = sp.csc_matrix(A)
+        if not np.array_equal(A.data, self.Ax):
+            # Changed coefficients: pass the model again, keeping the basis
+            basis = self.highs.getBasis()
+            self._pass_model(c, A, row_lower, row_upper, lower, upper)
+            if basis.valid:
+                self.highs.setBasis(basis)
+            return
+
+        changed = np.flatnonzero(c != self.c).astype(np.int32)
+        if len(changed):
+            self.highs.changeColsCost(len(changed), changed, c[changed])
+            self.c = np.array(c, copy=True)
+        changed = np.flatnonzero((lower != self.lower) | (upper != self.upper)).astype(np.int32)
+        if len(changed):
+            self.highs.changeColsBounds(len(changed), changed, lower[changed], upper[changed])
+            self.lower = np.array(lower, copy=True)
+            self.upper = np.array(upper, copy=True)
+        changed = np.flatnonzero((row_lower != self.row_lower) | (row_upper != self.row_upper))
+        for i in changed.tolist():
+            self.highs.changeRowBounds(i, row_lower[i], row_upper[i])
+        if len(changed):
+            self.row_lower = np.array(row_lower, copy=True)
+            self.row_upper = np.array(row_upper, copy=True)
+
+    def solve(self, c: np.ndarray, A: sp.csc_matrix, row_lower: np.ndarray, row_upper: np.ndarray,
+              lower: np.ndarray, upper: np.ndarray) -> LPSolution:
+        """Solve with updated data, hot started from the current basis"""
+        if self.n_solves > 0:
+            self._update(c, A, row_lower, row_upper, lower, upper)
+        self.highs.run()
+        self.n_solves += 1
+
+        status = self.highs.getModelStatus()
+        optimal = status == self.core.HighsModelStatus.kOptimal
+        solution = self.highs.getSolution()
+        basis = self.highs.getBasis()
+        return LPSolution(
+            x=np.array(solution.col_value) if solution.value_valid else None,
+            row_dual=np.array(solution.row_dual) if solution.dual_valid else None,
+            status=self.highs.modelStatusToString(status),
+            optimal=optimal,
+            iterations=int(self.highs.getInfo().simplex_iteration_count),
+            basis=basis if basis.valid else None
+        )
+
+
+highs_workspaces = WorkspaceCache()
+
+
+def solve_highs(c: np.ndarray, A: sp.csc_matrix, row_lower: np.ndarray, row_upper: np.ndarray,
+                lower: np.ndarray, upper: np.ndarray, network_key: str = None,
+                warm_start=None):
+    """
+    Solve an LP with HiGHS, reusing the cached model for this network
+    structure when one exists. Returns (solution, warm_started), or None when
+    no HiGHS bindings are available.
+
+    warm_start is an optional basis (LPSolution.basis) for a one-off problem
+    (no network_key), e.g. a re-solve with rows and columns appended to a
+    solved model; new rows start basic and new columns at their lower bound.
+    It can also be a primal point (an array of column values), which is
+    crossed over to a basis first.
+    """
+    core = highs_bindings()
+    if core is None:
+        return None
+
+    if network_key is None:
+        ws = HighsWorkspace(core, c, A, row_lower, row_upper, lower, upper)
+        if isinstance(warm_start, np.ndarray):
+            ws.start_from(warm_start, sp.csc_matrix(A))
+        elif warm_start is not None:
+            ws.set_basis(warm_start)
+        return ws.solve(c, A, row_lower, row_upper, lower, upper), warm_start is not None
+
+    key = structure_key(network_key, A)
+    ws = highs_workspaces.get(key)
+    if ws is None:
+        ws = HighsWorkspace(core, c, A, row_lower, row_upper, lower, upper)
+        highs_workspaces.put(key, ws)
+
+    # A model in use by another thread is not shared; solve cold instead
+    if not ws.lock.acquire(blocking=False):
+        return HighsWorkspace(core, c, A, row_lower, row_upper, lower, upper).solve(
+            c, A, row_lower, row_upper, lower, upper), False
+    try:
+        warm = ws.n_solves > 0
+        return ws.solve(c, A, row_lower, row_upper, lower, upper), warm
+    finally:
+        ws.lock.release()
@@ -0,0 +1,305 @@
+"""
+Session store
+Holds each client session's working case and last OPF result, with LRU
+eviction under session-count and memory caps. An optional SQLite file
+shares sessions between uvicorn worker processes.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, Union
+
+from app.models.schemas import CaseData, OPFResult, ColumnarOPFResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION = "default"
+
+# Sessions kept (in memory, and in the shared database when configured)
+MAX_SESSIONS = max(1, int(os.environ.get("OPF_MAX_SESSIONS", 64)))
+
+# Approximate memory budget for cases and results held in memory
+MAX_SESSION_MB = float(os.environ.get("OPF_SESSION_MAX_MB", 512))
+
+# SQLite file shared by worker processes; unset keeps sessions in-process only
+SESSION_DB = os.environ.get("OPF_SESSION_DB") or None
+
+# Session fields stored as JSON columns (<field>_json)
+SESSION_FIELDS = ("case", "result")
+
+# Rough in-memory footprint of one parsed bus/generator/line/load or result row
+ELEMENT_BYTES = 1024
+
+
+def estimate_size(obj) -> int:
+    """Approximate memory held by a case or OPF result"""
+    if obj is None:
+        return 0
+    if isinstance(obj, CaseData):
+        n = len(obj.buses) + len(obj.generators) + len(obj.lines) + len(obj.loads)
+    elif isinstance(obj, ColumnarOPFResult):
+        n = len(obj.gen_id) + len(obj.bus) + len(obj.line_from)
+    else:
+        n = len(obj.generator_results) + len(obj.bus_results) + len(obj.line_results)
+    return (n + 1) * ELEMENT_BYTES
+
+
+def _result_from_json(text: str) -> Union[OPFResult, ColumnarOPFResult]:
+    data = json.loads(text)
+    if data.get("shape") == "columns":
+        return ColumnarOPFResult.model_validate(data)
+    return OPFResult.model_validate(data)
+
+
+class Session:
+    """A client's working case and last OPF result"""
+
+    def __init__(self, session_id: str, case: Optional[CaseData] = None,
+                 result: Optional[Union[OPFResult, ColumnarOPFResult]] = None, version: int = 0):
+        self.id = session_id
+        self.case = case
+        self.result = result
+        self.version = version
+
+    @property
+    def size(self) -> int:
+        return estimate_size(self.case) + estimate_size(self.result)
+
+
+class SQLiteSessionBackend:
+    """Sessions serialized as JSON rows in a SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " id TEXT PRIMARY KEY, version INTEGER NOT NULL,"
+                " case_json TEXT, result_json TEXT, accessed REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        # Autocommit: multi-statement writes open their own BEGIN IMMEDIATE transaction
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def version(self, session_id: str) -> Optional[int]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT version FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def load(self, session_id: str) -> Optional[Session]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT version, case_json, result_json FROM sessions WHERE id = ?",
+                (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE sessions SET accessed = ? WHERE id = ?", (time.time(), session_id))
+        version, case_json, result_json = row
+        return Session(
+            session_id,
+            case=CaseData.model_validate_json(case_json) if case_json else None,
+            result=_result_from_json(result_json) if result_json else None,
+            version=version
+        )
+
+    def update(self, session_id: str, fields: dict, cached: Optional[Session], max_sessions: int) -> Session:
+        """
+        Write some fields of a session and return the session at its new
+        version. The version check and the write run in one BEGIN IMMEDIATE
+        transaction, so fields not given keep what another process stored
+        meanwhile; they are taken from cached while it is the stored version.
+        """
+        encoded = {f"{name}_json": value.model_dump_json() if value is not None else None
+                   for name, value in fields.items()}
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT version FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            stored_version = row[0] if row else 0
+            kept = [name for name in SESSION_FIELDS if name not in fields]
+            stored = {}
+            if row is not None and kept and (cached is None or cached.version != stored_version):
+                values = conn.execute(
+                    f"SELECT {', '.join(name + '_json' for name in kept)} FROM sessions WHERE id = ?",
+                    (session_id,)
+                ).fetchone()
+                stored = dict(zip(kept, values))
+            if row is None:
+                conn.execute(
+                    "INSERT INTO sessions (id, version, case_json, result_json, accessed)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (session_id, 1, encoded.get("case_json"), encoded.get("result_json"), time.time())
+                )
+            else:
+                assignments = "".join(f", {column} = ?" for column in encoded)
+                conn.execute(
+                    f"UPDATE sessions SET version = ?, accessed = ?{assignments} WHERE id = ?",
+                    (stored_version + 1, time.time(), *encoded.values(), session_id)
+                )
+            conn.execute(
+                "DELETE FROM sessions WHERE id NOT IN"
+                " (SELECT id FROM sessions ORDER BY accessed DESC LIMIT ?)",
+                (max_sessions,)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        session = Session(session_id, version=stored_version + 1)
+        for name in kept:
+            if name in stored:
+                text = stored[name]
+                decode = CaseData.model_validate_json if name == "case" else _result_from_json
+                setattr(session, name, decode(text) if text else None)
+            elif row is not None and cached is not None:
+                setattr(session, name, getattr(cached, name))
+        for name, value in fields.items():
+            setattr(session, name, value)
+        return session
+
+    def delete(self, session_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+
+class SessionStore:
+    """
+    Per-session case/result storage with LRU eviction.
+
+    Sessions are kept in memory up to max_sessions and max_bytes (estimated).
+    With a database path, every write goes through to SQLite and reads check
+    the stored version, so processes sharing the file see each other's
+    updates; memory then acts as a cache and eviction only drops the copy.
+    Each session has its own lock for database I/O and (de)serialization;
+    the store-wide lock only covers the in-memory LRU bookkeeping.
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, max_mb: float = MAX_SESSION_MB,
+                 db_path: Optional[str] = SESSION_DB):
+        self.max_sessions = max_sessions
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.backend = SQLiteSessionBackend(db_path) if db_path else None
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # session ID -> [lock, number of threads holding or waiting for it]
+        self._session_locks = {}
+
+    @contextmanager
+    def _session_lock(self, session_id: str):
+        with self._lock:
+            entry = self._session_locks.get(session_id)
+            if entry is None:
+                entry = self._session_locks[session_id] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._session_locks[session_id]
+
+    def _cached(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def _get(self, session_id: str) -> Optional[Session]:
+        """Current session (caller holds its session lock)"""
+        session = self._cached(session_id)
+        if self.backend is None:
+            return session
+        stored = self.backend.version(session_id)
+        if stored is None:
+            session = None
+        elif session is None or session.version != stored:
+            session = self.backend.load(session_id)
+        with self._lock:
+            if session is not None:
+                self._remember(session)
+            else:
+                self._forget(session_id)
+        return session
+
+    def _remember(self, session: Session):
+        self._forget(session.id)
+        self._sessions[session.id] = session
+        self._bytes += session.size
+        while len(self._sessions) > 1 and (
+                len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes):
+            evicted_id, evicted = self._sessions.popitem(last=False)
+            self._bytes -= evicted.size
+            logger.info(f"Evicted session {evicted_id!r} from memory")
+
+    def _forget(self, session_id: str):
+        old = self._sessions.pop(session_id, None)
+        if old is not None:
+            self._bytes -= old.size
+
+    def _update(self, session_id: str, **fields):
+        with self._session_lock(session_id):
+            current = self._cached(session_id)
+            if self.backend is not None:
+                session = self.backend.update(session_id, fields, current, self.max_sessions)
+            else:
+                session = Session(
+                    session_id,
+                    case=current.case if current else None,
+                    result=current.result if current else None
+                )
+                for name, value in fields.items():
+                    setattr(session, name, value)
+            with self._lock:
+                self._remember(session)
+
+    def get_case(self, session_id: str = DEFAULT_SESSION) -> Optional[CaseData]:
+        with self._session_lock(session_id):
+            session = self._get(session_id)
+            return session.case if session else None
+
+    def get_result(self, session_id: str = DEFAULT_SESSION) -> Optional[Union[OPFResult, ColumnarOPFResult]]:
+        with self._session_lock(session_id):
+            session = self._get(session_id)
+            return session.result if session else None
+
+    def set_case(self, session_id: str, case: CaseData):
+        self._update(session_id, case=case)
+
+    def set_result(self, session_id: str, case: CaseData,
+                   result: Union[OPFResult, ColumnarOPFResult]):
+        """Store a solved case together with its result"""
+        self._update(session_id, case=case, result=result)
+
+    def delete(self, session_id: str):
+        with self._session_lock(session_id):
+            with self._lock:
+                self._forget(session_id)
+            if self.backend is not None:
+                self.backend.delete(session_id)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+session_store = SessionStore()
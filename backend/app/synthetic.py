@@ -0,0 +1,216 @@
+"""
+Synthetic test networks
+Randomized DC cases of any size for scaling tests: planar meshed
+transmission topology, a mixed generator fleet, loads and line ratings
+sized from a base-case power flow, optionally split into islands
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import minimum_spanning_tree
+from scipy.sparse.linalg import spsolve
+from scipy.spatial import Delaunay
+
+from app.models.arrays import CaseArrays
+
+logger = logging.getLogger(__name__)
+
+# Generator fleet: (share of units, Pmax range (MW), Pmin as a share of Pmax,
+# linear cost range ($/MWh), quadratic cost range ($/MW^2h)). Quadratic
+# terms are in the range of the MATPOWER test cases; wind gets a small one
+# so the QP stays strictly convex
+FLEET = {
+    "nuclear": (0.05, (800.0, 1200.0), 0.5, (6.0, 10.0), (0.002, 0.005)),
+    "coal": (0.20, (200.0, 700.0), 0.3, (18.0, 26.0), (0.01, 0.04)),
+    "combined_cycle": (0.30, (150.0, 500.0), 0.2, (28.0, 40.0), (0.02, 0.06)),
+    "gas_turbine": (0.30, (20.0, 150.0), 0.0, (50.0, 80.0), (0.05, 0.2)),
+    "wind": (0.15, (50.0, 300.0), 0.0, (0.0, 2.0), (0.005, 0.01)),
+}
+
+# Catalogue line ratings (MW); ratings are rounded up to the next one
+STANDARD_RATINGS = np.array([100, 150, 200, 250, 300, 400, 500, 600, 800, 1000, 1200, 1500,
+                             2000, 2500, 3000, 4000, 5000], dtype=float)
+
+COST_MODELS = ("linear", "quadratic")
+
+
+def _island_edges(points: np.ndarray, n_branches: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Branches of one island as (k, 2) local bus indices: a minimum spanning
+    tree of the Delaunay triangulation (so the island is connected) plus the
+    shortest remaining Delaunay edges, with some randomness, up to n_branches
+    """
+    n = len(points)
+    if n < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+    if n < 4:
+        return np.array([(i, i + 1) for i in range(n - 1)], dtype=np.int64)
+
+    simplices = Delaunay(points).simplices
+    edges = np.vstack([simplices[:, [0, 1]], simplices[:, [1, 2]], simplices[:, [0, 2]]])
+    edges = np.unique(np.sort(edges, axis=1), axis=0)
+    length = np.linalg.norm(points[edges[:, 0]] - points[edges[:, 1]], axis=1)
+
+    tree = minimum_spanning_tree(sp.coo_matrix((length, (edges[:, 0], edges[:, 1])), shape=(n, n)))
+    tree = tree.tocoo()
+    in_tree = sp.coo_matrix((np.ones(tree.nnz), (tree.row, tree.col)), shape=(n, n)).tocsr()
+    is_tree = np.asarray(in_tree[edges[:, 0], edges[:, 1]]).ravel() > 0
+    tree_edges = np.sort(np.column_stack([tree.row, tree.col]), axis=1)
+
+    extra = edges[~is_tree]
+    n_extra = min(max(n_branches - len(tree_edges), 0), len(extra))
+    score = length[~is_tree] * rng.lognormal(0.0, 0.5, size=len(extra))
+    chosen = extra[np.argsort(score)[:n_extra]]
+    return np.vstack([tree_edges, chosen]).astype(np.int64)
+
+
+def _fleet(n_gen: int, rng: np.random.Generator, cost_model: str):
+    """Pmax, Pmin and [c2, c1, c0] cost rows of n_gen units drawn from FLEET"""
+    shares = np.array([spec[0] for spec in FLEET.values()])
+    kinds = rng.choice(len(FLEET), size=n_gen, p=shares / shares.sum())
+    pmax, pmin, cost = np.zeros(n_gen), np.zeros(n_gen), np.zeros((n_gen, 3))
+    for k, (_, p_range, min_share, b_range, a_range) in enumerate(FLEET.values()):
+        units = kinds == k
+        m = int(units.sum())
+        pmax[units] = rng.uniform(*p_range, size=m)
+        pmin[units] = min_share * pmax[units]
+        cost[units, 1] = rng.uniform(*b_range, size=m)
+        if cost_model == "quadratic":
+            cost[units, 0] = rng.uniform(*a_range, size=m)
+    return pmax, pmin, cost
+
+
+def _ratings(flow: np.ndarray, rng: np.random.Generator, tight_share: float) -> np.ndarray:
+    """
+    Catalogue ratings above the base-case flows, most with a wide margin and
+    a tight_share of lines rated just above their base flow (so the OPF
+    congests, while the base dispatch stays feasible without curtailment)
+    """
+    margin = rng.uniform(1.3, 2.5, size=len(flow))
+    tight = rng.random(len(flow)) < tight_share
+    margin[tight] = rng.uniform(1.0, 1.1, size=int(tight.sum()))
+    needed = np.abs(flow) * margin
+    index = np.searchsorted(STANDARD_RATINGS, needed)
+    over = index >= len(STANDARD_RATINGS)
+    rating = STANDARD_RATINGS[np.minimum(index, len(STANDARD_RATINGS) - 1)]
+    rating[over] = np.ceil(needed[over] / 500.0) * 500.0
+    return rating
+
+
+def generate_case(n_bus: int, seed: Optional[int] = 0, islands: int = 1, island_share: float = 0.05,
+                  branches_per_bus: float = 1.4, gens_per_bus: float = 0.2, load_share: float = 0.7,
+                  mean_load: float = 60.0, reserve_margin: float = 0.3, cost_model: str = "quadratic",
+                  tight_share: float = 0.05, base_mva: float = 100.0) -> CaseArrays:
+    """
+    Synthetic DC case with n_bus buses (IDs 1..n_bus).
+
+    Buses are scattered in the plane and joined by a planar mesh (Delaunay
+    edges, spanning tree first) with about branches_per_bus branches per
+    bus and reactance proportional to branch length. A load_share of buses
+    carries load (lognormal, mean_load MW); about gens_per_bus units per bus
+    are drawn from FLEET and scaled to reserve_margin above the load of
+    their island, with linear or quadratic costs (cost_model). Line ratings
+    are catalogue values above the flows of a proportional dispatch, a
+    tight_share of them close to it.
+
+    islands > 1 splits island_share of the buses into islands - 1 smaller
+    islands, each with its own slack bus, generation and load. The result
+    converts with .to_case() (CaseData) or app.parser.matpower.format_matpower.
+    """
+    if n_bus < 1:
+        raise ValueError("n_bus must be at least 1")
+    if islands < 1 or islands > n_bus:
+        raise ValueError(f"islands must be between 1 and n_bus, got {islands}")
+    if cost_model not in COST_MODELS:
+        raise ValueError(f"Unknown cost model {cost_model!r}, expected one of {COST_MODELS}")
+    rng = np.random.default_rng(seed)
+
+    # Island sizes: the main grid plus islands - 1 small ones
+    small = np.zeros(islands - 1, dtype=np.int64)
+    if islands > 1:
+        small[:] = max(1, int(round(island_share * n_bus / (islands - 1))))
+        small = np.minimum(small, (n_bus - 1) // (islands - 1))
+    sizes = np.concatenate([[n_bus - small.sum()], small])
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    island = np.repeat(np.arange(islands), sizes)
+
+    # Topology and branch impedances
+    points = rng.random((n_bus, 2))
+    edges = np.vstack([
+        start + _island_edges(points[start:start + size], int(round(branches_per_bus * size)), rng)
+        for start, size in zip(starts, sizes)
+    ])
+    length = np.linalg.norm(points[edges[:, 0]] - points[edges[:, 1]], axis=1)
+    typical = np.median(length) if len(length) else 1.0
+    x = np.clip(0.04 * length / typical * rng.lognormal(0.0, 0.3, size=len(edges)), 0.002, 0.5)
+    r = x / rng.uniform(6.0, 12.0, size=len(edges))
+    b = x * rng.uniform(0.5, 2.0, size=len(edges))
+
+    # Loads
+    has_load = rng.random(n_bus) < load_share
+    has_load[starts] = True
+    pd_bus = np.where(has_load, mean_load * rng.lognormal(-0.32, 0.8, size=n_bus), 0.0)
+    load_bus_idx = np.flatnonzero(has_load)
+
+    # Generators at distinct buses of each island, scaled to the island load
+    gen_idx, pmax, pmin, cost = [], [], [], []
+    for k, (start, size) in enumerate(zip(starts, sizes)):
+        n_gen = int(min(size, max(1, round(gens_per_bus * size))))
+        at = start + rng.choice(size, size=n_gen, replace=False)
+        unit_pmax, unit_pmin, unit_cost = _fleet(n_gen, rng, cost_model)
+        scale = (1.0 + reserve_margin) * pd_bus[island == k].sum() / unit_pmax.sum()
+        gen_idx.append(at)
+        pmax.append(unit_pmax * scale)
+        pmin.append(unit_pmin * scale)
+        cost.append(unit_cost)
+    gen_idx, pmax, pmin, cost = map(np.concatenate, (gen_idx, pmax, pmin, cost))
+
+    # Slack bus per island at its largest unit
+    bus_type = np.ones(n_bus, dtype=np.int64)
+    bus_type[gen_idx] = 2
+    for k in range(islands):
+        units = np.flatnonzero(island[gen_idx] == k)
+        bus_type[gen_idx[units[np.argmax(pmax[units])]]] = 3
+
+    # Ratings from a proportional dispatch (every unit at the same share of Pmax)
+    share = np.bincount(island, weights=pd_bus, minlength=islands) / np.bincount(
+        island[gen_idx], weights=pmax, minlength=islands)
+    dispatch = pmax * share[island[gen_idx]]
+    p = (np.bincount(gen_idx, weights=dispatch, minlength=n_bus) - pd_bus) / base_mva
+    flow = _dc_flows(n_bus, edges, x, p, np.flatnonzero(bus_type == 3)) * base_mva
+    rate = _ratings(flow, rng, tight_share)
+
+    bus_id = np.arange(1, n_bus + 1, dtype=np.int64)
+    gen_id = np.empty(len(gen_idx), dtype=object)
+    gen_id[:] = [f"G-{bus}-1" for bus in bus_id[gen_idx].tolist()]
+    logger.info(f"Synthetic case: {n_bus} buses, {len(gen_idx)} generators, {len(edges)} branches, "
+                f"{islands} islands, {pd_bus.sum():.0f} MW load")
+    return CaseArrays(
+        base_mva=base_mva,
+        bus_id=bus_id, bus_type=bus_type, base_kv=np.full(n_bus, 230.0),
+        gen_id=gen_id, gen_bus=bus_id[gen_idx], pmax=pmax, pmin=pmin, pg=dispatch,
+        gen_cost=cost, gen_cost_len=np.full(len(gen_idx), 3),
+        line_from=bus_id[edges[:, 0]], line_to=bus_id[edges[:, 1]], r=r, x=x, b=b,
+        rate_a=rate, rate_b=rate, rate_c=rate,
+        load_bus=bus_id[load_bus_idx], load_pd=pd_bus[load_bus_idx], load_qd=0.3 * pd_bus[load_bus_idx],
+    )
+
+
+def _dc_flows(n_bus: int, edges: np.ndarray, x: np.ndarray, p: np.ndarray, slacks: np.ndarray) -> np.ndarray:
+    """Branch flows (pu) of injections p, one reference angle per slack bus"""
+    susceptance = 1.0 / x
+    f, t = edges[:, 0], edges[:, 1]
+    B = sp.coo_matrix(
+        (np.concatenate([susceptance, susceptance, -susceptance, -susceptance]),
+         (np.concatenate([f, t, f, t]), np.concatenate([f, t, t, f]))),
+        shape=(n_bus, n_bus)
+    ).tocsc()
+    keep = np.ones(n_bus, dtype=bool)
+    keep[slacks] = False
+    theta = np.zeros(n_bus)
+    if keep.any():
+        theta[keep] = spsolve(B[keep][:, keep], p[keep])
+    return susceptance * (theta[f] - theta[t])
@@ -0,0 +1,140 @@
+"""
+Response encoding
+Content negotiation for case and result payloads: JSON serialized directly by
+pydantic-core, or columnar msgpack with typed arrays when the client asks for
+it and the msgpack package is installed
+"""
+
+import logging
+from typing import List, Optional, Union
+
+import numpy as np
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.models.arrays import CaseArrays, STRING_COLUMNS, as_case_arrays
+from app.models.schemas import CaseData, OPFResult, ColumnarOPFResult
+from app.solver.results import ResultArrays
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+# Integer columns go out as int32 (JS Int32Array) when every value fits
+INT32_MIN, INT32_MAX = -2**31, 2**31 - 1
+
+
+def msgpack_available() -> bool:
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def accepted_media_types(accept: Optional[str]) -> List[str]:
+    """Media types of an Accept header, most preferred first (q=0 dropped)"""
+    if not accept:
+        return []
+    ranked = []
+    for position, item in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type and q > 0:
+            ranked.append((-q, position, media_type.lower()))
+    return [media_type for _, _, media_type in sorted(ranked)]
+
+
+def choose_media_type(accept: Optional[str]) -> str:
+    """
+    msgpack when it is the client's first supported preference and the
+    package is installed; JSON otherwise
+    """
+    for media_type in accepted_media_types(accept):
+        if media_type == MSGPACK_MEDIA_TYPE:
+            if msgpack_available():
+                return MSGPACK_MEDIA_TYPE
+            logger.warning("msgpack requested but not installed, answering with JSON")
+        elif media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            return JSON_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def typed_array(values) -> dict:
+    """
+    Little-endian array bytes with dtype and shape, for zero-copy decoding
+    into a typed array (Float64Array / Int32Array)
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iub" and (arr.size == 0 or (arr.min() >= INT32_MIN and arr.max() <= INT32_MAX)):
+        arr = arr.astype("<i4")
+    else:
+        arr = arr.astype("<f8")
+    return {"dtype": "int32" if arr.dtype.kind == "i" else "float64",
+            "shape": list(arr.shape), "data": arr.tobytes()}
+
+
+def from_typed_array(column: dict) -> np.ndarray:
+    """Inverse of typed_array"""
+    dtype = "<i4" if column["dtype"] == "int32" else "<f8"
+    return np.frombuffer(column["data"], dtype=dtype).reshape(column["shape"])
+
+
+def _encode_columns(columns: dict, string_columns) -> dict:
+    return {
+        name: list(value) if name in string_columns else typed_array(value)
+        for name, value in columns.items()
+    }
+
+
+def columnar_payload(obj: Union[CaseData, CaseArrays, OPFResult, ColumnarOPFResult]) -> dict:
+    """
+    Columnar form of a case or OPF result: scalar fields plus a "columns" map
+    of typed arrays (strings and optional IDs stay plain lists)
+    """
+    if isinstance(obj, (CaseData, CaseArrays)):
+        case = as_case_arrays(obj)
+        return {
+            "kind": "case",
+            "base_mva": case.base_mva,
+            "columns": _encode_columns(case.columns(), STRING_COLUMNS),
+        }
+    if isinstance(obj, (OPFResult, ColumnarOPFResult)):
+        arrays = ResultArrays.from_result(obj)
+        payload = {
+            "kind": "opf_result",
+            "status": arrays.status,
+            "total_cost": arrays.total_cost,
+            "objective_value": arrays.objective_value,
+            "total_curtailment": arrays.total_curtailment,
+            "iterations": arrays.iterations,
+            "columns": _encode_columns(arrays.columns, ("gen_id",)),
+        }
+        if obj.timings is not None:
+            payload["timings"] = obj.timings.model_dump()
+        return payload
+    raise TypeError(f"No columnar encoding for {type(obj).__name__}")
+
+
+def encode_response(obj: BaseModel, accept: Optional[str] = None) -> Response:
+    """
+    Serialize a case or result for the negotiated media type. JSON is written
+    by pydantic-core directly, skipping FastAPI's response re-validation.
+    """
+    headers = {"Vary": "Accept"}
+    if choose_media_type(accept) == MSGPACK_MEDIA_TYPE:
+        import msgpack
+
+        return Response(
+            content=msgpack.packb(columnar_payload(obj), use_bin_type=True),
+            media_type=MSGPACK_MEDIA_TYPE, headers=headers
+        )
+    return Response(content=obj.model_dump_json(), media_type=JSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,77 @@
+"""
+Bounded worker pool for CPU-bound work
+Keeps solver and parser calls off the event loop so the API stays responsive.
+Background jobs and session store / file I/O run on pools of their own, so
+jobs can't take the solve slots of interactive requests and cheap requests
+don't wait behind solves.
+"""
+
+import os
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of solves/parses running at once; further requests wait in the queue
+OPF_MAX_WORKERS = max(1, int(os.environ.get("OPF_MAX_WORKERS", os.cpu_count() or 1)))
+
+# Threads share the compiled-network and solver-workspace caches; NumPy, SciPy
+# sparse routines, HiGHS and OSQP do most of their work in native code
+_executor = ThreadPoolExecutor(max_workers=OPF_MAX_WORKERS, thread_name_prefix="opf-worker")
+
+# Background jobs running at once; further jobs wait in the job pool's queue
+OPF_JOB_WORKERS = max(1, int(os.environ.get("OPF_JOB_WORKERS", max(1, OPF_MAX_WORKERS // 2))))
+
+_job_executor = ThreadPoolExecutor(max_workers=OPF_JOB_WORKERS, thread_name_prefix="opf-job")
+
+# Threads for blocking session store and file calls
+OPF_IO_WORKERS = max(1, int(os.environ.get("OPF_IO_WORKERS", 4)))
+
+_io_executor = ThreadPoolExecutor(max_workers=OPF_IO_WORKERS, thread_name_prefix="opf-io")
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def _task_started():
+    global _pending
+    with _pending_lock:
+        _pending += 1
+        busy = _pending > OPF_MAX_WORKERS
+        count = _pending
+    if busy:
+        logger.info(f"Worker pool busy: {count} tasks for {OPF_MAX_WORKERS} workers")
+
+
+def _task_finished(*_):
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+
+def submit_job(fn, *args, **kwargs) -> Future:
+    """Queue a background job on the job pool without waiting for it"""
+    return _job_executor.submit(fn, *args, **kwargs)
+
+
+async def run_in_worker(fn, *args, **kwargs):
+    """Run a blocking call on the worker pool and await its result"""
+    loop = asyncio.get_running_loop()
+    _task_started()
+    try:
+        return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+    finally:
+        _task_finished()
+
+
+async def run_io(fn, *args, **kwargs):
+    """Run a blocking I/O call (session store, files) on the I/O pool and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_executor, functools.partial(fn, *args, **kwargs))
+
+
+def pending_tasks() -> int:
+    """Number of tasks running or queued on the worker pool"""
+    return _pending
@@ -0,0 +1,144 @@
+"""
+Model assembly benchmark
+
+Times the construction of the nodal LP/QP constraint matrices on the bundled
+large cases, comparing the array-based assembly layer against the original
+per-element loop construction.
+
+Usage (from backend/):
+    python -m benchmarks.bench_assembly [case2383wp case2746wp ...]
+"""
+
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+import scipy.sparse as sp
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.parser.matpower import MatpowerParser
+from app.solver.assembly import build_nodal_model, find_island_references
+from app.solver.network import get_network_model
+
+CASES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "cases")
+DEFAULT_CASES = ["case2383wp", "case2746wp"]
+
+
+def prepare_inputs(case):
+    """Extract the array inputs the solver hands to the assembly layer"""
+    net = get_network_model(case)
+    Pd_pu, _ = net.extract_loads(case.load_bus, case.load_pd, case.load_qd)
+
+    active = case.gen_status != 0
+    costs = case.gen_cost.copy()
+    costs[~active] = 0.0
+    pmin = np.where(active, case.pmin / case.base_mva, 0.0)
+    pmax = np.where(active, case.pmax / case.base_mva, 0.0)
+
+    return dict(costs=costs, pmin=pmin, pmax=pmax, gen_bus=net.gen_bus_idx, Pd=Pd_pu, B=net.B,
+                f=net.from_idx, t=net.to_idx, b=net.susceptances, rates=net.line_rates,
+                slack_idx=net.slack_idx, base_mva=case.base_mva)
+
+
+def legacy_assembly(d, voll=10000.0):
+    """Reference: the original per-element LP and QP constraint construction"""
+    n_gen, n_bus = len(d["pmin"]), len(d["Pd"])
+    n_vars = n_gen + 2 * n_bus
+    off = n_gen + n_bus
+
+    c = np.zeros(n_vars)
+    for i, cost in enumerate(d["costs"]):
+        c[i] = cost[1] * d["base_mva"]
+    for i in range(n_bus):
+        c[n_gen + i] = voll * d["base_mva"]
+
+    # LP equality block
+    rows, cols, vals = [], [], []
+    B_coo = d["B"].tocoo()
+    rows.extend(B_coo.row)
+    cols.extend(B_coo.col + off)
+    vals.extend(B_coo.data)
+    for i in range(n_gen):
+        rows.append(d["gen_bus"][i]); cols.append(i); vals.append(-1.0)
+    for i in range(n_bus):
+        rows.append(i); cols.append(n_gen + i); vals.append(-1.0)
+    n_comp, labels, _ = find_island_references(d["B"], d["slack_idx"])
+    for k in range(n_comp):
+        island = np.where(labels == k)[0]
+        ref = d["slack_idx"] if d["slack_idx"] in island else island[0]
+        rows.append(n_bus + k); cols.append(off + ref); vals.append(1.0)
+    A_eq = sp.coo_matrix((vals, (rows, cols)), shape=(n_bus + n_comp, n_vars))
+
+    # LP inequality block
+    ub_rows, ub_cols, ub_vals, ub_b = [], [], [], []
+    r = 0
+    for k in range(len(d["b"])):
+        i, j, b = d["f"][k], d["t"][k], d["b"][k]
+        ub_rows.extend([r, r]); ub_cols.extend([off + i, off + j]); ub_vals.extend([b, -b]); ub_b.append(d["rates"][k]); r += 1
+        ub_rows.extend([r, r]); ub_cols.extend([off + i, off + j]); ub_vals.extend([-b, b]); ub_b.append(d["rates"][k]); r += 1
+    A_ub = sp.coo_matrix((ub_vals, (ub_rows, ub_cols)), shape=(r, n_vars))
+    bounds = [(d["pmin"][i], d["pmax"][i]) for i in range(n_gen)]
+    bounds += [(0.0, max(0.0, d["Pd"][i])) for i in range(n_bus)]
+    bounds += [(None, None)] * n_bus
+
+    # QP stacked constraints
+    A_rows, A_cols, A_vals = [], [], []
+    for rr, cc, v in zip(B_coo.row, B_coo.col, B_coo.data):
+        A_rows.append(rr); A_cols.append(off + cc); A_vals.append(v)
+    for i in range(n_gen):
+        A_rows.append(d["gen_bus"][i]); A_cols.append(i); A_vals.append(-1.0)
+    for i in range(n_bus):
+        A_rows.append(i); A_cols.append(n_gen + i); A_vals.append(-1.0)
+    row_idx = n_bus
+    for k in range(n_comp):
+        island = np.where(labels == k)[0]
+        ref = d["slack_idx"] if d["slack_idx"] in island else island[0]
+        A_rows.append(row_idx); A_cols.append(off + ref); A_vals.append(1.0); row_idx += 1
+    for k in range(len(d["b"])):
+        A_rows.extend([row_idx, row_idx]); A_cols.extend([off + d["f"][k], off + d["t"][k]])
+        A_vals.extend([d["b"][k], -d["b"][k]]); row_idx += 1
+    for i in range(n_gen + n_bus):
+        A_rows.append(row_idx); A_cols.append(i); A_vals.append(1.0); row_idx += 1
+    A = sp.csc_matrix((A_vals, (A_rows, A_cols)), shape=(row_idx, n_vars))
+
+    return A_eq, A_ub, bounds, A
+
+
+def vectorized_assembly(d, voll=10000.0):
+    """Array-based assembly for both the LP and QP paths"""
+    model = build_nodal_model(
+        d["costs"], d["pmin"], d["pmax"], d["gen_bus"], d["Pd"], d["B"],
+        d["f"], d["t"], d["b"], d["rates"], d["slack_idx"], voll, d["base_mva"], True
+    )
+    A_ub, _ = model.lp_inequalities()
+    A, _, _ = model.qp_constraints()
+    return model.A_eq, A_ub, model.lp_bounds(), A
+
+
+def best_of(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main(case_names, repeat=5):
+    logging.disable(logging.INFO)
+    print(f"{'case':<14}{'buses':>7}{'branches':>10}{'legacy (ms)':>14}{'arrays (ms)':>14}{'speedup':>9}")
+    for name in case_names:
+        with open(os.path.join(CASES_DIR, f"{name}.m")) as f:
+            case = MatpowerParser().parse_arrays(f.read())
+        d = prepare_inputs(case)
+        t_legacy = best_of(legacy_assembly, d, repeat)
+        t_vec = best_of(vectorized_assembly, d, repeat)
+        print(f"{name:<14}{case.n_bus:>7}{case.n_line:>10}"
+              f"{t_legacy * 1e3:>14.1f}{t_vec * 1e3:>14.1f}{t_legacy / t_vec:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_CASES)
@@ -0,0 +1,90 @@
+"""
+N-1 contingency screening benchmark
+
+Times full N-1 screening (every in-service branch and every dispatched
+generator) with LODF/PTDF updates of the base solution: the base OPF solve
+and the factorization on their own, then the whole screening call (which
+includes its own base solve). For reference it also times a DC power flow
+re-solve per outage on a sample of branches and extrapolates to the full
+outage set.
+
+Usage (from backend/):
+    python -m benchmarks.bench_contingency [case2383wp case2746wp ...]
+"""
+
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+from scipy.sparse.linalg import splu
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.parser.case_cache import load_case_arrays
+from app.solver.contingency import screen_contingencies
+from app.solver.network import get_network_model
+from app.solver.opf_solver import DCOPSolver
+from app.solver.sensitivity import clear_sensitivity_cache, get_sensitivity_model
+
+CASES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "cases")
+DEFAULT_CASES = ["case2383wp", "case2746wp"]
+
+# Branch outages re-solved for the per-outage reference
+RESOLVE_SAMPLE = 50
+
+
+def resolve_per_outage(case, outages):
+    """Seconds to refactor and re-solve the DC network once per outage"""
+    net = get_network_model(case)
+    injections = np.random.default_rng(0).normal(size=net.n_bus)
+    keep = np.ones(net.n_bus, dtype=bool)
+    keep[net.island_refs] = False
+    t0 = time.perf_counter()
+    for m in outages:
+        k = int(np.searchsorted(net.active_lines, m))
+        i, j, b = net.from_idx[k], net.to_idx[k], net.susceptances[k]
+        B = net.B.tolil(copy=True)
+        B[i, i] -= b
+        B[j, j] -= b
+        B[i, j] += b
+        B[j, i] += b
+        B = B.tocsc()[keep][:, keep]
+        try:
+            splu(B.tocsc()).solve(injections[keep])
+        except RuntimeError:
+            pass  # outage splits an island
+    return time.perf_counter() - t0
+
+
+def main(case_names):
+    logging.disable(logging.WARNING)
+    print(f"{'case':<14}{'buses':>7}{'outages':>9}{'base OPF (s)':>14}{'factor (s)':>12}"
+          f"{'N-1 (s)':>9}{'violations':>12}{'re-solve est. (s)':>19}")
+    for name in case_names:
+        case = load_case_arrays(os.path.join(CASES_DIR, f"{name}.m"))
+
+        t0 = time.perf_counter()
+        DCOPSolver().solve(case, result_format="columns")
+        t_base = time.perf_counter() - t0
+
+        clear_sensitivity_cache()
+        t0 = time.perf_counter()
+        model = get_sensitivity_model(case)
+        t_factor = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        result = screen_contingencies(case, max_violations=0)
+        t_screen = time.perf_counter() - t0
+
+        n_outages = result.n_branch_outages + result.n_generator_outages
+        sample = model.active_lines[:RESOLVE_SAMPLE]
+        t_resolve = resolve_per_outage(case, sample) / max(len(sample), 1) * result.n_branch_outages
+
+        print(f"{name:<14}{case.n_bus:>7}{n_outages:>9}{t_base:>14.2f}{t_factor:>12.3f}"
+              f"{t_screen:>9.2f}{result.n_violations:>12}{t_resolve:>19.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_CASES)
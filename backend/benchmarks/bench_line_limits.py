@@ -0,0 +1,58 @@
+"""
+Lazy line-limit benchmark
+
+Times the DC OPF with every branch limit in the model against constraint
+generation: a first lazy solve with no limits, then a lazy solve seeded
+with the lines that bound the previous one. Each mode is solved once
+before timing, so the compiled network and solver workspaces are warm.
+
+Usage (from backend/):
+    python -m benchmarks.bench_line_limits [case2383wp case2746wp ...]
+"""
+
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.parser.case_cache import load_case_arrays
+from app.solver.line_limits import clear_predictions
+from app.solver.opf_solver import DCOPSolver
+
+CASES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "cases")
+DEFAULT_CASES = ["case2383wp", "case2746wp"]
+
+
+def timed(case, **kwargs):
+    t0 = time.perf_counter()
+    result = DCOPSolver().solve(case, result_format="columns", **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def main(case_names):
+    logging.disable(logging.WARNING)
+    print(f"{'case':<14}{'lines':>7}{'full (s)':>10}{'lazy (s)':>10}{'solves':>8}"
+          f"{'seeded (s)':>12}{'solves':>8}{'binding':>9}{'cost diff':>11}")
+    for name in case_names:
+        case = load_case_arrays(os.path.join(CASES_DIR, f"{name}.m"))
+
+        timed(case)
+        full, t_full = timed(case)
+
+        timed(case, line_limit_mode="lazy")
+        clear_predictions()
+        lazy, t_lazy = timed(case, line_limit_mode="lazy")
+        seeded, t_seeded = timed(case, line_limit_mode="lazy")
+
+        binding = int(np.sum(np.asarray(seeded.line_loading_percent, dtype=float) > 99.99))
+        print(f"{name:<14}{case.n_line:>7}{t_full:>10.3f}{t_lazy:>10.3f}{lazy.iterations:>8}"
+              f"{t_seeded:>12.3f}{seeded.iterations:>8}{binding:>9}"
+              f"{abs(seeded.total_cost - full.total_cost):>11.2e}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_CASES)
@@ -0,0 +1,58 @@
+"""
+MATPOWER parse benchmark
+
+Times MatpowerParser.parse_text on large case files, split into the
+tokenizing stage (text to NumPy matrices) and the full parse including
+the Pydantic case objects.
+
+Usage (from backend/):
+    python -m benchmarks.bench_parser [case2746wp case2383wp ...]
+"""
+
+import os
+import sys
+import time
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.parser.matpower import MatpowerParser, find_matrix_body, parse_matrix, strip_comments
+
+CASES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "cases")
+DEFAULT_CASES = ["case2746wp", "case2383wp", "case300"]
+
+
+def tokenize(text):
+    text = strip_comments(text)
+    lowered = text.lower()
+    for name in ("bus", "gen", "branch", "gencost"):
+        body = find_matrix_body(text, name, lowered)
+        if body is not None:
+            parse_matrix(body)
+
+
+def best_of(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main(case_names, repeat=5):
+    logging.disable(logging.WARNING)
+    print(f"{'case':<14}{'size (kB)':>10}{'buses':>7}{'branches':>10}"
+          f"{'tokenize (ms)':>15}{'parse (ms)':>12}")
+    for name in case_names:
+        with open(os.path.join(CASES_DIR, f"{name}.m")) as f:
+            text = f.read()
+        case = MatpowerParser().parse_text(text)
+        t_tok = best_of(tokenize, text, repeat)
+        t_parse = best_of(lambda t: MatpowerParser().parse_text(t), text, repeat)
+        print(f"{name:<14}{len(text) / 1024:>10.0f}{len(case.buses):>7}{len(case.lines):>10}"
+              f"{t_tok * 1e3:>15.1f}{t_parse * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_CASES)
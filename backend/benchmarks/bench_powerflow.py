@@ -0,0 +1,83 @@
+"""
+Batched DC power flow throughput
+
+For each case: time to factorize the reduced susceptance matrix, then
+power flows per second with random injection vectors solved one at a time
+on the cached factorization and in batches (multi-column right-hand side),
+against a fresh spsolve of the reduced B per vector.
+
+Usage (from backend/):
+    python -m benchmarks.bench_powerflow [case118 case2383wp synthetic10000 ...]
+"""
+
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+from scipy.sparse.linalg import spsolve
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.parser.matpower import MatpowerParser
+from app.solver.network import clear_network_cache, get_network_model
+from app.solver.powerflow import dc_power_flow
+from app.solver.sensitivity import clear_sensitivity_cache
+from benchmarks.bench_suite import case_text
+
+DEFAULT_CASES = ["case30", "case118", "case300", "case2383wp", "case2746wp", "synthetic10000"]
+BATCH_SIZES = [1, 100, 1000]
+
+# Minimum wall time per measurement
+MIN_SECONDS = 0.2
+
+
+def rate(fn, n_flows):
+    """Power flows per second of fn, which runs n_flows of them per call"""
+    calls, t0 = 0, time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed >= MIN_SECONDS:
+            return calls * n_flows / elapsed
+
+
+def spsolve_rate(net, injections):
+    """Rebuild the reduced B and spsolve for each vector"""
+    def run():
+        keep = np.ones(net.n_bus, dtype=bool)
+        keep[net.slack_idx] = False
+        spsolve(net.B[keep][:, keep].tocsc(), injections[keep, 0])
+    return rate(run, 1)
+
+
+def run_case(name):
+    case = MatpowerParser().parse_arrays(case_text(name))
+    net = get_network_model(case)
+    rng = np.random.default_rng(0)
+    injections = rng.normal(scale=10.0, size=(case.n_bus, max(BATCH_SIZES)))
+
+    clear_sensitivity_cache()
+    t0 = time.perf_counter()
+    dc_power_flow(case, injections[:, :1])
+    factorize = time.perf_counter() - t0
+    rates = [rate(lambda k=k: dc_power_flow(case, injections[:, :k]), k) for k in BATCH_SIZES]
+    return case, factorize, spsolve_rate(net, injections), rates
+
+
+def main(case_names):
+    logging.disable(logging.WARNING)
+    print(f"{'case':<15}{'buses':>7}{'factor (ms)':>13}{'spsolve':>11}"
+          + "".join(f"{'batch ' + str(k):>12}" for k in BATCH_SIZES))
+    for name in case_names:
+        clear_network_cache()
+        case, factorize, baseline, rates = run_case(name)
+        print(f"{name:<15}{case.n_bus:>7}{factorize * 1e3:>13.1f}{baseline:>11.0f}"
+              + "".join(f"{r:>12.0f}" for r in rates), flush=True)
+    print("(power flows per second; spsolve = reduced B rebuilt and solved per vector)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_CASES)
@@ -0,0 +1,86 @@
+"""
+Network presolve benchmark
+
+Solves each case on the LP and QP paths (bench_suite cost variants) with
+and without presolve and reports model size (rows x columns), the best of
+three cold solves (network, sensitivity and solver workspace caches
+cleared) and the cost difference. Pass-through buses kept after the first
+presolved solve of a case stay remembered for the later ones. --load
+scales every load, e.g. 1.3 for a congested network.
+
+Every case and path where the presolved solve is more than --threshold
+(relative) slower than the full model is listed, and the exit status is 1.
+
+Usage (from backend/):
+    python -m benchmarks.bench_presolve [case2383wp case2746wp synthetic10000 ...] [--load 1.3]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.parser.matpower import MatpowerParser
+from app.solver.opf_solver import DCOPSolver
+from app.solver.sensitivity import clear_sensitivity_cache
+from benchmarks.bench_suite import case_text, clear_caches, cost_variants
+
+DEFAULT_CASES = ["case118", "case300", "case2383wp", "case2746wp", "case_ANDE"]
+REPEAT = 3
+# Slowdowns below this are timer noise on millisecond solves (s)
+MIN_SLOWDOWN = 0.005
+
+
+def cold_solve(case, presolve):
+    """Best of REPEAT cold solves: (result, seconds)"""
+    best = None
+    for _ in range(REPEAT):
+        clear_caches()
+        clear_sensitivity_cache()
+        t0 = time.perf_counter()
+        result = DCOPSolver().solve(case, result_format="columns", timings=True, presolve=presolve)
+        seconds = time.perf_counter() - t0
+        if best is None or seconds < best[1]:
+            best = (result, seconds)
+    return best
+
+
+def main(case_names, load=1.0, threshold=0.1):
+    logging.disable(logging.WARNING)
+    print(f"{'case':<15}{'path':<6}{'full model':>14}{'presolved':>14}{'full (ms)':>11}"
+          f"{'presolve (ms)':>15}{'resolves':>10}{'cost diff':>11}")
+    slower = []
+    for name in case_names:
+        case = MatpowerParser().parse_arrays(case_text(name))
+        case.load_pd = case.load_pd * load
+        for path, variant in cost_variants(case).items():
+            DCOPSolver().solve(variant)
+            full, t_full = cold_solve(variant, False)
+            reduced, t_reduced = cold_solve(variant, True)
+            size = [f"{r.timings.rows}x{r.timings.cols}" for r in (full, reduced)]
+            print(f"{name:<15}{path:<6}{size[0]:>14}{size[1]:>14}{t_full * 1e3:>11.1f}"
+                  f"{t_reduced * 1e3:>15.1f}{reduced.presolve_resolves:>10}"
+                  f"{abs(reduced.total_cost - full.total_cost):>11.2e}", flush=True)
+            if t_reduced - t_full > max(threshold * t_full, MIN_SLOWDOWN):
+                slower.append((name, path, t_full, t_reduced))
+    print("(cold solves; resolves = 1 when a pass-through bus next to a binding branch needed the full model)")
+    if not slower:
+        return 0
+    print(f"Presolve slower than the full model beyond {threshold:.0%}:")
+    for name, path, t_full, t_reduced in slower:
+        print(f"  {name:<15}{path:<6}{t_full * 1e3:>10.1f} -> {t_reduced * 1e3:>10.1f} ms"
+              f"  ({t_reduced / t_full - 1:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("cases", nargs="*", default=DEFAULT_CASES)
+    parser.add_argument("--load", type=float, default=1.0, help="Scale factor applied to every load")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown of presolve flagged (default 0.1)")
+    args = parser.parse_args()
+    sys.exit(main(args.cases, args.load, args.threshold))
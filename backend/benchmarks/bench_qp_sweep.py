@@ -0,0 +1,67 @@
+"""
+Quadratic-cost sweep benchmark
+
+Solves a load sweep on quadratic-cost cases twice: once with a fresh OSQP
+setup per solve (workspace cache cleared) and once reusing the cached
+workspace with warm starts.
+
+Usage (from backend/):
+    python -m benchmarks.bench_qp_sweep [case9Q case30Q case118 case300 ...]
+"""
+
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.parser.matpower import MatpowerParser
+from app.solver.opf_solver import DCOPSolver
+from app.solver.workspaces import osqp_workspaces
+
+CASES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "cases")
+DEFAULT_CASES = ["case9Q", "case30Q", "case118", "case300"]
+
+
+def load_sweep(case, n_steps, seed=0):
+    """
+    Copies of the case following a daily load shape (+/-10%) with 1% per-load
+    noise, as in an hourly study
+    """
+    rng = np.random.default_rng(seed)
+    for step in range(n_steps):
+        shape = 1.0 + 0.1 * np.sin(2 * np.pi * step / 24)
+        scale = shape * rng.uniform(0.99, 1.01, size=len(case.loads))
+        loads = [load.model_copy(update={"pd": load.pd * s}) for load, s in zip(case.loads, scale)]
+        yield case.model_copy(update={"loads": loads})
+
+
+def run_sweep(case, n_steps, warm):
+    solver = DCOPSolver()
+    costs = []
+    osqp_workspaces.clear()
+    t0 = time.perf_counter()
+    for step in load_sweep(case, n_steps):
+        if not warm:
+            osqp_workspaces.clear()
+        costs.append(solver.solve(step).total_cost)
+    return (time.perf_counter() - t0) / n_steps, np.array(costs)
+
+
+def main(case_names, n_steps=24):
+    logging.disable(logging.INFO)
+    print(f"{'case':<10}{'cold (ms/solve)':>17}{'warm (ms/solve)':>17}{'speedup':>9}{'max cost diff':>15}")
+    for name in case_names:
+        with open(os.path.join(CASES_DIR, f"{name}.m")) as f:
+            case = MatpowerParser().parse_text(f.read())
+        t_cold, c_cold = run_sweep(case, n_steps, warm=False)
+        t_warm, c_warm = run_sweep(case, n_steps, warm=True)
+        diff = np.max(np.abs(c_cold - c_warm) / np.maximum(np.abs(c_cold), 1.0))
+        print(f"{name:<10}{t_cold * 1e3:>17.1f}{t_warm * 1e3:>17.1f}{t_cold / t_warm:>8.1f}x{diff:>15.1e}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_CASES)
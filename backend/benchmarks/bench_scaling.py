@@ -0,0 +1,90 @@
+"""
+Scaling benchmark on synthetic networks
+
+Generates synthetic cases (app.synthetic) of increasing size and times
+MATPOWER text round trip, network compilation (including island
+detection), and an LP and a QP OPF split into the solver's assembly, solve
+and result construction phases. A least-squares fit of log(time) against
+log(buses) gives the empirical complexity exponent of each stage.
+Results are built in the default (records) format. On one core the
+default sizes take a few minutes, most of it in the 30k-bus LP; 100000
+buses can be given explicitly.
+
+Usage (from backend/):
+    python -m benchmarks.bench_scaling [1000 3000 10000 30000 100000 ...]
+"""
+
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.parser.matpower import MatpowerParser, format_matpower
+from app.solver.network import clear_network_cache, get_network_model
+from app.solver.opf_solver import DCOPSolver
+from app.solver.timing import peak_rss_mb
+from app.synthetic import generate_case
+
+DEFAULT_SIZES = [1000, 3000, 10000, 30000]
+ISLANDS = 3
+
+STAGES = ["generate", "text", "network", "lp_assembly", "lp_solve", "lp_results",
+          "qp_assembly", "qp_solve", "qp_results"]
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    value = fn(*args, **kwargs)
+    return time.perf_counter() - t0, value
+
+
+def run_size(n_bus):
+    times = {}
+    times["generate"], case = timed(generate_case, n_bus, islands=ISLANDS, cost_model="linear")
+    t0 = time.perf_counter()
+    MatpowerParser().parse_arrays(format_matpower(case))
+    times["text"] = time.perf_counter() - t0
+
+    clear_network_cache()
+    times["network"], net = timed(get_network_model, case)
+    notes = [f"{net.n_islands} islands"]
+
+    for path in ("lp", "qp"):
+        if path == "qp":
+            case = generate_case(n_bus, islands=ISLANDS, cost_model="quadratic")
+        solver = DCOPSolver()
+        result = solver.solve(case, timings=True)
+        phases = result.timings.phases
+        times[f"{path}_assembly"] = phases.get("assembly", 0.0)
+        times[f"{path}_solve"] = phases.get("solve", 0.0)
+        times[f"{path}_results"] = phases.get("results", 0.0) + phases.get("theta", 0.0)
+        notes.append(f"{path}: {result.timings.solver} {result.status}, {result.timings.solver_iterations} it")
+    return case, times, notes
+
+
+def main(sizes):
+    logging.disable(logging.WARNING)
+    print(f"{'buses':>8}{'branches':>10}" + "".join(f"{s:>13}" for s in STAGES) + f"{'RSS (MB)':>10}")
+    rows = []
+    for n_bus in sizes:
+        case, times, notes = run_size(n_bus)
+        rows.append(times)
+        print(f"{n_bus:>8}{case.n_line:>10}" + "".join(f"{times[s] * 1e3:>13.1f}" for s in STAGES)
+              + f"{peak_rss_mb() or 0:>10.0f}    " + "; ".join(notes), flush=True)
+
+    if len(sizes) > 1:
+        log_n = np.log(sizes)
+        exponents = []
+        for stage in STAGES:
+            t = np.array([row[stage] for row in rows])
+            exponents.append(np.polyfit(log_n, np.log(np.maximum(t, 1e-6)), 1)[0])
+        print(f"{'exponent':>18}" + "".join(f"{k:>13.2f}" for k in exponents))
+    print("(times in ms; exponent = slope of log time over log buses)")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,252 @@
+"""
+Benchmark suite over the bundled MATPOWER cases
+
+For every case: parse (records and columnar), network compilation, DC OPF
+solves on the LP and QP paths with and without line limits and with and
+without remove_isolated, and JSON serialization of the result in both
+result formats. Each case runs in a fresh process so its peak resident
+memory can be reported; every stage is timed cold (network and solver
+workspace caches cleared) and the best of --repeat runs is kept, with the
+assembly and solve phases of each OPF taken from the solver's PhaseTimer.
+
+Cases named synthetic<N> (e.g. synthetic10000) are generated networks of
+N buses (app.synthetic, fixed seed) written as MATPOWER text.
+
+The LP path zeroes the quadratic cost terms. The QP path keeps them and,
+for cases with linear costs only, adds a = 0.1 * b / pmax so the marginal
+cost of each unit rises by 20% over its range.
+
+--save writes the timings to a JSON baseline; --compare reruns and flags
+every metric more than --threshold (relative) slower, or larger for peak
+memory, than the baseline, and exits with status 1 if there are any.
+Baselines are specific to the machine they were recorded on.
+
+Usage (from backend/):
+    python -m benchmarks.bench_suite [case118 case300 synthetic10000 ...] [--repeat 3]
+    python -m benchmarks.bench_suite --save benchmarks/baseline.json
+    python -m benchmarks.bench_suite --compare benchmarks/baseline.json [--threshold 0.25]
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+import platform
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CASES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "cases")
+# Every bundled case
+DEFAULT_CASES = [os.path.splitext(os.path.basename(path))[0]
+                 for path in sorted(glob.glob(os.path.join(CASES_DIR, "*.m")))]
+
+# OPF variants: (cost path, enforce_line_limits, remove_isolated)
+SOLVE_VARIANTS = [(path, limits, isolated) for path in ("lp", "qp")
+                  for limits in (True, False) for isolated in (False, True)]
+
+# Differences below these are noise, whatever the relative change
+MIN_SECONDS = 0.005
+MIN_RSS_MB = 5.0
+
+
+def variant_name(path, limits, isolated):
+    return f"{path}_{'limits' if limits else 'nolimits'}{'_isolated' if isolated else ''}"
+
+
+def cost_variants(case):
+    """LP (linear terms only) and QP (quadratic terms present) copies of a case"""
+    lp = case.subset(np.ones(case.n_bus, dtype=bool))
+    lp.gen_cost = case.gen_cost.copy()
+    lp.gen_cost[:, 0] = 0.0
+    qp = case.subset(np.ones(case.n_bus, dtype=bool))
+    qp.gen_cost = case.gen_cost.copy()
+    if not np.any(qp.gen_cost[:, 0] > 0):
+        qp.gen_cost[:, 0] = 0.1 * qp.gen_cost[:, 1] / np.maximum(case.pmax, 1.0)
+    return {"lp": lp, "qp": qp}
+
+
+def clear_caches():
+    from app.solver.network import clear_network_cache
+    from app.solver.workspaces import highs_workspaces, osqp_workspaces
+
+    clear_network_cache()
+    highs_workspaces.clear()
+    osqp_workspaces.clear()
+
+
+def case_text(name):
+    """MATPOWER text of a bundled case, or of a synthetic<N> network"""
+    if name.startswith("synthetic"):
+        from app.parser.matpower import format_matpower
+        from app.synthetic import generate_case
+
+        return format_matpower(generate_case(int(name[len("synthetic"):])), name)
+    with open(os.path.join(CASES_DIR, f"{name}.m")) as f:
+        return f.read()
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    value = fn(*args, **kwargs)
+    return time.perf_counter() - t0, value
+
+
+def run_case(name, repeat=3):
+    """Metric -> best time (s) for one case, plus its peak RSS (MB)"""
+    import resource
+
+    from app.parser.matpower import MatpowerParser
+    from app.solver.network import get_network_model
+    from app.solver.opf_solver import DCOPSolver
+
+    logging.disable(logging.ERROR)
+    text = case_text(name)
+
+    # One untimed solve per path first, so lazy imports and solver start-up
+    # are not charged to the first timed stage
+    case = MatpowerParser().parse_arrays(text)
+    for case_variant in cost_variants(case).values():
+        try:
+            DCOPSolver().solve(case_variant)
+        except ValueError:
+            pass
+
+    best = {}
+
+    def keep(metric, seconds):
+        best[metric] = min(best.get(metric, float("inf")), seconds)
+
+    for _ in range(repeat):
+        keep("parse", timed(MatpowerParser().parse_text, text)[0])
+        seconds, case = timed(MatpowerParser().parse_arrays, text)
+        keep("parse_arrays", seconds)
+        clear_caches()
+        keep("network", timed(get_network_model, case)[0])
+
+        variants = cost_variants(case)
+        for path, limits, isolated in SOLVE_VARIANTS:
+            metric = variant_name(path, limits, isolated)
+            clear_caches()
+            solver = DCOPSolver()
+            try:
+                seconds, result = timed(solver.solve, variants[path], enforce_line_limits=limits,
+                                        remove_isolated=isolated)
+            except ValueError:
+                # e.g. case_ANDE: every branch is out of service, so
+                # remove_isolated keeps only the slack buses;
+                # sistema_paraguay_brasil's LP is infeasible (no branch in
+                # service and a bus injecting 3150 MW as negative load)
+                continue
+            keep(metric, seconds)
+            for phase in ("assembly", "solve"):
+                keep(f"{metric}.{phase}", solver.timer.phases.get(phase, 0.0))
+            if metric == "lp_limits":
+                keep("serialize_records", timed(result.model_dump_json)[0])
+                columns = DCOPSolver().solve(variants[path], result_format="columns")
+                keep("serialize_columns", timed(columns.model_dump_json)[0])
+
+    return {
+        "buses": case.n_bus,
+        "branches": case.n_line,
+        "seconds": best,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_suite(case_names, repeat=3):
+    """Each case in its own process, so peak RSS is per case"""
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for name in case_names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results[name] = pool.submit(run_case, name, repeat).result()
+    return results
+
+
+def environment():
+    import scipy
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(baseline, current, threshold=0.25):
+    """(case, metric, baseline, current) for every metric that got worse"""
+    regressions = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric, seconds in result["seconds"].items():
+            old = base["seconds"].get(metric)
+            if old is not None and seconds > old * (1 + threshold) and seconds - old > MIN_SECONDS:
+                regressions.append((name, metric, old, seconds))
+        old, rss = base.get("peak_rss_mb"), result["peak_rss_mb"]
+        if old is not None and rss > old * (1 + threshold) and rss - old > MIN_RSS_MB:
+            regressions.append((name, "peak_rss_mb", old, rss))
+    return regressions
+
+
+def print_table(results):
+    columns = ["parse", "network", "lp_limits", "lp_nolimits", "lp_limits_isolated",
+               "qp_limits", "qp_nolimits", "qp_limits_isolated", "serialize_records"]
+    headers = ["parse", "network", "LP", "LP free", "LP isl", "QP", "QP free", "QP isl", "json"]
+    width = max([15] + [len(name) + 2 for name in results])
+    print(f"{'case':<{width}}{'buses':>7}" + "".join(f"{h:>9}" for h in headers) + f"{'RSS (MB)':>10}")
+    for name, result in results.items():
+        times = "".join(f"{result['seconds'][c] * 1e3:>9.1f}" if c in result["seconds"] else f"{'-':>9}"
+                        for c in columns)
+        print(f"{name:<{width}}{result['buses']:>7}{times}{result['peak_rss_mb']:>10.0f}")
+    print("(times in ms; free = no line limits, isl = remove_isolated, - = case not solvable)")
+
+
+def main(case_names, repeat=3, save=None, baseline_path=None, threshold=0.25):
+    results = run_suite(case_names, repeat)
+    print_table(results)
+
+    if save:
+        with open(save, "w") as f:
+            json.dump({"environment": environment(), "cases": results}, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {save}")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        if baseline.get("environment") != environment():
+            print("Warning: baseline was recorded in a different environment")
+        regressions = compare(baseline["cases"], results, threshold)
+        if not regressions:
+            print(f"No regressions beyond {threshold:.0%} of {baseline_path}")
+            return 0
+        print(f"{len(regressions)} regressions beyond {threshold:.0%}:")
+        for name, metric, old, new in regressions:
+            scale, unit = (1.0, "MB") if metric == "peak_rss_mb" else (1e3, "ms")
+            print(f"  {name:<25}{metric:<28}{old * scale:>10.1f} -> {new * scale:>10.1f} {unit}"
+                  f"  ({new / old - 1:+.0%})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("cases", nargs="*", default=DEFAULT_CASES)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (best is kept)")
+    parser.add_argument("--save", metavar="PATH", help="Write the timings to a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Flag regressions against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative slowdown flagged as a regression (default 0.25)")
+    args = parser.parse_args()
+    sys.exit(main(args.cases, args.repeat, args.save, args.compare, args.threshold))
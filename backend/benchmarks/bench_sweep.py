@@ -0,0 +1,68 @@
+"""
+Time-series sweep benchmark
+
+Runs a year of hourly OPFs (a daily and seasonal load shape with noise at
+every load bus) through the sweep runner, in-process and on a process pool,
+streaming the profile from a temporary CSV file. Reports throughput and the
+peak resident memory of this process.
+
+Usage (from backend/):
+    python -m benchmarks.bench_sweep [case118 case300 ...]
+"""
+
+import os
+import sys
+import time
+import logging
+import resource
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.parser.case_cache import load_case_arrays
+from app.solver.timeseries import run_sweep
+
+CASES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "cases")
+DEFAULT_CASES = ["case118"]
+HOURS = 8760
+
+
+def write_profile(path, case, hours, seed=0):
+    """load:<bus> columns following daily and seasonal shapes with 2% noise"""
+    rng = np.random.default_rng(seed)
+    buses = np.unique(case.load_bus[case.load_pd > 0])
+    base = np.array([case.load_pd[case.load_bus == b].sum() for b in buses])
+    with open(path, "w") as f:
+        f.write("hour," + ",".join(f"load:{b}" for b in buses) + "\n")
+        for h in range(hours):
+            shape = (0.85 + 0.1 * np.sin(2 * np.pi * (h % 24 - 8) / 24)
+                     + 0.05 * np.cos(2 * np.pi * h / HOURS))
+            values = base * shape * rng.uniform(0.98, 1.02, size=len(base))
+            f.write(f"{h}," + ",".join(f"{v:.3f}" for v in values) + "\n")
+
+
+def main(case_names):
+    logging.disable(logging.WARNING)
+    workers = os.cpu_count() or 1
+    print(f"{'case':<10}{'hours':>7}{'workers':>9}{'time (s)':>10}{'ms/hour':>9}"
+          f"{'failed':>8}{'peak RSS (MB)':>15}")
+    for name in case_names:
+        case = load_case_arrays(os.path.join(CASES_DIR, f"{name}.m"))
+        with tempfile.TemporaryDirectory() as tmp:
+            profile = os.path.join(tmp, "profile.csv")
+            write_profile(profile, case, HOURS)
+            for n_workers in sorted({1, workers}):
+                t0 = time.perf_counter()
+                with open(profile, newline="") as f:
+                    result = run_sweep(case, f, os.path.join(tmp, f"out{n_workers}"),
+                                       max_workers=n_workers, total_hours=HOURS)
+                elapsed = time.perf_counter() - t0
+                rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+                print(f"{name:<10}{result.n_periods:>7}{n_workers:>9}{elapsed:>10.1f}"
+                      f"{elapsed / result.n_periods * 1000:>9.1f}{result.n_failed:>8}{rss:>15.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_CASES)
@@ -0,0 +1,72 @@
+"""
+Shared test fixtures
+Bundled MATPOWER cases parsed to CaseArrays and the tiny hand-built
+networks most solver tests start from. Each fixture is a factory, so a test
+can build several variants; every call returns a fresh case that the test
+may modify in place.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.schemas import Bus, Generator, Line, Load, CaseData
+from app.parser.matpower import MatpowerParser
+
+CASES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "cases")
+
+
+def _bundled_case(name="case30"):
+    with open(os.path.join(CASES_DIR, f"{name}.m")) as f:
+        return MatpowerParser().parse_arrays(f.read())
+
+
+def _two_bus_case(pd=50.0):
+    return CaseData(
+        buses=[Bus(id=1, type=3), Bus(id=2, type=1)],
+        generators=[Generator(id="G1", bus=1, pmin=0, pmax=200, cost=[0, 20, 0])],
+        lines=[Line(from_bus=1, to_bus=2, x=0.1, rate_a=200)],
+        loads=[Load(bus=2, pd=pd)],
+    )
+
+
+def _three_bus_case(pd=100.0, costs=((0, 20, 0), (0, 30, 0))):
+    return CaseData(
+        buses=[Bus(id=1, type=3), Bus(id=2, type=1), Bus(id=3, type=1)],
+        generators=[
+            Generator(id="G1", bus=1, pmin=0, pmax=200, cost=list(costs[0])),
+            Generator(id="G2", bus=2, pmin=0, pmax=200, cost=list(costs[1])),
+        ],
+        lines=[
+            Line(from_bus=1, to_bus=2, x=0.1, rate_a=200),
+            Line(from_bus=2, to_bus=3, x=0.1, rate_a=200),
+            Line(from_bus=1, to_bus=3, x=0.1, rate_a=200),
+        ],
+        loads=[Load(bus=3, pd=pd)],
+    )
+
+
+@pytest.fixture
+def bundled_case():
+    """bundled_case("case118"): a case from app/cases parsed to CaseArrays"""
+    return _bundled_case
+
+
+@pytest.fixture
+def two_bus_case():
+    """two_bus_case(pd): G1 at the slack bus 1 ($20/MWh, 200 MW) serving pd MW at bus 2"""
+    return _two_bus_case
+
+
+@pytest.fixture
+def three_bus_case():
+    """
+    three_bus_case(pd, costs): G1 at the slack bus 1 and G2 at bus 2 (200 MW
+    each, $20 and $30/MWh unless costs are given) serving pd MW at bus 3
+    over a triangle of 200 MW lines
+    """
+    return _three_bus_case
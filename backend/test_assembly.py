@@ -0,0 +1,86 @@
+import os
+import sys
+
+import numpy as np
+import scipy.sparse as sp
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.solver.assembly import build_nodal_model, find_island_references
+
+
+def _two_island_model(enforce_line_limits=True):
+    # Buses 0-1-2 form one island, bus 3 is isolated; slack is bus 1
+    f = np.array([0, 1])
+    t = np.array([1, 2])
+    b = np.array([10.0, 5.0])
+    B = sp.coo_matrix(
+        (np.concatenate([b, b, -b, -b]),
+         (np.concatenate([f, t, f, t]), np.concatenate([f, t, t, f]))),
+        shape=(4, 4)
+    ).tocsc()
+    return build_nodal_model(
+        gen_costs=np.array([[0.0, 20.0, 0.0], [0.01, 30.0, 0.0]]),
+        gen_pmin=np.zeros(2),
+        gen_pmax=np.array([1.0, 2.0]),
+        gen_bus_idx=np.array([1, 1]),
+        Pd_pu=np.array([0.0, 0.0, 0.5, -0.1]),
+        B_sparse=B,
+        from_idx=f,
+        to_idx=t,
+        susceptances=b,
+        line_rates=np.array([1.0, 0.3]),
+        slack_idx=1,
+        voll=1000.0,
+        base_mva=100.0,
+        enforce_line_limits=enforce_line_limits,
+    )
+
+
+def test_island_references_prefer_slack():
+    B = sp.csc_matrix(np.array([[1.0, -1.0, 0], [-1.0, 1.0, 0], [0, 0, 0]]))
+    n, labels, ref = find_island_references(B, slack_idx=1)
+    assert n == 2
+    assert list(ref) == [1, 2]
+
+
+def test_nodal_model_blocks():
+    model = _two_island_model()
+    assert model.n_vars == 2 + 4 + 4
+    assert model.A_eq.shape == (4 + 2, model.n_vars)
+    assert np.allclose(model.b_eq[:4], [0.0, 0.0, -0.5, 0.1])
+
+    A_eq = model.A_eq.toarray()
+    # Both generators inject at bus 1, curtailment is -I
+    assert A_eq[1, 0] == -1.0 and A_eq[1, 1] == -1.0
+    assert np.allclose(A_eq[:4, 2:6], -np.eye(4))
+    # Reference rows fix theta at the slack and the isolated bus
+    assert A_eq[4, model.theta_offset + 1] == 1.0
+    assert A_eq[5, model.theta_offset + 3] == 1.0
+
+    # Negative load can't be curtailed
+    assert model.upper[2 + 3] == 0.0
+    assert np.allclose(model.c[:2], [2000.0, 3000.0])
+    assert np.isclose(model.quad[1], 2 * 0.01 * 100.0**2)
+
+
+def test_lp_inequalities_interleave_directions():
+    model = _two_island_model()
+    A_ub, b_ub = model.lp_inequalities()
+    A_ub = A_ub.toarray()
+    off = model.theta_offset
+    assert A_ub.shape == (4, model.n_vars)
+    assert np.allclose(A_ub[0, off:off + 2], [10.0, -10.0])
+    assert np.allclose(A_ub[1, off:off + 2], [-10.0, 10.0])
+    assert np.allclose(b_ub, [1.0, 1.0, 0.3, 0.3])
+
+
+def test_qp_constraints_skip_line_rows_when_disabled():
+    with_limits = _two_island_model(True)
+    without_limits = _two_island_model(False)
+    A1, l1, u1 = with_limits.qp_constraints()
+    A2, l2, u2 = without_limits.qp_constraints()
+    assert A1.shape[0] == A2.shape[0] + 2
+    assert without_limits.lp_inequalities() == (None, None)
+    assert np.all(l2 <= u2)
@@ -0,0 +1,46 @@
+import os
+import sys
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.schemas import Scenario
+from app.solver.opf_solver import DCOPSolver
+from app.solver.scenarios import solve_scenarios
+
+
+def test_solve_many_columnar_results(three_bus_case):
+    scenarios = [
+        Scenario(name="base"),
+        Scenario(name="peak", load_scale=1.5),
+        Scenario(name="g1_out", gen_outages=["G1"]),
+        Scenario(name="cheap_g2", cost_overrides={"G2": [0, 10, 0]}),
+        Scenario(name="line_out", line_outages=[2]),
+        Scenario(name="bad", gen_outages=["nope"]),
+    ]
+    batch = DCOPSolver().solve_many(three_bus_case(), scenarios, max_workers=1)
+
+    assert batch.scenarios == ["base", "peak", "g1_out", "cheap_g2", "line_out", "bad"]
+    assert batch.bus_ids == [1, 2, 3]
+    assert batch.gen_ids == ["G1", "G2"]
+    assert len(batch.flow[0]) == 3
+
+    assert np.isclose(batch.total_cost[0], 100 * 20)
+    assert np.isclose(batch.total_cost[1], 150 * 20)
+    assert np.allclose(batch.pg[2], [0.0, 100.0], atol=1e-6)
+    assert np.allclose(batch.pg[3], [0.0, 100.0], atol=1e-6)
+    assert abs(batch.flow[4][2]) < 1e-6
+
+    assert batch.status[5] == "error"
+    assert "nope" in batch.error[5]
+    assert batch.total_cost[5] is None
+
+
+def test_solve_many_process_pool_matches_serial(three_bus_case):
+    scenarios = [Scenario(name=str(i), load_scale=0.5 + 0.1 * i) for i in range(4)]
+    serial = solve_scenarios(three_bus_case(), scenarios, max_workers=1, chunk_size=1)
+    pooled = solve_scenarios(three_bus_case(), scenarios, max_workers=2, chunk_size=1)
+    assert np.allclose(serial.total_cost, pooled.total_cost)
+    assert pooled.status == ["optimal"] * 4
@@ -0,0 +1,59 @@
+import os
+import sys
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.parser import case_cache
+from app.parser.matpower import MatpowerParser
+
+CASES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "cases")
+
+
+def _copy_case(tmp_path, name="case9.m"):
+    with open(os.path.join(CASES_DIR, name)) as f:
+        text = f.read()
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path), text
+
+
+def _load_at(case, bus):
+    return sum(load.pd for load in case.loads if load.bus == bus)
+
+
+def test_cached_case_matches_parse(tmp_path):
+    path, text = _copy_case(tmp_path, "case118.m")
+    parsed = MatpowerParser().parse_text(text)
+
+    case_cache.clear_memory_cache()
+    first = case_cache.load_case_file(path)
+    assert os.path.exists(case_cache.cache_path(path))
+
+    # Memory hit returns an equal case of the caller's own; disk hit too
+    again = case_cache.load_case_file(path)
+    assert again is not first and again.model_dump() == first.model_dump()
+    again.loads[0].pd += 1.0
+    again.lines[0].rate_a = 1.0
+    assert case_cache.load_case_file(path).model_dump() == first.model_dump()
+    arrays = case_cache.load_case_arrays(path)
+    arrays.rate_a[0] = 1.0
+    assert case_cache.load_case_arrays(path).rate_a[0] == first.lines[0].rate_a
+    case_cache.clear_memory_cache()
+    from_disk = case_cache.load_case_file(path)
+    assert from_disk is not first
+    assert from_disk.model_dump() == parsed.model_dump()
+
+
+def test_cache_invalidated_when_source_changes(tmp_path):
+    path, text = _copy_case(tmp_path)
+    case_cache.clear_memory_cache()
+    assert _load_at(case_cache.load_case_file(path), 6) == 90.0
+
+    with open(path, "w") as f:
+        f.write(text.replace("6    1    90    30", "6    1    95    30"))
+    os.utime(path, ns=(0, 0))
+    assert _load_at(case_cache.load_case_file(path), 6) == 95.0
+
+    case_cache.clear_memory_cache()
+    assert _load_at(case_cache.load_case_file(path), 6) == 95.0
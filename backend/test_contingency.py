@@ -0,0 +1,52 @@
+import os
+import sys
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.solver.contingency import screen_contingencies
+from app.solver.opf_solver import DCOPSolver
+from app.solver.sensitivity import get_sensitivity_model
+
+
+def _base(case):
+    base = DCOPSolver().solve(case, result_format="columns")
+    injections = (np.asarray(base.bus_pl) + np.asarray(base.bus_curtailment)) / case.base_mva
+    return base, injections
+
+
+def test_branch_outages_match_outaged_network(bundled_case):
+    case = bundled_case("case30")
+    _, injections = _base(case)
+    result = screen_contingencies(case, threshold=50.0, include_generators=False, max_workers=2,
+                                  chunk_size=8)
+    assert result.n_branch_outages == len(get_sensitivity_model(case).active_lines)
+    assert result.violations
+
+    loadings = [v.loading_percent for v in result.violations]
+    assert loadings == sorted(loadings, reverse=True)
+
+    for v in result.violations[:5]:
+        outaged = case.subset(np.ones(case.n_bus, dtype=bool))
+        outaged.line_status = outaged.line_status.copy()
+        outaged.line_status[v.outage_index] = 0
+        after = get_sensitivity_model(outaged).flows(injections) * case.base_mva
+        assert np.isclose(after[v.line], v.flow_mw)
+
+
+def test_generator_outage_picked_up_at_reference(bundled_case):
+    case = bundled_case("case30")
+    base, injections = _base(case)
+    gen = int(np.argmax(base.gen_pg))
+    result = screen_contingencies(case, branch_outages=[], generator_outages=[case.gen_id[gen]],
+                                  threshold=0.0, max_violations=10_000)
+    assert result.n_generator_outages == 1
+
+    model = get_sensitivity_model(case)
+    shifted = injections.copy()
+    shifted[model.bus_positions([case.gen_bus[gen]])[0]] -= base.gen_pg[gen] / case.base_mva
+    after = model.flows(shifted) * case.base_mva
+    for v in result.violations:
+        assert np.isclose(after[v.line], v.flow_mw)
@@ -0,0 +1,76 @@
+import io
+import os
+import csv
+import sys
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.export import iter_csv, iter_result_csv
+from app.models.schemas import Bus, Generator, Line, Load, CaseData, Scenario
+from app.solver.opf_solver import DCOPSolver
+
+
+def _case():
+    return CaseData(
+        buses=[Bus(id=1, type=3), Bus(id=2), Bus(id=3)],
+        generators=[Generator(id="G1", bus=1, pmin=0, pmax=200, cost=[0, 20, 0]),
+                    Generator(id="G2", bus=3, pmin=0, pmax=200, cost=[0.01, 30, 0])],
+        lines=[Line(from_bus=1, to_bus=2, x=0.1, rate_a=80),
+               Line(from_bus=2, to_bus=3, x=0.1, rate_a=200),
+               Line(from_bus=1, to_bus=3, x=0.2, rate_a=200)],
+        loads=[Load(bus=2, pd=100.0), Load(bus=3, pd=40.0)],
+    )
+
+
+def _report(result):
+    # Report as written before streaming: whole text built in memory
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["Generator Results"])
+    writer.writerow(["Bus", "Pg (MW)", "Qg (MVAR)", "Cost ($/h)"])
+    for gen in result.generator_results:
+        writer.writerow([gen.bus, gen.pg, gen.qg, gen.cost])
+    writer.writerow([])
+    writer.writerow(["Bus Results"])
+    writer.writerow(["Bus", "Va (degrees)", "Pl (MW)", "Ql (MVAR)", "LMP ($/MWh)", "Curtailment (MW)"])
+    for bus in result.bus_results:
+        writer.writerow([bus.bus, bus.va, bus.pl, bus.ql, bus.marginal_cost, bus.curtailment])
+    writer.writerow([])
+    writer.writerow(["Line Results"])
+    writer.writerow(["From", "To", "Flow (MW)", "Loading (%)", "Congestion Rent ($/h)"])
+    for line in result.line_results:
+        writer.writerow([line.from_bus, line.to_bus, line.flow_mw, line.loading_percent, line.congestion_rent])
+    writer.writerow([])
+    writer.writerow(["Total Cost", f"{result.total_cost} $/h"])
+    writer.writerow(["Total Curtailment", f"{result.total_curtailment} MW"])
+    return output.getvalue()
+
+
+def test_streamed_report_matches_in_memory_report():
+    result = DCOPSolver().solve(_case())
+    expected = _report(result)
+
+    chunks = list(iter_result_csv(result, chunk_bytes=64))
+    assert len(chunks) > 1
+    assert "".join(chunks) == expected
+
+    columns = DCOPSolver().solve(_case(), result_format="columns")
+    assert "".join(iter_csv(columns)).splitlines()[:2] == expected.splitlines()[:2]
+
+
+def test_batch_report_has_one_row_per_scenario_and_element():
+    scenarios = [Scenario(name="base"), Scenario(name="peak", load_scale=1.2),
+                 Scenario(name="outage", line_outages=[0])]
+    batch = DCOPSolver().solve_many(_case(), scenarios, max_workers=1)
+
+    rows = list(csv.reader(io.StringIO("".join(iter_csv(batch, chunk_bytes=128)))))
+    sections = {row[0]: i for i, row in enumerate(rows) if len(row) == 1}
+    assert rows[sections["Scenario Summary"] + 2][:2] == ["base", batch.status[0]]
+
+    gen_rows = rows[sections["Generator Results"] + 2:sections["Bus Results"] - 1]
+    assert len(gen_rows) == 3 * 2
+    assert gen_rows[2] == ["peak", "G1", repr(batch.pg[1][0])]
+
+    line_rows = rows[sections["Line Results"] + 2:]
+    assert len(line_rows) == 3 * 3
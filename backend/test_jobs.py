@@ -0,0 +1,119 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.jobs import JobManager, JobQueueFull, COMPLETED, FAILED, CANCELLED
+from app.models.schemas import Scenario
+from app.solver.opf_solver import DCOPSolver
+from app.workers import OPF_JOB_WORKERS, run_in_worker
+
+
+def _wait(job, timeout=30.0):
+    deadline = time.time() + timeout
+    while not job.finished and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def test_opf_job_completes_with_result(two_bus_case):
+    manager = JobManager()
+    job = manager.submit("opf", lambda job: DCOPSolver().solve(two_bus_case()))
+    _wait(job)
+
+    assert job.status == COMPLETED
+    assert job.progress == 1.0
+    assert abs(job.result.total_cost - 50 * 20) < 1e-6
+    assert manager.get(job.id).info().status == COMPLETED
+
+
+def test_batch_job_reports_progress(two_bus_case):
+    scenarios = [Scenario(name=str(i), load_scale=1 + i / 10) for i in range(20)]
+    seen = []
+
+    def run(job):
+        def progress(done, total):
+            seen.append(done)
+            job.report_progress(done, total)
+        return DCOPSolver().solve_many(two_bus_case(), scenarios, max_workers=1, progress=progress)
+
+    job = _wait(JobManager().submit("batch", run))
+    assert job.status == COMPLETED
+    assert seen == [8, 16, 20]
+    assert len(job.result.scenarios) == 20
+
+
+def test_failed_job_keeps_error():
+    def run(job):
+        raise ValueError("bad case")
+
+    job = _wait(JobManager().submit("opf", run))
+    assert job.status == FAILED
+    assert job.error == "bad case"
+
+
+def test_cancel_running_job_and_queue_limit():
+    manager = JobManager(max_active=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def run(job):
+        started.set()
+        release.wait(10)
+        job.report_progress(1, 2)
+        return "done"
+
+    job = manager.submit("opf", run)
+    started.wait(10)
+    try:
+        manager.submit("opf", run)
+        assert False, "queue limit not enforced"
+    except JobQueueFull:
+        pass
+
+    manager.cancel(job.id)
+    release.set()
+    _wait(job)
+    assert job.status == CANCELLED
+    assert job.result is None
+
+
+def test_finished_job_history_is_bounded():
+    manager = JobManager(history_size=2)
+    jobs = [_wait(manager.submit("opf", lambda job: 1)) for _ in range(4)]
+    assert [j.id for j in manager.list()] == [j.id for j in jobs[2:]]
+
+
+def test_jobs_leave_solve_workers_free(two_bus_case):
+    # Jobs occupying every job worker don't hold up an interactive solve
+    manager = JobManager()
+    release = threading.Event()
+    jobs = [manager.submit("opf", lambda job: release.wait(30)) for _ in range(OPF_JOB_WORKERS + 1)]
+    try:
+        result = asyncio.run(asyncio.wait_for(run_in_worker(DCOPSolver().solve, two_bus_case()), timeout=10))
+    finally:
+        release.set()
+    assert abs(result.total_cost - 50 * 20) < 1e-6
+    assert all(_wait(job).status == COMPLETED for job in jobs)
+
+
+def test_cleanup_on_failure_and_history_eviction():
+    manager = JobManager(history_size=1)
+    cleaned = []
+
+    def submit(fn, name):
+        job = manager.submit("sweep", fn, cleanup=lambda: cleaned.append(name))
+        job.future.result(timeout=30)
+        return job
+
+    assert submit(lambda job: 1 / 0, "failed").status == FAILED
+    assert cleaned == ["failed"]
+    submit(lambda job: 1, "first")
+    assert cleaned == ["failed"]
+    # The completed job keeps its files until it leaves the history
+    submit(lambda job: 2, "second")
+    assert cleaned == ["failed", "first"]
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.solver.line_limits import clear_predictions, predicted_lines
+from app.solver.network import get_network_model
+from app.solver.opf_solver import DCOPSolver
+
+
+@pytest.fixture
+def case(bundled_case):
+    # case30 with linear costs (LP path) and halved ratings, so several lines bind
+    case = bundled_case("case30")
+    case.gen_cost[:, 0] = 0.0
+    case.rate_a = case.rate_a * 0.5
+    return case
+
+
+def test_lazy_limits_match_full_model(case):
+    clear_predictions()
+    full = DCOPSolver().solve(case, result_format="columns")
+    lazy = DCOPSolver().solve(case, result_format="columns", line_limit_mode="lazy")
+
+    assert full.iterations == 1 and lazy.iterations > 1
+    assert np.isclose(lazy.total_cost, full.total_cost)
+    assert np.allclose(lazy.gen_pg, full.gen_pg)
+    assert np.allclose(lazy.bus_marginal_cost, full.bus_marginal_cost)
+    assert np.nanmax(lazy.line_loading_percent) <= 100 + 1e-6
+
+
+def test_binding_lines_seed_next_solve(case):
+    clear_predictions()
+    first = DCOPSolver().solve(case, line_limit_mode="lazy")
+    again = DCOPSolver().solve(case, line_limit_mode="lazy")
+    assert first.iterations > 1 and again.iterations == 1
+    assert np.isclose(again.total_cost, first.total_cost)
+
+    clear_predictions()
+    assert DCOPSolver().solve(case, line_limit_mode="lazy").iterations == first.iterations
+
+
+def test_lines_no_longer_binding_are_forgotten(case):
+    clear_predictions()
+    first = DCOPSolver().solve(case, result_format="columns", line_limit_mode="lazy")
+    net = get_network_model(case)
+    bound = predicted_lines(net.key, len(net.active_lines))
+    assert first.iterations > 1 and len(bound) > 0
+
+    # At a fifth of the demand most of those lines are well below their rating
+    light = case.subset(np.ones(case.n_bus, dtype=bool))
+    light.load_pd = light.load_pd * 0.2
+    second = DCOPSolver().solve(light, result_format="columns", line_limit_mode="lazy")
+    loading = np.asarray(second.line_loading_percent)[net.active_lines]
+    released = bound[loading[bound] < 90.0]
+    assert len(released) > 0
+
+    # and are not predicted for the next solve, which adds them back
+    assert not np.isin(released, predicted_lines(net.key, len(net.active_lines))).any()
+    third = DCOPSolver().solve(case, result_format="columns", line_limit_mode="lazy")
+    assert third.iterations > 1
+    assert np.isclose(third.total_cost, first.total_cost)
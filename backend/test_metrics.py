@@ -0,0 +1,80 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.main import app, _solve_opf
+from app.metrics import Histogram, registry
+from app.models.schemas import OPFRequest
+from app.solver.opf_solver import DCOPSolver
+
+
+@pytest.fixture
+def case(bundled_case):
+    # case30 with linear costs (LP path)
+    case = bundled_case("case30")
+    case.gen_cost[:, 0] = 0.0
+    return case
+
+
+def _get(path):
+    """GET through the ASGI app (middleware included): (status, body)"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+             "scheme": "http", "headers": [(b"host", b"test")], "client": ("test", 1),
+             "server": ("test", 80)}
+    asyncio.run(app(scope, receive, send))
+    status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    return status, b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+
+
+def test_solve_timings(case, bundled_case):
+    solver = DCOPSolver()
+    assert solver.solve(case, line_limit_mode="lazy").timings is None
+
+    for variant, name in ((case, "highs"), (bundled_case("case30"), "osqp")):
+        timings = DCOPSolver().solve(variant, line_limit_mode="lazy", timings=True).timings
+        assert {"prepare", "assembly", "solve", "results"} <= set(timings.phases)
+        assert sum(timings.phases.values()) <= timings.total_seconds + 1e-6
+        assert timings.solver == name and timings.solver_iterations > 0
+        assert timings.rows > 30 and timings.cols > 30 and timings.nnz > timings.rows
+        assert timings.peak_rss_mb is None or timings.peak_rss_mb > 0
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram("t_seconds", "test", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        hist.observe(value, path="/opf")
+    lines = list(hist.render())
+    assert 't_seconds_bucket{path="/opf",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{path="/opf",le="1"} 2' in lines
+    assert 't_seconds_bucket{path="/opf",le="+Inf"} 3' in lines
+    assert 't_seconds_count{path="/opf"} 3' in lines
+
+
+def test_metrics_endpoint(case):
+    result = _solve_opf(case, OPFRequest(include_timings=True), parse_seconds=0.01)
+    assert list(result.timings.phases)[0] == "parse"
+    assert result.timings.phases["parse"] == 0.01
+
+    _get("/")
+    status, body = _get("/metrics")
+    text = body.decode()
+    assert status == 200
+    assert 'opf_solves_total{solver="highs",status="optimal"}' in text
+    assert 'opf_solve_phase_seconds_count{phase="parse"}' in text
+    assert 'opf_request_duration_seconds_count{method="GET",path="/"}' in text
+    assert "opf_worker_pending_tasks 0" in text
+    assert registry.render().startswith("# HELP")
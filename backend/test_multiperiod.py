@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.solver.multiperiod import solve_multiperiod
+from app.solver.opf_solver import DCOPSolver
+
+
+@pytest.fixture
+def case(bundled_case):
+    # case30 with linear costs (LP path)
+    case = bundled_case("case30")
+    case.gen_cost[:, 0] = 0.0
+    return case
+
+
+def test_periods_match_single_snapshots(case):
+    scales = [0.7, 1.0]
+    result = solve_multiperiod(case, load_scale=scales)
+    assert result.status == "optimal" and result.n_periods == 2
+
+    for t, scale in enumerate(scales):
+        scaled = case.subset(np.ones(case.n_bus, dtype=bool))
+        scaled.load_pd = case.load_pd * scale
+        single = DCOPSolver().solve(scaled, result_format="columns")
+        assert np.isclose(result.period_cost[t], single.total_cost)
+        assert np.allclose(result.lmp[t], single.bus_marginal_cost)
+    assert np.isclose(result.total_cost, sum(result.period_cost))
+
+
+def test_ramp_limits_bind(case):
+    scales = [0.6, 1.0, 1.0, 0.6]
+    free = solve_multiperiod(case, load_scale=scales)
+    swing = np.abs(np.diff(np.asarray(free.pg), axis=0)).max(axis=0)
+    assert swing.max() > 10.0
+
+    # Every unit limited to 5 MW per half-hour period
+    rates = {gid: 10.0 for gid in case.gen_id.tolist()}
+    ramped = solve_multiperiod(case, load_scale=scales, period_hours=0.5, ramp_rates=rates)
+    assert ramped.status == "optimal"
+    assert np.all(np.abs(np.diff(np.asarray(ramped.pg), axis=0)) <= 5.0 + 1e-6)
+    assert sum(ramped.period_cost) > sum(free.period_cost)
+
+    # The first period starts within one ramp of the initial output
+    start = {gid: 0.0 for gid in case.gen_id.tolist()}
+    cold = solve_multiperiod(case, load_scale=scales, period_hours=0.5, ramp_rates=rates,
+                             initial_pg=start)
+    assert np.all(np.asarray(cold.pg[0]) <= 5.0 + 1e-6)
+
+
+def test_quadratic_ramp_limited_horizon_converges(bundled_case):
+    # case118 with its quadratic costs (OSQP path), ramps of 20% of capacity per hour
+    case = bundled_case("case118")
+    rates = {gid: 0.2 * pmax for gid, pmax in zip(case.gen_id.tolist(), case.pmax.tolist())}
+    hours = np.arange(8)
+    scales = list(0.8 + 0.2 * np.sin((hours - 8) / 24 * 2 * np.pi))
+    result = solve_multiperiod(case, load_scale=scales, ramp_rates=rates)
+    assert result.status == "optimal"
+    limits = np.array([rates[gid] for gid in case.gen_id.tolist()])
+    assert np.all(np.abs(np.diff(np.asarray(result.pg), axis=0)) <= limits + 1e-3)
+    assert sum(result.period_curtailment) < 1e-3
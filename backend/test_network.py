@@ -0,0 +1,56 @@
+import os
+import sys
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.schemas import Bus, Generator, Line, Load, CaseData
+from app.solver.network import get_network_model
+from app.solver.opf_solver import DCOPSolver
+
+
+def _case(pd=90.0, x=0.1):
+    return CaseData(
+        buses=[Bus(id=10, type=3), Bus(id=20, type=1), Bus(id=30, type=1), Bus(id=40, type=1)],
+        generators=[Generator(bus=10, pmin=0, pmax=200, cost=[0, 20, 0])],
+        lines=[
+            Line(from_bus=10, to_bus=20, x=x, rate_a=150),
+            Line(from_bus=20, to_bus=30, x=0.2, rate_a=150),
+            Line(from_bus=30, to_bus=99, x=0.2, rate_a=150),  # unknown bus
+            Line(from_bus=10, to_bus=30, x=0.2, rate_a=150, status=0),
+        ],
+        loads=[Load(bus=30, pd=pd), Load(bus=30, pd=10.0), Load(bus=77, pd=5.0)],
+    )
+
+
+def test_network_model_tables():
+    net = get_network_model(_case())
+    assert net.slack_bus == 10 and net.slack_idx == 0
+    assert list(net.active_lines) == [0, 1]
+    assert list(net.bus_positions([30, 99, 10])) == [2, -1, 0]
+    # Bus 40 has no branches and forms its own island
+    assert net.n_islands == 2
+    assert net.incidence.shape == (2, 4)
+    assert np.allclose(net.B.toarray()[1], [-10.0, 15.0, -5.0, 0.0])
+
+
+def test_network_model_cached_across_loads():
+    net_a = get_network_model(_case(pd=90.0))
+    net_b = get_network_model(_case(pd=50.0))
+    net_c = get_network_model(_case(x=0.05))
+    assert net_a is net_b
+    assert net_c is not net_a
+
+    Pd, _ = net_a.extract_loads(np.array([30, 30, 77]), np.array([90.0, 10.0, 5.0]), np.zeros(3))
+    assert np.allclose(Pd, [0.0, 0.0, 1.0, 0.0])
+
+
+def test_solve_reuses_network_with_new_loads():
+    solver = DCOPSolver()
+    low = solver.solve(_case(pd=50.0))
+    high = solver.solve(_case(pd=90.0))
+    assert low.status == high.status == "optimal"
+    assert np.isclose(low.total_cost, 60 * 20)
+    assert np.isclose(high.total_cost, 100 * 20)
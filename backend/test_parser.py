@@ -0,0 +1,73 @@
+import os
+import sys
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.parser.matpower import MatpowerParser, find_matrix_body, parse_matrix
+
+CASE = """
+function mpc = tiny
+mpc.baseMVA = 50;
+%% bus data
+mpc.bus = [
+    1   3   0    0   0  0  1  1.02  0  138  1  1.1  0.9;
+    2   1   40   5;  3  2  0  0   % ragged rows, two on one line
+];
+mpc.gen = [
+    1   10  0  100  -100  1.0  100  1  80  5  0  0  0  0  0  0  0  0  12  0  0;
+    1   20  0  100  -100  1.0  100  0  60  0;
+    3   30  0  100  -100  1.0  100  1  90  0;
+];
+mpc.branch = [
+    1  2  0.01  0.1  0.02  120  130  140  0  0  1;
+    2  3  0.02  0.2;
+];
+mpc.gencost = [
+    2  0  0  3  0.01  20  100;
+    1  0  0  2  0  0  50  1000;
+    2  0  0  2  30  5;
+    2  0  0  4  9  0.02  25  0;
+];
+"""
+
+
+def test_parse_small_case():
+    case = MatpowerParser().parse_text(CASE)
+
+    assert case.base_mva == 50.0
+    assert [b.id for b in case.buses] == [1, 2, 3]
+    assert case.buses[0].v_mag == 1.02 and case.buses[0].base_kv == 138.0
+    # Short rows fall back to defaults
+    assert case.buses[1].v_mag == 1.0 and case.buses[1].base_kv == 345.0
+    assert [(l.bus, l.pd, l.qd) for l in case.loads] == [(2, 40.0, 5.0)]
+
+    assert [g.id for g in case.generators] == ["G-1-1", "G-1-2", "G-3-1"]
+    assert [g.status for g in case.generators] == [1, 0, 1]
+    assert case.generators[0].pmax == 80.0 and case.generators[0].pmin == 5.0
+    assert case.generators[0].ramp_30 == 12.0 and case.generators[1].ramp_30 == 0.0
+
+    assert case.lines[0].rate_a == 120.0 and case.lines[0].b == 0.02
+    assert case.lines[0].rate_b == 130.0 and case.lines[0].rate_c == 140.0
+    assert case.lines[1].rate_a == 250.0 and case.lines[1].status == 1
+
+    # Piecewise-linear rows are skipped, so polynomial costs apply in row order;
+    # linear costs are zero-padded and higher orders truncated to [c2, c1, c0]
+    assert case.generators[0].cost == [0.01, 20.0, 100.0]
+    assert case.generators[1].cost == [0.0, 30.0, 5.0]
+    assert case.generators[2].cost == [0.02, 25.0, 0.0]
+
+
+def test_missing_gencost_uses_default_cost():
+    text = CASE[:CASE.index("mpc.gencost")]
+    case = MatpowerParser().parse_text(text)
+    assert all(g.cost == [0, 25, 0] for g in case.generators)
+
+
+def test_find_and_tokenize_matrix():
+    text = "mpc.genfuel = {'x'};\nMPC.Gen=[1 2 3\n4 5 6];"
+    body = find_matrix_body(text, "gen")
+    assert body == "1 2 3\n4 5 6"
+    m = parse_matrix(body)
+    assert m.data.tolist() == [[1, 2, 3], [4, 5, 6]]
+    assert find_matrix_body(text, "branch") is None
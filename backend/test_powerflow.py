@@ -0,0 +1,69 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.main import _compute_power_flow
+from app.models.schemas import PowerFlowRequest, PowerSystem
+from app.solver.network import get_network_model
+from app.solver.opf_solver import DCOPSolver
+from app.solver.powerflow import dc_power_flow
+from app.solver.sensitivity import get_sensitivity_model
+from app.synthetic import generate_case
+
+
+def test_power_flow_reproduces_opf_flows(bundled_case):
+    case = bundled_case("case30")
+    result = DCOPSolver().solve(case, result_format="columns")
+    case.pg = np.asarray(result.gen_pg)
+
+    pf = dc_power_flow(case)
+    assert pf.n_cases == 1
+    assert np.allclose(pf.flows[:, 0], result.line_flow_mw, atol=1e-6)
+    assert np.allclose(np.degrees(pf.theta[:, 0]), result.bus_va, atol=1e-6)
+    # The reference bus balances the dispatch: its injection is the one given
+    assert np.allclose(pf.slack_mw[:, 0], np.asarray(result.bus_pl)[pf.refs], atol=1e-6)
+
+
+def test_batched_columns_match_single_solves_on_islands():
+    case = generate_case(300, seed=2, islands=3)
+    model = get_sensitivity_model(case)
+    injections = np.random.default_rng(1).normal(scale=50.0, size=(case.n_bus, 20))
+
+    pf = dc_power_flow(case, injections)
+    assert pf.flows.shape == (case.n_line, 20) and len(pf.refs) == 3
+    for k in (0, 7, 19):
+        assert np.allclose(pf.flows[:, k], model.flows(injections[:, k]))
+    # Each island's reference bus takes up the island's imbalance
+    labels = get_network_model(case).island_labels
+    others = np.array([[injections[labels == labels[r], k].sum() - injections[r, k] for k in range(20)]
+                       for r in model.refs])
+    assert np.allclose(pf.slack_mw, -others)
+
+    # Injections at selected buses only
+    subset = dc_power_flow(case, injections[[4, 9]], buses=case.bus_id[[4, 9]])
+    sparse = np.zeros_like(injections)
+    sparse[[4, 9]] = injections[[4, 9]]
+    assert np.allclose(subset.flows, dc_power_flow(case, sparse).flows)
+    with pytest.raises(ValueError, match="one row per bus"):
+        dc_power_flow(case, injections[:-1])
+
+
+def test_power_flow_endpoint_payload(bundled_case):
+    case = bundled_case("case30").to_case()
+    system = PowerSystem(buses=case.buses, generators=case.generators, lines=case.lines, loads=case.loads)
+    request = PowerFlowRequest(case_data=system, buses=[2, 5], injections=[[10.0, -10.0], [0.0, 25.0]])
+    result = _compute_power_flow(request, "test")
+    assert len(result.va) == len(result.flows) == len(result.slack) == 2
+    assert len(result.flows[0]) == len(result.line_from) == len(case.lines)
+    assert result.reference_buses == [1] and result.va[0][0] == 0.0
+    # 10 MW from bus 2 to bus 5 and 25 MW from the reference bus to bus 5
+    assert result.slack[0] == pytest.approx([0.0], abs=1e-9)
+    assert result.slack[1] == pytest.approx([-25.0])
+
+    with pytest.raises(ValueError, match="same length"):
+        _compute_power_flow(PowerFlowRequest(case_data=system, injections=[[1.0], [1.0, 2.0]]), "test")
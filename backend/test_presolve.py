@@ -0,0 +1,97 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.arrays import CaseArrays
+from app.solver.network import get_network_model
+from app.solver.opf_solver import DCOPSolver
+from app.solver.presolve import LEAF, PASS_THROUGH, clear_protected, protected_buses, reduce_network
+
+
+def _linear(case):
+    # Quadratic cost terms dropped (LP path)
+    case.gen_cost[:, 0] = 0.0
+    return case
+
+
+def _solve_both(case, **kwargs):
+    full = DCOPSolver().solve(case, result_format="columns", timings=True, **kwargs)
+    reduced = DCOPSolver().solve(case, result_format="columns", timings=True, presolve=True, **kwargs)
+    return full, reduced
+
+
+@pytest.mark.parametrize("name", ["case39", "case300", "case2383wp"])
+def test_presolve_matches_full_model(name, bundled_case):
+    case = _linear(bundled_case(name))
+    full, reduced = _solve_both(case)
+    assert reduced.status == "optimal" and reduced.iterations == 1 and reduced.presolve_resolves == 0
+    assert reduced.total_cost == pytest.approx(full.total_cost, rel=1e-9)
+    assert np.allclose(reduced.bus_marginal_cost, full.bus_marginal_cost, atol=1e-6)
+    assert np.all(np.abs(reduced.line_flow_mw) <= np.where(case.rate_a > 0, case.rate_a, np.inf) + 1e-6)
+    assert abs(np.sum(reduced.bus_pl)) < 1e-6
+    assert reduced.timings.rows < full.timings.rows and reduced.timings.cols < full.timings.cols
+
+
+def test_reduction_of_small_network():
+    # 1 (slack, gen) =2 parallel= 2 - 3 (pass-through) - 4 (load) - 5 (radial load), 4 - 1 closes the loop
+    case = CaseArrays(
+        base_mva=100.0,
+        bus_id=np.arange(1, 6), bus_type=np.array([3, 1, 1, 1, 1]),
+        gen_id=np.array(["G1"], dtype=object), gen_bus=np.array([1]), pmax=np.array([300.0]),
+        pmin=np.array([0.0]), gen_cost=np.array([[0.0, 20.0, 0.0]]), gen_cost_len=np.array([3]),
+        line_from=np.array([1, 1, 2, 3, 4, 4]), line_to=np.array([2, 2, 3, 4, 5, 1]),
+        x=np.array([0.1, 0.2, 0.1, 0.1, 0.1, 0.3]), rate_a=np.array([100.0, 100.0, 80.0, 80.0, 50.0, 100.0]),
+        load_bus=np.array([2, 4, 5]), load_pd=np.array([30.0, 60.0, 40.0]),
+    )
+    net = get_network_model(case)
+    Pd, _ = net.extract_loads(case.load_bus, case.load_pd, case.load_qd)
+    reduction = reduce_network(net, Pd, net.gen_bus_idx, case.pmin / 100, case.pmax / 100)
+    assert reduction.n_parallel == 1
+    assert [(kind, int(net.bus_ids[bus])) for kind, bus, _, _ in reduction.eliminated] == \
+        [(LEAF, 5), (PASS_THROUGH, 3)]
+    assert net.bus_ids[reduction.kept].tolist() == [1, 2, 4]
+    assert np.allclose(reduction.loads(Pd), [0.0, 0.3, 1.0])
+
+    # A radial branch that could carry more than its rating stays in the model
+    case.rate_a[4] = 30.0
+    reduction = reduce_network(get_network_model(case), Pd, net.gen_bus_idx, case.pmin / 100, case.pmax / 100)
+    assert [int(net.bus_ids[bus]) for _, bus, _, _ in reduction.eliminated] == [3]
+
+    full, reduced = _solve_both(case)
+    assert reduced.total_curtailment == pytest.approx(full.total_curtailment) and full.total_curtailment > 0
+    assert np.allclose(reduced.bus_curtailment, full.bus_curtailment, atol=1e-6)
+    assert np.allclose(reduced.bus_marginal_cost, full.bus_marginal_cost, atol=1e-6)
+
+
+def test_small_reduction_solves_full_model(bundled_case):
+    # case57 keeps 49 of its 57 buses: not worth a reduced model
+    full, reduced = _solve_both(bundled_case("case57"))
+    assert reduced.status == full.status == "optimal"
+    assert reduced.timings.rows == full.timings.rows and "presolve" in reduced.timings.phases
+    assert reduced.total_cost == pytest.approx(full.total_cost, rel=1e-6)
+
+
+def test_binding_branch_keeps_pass_through_bus(bundled_case):
+    # Bus 9 of case39 is a pass-through bus between buses 8 and 39; rating
+    # branch 8-9 below its flow binds it
+    case = _linear(bundled_case("case39"))
+    case.rate_a = case.rate_a.copy()
+    case.rate_a[13] = 20.0
+    clear_protected()
+    full, reduced = _solve_both(case)
+    assert reduced.iterations == 1 and reduced.presolve_resolves == 1
+    assert reduced.total_cost == pytest.approx(full.total_cost, rel=1e-9)
+    assert np.allclose(reduced.bus_marginal_cost, full.bus_marginal_cost, atol=1e-6)
+    assert abs(reduced.line_flow_mw[13]) <= 20.0 + 1e-6
+
+    # The bus is remembered: the next presolve keeps it and needs no full solve
+    net = get_network_model(case)
+    assert net.bus_ids[protected_buses(net.key)].tolist() == [9]
+    again = DCOPSolver().solve(case, result_format="columns", presolve=True)
+    assert again.presolve_resolves == 0
+    assert np.allclose(again.bus_marginal_cost, full.bus_marginal_cost, atol=1e-6)
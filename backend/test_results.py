@@ -0,0 +1,47 @@
+import os
+import sys
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.schemas import Bus, Generator, Line, Load, CaseData, ColumnarOPFResult
+from app.solver.opf_solver import DCOPSolver
+from app.solver.results import columns_to_result
+from app.store import SessionStore
+
+
+def _case():
+    return CaseData(
+        buses=[Bus(id=1, type=3), Bus(id=2), Bus(id=3)],
+        generators=[Generator(id="G1", bus=1, pmin=0, pmax=200, cost=[0, 20, 0]),
+                    Generator(id="G2", bus=3, pmin=0, pmax=200, cost=[0, 40, 0])],
+        lines=[Line(from_bus=1, to_bus=2, x=0.1, rate_a=60),
+               Line(from_bus=2, to_bus=3, x=0.1, rate_a=200),
+               Line(from_bus=1, to_bus=3, x=0.1, rate_a=200, status=0),
+               Line(from_bus=1, to_bus=9, x=0.1)],
+        loads=[Load(bus=2, pd=100)],
+    )
+
+
+def test_columns_match_records():
+    records = DCOPSolver().solve(_case())
+    columns = DCOPSolver().solve(_case(), result_format="columns")
+
+    assert isinstance(columns, ColumnarOPFResult)
+    assert columns.gen_id == ["G1", "G2"]
+    # Out-of-service branch reported with zero flow, branch to a missing bus left out
+    assert list(zip(columns.line_from, columns.line_to)) == [(1, 2), (2, 3), (1, 3)]
+    assert columns.line_flow_mw[2] == 0.0
+    assert columns.line_loading_percent[0] == 100.0 * abs(columns.line_flow_mw[0]) / 60
+    # Congested branch 1-2 collects rent
+    assert columns.line_congestion_rent[0] > 0
+    assert columns_to_result(columns).model_dump() == records.model_dump()
+
+
+def test_store_keeps_columnar_results(tmp_path):
+    result = DCOPSolver().solve(_case(), result_format="columns")
+    store = SessionStore(db_path=str(tmp_path / "sessions.db"))
+    store.set_result("a", _case(), result)
+
+    other = SessionStore(db_path=str(tmp_path / "sessions.db"))
+    assert other.get_result("a") == result
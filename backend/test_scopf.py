@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.solver.opf_solver import DCOPSolver
+from app.solver.scopf import solve_scopf
+from app.solver.sensitivity import get_sensitivity_model
+
+
+@pytest.fixture
+def case(bundled_case):
+    # case30 with linear costs (LP path) and emergency ratings equal to rate_a
+    case = bundled_case("case30")
+    case.gen_cost[:, 0] = 0.0
+    case.rate_c = case.rate_a.copy()
+    return case
+
+
+def _injections(result, case):
+    return (np.asarray(result.bus_pl) + np.asarray(result.bus_curtailment)) / case.base_mva
+
+
+def test_scopf_secures_every_outage(case):
+    scopf = solve_scopf(case, result_format="columns")
+    assert scopf.converged and scopf.rounds > 1 and scopf.n_cuts > 0
+    assert scopf.n_violations == 0 and scopf.result.status == "optimal"
+    assert scopf.result.total_cost > DCOPSolver().solve(case).total_cost
+
+    # Post-contingency flows of the secured dispatch, network by network
+    injections = _injections(scopf.result, case)
+    for m in get_sensitivity_model(case).active_lines:
+        if m in scopf.islanding:
+            continue
+        outaged = case.subset(np.ones(case.n_bus, dtype=bool))
+        outaged.line_status = outaged.line_status.copy()
+        outaged.line_status[m] = 0
+        after = get_sensitivity_model(outaged).flows(injections) * case.base_mva
+        assert np.all(np.abs(after) <= case.rate_c + 0.01)
+
+
+def test_lazy_limits_match_full_model(case):
+    lazy = solve_scopf(case)
+    # A negative tolerance adds every contingency limit in the first round
+    full = solve_scopf(case, tolerance_mw=-1e6, max_cuts_per_round=10**6)
+    assert full.n_cuts > 10 * lazy.n_cuts
+    assert np.isclose(lazy.result.total_cost, full.result.total_cost)
+
+
+def test_unsecurable_limits_are_priced(case):
+    case.rate_c[0] = 1.0
+    scopf = solve_scopf(case, overload_cost=1000.0)
+    assert scopf.converged and scopf.result.status == "optimal"
+    assert scopf.n_violations > 0 and scopf.overload_mw > 0
@@ -0,0 +1,59 @@
+import os
+import sys
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.solver.sensitivity import get_sensitivity_model
+
+
+def _flows(case, injections):
+    return get_sensitivity_model(case).flows(injections)
+
+
+def test_ptdf_predicts_flows_in_either_orientation(bundled_case):
+    case = bundled_case("case30")
+    model = get_sensitivity_model(case)
+    injections = np.random.default_rng(0).normal(size=model.n_bus)
+
+    full = model.ptdf()
+    assert full.shape == (model.n_line, model.n_bus)
+    assert np.allclose(full @ injections, _flows(case, injections))
+
+    # Row solves (few lines) and column solves (few buses) give the same block
+    assert np.allclose(model.ptdf(lines=[0, 3, 7]), full[[0, 3, 7]])
+    assert np.allclose(model.ptdf(buses=[1, 4]), full[:, [1, 4]])
+
+
+def test_lodf_matches_outaged_network(bundled_case):
+    case = bundled_case("case30")
+    model = get_sensitivity_model(case)
+    injections = np.random.default_rng(1).normal(size=model.n_bus)
+    before = _flows(case, injections)
+
+    lodf, islanding = model.lodf()
+    for m in np.flatnonzero(~islanding)[:5]:
+        outaged = case.subset(np.ones(case.n_bus, dtype=bool))
+        outaged.line_status = outaged.line_status.copy()
+        outaged.line_status[m] = 0
+        after = _flows(outaged, injections)
+        assert np.allclose(before + lodf[:, m] * before[m], after)
+
+    # Radial branches split the network; their factors are undefined
+    assert islanding.any()
+    assert np.isnan(lodf[:, islanding]).all()
+
+
+def test_factorization_cached_per_topology(bundled_case):
+    case = bundled_case("case30")
+    first = get_sensitivity_model(case)
+
+    # Loads and ratings do not change the sensitivities
+    case.load_pd = case.load_pd * 1.5
+    case.rate_a = case.rate_a * 2
+    assert get_sensitivity_model(case) is first
+
+    case.x = case.x * 1.1
+    assert get_sensitivity_model(case) is not first
@@ -0,0 +1,108 @@
+import os
+import sys
+import asyncio
+import threading
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.schemas import OPFResult
+from app.store import SessionStore, ELEMENT_BYTES
+from app.workers import OPF_MAX_WORKERS, run_in_worker, run_io
+
+
+def test_sessions_are_isolated(two_bus_case):
+    store = SessionStore(db_path=None)
+    store.set_case("a", two_bus_case(10.0))
+    store.set_case("b", two_bus_case(20.0))
+    store.set_result("b", two_bus_case(20.0), OPFResult(total_cost=400.0, objective_value=400.0))
+
+    assert store.get_case("a").loads[0].pd == 10.0
+    assert store.get_case("b").loads[0].pd == 20.0
+    assert store.get_result("a") is None
+    assert store.get_result("b").total_cost == 400.0
+    assert store.get_case("missing") is None
+
+    # Replacing the case keeps the last result
+    store.set_case("b", two_bus_case(30.0))
+    assert store.get_result("b").total_cost == 400.0
+
+
+def test_lru_eviction_by_count_and_size(two_bus_case):
+    store = SessionStore(max_sessions=2, db_path=None)
+    for sid in ("a", "b", "c"):
+        store.set_case(sid, two_bus_case())
+    assert store.get_case("a") is None
+    assert store.get_case("c") is not None
+
+    # Budget for about one case
+    store = SessionStore(max_mb=7 * ELEMENT_BYTES / 1024 / 1024, db_path=None)
+    store.set_case("a", two_bus_case())
+    store.get_case("a")
+    store.set_case("b", two_bus_case())
+    assert store.get_case("a") is None
+    assert store.get_case("b") is not None
+
+
+def test_sqlite_store_is_shared(tmp_path, two_bus_case):
+    path = str(tmp_path / "sessions.db")
+    first = SessionStore(db_path=path)
+    second = SessionStore(db_path=path)
+
+    first.set_case("a", two_bus_case(10.0))
+    assert second.get_case("a").loads[0].pd == 10.0
+
+    second.set_result("a", two_bus_case(15.0), OPFResult(total_cost=300.0, objective_value=300.0))
+    assert first.get_case("a").loads[0].pd == 15.0
+    assert first.get_result("a").total_cost == 300.0
+
+    first.delete("a")
+    assert second.get_case("a") is None
+
+
+def test_sqlite_concurrent_writes_keep_other_fields(tmp_path, two_bus_case):
+    # Two processes' stores writing the same session: a case written from a
+    # stale cached copy must not drop the other store's result, and every
+    # write gets its own version
+    path = str(tmp_path / "sessions.db")
+    first = SessionStore(db_path=path)
+    second = SessionStore(db_path=path)
+    first.set_case("a", two_bus_case(10.0))
+    second.get_case("a")
+
+    def set_results():
+        for k in range(20):
+            first.set_result("a", two_bus_case(10.0), OPFResult(total_cost=float(k), objective_value=float(k)))
+
+    def set_cases():
+        for k in range(20):
+            second.set_case("a", two_bus_case(20.0 + k))
+
+    threads = [threading.Thread(target=set_results), threading.Thread(target=set_cases)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert second.backend.version("a") == 41
+    assert second.get_result("a") is not None
+    assert first.get_result("a").total_cost == second.get_result("a").total_cost
+    assert len(first._session_locks) == len(second._session_locks) == 0
+
+
+def test_store_calls_do_not_wait_for_busy_workers(two_bus_case):
+    # Every solve worker blocked: store reads still answer on the I/O pool
+    store = SessionStore(db_path=None)
+    store.set_case("a", two_bus_case(10.0))
+    release = threading.Event()
+
+    async def scenario():
+        solves = [asyncio.ensure_future(run_in_worker(release.wait, 30)) for _ in range(OPF_MAX_WORKERS + 1)]
+        try:
+            case = await asyncio.wait_for(run_io(store.get_case, "a"), timeout=5)
+        finally:
+            release.set()
+            await asyncio.gather(*solves)
+        return case
+
+    assert asyncio.run(scenario()).loads[0].pd == 10.0
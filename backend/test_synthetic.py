@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.parser.matpower import MatpowerParser, format_matpower
+from app.solver.network import get_network_model
+from app.solver.opf_solver import DCOPSolver
+from app.synthetic import generate_case
+
+
+def test_synthetic_case_structure_and_solve():
+    case = generate_case(400, seed=3, islands=3)
+    assert case.n_bus == 400 and np.array_equal(case.bus_id, np.arange(1, 401))
+    assert abs(case.n_line - 1.4 * 400) <= 3
+    assert np.all(case.x > 0) and np.all(case.rate_a >= 100)
+
+    # One slack per island, each island with enough capacity for its load
+    net = get_network_model(case)
+    assert net.n_islands == 3
+    assert np.count_nonzero(case.bus_type == 3) == 3
+    assert case.pmax.sum() > case.load_pd.sum()
+
+    # Ratings leave the proportional dispatch feasible: no load is shed
+    # (OSQP may stop at its iteration limit on the QP, hence the tolerance)
+    for cost_model in ("quadratic", "linear"):
+        case = generate_case(400, seed=3, islands=3, cost_model=cost_model)
+        assert np.all(case.gen_cost[:, 0] > 0) == (cost_model == "quadratic")
+        result = DCOPSolver().solve(case, result_format="columns")
+        assert result.total_curtailment < 1e-3 * case.load_pd.sum()
+    assert result.status == "optimal"
+
+    # Same seed, same case
+    again = generate_case(400, seed=3, islands=3, cost_model="linear")
+    assert np.array_equal(again.line_from, case.line_from) and np.allclose(again.pmax, case.pmax)
+
+    with pytest.raises(ValueError, match="islands"):
+        generate_case(10, islands=11)
+
+
+@pytest.mark.parametrize("source", ["synthetic", "case118"])
+def test_matpower_text_round_trip(source, bundled_case):
+    if source == "synthetic":
+        case = generate_case(200, seed=1)
+    else:
+        case = bundled_case(source)
+    parsed = MatpowerParser().parse_arrays(format_matpower(case, source))
+
+    for name in ("bus_id", "bus_type", "gen_bus", "gen_status", "line_from", "line_to", "line_status"):
+        assert np.array_equal(getattr(parsed, name), getattr(case, name)), name
+    for name in ("pmax", "pmin", "gen_cost", "x", "r", "rate_a", "load_pd", "base_kv"):
+        assert np.allclose(getattr(parsed, name), getattr(case, name), rtol=1e-7), name
+    assert list(parsed.gen_id) == list(case.gen_id)
+    assert np.isclose(DCOPSolver().solve(parsed).total_cost, DCOPSolver().solve(case).total_cost)
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import wire
+from app.models.arrays import CaseArrays
+from app.solver.opf_solver import DCOPSolver
+
+
+def test_accept_negotiation(monkeypatch):
+    assert wire.accepted_media_types("application/json;q=0.5, application/x-msgpack, text/html;q=0") == \
+        ["application/x-msgpack", "application/json"]
+
+    monkeypatch.setattr(wire, "msgpack_available", lambda: False)
+    assert wire.choose_media_type("application/x-msgpack, application/json;q=0.5") == wire.JSON_MEDIA_TYPE
+
+    monkeypatch.setattr(wire, "msgpack_available", lambda: True)
+    assert wire.choose_media_type("application/x-msgpack, application/json;q=0.5") == wire.MSGPACK_MEDIA_TYPE
+    assert wire.choose_media_type("application/json, application/x-msgpack;q=0.9") == wire.JSON_MEDIA_TYPE
+    assert wire.choose_media_type(None) == wire.JSON_MEDIA_TYPE
+
+
+def test_case_payload_round_trip(two_bus_case):
+    case = two_bus_case()
+    # A named bus: the optional string columns travel as plain lists
+    case.buses[0].name = "North"
+    payload = wire.columnar_payload(case)
+    columns = {
+        name: np.asarray(value, dtype=object) if isinstance(value, list) else wire.from_typed_array(value)
+        for name, value in payload["columns"].items()
+    }
+    assert payload["columns"]["bus_id"]["dtype"] == "int32"
+    assert payload["columns"]["gen_cost"]["shape"] == [1, 3]
+    rebuilt = CaseArrays(base_mva=payload["base_mva"], **columns).to_case()
+    assert rebuilt.model_dump() == case.model_dump()
+
+
+def test_result_payload_matches_result(two_bus_case):
+    result = DCOPSolver().solve(two_bus_case())
+    payload = wire.columnar_payload(result)
+    assert payload["kind"] == "opf_result"
+    assert payload["total_cost"] == result.total_cost
+    assert payload["columns"]["gen_id"] == ["G1"]
+    assert wire.from_typed_array(payload["columns"]["line_flow_mw"]).tolist() == \
+        [line.flow_mw for line in result.line_results]
+
+
+def test_msgpack_response(two_bus_case):
+    msgpack = pytest.importorskip("msgpack")
+    response = wire.encode_response(two_bus_case(), "application/x-msgpack")
+    assert response.media_type == wire.MSGPACK_MEDIA_TYPE
+    payload = msgpack.unpackb(response.body, raw=False)
+    assert wire.from_typed_array(payload["columns"]["load_pd"]).tolist() == [50.0]
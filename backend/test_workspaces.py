@@ -0,0 +1,84 @@
+import os
+import sys
+from unittest import mock
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.solver import opf_solver
+from app.solver.opf_solver import DCOPSolver
+from app.solver.workspaces import highs_workspaces, osqp_workspaces, solve_highs
+
+# Quadratic costs for the two units of the three-bus case (OSQP path)
+QUADRATIC_COSTS = ([0.02, 20, 0], [0.05, 15, 0])
+
+
+def test_qp_workspace_reused_across_load_changes(three_bus_case):
+    osqp_workspaces.clear()
+    solver = DCOPSolver()
+    solver.solve(three_bus_case(100.0, QUADRATIC_COSTS))
+    assert len(osqp_workspaces) == 1
+
+    warm = solver.solve(three_bus_case(120.0, QUADRATIC_COSTS))
+    assert len(osqp_workspaces) == 1
+
+    osqp_workspaces.clear()
+    cold = solver.solve(three_bus_case(120.0, QUADRATIC_COSTS))
+    assert warm.status == cold.status == "optimal"
+    assert np.isclose(warm.total_cost, cold.total_cost, rtol=1e-4)
+
+
+def test_qp_workspace_handles_cost_updates(three_bus_case):
+    osqp_workspaces.clear()
+    solver = DCOPSolver()
+    solver.solve(three_bus_case(100.0, QUADRATIC_COSTS))
+
+    case = three_bus_case(100.0, QUADRATIC_COSTS)
+    case.generators[0].cost = [0.04, 20, 0]
+    updated = solver.solve(case)
+
+    osqp_workspaces.clear()
+    cold = solver.solve(case)
+    assert np.isclose(updated.total_cost, cold.total_cost, rtol=1e-4)
+
+
+def test_lp_model_hot_starts_across_load_and_cost_changes(three_bus_case):
+    highs_workspaces.clear()
+    solver = DCOPSolver()
+    case = three_bus_case(100.0, QUADRATIC_COSTS)
+    for g in case.generators:
+        g.cost = [0, g.cost[1], 0]
+    solver.solve(case)
+    assert len(highs_workspaces) == 1
+
+    case.loads[0].pd = 150.0
+    case.generators[1].cost = [0, 25, 0]
+    hot = solver.solve(case)
+    assert len(highs_workspaces) == 1
+
+    with mock.patch.object(opf_solver, "solve_highs", return_value=None):
+        reference = DCOPSolver().solve(case)
+    assert hot.status == reference.status == "optimal"
+    assert np.isclose(hot.total_cost, reference.total_cost)
+    assert np.allclose([b.marginal_cost for b in hot.bus_results],
+                       [b.marginal_cost for b in reference.bus_results])
+
+
+def test_lp_without_valid_duals_falls_back_to_linprog(three_bus_case):
+    # HiGHS can stop with primal values but no valid duals; LMPs then come from linprog
+    case = three_bus_case(250.0)
+    reference = DCOPSolver().solve(case)
+
+    def without_duals(*args, **kwargs):
+        solution, warm = solve_highs(*args, **kwargs)
+        solution.row_dual = None
+        return solution, warm
+
+    with mock.patch.object(opf_solver, "solve_highs", side_effect=without_duals):
+        result = DCOPSolver().solve(case)
+    assert result.status == "optimal"
+    assert np.isclose(result.total_cost, reference.total_cost)
+    assert np.allclose([b.marginal_cost for b in result.bus_results],
+                       [b.marginal_cost for b in reference.bus_results])
@@ -4,6 +4,23 @@
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
+/**
+ * Per-tab session ID so each user keeps their own case and results on the server
+ */
+function getSessionId(): string {
+  if (typeof window === 'undefined') return 'default';
+  let id = window.sessionStorage.getItem('opfSessionId');
+  if (!id) {
+    id = window.crypto?.randomUUID?.() ?? `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    window.sessionStorage.setItem('opfSessionId', id);
+  }
+  return id;
+}
+
+function sessionHeaders(headers: Record<string, string> = {}): Record<string, string> {
+  return { ...headers, 'X-Session-Id': getSessionId() };
+}
+
 export interface Bus {
   id: number;
   name?: string;
@@ -103,7 +120,7 @@ export interface OPFResult {
 export async function loadCase(system: PowerSystem): Promise<CaseData> {
   const response = await fetch(`${API_BASE_URL}/case`, {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: sessionHeaders({ 'Content-Type': 'application/json' }),
     body: JSON.stringify(system),
   });
   if (!response.ok) throw new Error('Failed to load case');
@@ -113,7 +130,7 @@ export async function loadCase(system: PowerSystem): Promise<CaseData> {
 export async function loadMatpowerCase(text: string): Promise<CaseData> {
   const response = await fetch(`${API_BASE_URL}/case/text`, {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: sessionHeaders({ 'Content-Type': 'application/json' }),
     body: text,
   });
   if (!response.ok) throw new Error('Failed to parse MATPOWER case');
@@ -121,7 +138,7 @@ export async function loadMatpowerCase(text: string): Promise<CaseData> {
 }
 
 export async function getCase(): Promise<CaseData> {
-  const response = await fetch(`${API_BASE_URL}/case`);
+  const response = await fetch(`${API_BASE_URL}/case`, { headers: sessionHeaders() });
   if (!response.ok) throw new Error('No case loaded');
   return response.json();
 }
@@ -129,7 +146,7 @@ export async function getCase(): Promise<CaseData> {
 export async function runOPF(system?: PowerSystem, enforceLineLimits: boolean = true, voll: number = 10000, removeIsolated: boolean = false): Promise<OPFResult> {
   const response = await fetch(`${API_BASE_URL}/opf`, {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: sessionHeaders({ 'Content-Type': 'application/json' }),
     body: system ? JSON.stringify({
       case_data: system,
       enforce_line_limits: enforceLineLimits,
@@ -146,7 +163,7 @@ export async function runOPF(system?: PowerSystem, enforceLineLimits: boolean =
 }
 
 export async function getResults(): Promise<OPFResult> {
-  const response = await fetch(`${API_BASE_URL}/results`);
+  const response = await fetch(`${API_BASE_URL}/results`, { headers: sessionHeaders() });
   if (!response.ok) throw new Error('No results available');
   return response.json();
 }
@@ -164,19 +181,19 @@ export async function getMatpowerExample(): Promise<string> {
 }
 
 export async function exportCSV(): Promise<Blob> {
-  const response = await fetch(`${API_BASE_URL}/export/csv`);
+  const response = await fetch(`${API_BASE_URL}/export/csv`, { headers: sessionHeaders() });
   if (!response.ok) throw new Error('Failed to export CSV');
   return response.blob();
 }
 
 export async function exportJSON(): Promise<Blob> {
-  const response = await fetch(`${API_BASE_URL}/export/json`);
+  const response = await fetch(`${API_BASE_URL}/export/json`, { headers: sessionHeaders() });
   if (!response.ok) throw new Error('Failed to export JSON');
   return response.blob();
 }
 
 export function triggerExport(format: 'csv' | 'json') {
-  const url = `${API_BASE_URL}/export/${format}`;
+  const url = `${API_BASE_URL}/export/${format}?session=${encodeURIComponent(getSessionId())}`;
   // Using target='_blank' helps Chrome handle the download as a navigation event
   // without replacing the current page context, often bypassing strict click checks.
 
@@ -202,6 +219,7 @@ export async function getAvailableCases(): Promise<string[]> {
 export async function loadServerCase(filename: string): Promise<CaseData> {
   const response = await fetch(`${API_BASE_URL}/cases/${filename}/load`, {
     method: 'POST',
+    headers: sessionHeaders(),
   });
   if (!response.ok) throw new Error('Failed to load case');
   return response.json();
@@ -210,7 +228,7 @@ export async function loadServerCase(filename: string): Promise<CaseData> {
 export async function saveServerCase(filename: string, system: PowerSystem): Promise<{ status: string, message: string, filename: string }> {
   const response = await fetch(`${API_BASE_URL}/cases/${filename}/save`, {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: sessionHeaders({ 'Content-Type': 'application/json' }),
     body: JSON.stringify(system),
   });
   if (!response.ok) throw new Error('Failed to save case to server');